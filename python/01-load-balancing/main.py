@@ -1,17 +1,28 @@
-
+"""
 Main entry point for the Smart Grid Load Balancing System.
 This script demonstrates the integration of data loading, load balancing, monitoring, and reporting components.
+"""
 
 from src.utils.data_loader import GridDataLoader
 from src.services.load_balancer import GridLoadBalancer
 from src.services.monitoring_system import GridMonitoringSystem
 from src.services.data_processor import LoadDataProcessor
+from src.services.event_bus import EventBus
 from src.reports.grid_reports import GridReports
+from src.models.events import TransferEvent
+import asyncio
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+async def stream_live_updates(event_bus, measurements, transfers):
+    """Publish measurements and transfers on the event bus and wait for every consumer to catch up."""
+    await event_bus.start()
+    await event_bus.publish_many(measurements)
+    await event_bus.publish_many([TransferEvent(**transfer) for transfer in transfers])
+    await event_bus.close()
+
 def main():
     logging.info("Starting Smart Grid Load Balancing System simulation...")
 
@@ -37,13 +48,13 @@ def main():
 
         # 3. Get current grid state (combines topology with current loads)
         current_grid_state = data_loader.get_current_grid_state()
-        logging.info(f"Current system utilization: {current_grid_state["system_utilization_pct"]:.2f}%")
+        logging.info(f"Current system utilization: {current_grid_state['system_utilization_pct']:.2f}%")
 
         # 4. Analyze grid capacity and identify issues
         logging.info("Analyzing grid segment capacities...")
         capacity_analysis = grid_load_balancer.analyze_grid_capacity()
-        logging.info(f"Critical segments: {len(capacity_analysis["critical"])}")
-        logging.info(f"Warning segments: {len(capacity_analysis["warning"])}")
+        logging.info(f"Critical segments: {len(capacity_analysis['critical'])}")
+        logging.info(f"Warning segments: {len(capacity_analysis['warning'])}")
 
         # 5. Generate and display alerts
         logging.info("Checking for and generating alerts...")
@@ -51,18 +62,19 @@ def main():
         if active_alerts:
             logging.warning(f"Found {len(active_alerts)} active alerts.")
             for alert in active_alerts:
-                logging.warning(f"  Alert: {alert["segment_id"]} - {alert["alert_level"]} at {alert["utilization_pct"]:.2f}% - Action: {alert["recommended_action"]}")
+                logging.warning(f"  Alert: {alert['segment_id']} - {alert['alert_level']} at {alert['utilization_pct']:.2f}% - Action: {alert['recommended_action']}")
         else:
             logging.info("No active alerts. Grid is stable.")
 
         # 6. Calculate optimal load transfers (if any critical segments)
+        transfer_recommendations = []
         if capacity_analysis["critical"]:
             logging.info("Calculating optimal load transfers for critical segments...")
             transfer_recommendations = grid_load_balancer.calculate_optimal_transfers()
             if transfer_recommendations:
                 logging.info(f"Recommended {len(transfer_recommendations)} load transfers.")
                 for transfer in transfer_recommendations:
-                    logging.info(f"  Transfer: {transfer["transfer_mw"]:.2f} MW from {transfer["from_segment_id"]} to {transfer["to_segment_id"]}")
+                    logging.info(f"  Transfer: {transfer['transfer_mw']:.2f} MW from {transfer['from_segment_id']} to {transfer['to_segment_id']}")
             else:
                 logging.info("No optimal transfers found or needed at this time.")
         else:
@@ -86,9 +98,24 @@ def main():
 
         # 9. Calculate and display efficiency metrics
         logging.info("Calculating grid efficiency metrics...")
-        efficiency_metrics = grid_reports.calculate_efficiency_metrics(current_grid_state)
+        efficiency_metrics = grid_reports.calculate_efficiency_metrics(current_grid_state, transfer_recommendations)
         logging.info(f"Efficiency Metrics: {efficiency_metrics}")
 
+        # 10. Stream live updates through the event bus instead of passing whole lists around
+        logging.info("Streaming measurements and transfers through the event bus...")
+        event_bus = EventBus()
+        monitoring_system.connect_event_bus(event_bus)
+        load_data_processor.connect_event_bus(event_bus)
+        grid_reports.connect_event_bus(event_bus)
+        asyncio.run(stream_live_updates(event_bus, sample_measurements, transfer_recommendations))
+        for subscription_stats in event_bus.stats():
+            logging.info(
+                f"  Consumer {subscription_stats['name']}: {subscription_stats['delivered']} events in "
+                f"{subscription_stats['batches']} batches, {subscription_stats['dropped']} dropped, "
+                f"{subscription_stats['failed_events']} failed"
+            )
+        logging.info(f"Live load statistics: {load_data_processor.get_live_load_statistics()['segment_statistics']}")
+
         logging.info("Smart Grid Load Balancing System simulation completed.")
 
     except Exception as e:
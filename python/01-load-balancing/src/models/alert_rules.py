@@ -0,0 +1,70 @@
+"""
+Alert rule data models using Pydantic for validation.
+Declares the conditions that raise monitoring alerts so thresholds live in one
+place instead of being hard-coded across services.
+"""
+
+from pydantic import BaseModel, Field, validator
+from typing import Dict, List, Optional
+from enum import Enum
+
+ALERT_LEVELS = ("NORMAL", "WARNING", "CRITICAL", "EMERGENCY")
+
+# Utilization percentage at which each alert level starts
+CAPACITY_ALERT_THRESHOLDS = {"WARNING": 80.0, "CRITICAL": 90.0, "EMERGENCY": 95.0}
+
+
+class RuleMetric(str, Enum):
+    """Per-segment quantity an alert rule is evaluated against"""
+    UTILIZATION_PCT = 'utilization_pct'   # current_load_mw / max_capacity_mw * 100
+    RATE_MW_PER_MIN = 'rate_mw_per_min'   # Recent load trend from the monitor's load history
+
+
+class AlertRule(BaseModel):
+    """
+    One declarative alert condition, evaluated for every segment each tick.
+
+    Business Rules:
+    - The rule fires when the metric is at or above the segment's threshold.
+    - Thresholds are threshold, or safety_threshold_pct + threshold when
+      relative_to_safety_threshold is set; overrides replace it for listed segments.
+    - Once fired, the rule stays active until the metric falls below
+      threshold - hysteresis, so readings hovering at a limit do not flap.
+    """
+    rule_id: str
+    alert_level: str = Field(description="WARNING, CRITICAL or EMERGENCY")
+    metric: RuleMetric = RuleMetric.UTILIZATION_PCT
+    threshold: float
+    relative_to_safety_threshold: bool = False
+    hysteresis: float = Field(default=0.0, ge=0)
+    overrides: Dict[str, float] = Field(default_factory=dict, description="Threshold per segment ID")
+    window_minutes: float = Field(default=15.0, gt=0, description="Trend window for rate rules")
+    recommended_action: Optional[str] = None
+
+    @validator('alert_level')
+    def validate_alert_level(cls, v):
+        """Rules raise alerts, so NORMAL is not a valid level"""
+        if v not in ALERT_LEVELS[1:]:
+            raise ValueError(f"alert_level must be one of {ALERT_LEVELS[1:]}")
+        return v
+
+
+def default_alert_rules() -> List[AlertRule]:
+    """
+    Standard monitoring rules.
+
+    Business Rules:
+    - Warning/Critical/Emergency at 80/90/95% utilization, each clearing 1% lower
+    - Warning when a segment reaches its own safety_threshold_pct
+    - Warning when load rises 5 MW/min or faster over 15 minutes
+    """
+    rules = [
+        AlertRule(rule_id=f"utilization_{level.lower()}", alert_level=level, threshold=threshold, hysteresis=1.0)
+        for level, threshold in CAPACITY_ALERT_THRESHOLDS.items()
+    ]
+    rules.append(AlertRule(rule_id="safety_threshold", alert_level="WARNING", threshold=0.0,
+                           relative_to_safety_threshold=True, hysteresis=1.0))
+    rules.append(AlertRule(rule_id="rapid_load_rise", alert_level="WARNING", metric=RuleMetric.RATE_MW_PER_MIN,
+                           threshold=5.0, hysteresis=1.0,
+                           recommended_action="Load rising rapidly. Check for faults and prepare load transfer."))
+    return rules
@@ -0,0 +1,38 @@
+"""
+Event data models published on the in-process event bus.
+Load measurements are published as LoadMeasurement models; alerts and transfer
+recommendations are wrapped in the models below.
+"""
+
+from pydantic import BaseModel, Field
+from typing import Dict, Optional
+from datetime import datetime
+
+
+class CapacityAlertEvent(BaseModel):
+    """A capacity alert raised by the monitoring system for one grid segment."""
+    segment_id: str
+    alert_level: str = Field(description="WARNING, CRITICAL or EMERGENCY")
+    alert_type: str = Field(default="CAPACITY", description="CAPACITY or RISING_LOAD")
+    rule_id: Optional[str] = Field(default=None, description="Alert rule that fired")
+    utilization_pct: float
+    current_load_mw: float
+    max_capacity_mw: float
+    timestamp: datetime = Field(default_factory=datetime.now)
+    recommended_action: Optional[str] = None
+
+    def to_alert_dict(self) -> Dict:
+        """Alert in the dictionary shape produced by GridMonitoringSystem.generate_capacity_alerts."""
+        alert = self.model_dump()
+        alert["timestamp"] = self.timestamp.isoformat()
+        return alert
+
+
+class TransferEvent(BaseModel):
+    """A power transfer recommended by the load balancer or put into effect."""
+    from_segment_id: str
+    to_segment_id: str
+    transfer_mw: float = Field(ge=0, description="Power sent from the source segment in MW")
+    estimated_loss_mw: float = Field(default=0.0, ge=0)
+    path_id: Optional[str] = None
+    timestamp: datetime = Field(default_factory=datetime.now)
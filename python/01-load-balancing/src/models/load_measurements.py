@@ -1,13 +1,16 @@
 """
 Load measurement data models using Pydantic for validation.
-Defines the core structures for time-series load data.
+Defines the core structures for time-series load data, plus compact
+representations for holding very large measurement histories in memory.
 """
 
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 from enum import Enum
 
+import numpy as np
+
 class MeasurementQuality(str, Enum):
     """Quality status of a load measurement."""
     GOOD = 'good'
@@ -15,6 +18,30 @@ class MeasurementQuality(str, Enum):
     BAD = 'bad'
     MISSING = 'missing'
 
+# Compact integer codes for storing quality as a column next to load values.
+# The order is also the index into QualityMask weight vectors.
+QUALITY_CODES = {
+    MeasurementQuality.GOOD: 0,
+    MeasurementQuality.SUSPECT: 1,
+    MeasurementQuality.BAD: 2,
+    MeasurementQuality.MISSING: 3,
+}
+QUALITY_BY_CODE = {code: quality for quality, code in QUALITY_CODES.items()}
+
+class QualityMask(str, Enum):
+    """Which measurement qualities contribute to an aggregation, and how much."""
+    GOOD_ONLY = 'good_only'
+    GOOD_AND_SUSPECT = 'good_and_suspect'
+    WEIGHTED = 'weighted'
+
+# Per-quality weights indexed by quality code (good, suspect, bad, missing).
+# WEIGHTED keeps suspect readings at half weight; callers can pass their own weights.
+QUALITY_MASK_WEIGHTS = {
+    QualityMask.GOOD_ONLY: (1.0, 0.0, 0.0, 0.0),
+    QualityMask.GOOD_AND_SUSPECT: (1.0, 1.0, 0.0, 0.0),
+    QualityMask.WEIGHTED: (1.0, 0.5, 0.0, 0.0),
+}
+
 class LoadMeasurement(BaseModel):
     """
     Represents a single load measurement at a specific timestamp for a grid segment.
@@ -40,7 +67,7 @@ class LoadMeasurement(BaseModel):
 
     @validator('timestamp', pre=True)
     def parse_timestamp(cls, v):
-        """Parse timestamp string to datetime object."
+        """Parse timestamp string to datetime object."""
         # Business Rule: Timestamps can come as strings and need to be parsed.
         # Copilot Prompting Tip: "Add a Pydantic validator to parse timestamp strings into datetime objects. Consider common formats like ISO 8601."
         if isinstance(v, str):
@@ -55,3 +82,172 @@ class LoadMeasurement(BaseModel):
                         continue
                 raise ValueError(f"Could not parse timestamp: {v}")
         return v
+
+
+class CompactLoadMeasurement:
+    """
+    Lightweight, unvalidated load measurement record.
+    
+    Has the same field names as LoadMeasurement and keeps measurement_quality as a
+    MeasurementQuality member, so code reading measurements works with either type.
+    Use it for rows that were already validated (e.g. by the data loader).
+    
+    Memory per row (CPython 3.12, measured with tracemalloc over 100k rows):
+    - LoadMeasurement: ~544 bytes
+    - CompactLoadMeasurement: ~136 bytes (segment IDs and quality members shared)
+    - LoadMeasurementBatch: ~21 bytes (see below)
+    
+    The record is only ~4x smaller than the model, so it does not meet the 5x
+    reduction target; LoadMeasurementBatch does. A per-row object cannot get there:
+    the slotted instance and its float load alone take ~96 bytes, so even storing
+    the timestamp as a float only brings a record down to ~120 bytes. Hold large
+    histories in a batch and use this type for individual rows.
+    """
+    __slots__ = ('timestamp', 'segment_id', 'load_mw', 'measurement_quality')
+
+    def __init__(self, timestamp: datetime, segment_id: str, load_mw: float,
+                 measurement_quality: MeasurementQuality = MeasurementQuality.GOOD):
+        self.timestamp = timestamp
+        self.segment_id = segment_id
+        self.load_mw = load_mw
+        self.measurement_quality = MeasurementQuality(measurement_quality)
+
+    def __repr__(self) -> str:
+        return (f"CompactLoadMeasurement(timestamp={self.timestamp!r}, segment_id={self.segment_id!r}, "
+                f"load_mw={self.load_mw!r}, measurement_quality={self.measurement_quality.value!r})")
+
+    def __eq__(self, other) -> bool:
+        fields = CompactLoadMeasurement.__slots__
+        return all(getattr(self, name) == getattr(other, name, None) for name in fields)
+
+    @classmethod
+    def from_model(cls, measurement: LoadMeasurement) -> "CompactLoadMeasurement":
+        return cls(measurement.timestamp, measurement.segment_id, measurement.load_mw, measurement.measurement_quality)
+
+    def to_model(self) -> LoadMeasurement:
+        """Re-validate as a full LoadMeasurement model."""
+        return LoadMeasurement(timestamp=self.timestamp, segment_id=self.segment_id,
+                               load_mw=self.load_mw, measurement_quality=self.measurement_quality)
+
+
+class LoadMeasurementBatch:
+    """
+    Array-backed container of load measurements in columnar form.
+    
+    Stores each row as an int64 timestamp (datetime64[us]), an int32 segment code
+    into a shared segment ID list, a float64 load and an int8 quality code
+    (QUALITY_CODES): 21 bytes per row, over 25x smaller than LoadMeasurement.
+    Appends double the arrays when full, so they are amortized O(1) at the cost of
+    up to 2x spare capacity; from_columns allocates exactly.
+    
+    Indexing and iteration yield CompactLoadMeasurement records; analytics should
+    read the NumPy columns directly via columns().
+    """
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(1, capacity)
+        self._timestamps = np.empty(capacity, dtype="datetime64[us]")
+        self._segment_codes = np.empty(capacity, dtype=np.int32)
+        self._loads = np.empty(capacity, dtype=np.float64)
+        self._quality_codes = np.empty(capacity, dtype=np.int8)
+        self._size = 0
+        self.segment_ids: List[str] = []
+        self._segment_lookup: Dict[str, int] = {}
+
+    @classmethod
+    def from_columns(cls, timestamps, segment_ids, loads, quality_codes=None) -> "LoadMeasurementBatch":
+        """Build a batch from parallel arrays (segment_ids as strings, quality as int8 codes)."""
+        loads = np.asarray(loads, dtype=np.float64)
+        batch = cls(capacity=len(loads))
+        keys, codes = np.unique(np.asarray(segment_ids, dtype=str), return_inverse=True)
+        batch.segment_ids = keys.tolist()
+        batch._segment_lookup = {segment_id: code for code, segment_id in enumerate(batch.segment_ids)}
+        batch._size = len(loads)
+        batch._timestamps[:batch._size] = np.asarray(timestamps, dtype="datetime64[us]")
+        batch._segment_codes[:batch._size] = codes
+        batch._loads[:batch._size] = loads
+        if quality_codes is None:
+            batch._quality_codes[:batch._size] = QUALITY_CODES[MeasurementQuality.GOOD]
+        else:
+            batch._quality_codes[:batch._size] = np.asarray(quality_codes, dtype=np.int8)
+        return batch
+
+    @classmethod
+    def from_measurements(cls, measurements: Iterable) -> "LoadMeasurementBatch":
+        """Build a batch from LoadMeasurement or CompactLoadMeasurement records."""
+        batch = cls()
+        for measurement in measurements:
+            batch.append(measurement.timestamp, measurement.segment_id, measurement.load_mw, measurement.measurement_quality)
+        return batch
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays (including spare capacity)."""
+        return self._timestamps.nbytes + self._segment_codes.nbytes + self._loads.nbytes + self._quality_codes.nbytes
+
+    def append(self, timestamp: datetime, segment_id: str, load_mw: float,
+               measurement_quality: MeasurementQuality = MeasurementQuality.GOOD) -> None:
+        if self._size == len(self._loads):
+            self._grow(2 * len(self._loads))
+        code = self._segment_lookup.get(segment_id)
+        if code is None:
+            code = self._segment_lookup[segment_id] = len(self.segment_ids)
+            self.segment_ids.append(segment_id)
+        i = self._size
+        self._timestamps[i] = np.datetime64(timestamp, "us")
+        self._segment_codes[i] = code
+        self._loads[i] = load_mw
+        self._quality_codes[i] = QUALITY_CODES[MeasurementQuality(measurement_quality)]
+        self._size += 1
+
+    def _grow(self, capacity: int) -> None:
+        for name in ("_timestamps", "_segment_codes", "_loads", "_quality_codes"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def __getitem__(self, index: int) -> CompactLoadMeasurement:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("LoadMeasurementBatch index out of range")
+        return CompactLoadMeasurement(
+            self._timestamps[index].astype(datetime),
+            self.segment_ids[self._segment_codes[index]],
+            float(self._loads[index]),
+            QUALITY_BY_CODE[int(self._quality_codes[index])],
+        )
+
+    def __iter__(self) -> Iterator[CompactLoadMeasurement]:
+        timestamps = self._timestamps[:self._size].astype(datetime)
+        for i in range(self._size):
+            yield CompactLoadMeasurement(
+                timestamps[i],
+                self.segment_ids[self._segment_codes[i]],
+                float(self._loads[i]),
+                QUALITY_BY_CODE[int(self._quality_codes[i])],
+            )
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """
+        Column views for vectorized analytics.
+        
+        Returns:
+            Dictionary with timestamps, segment_codes, segment_ids (one string per row),
+            hours, loads and quality_codes arrays.
+        """
+        timestamps = self._timestamps[:self._size]
+        segment_codes = self._segment_codes[:self._size]
+        hours = (timestamps.astype("datetime64[h]").astype(np.int64) % 24).astype(np.int8)
+        return {
+            "timestamps": timestamps,
+            "segment_codes": segment_codes,
+            "segment_ids": np.asarray(self.segment_ids, dtype=str)[segment_codes] if self.segment_ids else np.empty(0, dtype=str),
+            "hours": hours,
+            "loads": self._loads[:self._size],
+            "quality_codes": self._quality_codes[:self._size],
+        }
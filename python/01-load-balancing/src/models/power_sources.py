@@ -80,7 +80,7 @@ class PowerSource(BaseModel):
         return output_mw * self.cost_per_mwh
 
     def is_renewable(self) -> bool:
-        """Check if the power source is renewable."
+        """Check if the power source is renewable."""
         # Business Rule: Renewable sources are SOLAR, WIND, HYDROELECTRIC.
         # Copilot Prompting Tip: "Implement a method to determine if the power source type is renewable."
         return self.source_type in [PowerSourceType.SOLAR, PowerSourceType.WIND, PowerSourceType.HYDROELECTRIC]
@@ -1,12 +1,136 @@
-
+"""
 Reporting functions for generating operational summaries and performance analysis of the smart grid.
 Uses standard Python libraries for data aggregation and formatting.
+"""
 
-
+import csv
+import io
+import os
+import re
 import statistics
-from collections import Counter, defaultdict
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict
+from pathlib import Path
+from typing import List, Dict, Optional
+
+from ..models.events import CapacityAlertEvent
+from ..models.load_measurements import LoadMeasurement
+from ..services.rollup_store import MeasurementRollupStore
+
+REGION_REPORT_COLUMNS = [
+    "segment_id", "name", "max_capacity_mw", "current_load_mw", "utilization_pct", "alert_level",
+    "average_load", "peak_load", "min_load", "measurement_count",
+]
+
+
+# Utilization above which the summaries recommend rebalancing the busiest segment
+HIGH_UTILIZATION_RECOMMENDATION_PCT = 85.0
+
+
+def _render_summary_text(context: Dict) -> str:
+    """
+    Render the five sections of a daily performance summary.
+    
+    Shared by GridReports.generate_daily_performance_summary and the per-region
+    reports, which differ only in their title and metrics section. The context
+    holds: title, metrics_heading, metric_lines, segments (segment_id, name,
+    utilization_pct, alert_level per segment), hourly_pattern (average load per
+    hour) and total_measurements.
+    """
+    segments = context["segments"]
+    lines = [context["title"], ""]
+    lines.append(f"1. {context['metrics_heading']}:")
+    lines.extend(f"   {line}" for line in context["metric_lines"])
+    lines.append("")
+
+    lines.append("2. Segment Utilization Summary:")
+    for segment in segments:
+        lines.append(f"   - {segment['name']} ({segment['segment_id']}): {segment['utilization_pct']:.2f}% utilized")
+    highest = max(segments, key=lambda segment: segment["utilization_pct"]) if segments else None
+    if highest:
+        lowest = min(segments, key=lambda segment: segment["utilization_pct"])
+        lines.append(f"   Highest Utilization: {highest['segment_id']} ({highest['utilization_pct']:.2f}%) ")
+        lines.append(f"   Lowest Utilization: {lowest['segment_id']} ({lowest['utilization_pct']:.2f}%) ")
+    lines.append("")
+
+    lines.append("3. Load Pattern Analysis:")
+    if context["total_measurements"]:
+        if context["hourly_pattern"]:
+            peak_hour = max(context["hourly_pattern"], key=context["hourly_pattern"].get)
+            lines.append(f"   Peak Load Hour (Avg): {peak_hour}:00 (Avg Load: {context['hourly_pattern'][peak_hour]:.2f} MW)")
+        lines.append(f"   Total Measurements Analyzed: {context['total_measurements']}")
+    else:
+        lines.append("   No measurement data available for detailed load pattern analysis.")
+    lines.append("")
+
+    lines.append("4. Active Alerts:")
+    alert_counts = Counter(segment["alert_level"] for segment in segments if segment["alert_level"] != "NORMAL")
+    if alert_counts:
+        for level, count in alert_counts.items():
+            lines.append(f"   - {level}: {count} alerts")
+        lines.append("   Review monitoring system for details and recommended actions.")
+    else:
+        lines.append("   No active alerts. All segments operating within normal parameters.")
+    lines.append("")
+
+    lines.append("5. Recommendations for Next Operations:")
+    if highest and highest["utilization_pct"] > HIGH_UTILIZATION_RECOMMENDATION_PCT:
+        lines.append(f"   - Consider load balancing or generation adjustments for {highest['segment_id']} due to high utilization.")
+    if alert_counts:
+        lines.append("   - Address all CRITICAL and EMERGENCY alerts immediately.")
+    lines.append("   - Continue to monitor system utilization and power source availability.")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _render_region_report(context: Dict, output_dir: Optional[str] = None) -> Dict:
+    """
+    Render one region's daily summary as text and CSV (runs inside a worker process).
+    
+    The context holds only plain data prepared by GridReports.generate_region_reports,
+    so it is cheap to send to a worker. When output_dir is given the reports are
+    written there and their paths returned instead of their contents.
+    """
+    region = context["region"]
+    segments = context["segments"]
+    total_capacity = sum(segment["max_capacity_mw"] for segment in segments)
+    total_load = sum(segment["current_load_mw"] for segment in segments)
+
+    metric_lines = [
+        f"Segments: {len(segments)}",
+        f"Total Capacity: {total_capacity:.2f} MW",
+        f"Total Current Load: {total_load:.2f} MW",
+        f"Region Utilization: {(total_load / total_capacity) * 100 if total_capacity > 0 else 0.0:.2f}%",
+    ]
+    if context["unknown_segments"]:
+        metric_lines.append(f"Segments not in topology: {', '.join(context['unknown_segments'])}")
+    text = _render_summary_text({
+        **context,
+        "title": f"--- Daily Grid Performance Summary: {region} - {context['generated_at']} ---",
+        "metrics_heading": "Region Metrics",
+        "metric_lines": metric_lines,
+    })
+    alert_counts = Counter(segment["alert_level"] for segment in segments if segment["alert_level"] != "NORMAL")
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=REGION_REPORT_COLUMNS)
+    writer.writeheader()
+    writer.writerows(segments)
+    csv_text = buffer.getvalue()
+
+    result = {"region": region, "segment_count": len(segments), "alert_counts": dict(alert_counts)}
+    if output_dir is None:
+        result.update(text=text, csv=csv_text)
+        return result
+
+    stem = Path(output_dir) / f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', region)}_daily_summary"
+    text_path, csv_path = stem.with_suffix(".txt"), stem.with_suffix(".csv")
+    text_path.write_text(text)
+    with open(csv_path, "w", newline="") as f:
+        f.write(csv_text)
+    result.update(text_path=str(text_path.resolve()), csv_path=str(csv_path.resolve()))
+    return result
 
 class GridReports:
     """
@@ -16,6 +140,53 @@ class GridReports:
         self.data_loader = data_loader
         self.data_processor = data_processor
         self.monitoring_system = monitoring_system
+        self.rollups = MeasurementRollupStore()
+        self._segment_capacity: Optional[Dict[str, float]] = None
+        # Live alert feed from the event bus
+        self.live_alert_counts: Counter = Counter()
+        self.recent_alerts: deque = deque(maxlen=1000)
+
+    def connect_event_bus(self, bus) -> None:
+        """
+        Consume live measurement and alert events from an EventBus.
+        
+        Measurements go straight into the trend rollups and alerts into a bounded
+        recent-alerts window, so reports never need the full history handed to them.
+        
+        Args:
+            bus: The EventBus carrying LoadMeasurement and CapacityAlertEvent events.
+        """
+        bus.subscribe(LoadMeasurement, self.handle_measurement_events, name="grid_reports")
+        bus.subscribe(CapacityAlertEvent, self.handle_alert_events, name="grid_reports.alerts")
+
+    def handle_measurement_events(self, measurements: List[LoadMeasurement]) -> None:
+        """Fold a batch of live measurements into the trend rollups."""
+        self.rollups.add_measurements(measurements)
+
+    def handle_alert_events(self, alerts: List[CapacityAlertEvent]) -> None:
+        """Record a batch of live alerts for the alert summary."""
+        for alert in alerts:
+            self.live_alert_counts[alert.alert_level] += 1
+            self.recent_alerts.append(alert.to_alert_dict())
+
+    @property
+    def measurement_watermarks(self) -> Dict[str, datetime]:
+        """Latest measurement timestamp in the rollups per segment."""
+        return self.rollups.watermarks
+
+    def checkpoint_state(self) -> Dict:
+        """Rollups and live alert summary to persist so a restart does not reprocess history."""
+        return {
+            "rollups": self.rollups,
+            "live_alert_counts": dict(self.live_alert_counts),
+            "recent_alerts": list(self.recent_alerts),
+        }
+
+    def restore_checkpoint_state(self, state: Dict) -> None:
+        """Restore state produced by checkpoint_state."""
+        self.rollups = state["rollups"]
+        self.live_alert_counts = Counter(state["live_alert_counts"])
+        self.recent_alerts = deque(state["recent_alerts"], maxlen=self.recent_alerts.maxlen)
 
     def generate_daily_performance_summary(self, grid_state: Dict, measurements: List[Dict]) -> str:
         """
@@ -41,69 +212,129 @@ class GridReports:
         Returns:
             A formatted string representing the daily performance summary report.
         """
-        summary_lines = []
-        summary_lines.append(f"--- Daily Grid Performance Summary - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---")
-        summary_lines.append("")
-
-        # Overall System Metrics
-        summary_lines.append("1. Overall System Metrics:")
-        summary_lines.append(f"   Total Capacity: {grid_state.get("total_capacity_mw", 0.0):.2f} MW")
-        summary_lines.append(f"   Total Current Load: {grid_state.get("total_current_load_mw", 0.0):.2f} MW")
-        summary_lines.append(f"   System Utilization: {grid_state.get("system_utilization_pct", 0.0):.2f}%")
-        summary_lines.append("")
-
-        # Segment Utilization Summary
-        summary_lines.append("2. Segment Utilization Summary:")
-        segment_utilizations = []
-        for segment in grid_state["topology"].segments:
-            utilization = segment.get_utilization_percentage()
-            segment_utilizations.append((segment.segment_id, utilization))
-            summary_lines.append(f"   - {segment.name} ({segment.segment_id}): {utilization:.2f}% utilized")
-        
-        if segment_utilizations:
-            highest_util_segment = max(segment_utilizations, key=lambda item: item[1])
-            lowest_util_segment = min(segment_utilizations, key=lambda item: item[1])
-            summary_lines.append(f"   Highest Utilization: {highest_util_segment[0]} ({highest_util_segment[1]:.2f}%) ")
-            summary_lines.append(f"   Lowest Utilization: {lowest_util_segment[0]} ({lowest_util_segment[1]:.2f}%) ")
-        summary_lines.append("")
+        alert_levels = self.monitoring_system.segment_alert_levels() # Current rule alert levels
+        segments = [
+            {
+                "segment_id": segment.segment_id,
+                "name": segment.name,
+                "utilization_pct": segment.get_utilization_percentage(),
+                "alert_level": alert_levels.get(segment.segment_id, "NORMAL"),
+            }
+            for segment in grid_state["topology"].segments
+        ]
 
         # Load Pattern Analysis (using data_processor)
-        summary_lines.append("3. Load Pattern Analysis:")
+        hourly_pattern, total_measurements = {}, 0
         if measurements:
             load_analysis = self.data_processor.analyze_load_patterns(measurements)
-            if "daily_load_pattern" in load_analysis:
-                peak_hour = max(load_analysis["daily_load_pattern"], key=lambda hour: load_analysis["daily_load_pattern"][hour]["average_load"])
-                peak_load_avg = load_analysis["daily_load_pattern"][peak_hour]["average_load"]
-                summary_lines.append(f"   Peak Load Hour (Avg): {peak_hour}:00 (Avg Load: {peak_load_avg:.2f} MW)")
-            summary_lines.append(f"   Total Measurements Analyzed: {load_analysis.get("total_measurements", 0)}")
-        else:
-            summary_lines.append("   No measurement data available for detailed load pattern analysis.")
-        summary_lines.append("")
-
-        # Active Alerts Summary
-        summary_lines.append("4. Active Alerts:")
-        active_alerts = self.monitoring_system.generate_capacity_alerts() # Get current alerts
-        if active_alerts:
-            alert_counts = Counter([alert["alert_level"] for alert in active_alerts])
-            for level, count in alert_counts.items():
-                summary_lines.append(f"   - {level}: {count} alerts")
-            summary_lines.append("   Review monitoring system for details and recommended actions.")
-        else:
-            summary_lines.append("   No active alerts. All segments operating within normal parameters.")
-        summary_lines.append("")
+            hourly_pattern = {
+                hour: pattern["average_load"] for hour, pattern in load_analysis.get("daily_load_pattern", {}).items()
+            }
+            total_measurements = load_analysis.get("total_measurements", 0)
+
+        return _render_summary_text({
+            "title": f"--- Daily Grid Performance Summary - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---",
+            "metrics_heading": "Overall System Metrics",
+            "metric_lines": [
+                f"Total Capacity: {grid_state.get('total_capacity_mw', 0.0):.2f} MW",
+                f"Total Current Load: {grid_state.get('total_current_load_mw', 0.0):.2f} MW",
+                f"System Utilization: {grid_state.get('system_utilization_pct', 0.0):.2f}%",
+            ],
+            "segments": segments,
+            "hourly_pattern": hourly_pattern,
+            "total_measurements": total_measurements,
+        })
+
+    def generate_region_reports(self, regions: Dict[str, List[str]], grid_state: Dict, measurements: List[Dict],
+                                output_dir: Optional[str] = None, max_workers: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Generate the daily performance summary for many operating regions at once.
+        
+        Load pattern analysis runs once over all measurements (with per-segment hourly
+        patterns) and each region's report is assembled from those shared results.
+        Regions are then rendered to text and CSV, and written, on a process pool, so
+        the batch takes roughly as long as its slowest region.
+        
+        Business Rules:
+        - Each region's report has the same sections as generate_daily_performance_summary,
+          restricted to the region's segments.
+        - Alert levels are the monitoring system's alert rule levels, the same ones
+          check_all_segments reports.
+        - Segment IDs missing from the topology are listed in the region's report.
+        
+        Args:
+            regions: Segment IDs per region (or any named segment group).
+            grid_state: Current state of the grid from data_loader.get_current_grid_state().
+            measurements: Load measurement records for analysis.
+            output_dir: Directory to write "<region>_daily_summary.txt/.csv" into,
+                relative to data_dir unless absolute. When omitted, report contents
+                are returned instead of written.
+            max_workers: Worker processes to use (defaults to the CPU count). With one
+                worker, or a single region, reports are rendered in this process.
+            
+        Returns:
+            Per region: segment_count, alert_counts and either text/csv contents or
+            text_path/csv_path of the written files.
+        """
+        segments_by_id = {segment.segment_id: segment for segment in grid_state["topology"].segments}
+        analysis = self.data_processor.analyze_load_patterns(measurements, by_segment_hour=True) if measurements else {}
+        segment_statistics = analysis.get("segment_statistics", {})
+        segment_hourly = analysis.get("segment_hourly_pattern", {})
+        generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        alert_levels = self.monitoring_system.segment_alert_levels()
 
-        # Recommendations
-        summary_lines.append("5. Recommendations for Next Operations:")
-        if highest_util_segment[1] > 85: # Example threshold for recommendation
-            summary_lines.append(f"   - Consider load balancing or generation adjustments for {highest_util_segment[0]} due to high utilization.")
-        if active_alerts:
-            summary_lines.append("   - Address all CRITICAL and EMERGENCY alerts immediately.")
-        summary_lines.append("   - Continue to monitor system utilization and power source availability.")
-        summary_lines.append("")
+        segment_rows = {}
+        for segment_id, segment in segments_by_id.items():
+            utilization = segment.get_utilization_percentage()
+            stats = segment_statistics.get(segment_id, {})
+            segment_rows[segment_id] = {
+                "segment_id": segment_id,
+                "name": segment.name,
+                "max_capacity_mw": segment.max_capacity_mw,
+                "current_load_mw": segment.current_load_mw,
+                "utilization_pct": utilization,
+                "alert_level": alert_levels.get(segment_id, "NORMAL"),
+                "average_load": stats.get("average_load"),
+                "peak_load": stats.get("peak_load"),
+                "min_load": stats.get("min_load"),
+                "measurement_count": stats.get("measurement_count", 0),
+            }
 
-        return "\n".join(summary_lines)
+        contexts = []
+        for region, segment_ids in regions.items():
+            # Combine the segments' hourly averages, weighted by the readings behind each
+            hour_loads, hour_weights = defaultdict(float), defaultdict(float)
+            for segment_id in segment_ids:
+                for hour, cell in segment_hourly.get(segment_id, {}).items():
+                    hour_loads[hour] += cell["average_load"] * cell["weight_total"]
+                    hour_weights[hour] += cell["weight_total"]
+            contexts.append({
+                "region": region,
+                "generated_at": generated_at,
+                "segments": [segment_rows[segment_id] for segment_id in segment_ids if segment_id in segment_rows],
+                "unknown_segments": [segment_id for segment_id in segment_ids if segment_id not in segment_rows],
+                "hourly_pattern": {hour: hour_loads[hour] / weight for hour, weight in hour_weights.items() if weight > 0},
+                "total_measurements": sum(segment_rows[s]["measurement_count"] for s in segment_ids if s in segment_rows),
+            })
 
-    def calculate_efficiency_metrics(self, grid_state: Dict) -> Dict[str, float]:
+        if output_dir is not None:
+            output_path = Path(output_dir)
+            if not output_path.is_absolute():
+                output_path = self.data_loader.data_dir / output_path
+            output_path.mkdir(parents=True, exist_ok=True)
+            output_dir = str(output_path)
+
+        workers = max_workers or os.cpu_count() or 1
+        if workers <= 1 or len(contexts) <= 1:
+            results = [_render_region_report(context, output_dir) for context in contexts]
+        else:
+            chunksize = max(1, len(contexts) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=min(workers, len(contexts))) as executor:
+                results = list(executor.map(_render_region_report, contexts, [output_dir] * len(contexts), chunksize=chunksize))
+        return {result.pop("region"): result for result in results}
+
+    def calculate_efficiency_metrics(self, grid_state: Dict, active_transfers: Optional[List[Dict]] = None,
+                                     measurements: Optional[List[Dict]] = None) -> Dict[str, float]:
         """
         Calculate key performance indicators for grid operations.
         
@@ -115,11 +346,14 @@ class GridReports:
         
         Args:
             grid_state: Current state of the grid.
+            active_transfers: Transfers currently in effect (e.g. the load balancer's
+                transfer recommendations), used for transmission losses.
+            measurements: Optional load measurement history for load factors.
             
         Returns:
             A dictionary of calculated efficiency metrics.
         """
-        return self.data_processor.calculate_grid_efficiency_metrics(grid_state)
+        return self.data_processor.calculate_grid_efficiency_metrics(grid_state, active_transfers, measurements)
 
     def analyze_power_source_utilization(self, power_sources: List[Dict]) -> Dict[str, float]:
         """
@@ -156,7 +390,9 @@ class GridReports:
             }
         return results
 
-    def create_capacity_trend_report(self, measurements: List[Dict]) -> Dict:
+    def create_capacity_trend_report(self, measurements: Optional[List[Dict]] = None, start: Optional[datetime] = None,
+                                     end: Optional[datetime] = None, resolution: Optional[str] = None,
+                                     max_points: int = 400) -> Dict:
         """
         Generates a report on capacity utilization trends over time.
         
@@ -164,18 +400,53 @@ class GridReports:
         - Aggregate load data by time intervals (e.g., hourly, daily).
         - Calculate average, peak, and minimum utilization for each interval.
         - Identify periods of high and low utilization.
+        - Read pre-aggregated hourly/daily/monthly rollups, never raw measurements.
         
         Copilot Prompting Tip:
         "Implement a method to create a capacity trend report. Aggregate load measurements by time (e.g., hourly), calculate average and peak loads for each interval, and identify trends. Return a dictionary summarizing these trends."
         
         Args:
-            measurements: List of load measurement records.
+            measurements: New load measurement records to fold into the rollups first.
+                Records at or before a segment's last ingested timestamp are skipped.
+            start: Inclusive start of the reporting range.
+            end: Exclusive end of the reporting range.
+            resolution: "hourly", "daily" or "monthly". When omitted, the finest
+                resolution that keeps each series within max_points is used.
+            max_points: Upper bound on periods per segment for automatic resolution.
             
         Returns:
             A dictionary summarizing capacity utilization trends.
         """
-        # This will leverage the analyze_load_patterns from data_processor
-        return self.data_processor.analyze_load_patterns(measurements)
+        if measurements:
+            self.rollups.add_measurements(measurements)
+
+        if self._segment_capacity is None:
+            self._segment_capacity = {s.segment_id: s.max_capacity_mw for s in self.data_loader.load_grid_topology().segments}
+
+        segment_trends = {}
+        for segment_id in self.rollups.segment_ids:
+            used_resolution, series = self.rollups.trend(segment_id, start, end, resolution, max_points)
+            capacity = self._segment_capacity.get(segment_id)
+            if capacity:
+                for point in series:
+                    point["average_utilization_pct"] = (point["average_load"] / capacity) * 100
+                    point["peak_utilization_pct"] = (point["peak_load"] / capacity) * 100
+            if series:
+                peak_period = max(series, key=lambda point: point["peak_load"])
+                low_period = min(series, key=lambda point: point["average_load"])
+                segment_trends[segment_id] = {
+                    "resolution": used_resolution,
+                    "periods": series,
+                    "highest_load_period": peak_period["period_start"],
+                    "lowest_load_period": low_period["period_start"],
+                }
+
+        return {
+            "segment_trends": segment_trends,
+            "range_start": start,
+            "range_end": end,
+            "report_timestamp": datetime.now()
+        }
 
     def export_data_to_csv(self, data: List[Dict], filename: str, headers: List[str]) -> str:
         """
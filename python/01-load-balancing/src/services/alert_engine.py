@@ -0,0 +1,152 @@
+"""
+Vectorized alert rule evaluation for grid monitoring.
+Compiles declarative AlertRule definitions into per-segment threshold arrays so
+every rule is checked against every segment in one NumPy pass per tick.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..models.alert_rules import ALERT_LEVELS, AlertRule, RuleMetric
+from ..models.grid_infrastructure import GridSegment
+
+
+class AlertRuleEngine:
+    """
+    Evaluates a rule set against the whole grid at once and tracks rule state.
+
+    Compiling resolves each rule's threshold for every segment (fixed, relative to
+    the segment's safety_threshold_pct, or overridden) into a rules x segments
+    matrix. Evaluation compares that matrix with the metric matrix, applies
+    hysteresis against the last committed tick's state, and reports one alert per
+    segment and metric: the most severe rule that is active. evaluate never changes
+    that state; commit evaluates a tick and stores it.
+
+    Args:
+        rules: Alert rules to evaluate; for equally severe rules the first listed wins.
+        segments: Segments to evaluate, in the order of the arrays passed to evaluate.
+    """
+
+    def __init__(self, rules: Sequence[AlertRule], segments: Iterable[GridSegment]):
+        self.rules: List[AlertRule] = list(rules)
+        self.rule_index: Dict[str, int] = {rule.rule_id: i for i, rule in enumerate(self.rules)}
+        if len(self.rule_index) != len(self.rules):
+            raise ValueError("Alert rule IDs must be unique")
+        self.compile(segments)
+
+    def compile(self, segments: Iterable[GridSegment]) -> None:
+        """Rebuild threshold arrays for a (possibly changed) list of segments and reset rule state."""
+        segments = list(segments)
+        self.segment_ids: List[str] = [segment.segment_id for segment in segments]
+        self.rows: Dict[str, int] = {segment_id: row for row, segment_id in enumerate(self.segment_ids)}
+        self.capacities_mw = np.array([segment.max_capacity_mw for segment in segments], dtype=float)
+        safety_thresholds = np.array([segment.safety_threshold_pct for segment in segments], dtype=float)
+
+        self._thresholds = np.empty((len(self.rules), len(segments)))
+        for i, rule in enumerate(self.rules):
+            self._thresholds[i] = safety_thresholds + rule.threshold if rule.relative_to_safety_threshold else rule.threshold
+            for segment_id, threshold in rule.overrides.items():
+                if segment_id in self.rows:
+                    self._thresholds[i, self.rows[segment_id]] = threshold
+        self._clear_thresholds = self._thresholds - np.array([rule.hysteresis for rule in self.rules]).reshape(-1, 1)
+        self._ranks = np.array([ALERT_LEVELS.index(rule.alert_level) for rule in self.rules], dtype=np.int64)
+
+        # Rules sharing a metric (and trend window) compete; only the most severe active one is reported
+        groups: Dict[Tuple[RuleMetric, Optional[float]], List[int]] = defaultdict(list)
+        for i, rule in enumerate(self.rules):
+            groups[self._metric_key(rule)].append(i)
+        self._groups = [np.array(indices) for indices in groups.values()]
+        self.active = np.zeros((len(self.rules), len(segments)), dtype=bool)
+
+    @staticmethod
+    def _metric_key(rule: AlertRule) -> Tuple[RuleMetric, Optional[float]]:
+        return rule.metric, rule.window_minutes if rule.metric == RuleMetric.RATE_MW_PER_MIN else None
+
+    @property
+    def rate_windows(self) -> List[float]:
+        """Trend windows (minutes) that rate rules need passed to evaluate."""
+        return sorted({rule.window_minutes for rule in self.rules if rule.metric == RuleMetric.RATE_MW_PER_MIN})
+
+    def evaluate(self, loads_mw: np.ndarray, rates_mw_per_min: Optional[Dict[float, np.ndarray]] = None,
+                 rows: Optional[Sequence[int]] = None) -> List[Dict]:
+        """
+        Evaluate every rule against the segments without changing rule state.
+
+        Hysteresis and is_new are judged against the state of the last commit, so
+        queries may call this as often as they like.
+
+        Args:
+            loads_mw: Current load per segment, aligned with segment_ids (or with rows).
+            rates_mw_per_min: Load trend per segment for each window in rate_windows,
+                aligned like loads_mw. Missing windows or NaN rates never fire (and
+                clear active rules).
+            rows: Only evaluate these segment positions; defaults to every segment.
+
+        Returns:
+            One record per segment and metric with an active rule: segment_id, row,
+            rule_id, alert_level, metric, metric_value, threshold and is_new (not
+            active at the last commit). Most severe first, then highest metric value.
+        """
+        records, _ = self._evaluate(loads_mw, rates_mw_per_min, rows)
+        return records
+
+    def commit(self, loads_mw: np.ndarray, rates_mw_per_min: Optional[Dict[float, np.ndarray]] = None) -> List[Dict]:
+        """
+        Evaluate one tick for every segment and make its rule state current.
+
+        Only the live measurement path should call this: each commit consumes the
+        is_new edges of the rules that fired, and advances hysteresis.
+
+        Returns:
+            The same records as evaluate.
+        """
+        records, self.active = self._evaluate(loads_mw, rates_mw_per_min, None)
+        return records
+
+    def _evaluate(self, loads_mw: np.ndarray, rates_mw_per_min: Optional[Dict[float, np.ndarray]],
+                  rows: Optional[Sequence[int]]) -> Tuple[List[Dict], np.ndarray]:
+        columns = np.arange(len(self.segment_ids)) if rows is None else np.asarray(rows, dtype=np.int64)
+        thresholds = self._thresholds[:, columns]
+        loads_mw = np.asarray(loads_mw, dtype=float)
+        utilization = loads_mw / self.capacities_mw[columns] * 100
+        rates_mw_per_min = rates_mw_per_min or {}
+        missing = np.full(len(columns), np.nan)
+        metrics = np.empty_like(thresholds)
+        for i, rule in enumerate(self.rules):
+            if rule.metric == RuleMetric.UTILIZATION_PCT:
+                metrics[i] = utilization
+            else:
+                metrics[i] = rates_mw_per_min.get(rule.window_minutes, missing)
+
+        previous = self.active[:, columns]
+        with np.errstate(invalid="ignore"):
+            active = (metrics >= thresholds) | (previous & (metrics >= self._clear_thresholds[:, columns]))
+
+        rule_indices, positions = [], []
+        for group in self._groups:
+            severity = np.where(active[group], self._ranks[group, None], -1)
+            alerting = np.flatnonzero(severity.max(axis=0) >= 0)
+            rule_indices.append(group[severity[:, alerting].argmax(axis=0)])
+            positions.append(alerting)
+        rule_indices = np.concatenate(rule_indices) if rule_indices else np.empty(0, dtype=np.int64)
+        positions = np.concatenate(positions) if positions else np.empty(0, dtype=np.int64)
+        values = metrics[rule_indices, positions]
+        order = np.lexsort((-values, -self._ranks[rule_indices]))
+
+        records = []
+        for i, position in zip(rule_indices[order].tolist(), positions[order].tolist()):
+            rule = self.rules[i]
+            row = int(columns[position])
+            records.append({
+                "segment_id": self.segment_ids[row],
+                "row": row,
+                "rule_id": rule.rule_id,
+                "alert_level": rule.alert_level,
+                "metric": rule.metric.value,
+                "metric_value": float(metrics[i, position]),
+                "threshold": float(thresholds[i, position]),
+                "is_new": not previous[i, position],
+            })
+        return records, active
@@ -0,0 +1,243 @@
+"""
+Pluggable strategies for transfer planning and power source dispatch.
+GridLoadBalancer delegates to one strategy of each kind; strategies are registered
+by name so they can be selected by configuration and benchmarked side by side.
+"""
+
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Dict, List, Optional, Type
+
+from ..models.grid_infrastructure import GridSegment, PowerTransferPath
+
+
+def load_to_shed(segment: GridSegment) -> float:
+    """Load above a segment's safety threshold in MW (0 if it is within it)."""
+    return max(0.0, segment.current_load_mw - segment.max_capacity_mw * (segment.safety_threshold_pct / 100))
+
+
+def _transfer_amount(to_shed: float, available_capacity: float, path: PowerTransferPath) -> float:
+    """MW to send over a path, limited by the sender's excess, the path and the receiver after losses."""
+    max_transfer_after_loss = path.max_transfer_mw * (1 - path.power_loss_pct / 100)
+    return min(to_shed, path.max_transfer_mw, available_capacity, max_transfer_after_loss)
+
+
+def _recommendation(overloaded: GridSegment, available: GridSegment, path: PowerTransferPath,
+                    transfer_mw: float, distance_km: Optional[float] = None) -> Dict:
+    recommendation = {
+        "from_segment_id": overloaded.segment_id,
+        "to_segment_id": available.segment_id,
+        "transfer_mw": transfer_mw,
+        "estimated_loss_mw": transfer_mw * (path.power_loss_pct / 100),
+        "path_id": f"{overloaded.segment_id}->{available.segment_id}"
+    }
+    if distance_km is not None:
+        recommendation["distance_km"] = distance_km
+    return recommendation
+
+
+class TransferStrategy(ABC):
+    """Plans power transfers away from overloaded segments."""
+    name: str = ""
+
+    @abstractmethod
+    def plan_transfers(self, balancer, max_distance_km: Optional[float] = None) -> List[Dict]:
+        """
+        Recommend transfers for the balancer's current grid state.
+
+        Args:
+            balancer: GridLoadBalancer whose capacity index, spatial index and
+                topology describe the grid.
+            max_distance_km: Optional search radius for receiving segments.
+
+        Returns:
+            Transfer recommendations in the GridLoadBalancer.calculate_optimal_transfers format.
+        """
+
+
+class DispatchStrategy(ABC):
+    """Plans output changes for power sources."""
+    name: str = ""
+
+    @abstractmethod
+    def plan_dispatch(self, balancer) -> List[Dict]:
+        """
+        Recommend dispatch adjustments for the balancer's power sources.
+
+        Returns:
+            One dictionary per source whose output should change: source_id,
+            current_output_mw, new_output_mw, change_mw and cost_per_hour.
+        """
+
+
+TRANSFER_STRATEGIES: Dict[str, Type[TransferStrategy]] = {}
+DISPATCH_STRATEGIES: Dict[str, Type[DispatchStrategy]] = {}
+
+
+def register_strategy(strategy_class: Type) -> Type:
+    """Register a TransferStrategy or DispatchStrategy subclass under its name (usable as a decorator)."""
+    if not strategy_class.name:
+        raise ValueError(f"{strategy_class.__name__} must define a name")
+    if issubclass(strategy_class, TransferStrategy):
+        TRANSFER_STRATEGIES[strategy_class.name] = strategy_class
+    elif issubclass(strategy_class, DispatchStrategy):
+        DISPATCH_STRATEGIES[strategy_class.name] = strategy_class
+    else:
+        raise TypeError(f"{strategy_class.__name__} is not a balancing strategy")
+    return strategy_class
+
+
+@register_strategy
+class GreedyTransferStrategy(TransferStrategy):
+    """
+    Default transfer planning.
+
+    Business Rules:
+    - Critical segments are handled most utilized first.
+    - Each sheds its load above the safety threshold to healthy segments, least
+      utilized first (or nearest first within max_distance_km), over direct paths.
+    """
+    name = "greedy"
+
+    def plan_transfers(self, balancer, max_distance_km: Optional[float] = None) -> List[Dict]:
+        transfer_recommendations = []
+        # Critical segments are visited most utilized first, healthy ones least utilized first.
+        # Both orderings come straight from the capacity index heaps, so nothing is re-sorted.
+        overloaded_segments = list(balancer.capacity_index.iter_by_utilization("critical", descending=True))
+        nearby_receivers = balancer._find_nearby_receivers(overloaded_segments, max_distance_km) if max_distance_km is not None else None
+
+        for overloaded in overloaded_segments:
+            # This is the load above the safety threshold
+            to_shed = load_to_shed(overloaded)
+            if to_shed <= 0: # No excess load to shed
+                continue
+
+            if nearby_receivers is not None:
+                candidates = nearby_receivers[overloaded.segment_id]
+            else:
+                candidates = ((available, None) for available in balancer.capacity_index.iter_by_utilization("healthy"))
+
+            for available, distance_km in candidates:
+                available_capacity = available.max_capacity_mw - available.current_load_mw
+                if available_capacity <= 0: # No capacity to receive load
+                    continue
+
+                transfer_path = balancer._find_transfer_path(overloaded.segment_id, available.segment_id)
+                if not transfer_path: # No direct transfer path
+                    continue
+
+                actual_transfer_mw = _transfer_amount(to_shed, available_capacity, transfer_path)
+                if actual_transfer_mw > 0:
+                    transfer_recommendations.append(
+                        _recommendation(overloaded, available, transfer_path, actual_transfer_mw, distance_km)
+                    )
+                    to_shed -= actual_transfer_mw
+                    if to_shed <= 0: # All excess load handled for this segment
+                        break
+        return transfer_recommendations
+
+
+@register_strategy
+class LowestLossTransferStrategy(TransferStrategy):
+    """
+    Transfer planning that prefers the cheapest paths in transmission losses.
+
+    Business Rules:
+    - Critical segments are handled most utilized first.
+    - Receivers are healthy segments with a direct ACTIVE path, lowest path loss first.
+    - Capacity given to one overloaded segment is not offered again to the next.
+    """
+    name = "lowest_loss"
+
+    def plan_transfers(self, balancer, max_distance_km: Optional[float] = None) -> List[Dict]:
+        paths_from = defaultdict(list)
+        for path in balancer.topology.transfer_paths:
+            if path.status == "ACTIVE":
+                paths_from[path.from_segment_id].append(path)
+        remaining_capacity: Dict[str, float] = {}
+        allowed = None
+        overloaded_segments = list(balancer.capacity_index.iter_by_utilization("critical", descending=True))
+        if max_distance_km is not None:
+            nearby = balancer._find_nearby_receivers(overloaded_segments, max_distance_km)
+            allowed = {s: {r.segment_id: d for r, d in receivers} for s, receivers in nearby.items()}
+
+        transfer_recommendations = []
+        for overloaded in overloaded_segments:
+            to_shed = load_to_shed(overloaded)
+            for path in sorted(paths_from[overloaded.segment_id], key=lambda p: p.power_loss_pct):
+                if to_shed <= 0:
+                    break
+                receiver_id = path.to_segment_id
+                if balancer.capacity_index.category_of(receiver_id) != "healthy":
+                    continue
+                if allowed is not None and receiver_id not in allowed[overloaded.segment_id]:
+                    continue
+                available = balancer.capacity_index.get_segment(receiver_id)
+                capacity = remaining_capacity.setdefault(receiver_id, available.max_capacity_mw - available.current_load_mw)
+                transfer_mw = _transfer_amount(to_shed, capacity, path)
+                if transfer_mw > 0:
+                    distance_km = allowed[overloaded.segment_id][receiver_id] if allowed is not None else None
+                    transfer_recommendations.append(_recommendation(overloaded, available, path, transfer_mw, distance_km))
+                    to_shed -= transfer_mw
+                    remaining_capacity[receiver_id] -= transfer_mw
+        return transfer_recommendations
+
+
+@register_strategy
+class CurrentOutputDispatchStrategy(DispatchStrategy):
+    """Default dispatch: keep every source at its current output (no adjustments)."""
+    name = "current_output"
+
+    def plan_dispatch(self, balancer) -> List[Dict]:
+        return []
+
+
+@register_strategy
+class MeritOrderDispatchStrategy(DispatchStrategy):
+    """
+    Dispatch sources in merit order to cover demand plus reserve.
+
+    Business Rules:
+    - Target output is total segment load plus reserve_pct (15% by default).
+    - Renewables are loaded first, then the rest by cost_per_mwh, then reliability.
+    - Weather-dependent sources cannot go above their current output.
+    - OFFLINE sources are only used if they start within max_startup_minutes.
+
+    Args:
+        reserve_pct: Reserve margin on top of demand.
+        max_startup_minutes: Longest startup time acceptable for offline sources.
+    """
+    name = "merit_order"
+
+    def __init__(self, reserve_pct: float = 15.0, max_startup_minutes: int = 60):
+        self.reserve_pct = reserve_pct
+        self.max_startup_minutes = max_startup_minutes
+
+    def plan_dispatch(self, balancer) -> List[Dict]:
+        demand = balancer.capacity_index.total_load_mw * (1 + self.reserve_pct / 100)
+        candidates = [
+            source for source in balancer.power_sources
+            if source.operational_status == "ONLINE"
+            or (source.operational_status == "OFFLINE" and (source.startup_time_minutes or 0) <= self.max_startup_minutes)
+        ]
+        candidates.sort(key=lambda source: (not source.is_renewable(), source.cost_per_mwh, -source.reliability_score))
+
+        remaining = demand
+        new_outputs = {source.source_id: 0.0 for source in balancer.power_sources}
+        for source in candidates:
+            available = source.current_output_mw if source.weather_dependent else source.max_capacity_mw
+            new_outputs[source.source_id] = min(available, max(remaining, 0.0))
+            remaining -= new_outputs[source.source_id]
+
+        recommendations = []
+        for source in balancer.power_sources:
+            new_output = new_outputs[source.source_id]
+            if abs(new_output - source.current_output_mw) > 1e-9:
+                recommendations.append({
+                    "source_id": source.source_id,
+                    "current_output_mw": source.current_output_mw,
+                    "new_output_mw": new_output,
+                    "change_mw": new_output - source.current_output_mw,
+                    "cost_per_hour": source.get_cost_per_hour(new_output),
+                })
+        return recommendations
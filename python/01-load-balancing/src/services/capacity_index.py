@@ -0,0 +1,218 @@
+"""
+Incrementally maintained capacity index for grid segments.
+Keeps segments bucketed by health class and ordered by utilization so load
+balancing and monitoring can react to single-segment load changes without
+rescanning and re-sorting the whole topology.
+"""
+
+import heapq
+from itertools import count
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..models.grid_infrastructure import GridSegment
+
+# Heap entries are (sort_key, sequence, segment_id). The sequence number is unique
+# per push, so an entry is live only while it matches the segment's latest sequence.
+_HeapEntry = Tuple[float, int, str]
+
+
+def classify_balancer_capacity(utilization_pct: float) -> str:
+    """
+    Health classification used by the load balancer.
+
+    Business Rules:
+    - Healthy: < 80% utilization
+    - Warning: 80-90% utilization
+    - Critical: > 90% utilization
+    """
+    if utilization_pct < 80.0:
+        return "healthy"
+    elif utilization_pct <= 90.0:
+        return "warning"
+    return "critical"
+
+
+BALANCER_CATEGORIES = ("healthy", "warning", "critical")
+
+
+class SegmentCapacityIndex:
+    """
+    Segments bucketed by health class and ordered by utilization within each bucket.
+
+    Every bucket keeps a min-heap and a max-heap of utilization with lazy deletion,
+    so a per-segment load update costs O(log n) and the least/most loaded segment
+    of any bucket is available in O(1) amortized time. Running totals of load and
+    capacity are kept alongside, so system utilization never needs a full scan.
+
+    Args:
+        segments: Grid segments to index. The index holds references to these
+            objects and updates their current_load_mw in place.
+        classify: Maps a utilization percentage to a category name.
+        categories: All category names, ordered from least to most loaded.
+    """
+
+    def __init__(self, segments: Iterable[GridSegment],
+                 classify: Callable[[float], str] = classify_balancer_capacity,
+                 categories: Sequence[str] = BALANCER_CATEGORIES):
+        self.classify = classify
+        self.categories: Tuple[str, ...] = tuple(categories)
+        self._segments: Dict[str, GridSegment] = {}
+        self._category_of: Dict[str, str] = {}
+        self._live_seq: Dict[str, int] = {}
+        self._members: Dict[str, Dict[str, GridSegment]] = {c: {} for c in self.categories}
+        self._min_heaps: Dict[str, List[_HeapEntry]] = {c: [] for c in self.categories}
+        self._max_heaps: Dict[str, List[_HeapEntry]] = {c: [] for c in self.categories}
+        self._seq = count()
+        self.total_load_mw = 0.0
+        self.total_capacity_mw = 0.0
+        self.version = 0
+
+        for segment in segments:
+            self.add_segment(segment)
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    def __contains__(self, segment_id: str) -> bool:
+        return segment_id in self._segments
+
+    @property
+    def system_utilization_pct(self) -> float:
+        """System-wide utilization from the running load and capacity totals."""
+        if self.total_capacity_mw <= 0:
+            return 0.0
+        return (self.total_load_mw / self.total_capacity_mw) * 100
+
+    def get_segment(self, segment_id: str) -> Optional[GridSegment]:
+        """Return the indexed segment with the given ID, if any."""
+        return self._segments.get(segment_id)
+
+    def category_of(self, segment_id: str) -> Optional[str]:
+        """Return the health category currently assigned to a segment."""
+        return self._category_of.get(segment_id)
+
+    def add_segment(self, segment: GridSegment) -> None:
+        """Add a segment to the index, or re-index it if it is already present."""
+        if segment.segment_id in self._segments:
+            self.remove_segment(segment.segment_id)
+        self._segments[segment.segment_id] = segment
+        self.total_load_mw += segment.current_load_mw
+        self.total_capacity_mw += segment.max_capacity_mw
+        self._place(segment)
+
+    def remove_segment(self, segment_id: str) -> Optional[GridSegment]:
+        """Drop a segment from the index. Its stale heap entries are skipped lazily."""
+        segment = self._segments.pop(segment_id, None)
+        if segment is None:
+            return None
+        category = self._category_of.pop(segment_id)
+        del self._members[category][segment_id]
+        del self._live_seq[segment_id]
+        self.total_load_mw -= segment.current_load_mw
+        self.total_capacity_mw -= segment.max_capacity_mw
+        self.version += 1
+        return segment
+
+    def update_load(self, segment_id: str, load_mw: float) -> str:
+        """
+        Apply a new load reading to a segment in O(log n).
+
+        Args:
+            segment_id: The ID of the segment whose load changed.
+            load_mw: The new current load in MW.
+
+        Returns:
+            The segment's health category after the update.
+        """
+        segment = self._segments.get(segment_id)
+        if segment is None:
+            raise KeyError(f"Segment {segment_id} is not indexed")
+        if load_mw < 0:
+            raise ValueError(f"Load for segment {segment_id} must be non-negative, got {load_mw}")
+
+        self.total_load_mw += load_mw - segment.current_load_mw
+        segment.current_load_mw = load_mw
+        del self._members[self._category_of[segment_id]][segment_id]
+        self._place(segment)
+        return self._category_of[segment_id]
+
+    def members(self, category: str) -> List[GridSegment]:
+        """Segments in a category, in the order they entered it."""
+        return list(self._members[category].values())
+
+    def category_count(self, category: str) -> int:
+        """Number of segments currently in a category."""
+        return len(self._members[category])
+
+    def snapshot(self) -> Dict[str, List[GridSegment]]:
+        """Categorized segments in the same shape as GridLoadBalancer.analyze_grid_capacity."""
+        return {category: self.members(category) for category in self.categories}
+
+    def peek_least_loaded(self, category: Optional[str] = None) -> Optional[GridSegment]:
+        """
+        Least utilized segment of a category, or of the whole grid if no category is given.
+        """
+        for name in ([category] if category else self.categories):
+            entry = self._peek(self._min_heaps[name], name)
+            if entry:
+                return self._segments[entry[2]]
+        return None
+
+    def peek_most_loaded(self, category: Optional[str] = None) -> Optional[GridSegment]:
+        """
+        Most utilized segment of a category, or of the whole grid if no category is given.
+        """
+        for name in ([category] if category else reversed(self.categories)):
+            entry = self._peek(self._max_heaps[name], name)
+            if entry:
+                return self._segments[entry[2]]
+        return None
+
+    def iter_by_utilization(self, category: str, descending: bool = False) -> Iterator[GridSegment]:
+        """
+        Yield a category's segments ordered by utilization without sorting the bucket.
+
+        Walks the heap array best-first, so taking the first k segments costs
+        O(k log k) and callers that stop early never pay for the full ordering.
+        The heap is not modified, but the index must not be updated while iterating.
+        """
+        heap = self._max_heaps[category] if descending else self._min_heaps[category]
+        if not heap:
+            return
+        frontier = [(heap[0], 0)]
+        while frontier:
+            entry, position = heapq.heappop(frontier)
+            if self._is_live(entry, category):
+                yield self._segments[entry[2]]
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+
+    def _place(self, segment: GridSegment) -> None:
+        """Classify a segment and push fresh entries onto its bucket's heaps."""
+        utilization = segment.get_utilization_percentage()
+        category = self.classify(utilization)
+        seq = next(self._seq)
+        self._category_of[segment.segment_id] = category
+        self._members[category][segment.segment_id] = segment
+        self._live_seq[segment.segment_id] = seq
+        self._push(self._min_heaps, category, (utilization, seq, segment.segment_id))
+        self._push(self._max_heaps, category, (-utilization, seq, segment.segment_id))
+        self.version += 1
+
+    def _push(self, heaps: Dict[str, List[_HeapEntry]], category: str, entry: _HeapEntry) -> None:
+        heap = heaps[category]
+        heapq.heappush(heap, entry)
+        # Rebuild once stale entries dominate, keeping heap size O(live members)
+        if len(heap) > 2 * len(self._members[category]) + 16:
+            heap[:] = [e for e in heap if self._is_live(e, category)]
+            heapq.heapify(heap)
+
+    def _peek(self, heap: List[_HeapEntry], category: str) -> Optional[_HeapEntry]:
+        while heap and not self._is_live(heap[0], category):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _is_live(self, entry: _HeapEntry, category: str) -> bool:
+        segment_id = entry[2]
+        return self._live_seq.get(segment_id) == entry[1] and self._category_of.get(segment_id) == category
@@ -11,6 +11,61 @@ from collections import defaultdict, Counter
 import statistics
 import math
 
+import numpy as np
+
+from ..models.load_measurements import LoadMeasurement, LoadMeasurementBatch, MeasurementQuality, QualityMask, QUALITY_CODES, QUALITY_MASK_WEIGHTS
+from ..models.events import TransferEvent
+from ..models.alert_rules import CAPACITY_ALERT_THRESHOLDS
+from .loss_accounting import TransmissionLossLedger
+
+
+def _measurement_field(measurement, name: str):
+    """Read a field from either a measurement dictionary or a LoadMeasurement model."""
+    if isinstance(measurement, dict):
+        return measurement.get(name)
+    return getattr(measurement, name, None)
+
+
+def _measurement_columns(measurements) -> Dict[str, np.ndarray]:
+    """
+    Convert measurement records into parallel NumPy columns in a single pass.
+    
+    Records missing a segment, timestamp or load are dropped. Quality is stored as
+    an int8 code (see QUALITY_CODES); records without one count as good.
+    A LoadMeasurementBatch already holds columns and is returned without a pass.
+    
+    Returns:
+        Dictionary with segment_ids, timestamps, hours, loads and quality_codes columns.
+    """
+    if isinstance(measurements, LoadMeasurementBatch):
+        return measurements.columns()
+    segment_ids, timestamps, hours, loads, quality_codes = [], [], [], [], []
+    good = QUALITY_CODES[MeasurementQuality.GOOD]
+    for measurement in measurements:
+        segment_id = _measurement_field(measurement, "segment_id")
+        timestamp = _measurement_field(measurement, "timestamp")
+        load_mw = _measurement_field(measurement, "load_mw")
+        if not segment_id or timestamp is None or load_mw is None:
+            continue
+        segment_ids.append(segment_id)
+        timestamps.append(timestamp)
+        hours.append(timestamp.hour if isinstance(timestamp, datetime) else -1)
+        loads.append(load_mw)
+        quality = _measurement_field(measurement, "measurement_quality")
+        quality_codes.append(QUALITY_CODES.get(quality, good) if quality is not None else good)
+    return {
+        "segment_ids": np.asarray(segment_ids, dtype=str),
+        "timestamps": np.asarray(timestamps, dtype="datetime64[us]"),
+        "hours": np.asarray(hours, dtype=np.int8),
+        "loads": np.asarray(loads, dtype=float),
+        "quality_codes": np.asarray(quality_codes, dtype=np.int8),
+    }
+
+
+def _quality_weights(quality_mask: QualityMask, weights: Optional[Tuple[float, ...]] = None) -> np.ndarray:
+    """Weight per quality code for a mask; explicit weights override the mask defaults."""
+    return np.asarray(weights if weights is not None else QUALITY_MASK_WEIGHTS[QualityMask(quality_mask)], dtype=float)
+
 class LoadDataProcessor:
     """
     Processes load measurement data and calculates grid performance metrics.
@@ -20,28 +75,42 @@ class LoadDataProcessor:
     def __init__(self, data_loader):
         self.data_loader = data_loader
         self.processed_data = {}
-        self.alert_thresholds = {
-            "warning": 80.0,
-            "critical": 90.0, 
-            "emergency": 95.0
-        }
+        self.alert_thresholds = {level.lower(): threshold for level, threshold in CAPACITY_ALERT_THRESHOLDS.items()}
+        self.loss_ledger: Optional[TransmissionLossLedger] = None
+        # Running per-segment accumulators fed by live measurement events
+        self.live_statistics: Dict[str, Dict[str, float]] = {}
+        self.live_quality_counts: Counter = Counter()
+        # Latest measurement timestamp folded in per segment, for checkpoint replay
+        self.measurement_watermarks: Dict[str, datetime] = {}
     
-    def analyze_load_patterns(self, measurements: List[Dict]) -> Dict[str, any]:
+    def analyze_load_patterns(self, measurements: List[Dict], quality_mask: QualityMask = QualityMask.GOOD_AND_SUSPECT,
+                              quality_weights: Optional[Tuple[float, ...]] = None,
+                              by_segment_hour: bool = False) -> Dict[str, any]:
         """
         Analyze load measurement patterns for operational insights.
         
         Examines time-series data to identify peak periods, trends, and anomalies.
         Used for load forecasting and capacity planning decisions.
         
+        Business Rules:
+        - Measurement quality decides how much each reading counts: GOOD_ONLY and
+          GOOD_AND_SUSPECT include or exclude readings, WEIGHTED scales them.
+        - Bad and missing readings never contribute to averages, peaks or minimums.
+        - Per-quality counts are reported for every analysis.
+        
         Args:
             measurements: List of load measurement records with timestamps and values
+            quality_mask: Which measurement qualities to include.
+            quality_weights: Optional weights per quality (good, suspect, bad, missing)
+                overriding the mask's defaults, e.g. for a custom WEIGHTED scheme.
+            by_segment_hour: Also return "segment_hourly_pattern", the hour-of-day
+                pattern of each segment, with the weight_total behind each average so
+                patterns of several segments can be combined (e.g. per region).
             
         Returns:
             Dictionary with pattern analysis results and operational recommendations
         """
         # TODO: Implement comprehensive load pattern analysis
-        # - Group measurements by time periods (hourly, daily patterns)
-        # - Calculate peak load times and minimum load periods
         # - Identify weekly and seasonal patterns
         # - Detect unusual consumption patterns or anomalies
         # - Calculate load growth rates and trending
@@ -50,48 +119,184 @@ class LoadDataProcessor:
         if not measurements:
             return {"error": "No measurement data provided"}
         
-        # Group measurements by segment and time period
-        segment_data = defaultdict(list)
-        hourly_patterns = defaultdict(list)
+        columns = _measurement_columns(measurements)
+        loads = columns["loads"]
+        quality_codes = columns["quality_codes"]
+        weights = _quality_weights(quality_mask, quality_weights)[quality_codes]
+        included = weights > 0
+
+        # Per-quality counts come from the compact code column, not another pass over records
+        quality_counts = np.bincount(quality_codes, minlength=len(QUALITY_CODES))
+
+        # Weighted per-segment statistics in one vectorized pass over the columns
+        segment_keys, segment_codes = np.unique(columns["segment_ids"], return_inverse=True)
+        n_segments = len(segment_keys)
+        weight_sum = np.bincount(segment_codes, weights=weights, minlength=n_segments)
+        weight_sq_sum = np.bincount(segment_codes, weights=weights ** 2, minlength=n_segments)
+        included_counts = np.bincount(segment_codes[included], minlength=n_segments)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            averages = np.bincount(segment_codes, weights=weights * loads, minlength=n_segments) / weight_sum
+            deviation_sq = weights * (loads - averages[segment_codes]) ** 2
+            # Unbiased weighted variance; equals the sample variance for 0/1 weights
+            variance_denominator = weight_sum - weight_sq_sum / weight_sum
+            variances = np.bincount(segment_codes, weights=np.nan_to_num(deviation_sq), minlength=n_segments) / variance_denominator
+        peaks = np.full(n_segments, -np.inf)
+        minimums = np.full(n_segments, np.inf)
+        np.maximum.at(peaks, segment_codes[included], loads[included])
+        np.minimum.at(minimums, segment_codes[included], loads[included])
+
+        segment_stats = {}
+        for i, segment_id in enumerate(segment_keys.tolist()):
+            if included_counts[i] == 0:
+                continue
+            segment_stats[segment_id] = {
+                "average_load": float(averages[i]),
+                "peak_load": float(peaks[i]),
+                "min_load": float(minimums[i]),
+                "load_variance": float(variances[i]) if included_counts[i] > 1 else 0,
+                "measurement_count": int(included_counts[i])
+            }
         
-        for measurement in measurements:
-            segment_id = measurement.get("segment_id")
-            timestamp = measurement.get("timestamp")
-            load_mw = measurement.get("load_mw")
-            
-            if segment_id and timestamp and load_mw is not None:
-                segment_data[segment_id].append(load_mw)
-                
-                # Extract hour for daily pattern analysis
-                if isinstance(timestamp, datetime):
-                    hour = timestamp.hour
-                    hourly_patterns[hour].append(load_mw)
+        # Weighted average load per hour of day
+        hours = columns["hours"]
+        valid_hours = included & (hours >= 0)
+        hour_weights = np.bincount(hours[valid_hours], weights=weights[valid_hours], minlength=24)
+        hour_loads = np.bincount(hours[valid_hours], weights=(weights * loads)[valid_hours], minlength=24)
+        hour_counts = np.bincount(hours[valid_hours], minlength=24)
+        daily_pattern = {
+            hour: {
+                "average_load": float(hour_loads[hour] / hour_weights[hour]),
+                "load_count": int(hour_counts[hour])
+            }
+            for hour in np.nonzero(hour_counts)[0].tolist()
+        }
         
-        # Calculate statistics for each segment
-        segment_stats = {}
-        for segment_id, loads in segment_data.items():
-            if loads:
-                segment_stats[segment_id] = {
-                    "average_load": statistics.mean(loads),
-                    "peak_load": max(loads),
-                    "min_load": min(loads),
-                    "load_variance": statistics.variance(loads) if len(loads) > 1 else 0
+        analysis = {
+            "segment_statistics": segment_stats,
+            "daily_load_pattern": daily_pattern,
+            "total_measurements": len(measurements),
+            "included_measurements": int(included.sum()),
+            "quality_mask": QualityMask(quality_mask).value,
+            "quality_counts": {quality.value: int(quality_counts[code]) for quality, code in QUALITY_CODES.items()},
+            "analysis_timestamp": datetime.now()
+        }
+
+        if by_segment_hour:
+            # Same weighted averages keyed by (segment, hour) in one flat bincount
+            cells = segment_codes[valid_hours] * 24 + hours[valid_hours]
+            cell_weights = np.bincount(cells, weights=weights[valid_hours], minlength=n_segments * 24).reshape(n_segments, 24)
+            cell_loads = np.bincount(cells, weights=(weights * loads)[valid_hours], minlength=n_segments * 24).reshape(n_segments, 24)
+            cell_counts = np.bincount(cells, minlength=n_segments * 24).reshape(n_segments, 24)
+            analysis["segment_hourly_pattern"] = {
+                segment_id: {
+                    hour: {
+                        "average_load": float(cell_loads[i, hour] / cell_weights[i, hour]),
+                        "load_count": int(cell_counts[i, hour]),
+                        "weight_total": float(cell_weights[i, hour])
+                    }
+                    for hour in np.nonzero(cell_counts[i])[0].tolist()
                 }
+                for i, segment_id in enumerate(segment_keys.tolist()) if included_counts[i] > 0
+            }
+
+        return analysis
+    
+    def connect_event_bus(self, bus) -> None:
+        """
+        Consume live measurement and transfer events from an EventBus.
+        
+        Args:
+            bus: The EventBus carrying LoadMeasurement and TransferEvent events.
+        """
+        bus.subscribe(LoadMeasurement, self.handle_measurement_events, name="load_data_processor")
+        bus.subscribe(TransferEvent, self.handle_transfer_events, name="load_data_processor.transfers")
+
+    def handle_measurement_events(self, measurements: List[LoadMeasurement]) -> None:
+        """
+        Fold a batch of live measurements into the running per-segment accumulators.
         
-        # Calculate daily patterns
-        daily_pattern = {}
-        for hour, loads in hourly_patterns.items():
-            if loads:
-                daily_pattern[hour] = {
-                    "average_load": statistics.mean(loads),
-                    "load_count": len(loads)
+        Business Rules:
+        - Good and suspect readings update load statistics; bad and missing readings
+          are only counted.
+        """
+        included = (MeasurementQuality.GOOD, MeasurementQuality.SUSPECT)
+        for measurement in measurements:
+            self.live_quality_counts[measurement.measurement_quality.value] += 1
+            self.measurement_watermarks[measurement.segment_id] = measurement.timestamp
+            if measurement.measurement_quality not in included:
+                continue
+            load_mw = measurement.load_mw
+            stats = self.live_statistics.get(measurement.segment_id)
+            if stats is None:
+                stats = self.live_statistics[measurement.segment_id] = {
+                    "count": 0, "total": 0.0, "total_sq": 0.0, "min": load_mw, "max": load_mw, "last_timestamp": None
                 }
+            stats["count"] += 1
+            stats["total"] += load_mw
+            stats["total_sq"] += load_mw * load_mw
+            stats["min"] = min(stats["min"], load_mw)
+            stats["max"] = max(stats["max"], load_mw)
+            stats["last_timestamp"] = measurement.timestamp
+
+    def handle_transfer_events(self, transfers: List[TransferEvent]) -> None:
+        """
+        Update transmission loss totals from live transfer events.
         
+        A transfer replaces the active transfer on the same path; a transfer of
+        0 MW ends it.
+        """
+        if self.loss_ledger is None:
+            self.loss_ledger = TransmissionLossLedger(self.data_loader.load_grid_topology())
+        for transfer in transfers:
+            record = transfer.model_dump()
+            if transfer.transfer_mw > 0:
+                self.loss_ledger.upsert_transfer(record)
+            else:
+                self.loss_ledger.remove_transfer(TransmissionLossLedger.path_id(record))
+
+    def checkpoint_state(self) -> Dict[str, any]:
+        """Derived live state to persist so a restart does not reprocess history."""
+        return {
+            "live_statistics": self.live_statistics,
+            "live_quality_counts": dict(self.live_quality_counts),
+            "active_transfers": list(self.loss_ledger.active_transfers.values()) if self.loss_ledger else None,
+            "measurement_watermarks": self.measurement_watermarks,
+        }
+
+    def restore_checkpoint_state(self, state: Dict[str, any]) -> None:
+        """Restore state produced by checkpoint_state."""
+        self.live_statistics = state["live_statistics"]
+        self.live_quality_counts = Counter(state["live_quality_counts"])
+        self.measurement_watermarks = state["measurement_watermarks"]
+        self.loss_ledger = None
+        if state["active_transfers"] is not None:
+            self.loss_ledger = TransmissionLossLedger(self.data_loader.load_grid_topology())
+            self.loss_ledger.apply_changes(upserts=state["active_transfers"])
+
+    def get_live_load_statistics(self) -> Dict[str, any]:
+        """
+        Current per-segment load statistics from the live accumulators.
+        
+        Returns:
+            Dictionary in the shape of analyze_load_patterns' segment_statistics, plus
+            per-quality counts.
+        """
+        segment_stats = {}
+        for segment_id, stats in self.live_statistics.items():
+            count = stats["count"]
+            average = stats["total"] / count
+            variance = (stats["total_sq"] - count * average * average) / (count - 1) if count > 1 else 0
+            segment_stats[segment_id] = {
+                "average_load": average,
+                "peak_load": stats["max"],
+                "min_load": stats["min"],
+                "load_variance": max(variance, 0.0),
+                "measurement_count": count,
+                "last_timestamp": stats["last_timestamp"]
+            }
         return {
             "segment_statistics": segment_stats,
-            "daily_load_pattern": daily_pattern,
-            "total_measurements": len(measurements),
-            "analysis_timestamp": datetime.now()
+            "quality_counts": dict(self.live_quality_counts)
         }
     
     def detect_load_anomalies(self, measurements: List[Dict], threshold_std: float = 2.0) -> List[Dict]:
@@ -152,47 +357,104 @@ class LoadDataProcessor:
         
         return sorted(anomalies, key=lambda x: x.get("timestamp", datetime.min))
     
-    def calculate_grid_efficiency_metrics(self, grid_state: Dict) -> Dict[str, float]:
+    def calculate_grid_efficiency_metrics(self, grid_state: Dict, active_transfers: Optional[List[Dict]] = None,
+                                          measurements: Optional[List[Dict]] = None) -> Dict[str, float]:
         """
         Calculate key performance indicators for grid operations.
         
         Computes efficiency metrics, utilization rates, and performance indicators.
         Used for operational dashboards and regulatory reporting.
-        """
-        # TODO: Implement comprehensive efficiency calculations
-        # - Calculate overall grid utilization percentage
-        # - Determine load factor and capacity factor metrics
-        # - Compute power loss percentages across transfer paths
-        # - Calculate demand diversity factor across segments
-        # - Generate reliability and availability metrics
-        # - Return structured metrics for dashboard display
         
-        # Business Rule: Overall grid utilization is total_current_load_mw / total_capacity_mw * 100
-        # Business Rule: Power loss across transfer paths is sum of (transfer_mw * power_loss_pct)
-        # Copilot Prompting Tip: "Implement calculation for overall grid utilization and total power loss across all active transfer paths."
-
+        Business Rules:
+        - Overall grid utilization is total_current_load_mw / total_capacity_mw * 100
+        - Power loss across transfer paths is sum of (transfer_mw * power_loss_pct / 100)
+        - Losses are tracked per path, per sending segment and system-wide
+        
+        Args:
+            grid_state: Current state of the grid from data_loader.get_current_grid_state().
+            active_transfers: Transfers currently in effect, e.g. from
+                GridLoadBalancer.calculate_optimal_transfers(). Only transfers that changed
+                since the previous call update the loss totals. When omitted, the loss
+                totals from the previous call are reported.
+            measurements: Optional load measurement history for load, diversity and
+                capacity factors.
+            
+        Returns:
+            Dictionary of efficiency metrics.
+        """
         total_capacity = grid_state.get("total_capacity_mw", 0.0)
         total_current_load = grid_state.get("total_current_load_mw", 0.0)
         
         overall_utilization_pct = (total_current_load / total_capacity) * 100 if total_capacity > 0 else 0.0
 
-        total_power_loss_mw = 0.0
-        # Assuming transfer_paths are part of the grid_state topology and have current transfer data
-        # This part would typically require actual transfer data from the load balancer
-        # For now, we'll assume a simplified calculation or placeholder
-        
-        # Placeholder for power loss calculation - would need actual transfers to be meaningful
-        # For a more complete implementation, this would integrate with the load balancer's transfer recommendations
-        # For the purpose of this exercise, we'll keep it simple.
-        
-        # Example: If we had a list of active transfers with their amounts and path losses
-        # for transfer in active_transfers:
-        #     path = self.data_loader.load_grid_topology().get_transfer_path(transfer["from"], transfer["to"])
-        #     if path:
-        #         total_power_loss_mw += transfer["amount"] * (path.power_loss_pct / 100)
+        if self.loss_ledger is None and "topology" in grid_state:
+            self.loss_ledger = TransmissionLossLedger(grid_state["topology"])
+        if active_transfers is not None and self.loss_ledger is not None:
+            self.loss_ledger.sync(active_transfers)
 
-        return {
+        metrics = {
             "overall_grid_utilization_pct": overall_utilization_pct,
-            "total_power_loss_mw": total_power_loss_mw, # This will be 0.0 until integrated with actual transfers
+            "total_power_loss_mw": 0.0,
             "timestamp": datetime.now()
         }
+        if self.loss_ledger is not None:
+            metrics.update(self.loss_ledger.summary())
+        if measurements:
+            metrics.update(self.calculate_load_factors(measurements, grid_state))
+        return metrics
+
+    def calculate_load_factors(self, measurements: List[Dict], grid_state: Optional[Dict] = None) -> Dict[str, any]:
+        """
+        Calculate load, diversity and capacity factors over a measurement history.
+        
+        All aggregations run as vectorized NumPy operations over the whole history.
+        
+        Business Rules:
+        - Load factor: average load / peak load (per segment and system-wide).
+        - Diversity factor: sum of individual segment peaks / coincident system peak.
+        - Capacity factor: average load / max capacity (requires grid_state topology).
+        
+        Args:
+            measurements: Load measurement records (dictionaries or LoadMeasurement models).
+            grid_state: Optional grid state supplying segment capacities.
+            
+        Returns:
+            Dictionary with system-wide factors and per-segment breakdowns.
+        """
+        columns = _measurement_columns(measurements)
+        if not len(columns["loads"]):
+            return {}
+
+        loads = columns["loads"]
+        segment_keys, segment_codes = np.unique(columns["segment_ids"], return_inverse=True)
+        _, time_codes = np.unique(columns["timestamps"], return_inverse=True)
+
+        # Per-segment average and peak
+        segment_counts = np.bincount(segment_codes, minlength=len(segment_keys))
+        segment_avg = np.bincount(segment_codes, weights=loads, minlength=len(segment_keys)) / segment_counts
+        segment_peak = np.zeros(len(segment_keys))
+        np.maximum.at(segment_peak, segment_codes, loads)
+
+        # System load at each timestamp is the sum over segments reporting at that time
+        system_load = np.bincount(time_codes, weights=loads)
+        system_peak = system_load.max()
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            segment_load_factor = np.where(segment_peak > 0, segment_avg / segment_peak, 0.0)
+
+        factors = {
+            "load_factor": float(system_load.mean() / system_peak) if system_peak > 0 else 0.0,
+            "diversity_factor": float(segment_peak.sum() / system_peak) if system_peak > 0 else 0.0,
+            "segment_load_factor": dict(zip(segment_keys.tolist(), segment_load_factor.tolist())),
+        }
+
+        if grid_state and "topology" in grid_state:
+            capacity_by_segment = {s.segment_id: s.max_capacity_mw for s in grid_state["topology"].segments}
+            capacities = np.array([capacity_by_segment.get(key, np.nan) for key in segment_keys])
+            known = ~np.isnan(capacities)
+            segment_capacity_factor = segment_avg[known] / capacities[known]
+            factors["segment_capacity_factor"] = dict(zip(segment_keys[known].tolist(), segment_capacity_factor.tolist()))
+            total_capacity = capacities[known].sum()
+            factors["capacity_factor"] = float(segment_avg[known].sum() / total_capacity) if total_capacity > 0 else 0.0
+
+        return factors
@@ -0,0 +1,215 @@
+"""
+In-process publish/subscribe event bus for live grid data.
+Delivers measurement, alert and transfer events to subscribers in batches through
+bounded per-subscriber queues, with explicit policies for slow consumers.
+"""
+
+import asyncio
+import inspect
+import logging
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Type
+
+
+class OverflowPolicy(str, Enum):
+    """What happens when a subscriber's queue is full."""
+    BLOCK = 'block'              # Publisher waits for space (backpressure)
+    DROP_OLDEST = 'drop_oldest'  # Oldest queued event is discarded
+    DROP_NEWEST = 'drop_newest'  # Incoming event is discarded
+
+
+class Subscription:
+    """
+    One subscriber's bounded queue and delivery statistics.
+
+    Handlers receive a list of up to batch_size events and may be plain functions
+    or coroutines. Events in a batch whose handler raised count as failed_events,
+    not delivered; failures counts those batches.
+    """
+
+    def __init__(self, event_type: Type, handler: Callable[[List[Any]], Any], max_queue: int,
+                 batch_size: int, policy: OverflowPolicy, name: Optional[str] = None):
+        if max_queue < 1 or batch_size < 1:
+            raise ValueError("max_queue and batch_size must be at least 1")
+        self.event_type = event_type
+        self.handler = handler
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.policy = OverflowPolicy(policy)
+        self.name = name or getattr(handler, "__qualname__", repr(handler))
+        self.queue: deque = deque()
+        self.delivered = 0
+        self.dropped = 0
+        self.batches = 0
+        self.failures = 0
+        self.failed_events = 0
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_full(self) -> bool:
+        return len(self.queue) >= self.max_queue
+
+    def offer(self, event: Any) -> bool:
+        """Enqueue without waiting, applying the drop policy. Returns False if the event was dropped."""
+        if self.is_full:
+            if self.policy == OverflowPolicy.DROP_OLDEST:
+                self.queue.popleft()
+                self.dropped += 1
+            else:
+                # DROP_NEWEST, or BLOCK when the caller cannot wait
+                self.dropped += 1
+                return False
+        self.queue.append(event)
+        self._not_empty.set()
+        self._idle.clear()
+        if self.is_full:
+            self._not_full.clear()
+        return True
+
+    async def put(self, event: Any) -> bool:
+        """Enqueue, waiting for space when the policy is BLOCK."""
+        while self.policy == OverflowPolicy.BLOCK and self.is_full:
+            await self._not_full.wait()
+        return self.offer(event)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "event_type": self.event_type.__name__,
+            "queued": len(self.queue),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "failures": self.failures,
+            "failed_events": self.failed_events,
+            "policy": self.policy.value,
+        }
+
+
+class EventBus:
+    """
+    Typed asyncio pub/sub bus.
+
+    Subscribers register for an event class and receive every published event that
+    is an instance of it. Each subscription gets its own bounded queue and consumer
+    task, so one slow consumer only affects publishers when its policy is BLOCK.
+
+    Usage:
+        bus = EventBus()
+        bus.subscribe(LoadMeasurement, monitor.handle_measurement_events)
+        await bus.start()
+        await bus.publish(measurement)
+        await bus.close()   # drains all queues
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._subscriptions: List[Subscription] = []
+        self._routes: Dict[Type, List[Subscription]] = {}
+        self._running = False
+
+    def subscribe(self, event_type: Type, handler: Callable[[List[Any]], Any], max_queue: int = 10000,
+                  batch_size: int = 500, policy: OverflowPolicy = OverflowPolicy.BLOCK,
+                  name: Optional[str] = None) -> Subscription:
+        """
+        Register a batch handler for events of event_type (including subclasses).
+
+        Args:
+            event_type: Event class to receive, e.g. LoadMeasurement or CapacityAlertEvent.
+            handler: Called with a list of events; may be a coroutine function.
+            max_queue: Maximum events held for this subscriber.
+            batch_size: Maximum events passed to one handler call.
+            policy: Behaviour when the queue is full.
+            name: Label used in statistics and logs.
+        """
+        subscription = Subscription(event_type, handler, max_queue, batch_size, policy, name)
+        self._subscriptions.append(subscription)
+        self._routes.clear()
+        if self._running:
+            subscription._task = asyncio.create_task(self._consume(subscription))
+        return subscription
+
+    def _subscribers_for(self, event_type: Type) -> List[Subscription]:
+        routes = self._routes.get(event_type)
+        if routes is None:
+            routes = [s for s in self._subscriptions if issubclass(event_type, s.event_type)]
+            self._routes[event_type] = routes
+        return routes
+
+    async def publish(self, event: Any) -> int:
+        """
+        Deliver an event to every matching subscriber, waiting on BLOCK subscribers that are full.
+
+        Returns:
+            Number of subscribers the event was queued for.
+        """
+        queued = 0
+        for subscription in self._subscribers_for(type(event)):
+            queued += await subscription.put(event)
+        return queued
+
+    async def publish_many(self, events: List[Any]) -> int:
+        """Publish events in order; returns the total number of queued deliveries."""
+        queued = 0
+        for event in events:
+            queued += await self.publish(event)
+        return queued
+
+    def publish_nowait(self, event: Any) -> int:
+        """Deliver an event without waiting; full BLOCK subscribers drop it like DROP_NEWEST."""
+        return sum(subscription.offer(event) for subscription in self._subscribers_for(type(event)))
+
+    async def start(self) -> None:
+        """Start one consumer task per subscription on the running event loop."""
+        if self._running:
+            return
+        self._running = True
+        for subscription in self._subscriptions:
+            subscription._task = asyncio.create_task(self._consume(subscription))
+
+    async def close(self) -> None:
+        """Wait for every queue to drain, then stop the consumer tasks."""
+        # Handlers may publish follow-up events (e.g. alerts), so repeat until all are idle at once
+        while self._running and not all(s._idle.is_set() for s in self._subscriptions):
+            for subscription in self._subscriptions:
+                await subscription._idle.wait()
+        self._running = False
+        for subscription in self._subscriptions:
+            if subscription._task:
+                subscription._task.cancel()
+        await asyncio.gather(*(s._task for s in self._subscriptions if s._task), return_exceptions=True)
+        for subscription in self._subscriptions:
+            subscription._task = None
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Delivery statistics per subscription, for spotting slow consumers."""
+        return [subscription.stats() for subscription in self._subscriptions]
+
+    async def _consume(self, subscription: Subscription) -> None:
+        while True:
+            await subscription._not_empty.wait()
+            batch = [subscription.queue.popleft() for _ in range(min(subscription.batch_size, len(subscription.queue)))]
+            if not subscription.queue:
+                subscription._not_empty.clear()
+            subscription._not_full.set()
+            try:
+                result = subscription.handler(batch)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                subscription.failures += 1
+                subscription.failed_events += len(batch)
+                self.logger.error(f"Event handler {subscription.name} failed on a batch of {len(batch)}: {e}")
+            else:
+                subscription.delivered += len(batch)
+            subscription.batches += 1
+            if not subscription.queue:
+                subscription._idle.set()
+            # Let publishers and other consumers run between batches
+            await asyncio.sleep(0)
@@ -3,10 +3,18 @@ Core load balancing service for the smart grid system.
 Implements algorithms to analyze grid capacity and optimize power distribution.
 """
 
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional, Union
 from ..utils.data_loader import GridDataLoader
+from ..utils.spatial_index import GeoSpatialIndex
 from ..models.grid_infrastructure import GridSegment, PowerTransferPath, GridTopology
 from ..models.power_sources import PowerSource
+from ..models.load_measurements import LoadMeasurement
+from .balancing_strategies import (
+    DISPATCH_STRATEGIES, TRANSFER_STRATEGIES, CurrentOutputDispatchStrategy, DispatchStrategy,
+    GreedyTransferStrategy, TransferStrategy
+)
+from .capacity_index import SegmentCapacityIndex
+from .transfer_headroom import TransferHeadroomService
 
 class GridLoadBalancer:
     """
@@ -18,15 +26,35 @@ class GridLoadBalancer:
     - Prioritize renewable energy when cost-competitive.
     - Maintain 15% system reserve capacity.
     
+    Transfer planning and dispatch are delegated to a TransferStrategy and a
+    DispatchStrategy (greedy transfers and unchanged dispatch by default); either
+    can be passed as an instance or by registered name.
+    
     Copilot Prompting Tip:
     "Implement the GridLoadBalancer class, focusing on methods for analyzing grid capacity, calculating optimal transfers, and optimizing power source dispatch."
     """
     
-    def __init__(self):
+    def __init__(self, grid_state: Optional[Dict] = None,
+                 transfer_strategy: Union[TransferStrategy, str, None] = None,
+                 dispatch_strategy: Union[DispatchStrategy, str, None] = None):
         self.data_loader = GridDataLoader()
-        self.current_grid_state = self.data_loader.get_current_grid_state()
+        self.current_grid_state = grid_state if grid_state is not None else self.data_loader.get_current_grid_state()
         self.topology: GridTopology = self.current_grid_state["topology"]
         self.power_sources: List[PowerSource] = self.current_grid_state["power_sources"]
+        self.capacity_index = SegmentCapacityIndex(self.topology.segments)
+        # First path listed for each (from, to) pair, matching a linear scan of transfer_paths
+        self._paths_by_segments: Dict = {}
+        for path in self.topology.transfer_paths:
+            self._paths_by_segments.setdefault((path.from_segment_id, path.to_segment_id), path)
+        self.segment_locator = GeoSpatialIndex.from_items(self.topology.segments, key=lambda s: s.segment_id)
+        self.source_locator = GeoSpatialIndex.from_items(self.power_sources, key=lambda s: s.source_id)
+        self.headroom_service = TransferHeadroomService(self.topology)
+        if isinstance(transfer_strategy, str):
+            transfer_strategy = TRANSFER_STRATEGIES[transfer_strategy]()
+        if isinstance(dispatch_strategy, str):
+            dispatch_strategy = DISPATCH_STRATEGIES[dispatch_strategy]()
+        self.transfer_strategy: TransferStrategy = transfer_strategy or GreedyTransferStrategy()
+        self.dispatch_strategy: DispatchStrategy = dispatch_strategy or CurrentOutputDispatchStrategy()
 
     def analyze_grid_capacity(self) -> Dict[str, List[GridSegment]]:
         """
@@ -46,21 +74,56 @@ class GridLoadBalancer:
         Returns:
             Dictionary with categorized segments (e.g., {"healthy": [...], "warning": [...], "critical": [...]})
         """
-        categorized_segments = {
-            "healthy": [],
-            "warning": [],
-            "critical": []
-        }
+        # Categories are maintained incrementally by the capacity index as loads change
+        return self.capacity_index.snapshot()
 
-        for segment in self.topology.segments:
-            utilization = segment.get_utilization_percentage()
-            if utilization < 80.0:
-                categorized_segments["healthy"].append(segment)
-            elif 80.0 <= utilization <= 90.0:
-                categorized_segments["warning"].append(segment)
-            else:
-                categorized_segments["critical"].append(segment)
-        return categorized_segments
+    def update_segment_load(self, segment_id: str, load_mw: float) -> str:
+        """
+        Apply a new load reading for a segment and re-categorize it in place.
+        
+        Args:
+            segment_id: The ID of the segment whose load changed.
+            load_mw: The new current load in MW.
+            
+        Returns:
+            The segment's capacity category after the update.
+        """
+        category = self.capacity_index.update_load(segment_id, load_mw)
+        self.headroom_service.refresh_segment(segment_id)
+        return category
+
+    def apply_measurements(self, measurements: List[LoadMeasurement]) -> None:
+        """
+        Stream load measurements into the balancer's grid state.
+        
+        Measurements are applied in the order given, so the latest reading for
+        each segment wins. Readings for unknown segments are ignored.
+        
+        Args:
+            measurements: Load measurements, typically in timestamp order.
+        """
+        for measurement in measurements:
+            if measurement.segment_id in self.capacity_index:
+                self.capacity_index.update_load(measurement.segment_id, measurement.load_mw)
+                self.headroom_service.refresh_segment(measurement.segment_id)
+
+    def get_transfer_headroom(self, from_segment_ids: Union[str, Iterable[str]],
+                              to_segment_ids: Union[str, Iterable[str]]) -> Dict:
+        """
+        How many MW can be moved from one segment (or group) to another right now, over any route.
+        
+        Answered from a cached max-flow over the transfer paths that is updated as
+        loads change, so it is cheap to call interactively without running
+        calculate_optimal_transfers.
+        
+        Args:
+            from_segment_ids: Sending segment ID or IDs.
+            to_segment_ids: Receiving segment ID or IDs.
+            
+        Returns:
+            Headroom dictionary from TransferHeadroomService.headroom.
+        """
+        return self.headroom_service.headroom(from_segment_ids, to_segment_ids)
 
     def _find_transfer_path(self, from_segment_id: str, to_segment_id: str) -> Optional[PowerTransferPath]:
         """
@@ -73,80 +136,97 @@ class GridLoadBalancer:
         Returns:
             The PowerTransferPath object if found, otherwise None.
         """
-        for path in self.topology.transfer_paths:
-            if path.from_segment_id == from_segment_id and path.to_segment_id == to_segment_id:
-                return path
-        return None
+        return self._paths_by_segments.get((from_segment_id, to_segment_id))
 
-    def calculate_optimal_transfers(self) -> List[Dict]:
+    def find_nearest_power_sources(self, segment_ids: List[str], k: int = 3) -> Dict[str, List[Dict]]:
+        """
+        Find the k power sources closest to each of the given segments.
+        
+        All segments are looked up in one batched spatial query, so dispatch can
+        prefer nearby generation without measuring every source against every segment.
+        
+        Args:
+            segment_ids: IDs of the segments that need supply.
+            k: Number of nearest sources to return per segment.
+            
+        Returns:
+            Dictionary mapping segment_id to its nearest sources, closest first, with
+            distance and spare capacity for each.
+        """
+        segments = [self.capacity_index.get_segment(segment_id) for segment_id in segment_ids]
+        segments = [segment for segment in segments if segment is not None]
+        if not segments:
+            return {}
+
+        nearest = self.source_locator.query_nearest(
+            [segment.latitude for segment in segments],
+            [segment.longitude for segment in segments],
+            k=k,
+        )
+        results = {}
+        for segment, (indices, distances) in zip(segments, nearest):
+            results[segment.segment_id] = [
+                {
+                    "source_id": self.source_locator.keys[i],
+                    "distance_km": float(distance),
+                    "spare_capacity_mw": self.source_locator.items[i].max_capacity_mw - self.source_locator.items[i].current_output_mw,
+                    "operational_status": self.source_locator.items[i].operational_status,
+                }
+                for i, distance in zip(indices, distances)
+            ]
+        return results
+
+    def calculate_optimal_transfers(self, max_distance_km: Optional[float] = None) -> List[Dict]:
         """
         Calculate optimal power transfers to balance loads across grid segments.
         
         Finds overloaded segments and available capacity elsewhere.
         Recommends transfers that minimize transmission losses and costs.
+        Planning is delegated to self.transfer_strategy (GreedyTransferStrategy by default).
         
         Business Rules:
         - Prioritize transferring load from critical segments.
         - Only transfer to healthy segments with sufficient available capacity.
         - Account for power loss during transmission.
         - Do not exceed the max_transfer_mw of any transfer path.
+        - When max_distance_km is given, only consider receivers within that distance, nearest first.
         
         Copilot Prompting Tip:
         "Implement the logic to calculate optimal power transfers. Iterate through critical segments, find suitable healthy segments, identify transfer paths, and calculate the feasible transfer amount considering power loss and path capacity. Return a list of recommended transfers."
         
+        Args:
+            max_distance_km: Optional search radius for receiving segments. Nearby
+                receivers lose less power in transmission, so they are tried first.
+        
         Returns:
             List of dictionaries, each representing a recommended transfer.
         """
-        transfer_recommendations = []
-        capacity_analysis = self.analyze_grid_capacity()
-        overloaded_segments = sorted(capacity_analysis.get("critical", []), key=lambda s: s.get_utilization_percentage(), reverse=True)
-        available_segments = sorted(capacity_analysis.get("healthy", []), key=lambda s: s.get_utilization_percentage())
+        return self.transfer_strategy.plan_transfers(self, max_distance_km)
 
-        for overloaded in overloaded_segments:
-            # Calculate the amount of load that needs to be shed from this segment
-            # This is the load above the safety threshold
-            load_to_shed = overloaded.current_load_mw - (overloaded.max_capacity_mw * (overloaded.safety_threshold_pct / 100))
-            if load_to_shed <= 0: # No excess load to shed
-                continue
-
-            for available in available_segments:
-                # Calculate available capacity in the target segment
-                available_capacity = available.max_capacity_mw - available.current_load_mw
-                if available_capacity <= 0: # No capacity to receive load
-                    continue
-
-                transfer_path = self._find_transfer_path(overloaded.segment_id, available.segment_id)
-                if not transfer_path: # No direct transfer path
-                    continue
-
-                # Calculate the maximum feasible transfer considering path capacity and available capacity
-                # The actual power that arrives at the destination after losses
-                max_transfer_after_loss = transfer_path.max_transfer_mw * (1 - transfer_path.power_loss_pct / 100)
-                
-                # The amount of power we can send from the overloaded segment
-                transfer_amount_from_source = min(load_to_shed, transfer_path.max_transfer_mw)
-
-                # The amount of power the destination can receive
-                transfer_amount_to_dest = min(available_capacity, max_transfer_after_loss)
-
-                # The actual amount to transfer is limited by both source's need and destination's capacity
-                actual_transfer_mw = min(transfer_amount_from_source, transfer_amount_to_dest)
-
-                if actual_transfer_mw > 0:
-                    transfer_recommendations.append({
-                        "from_segment_id": overloaded.segment_id,
-                        "to_segment_id": available.segment_id,
-                        "transfer_mw": actual_transfer_mw,
-                        "estimated_loss_mw": actual_transfer_mw * (transfer_path.power_loss_pct / 100),
-                        "path_id": f"{overloaded.segment_id}->{available.segment_id}"
-                    })
-                    # Reduce load_to_shed and available_capacity for subsequent iterations
-                    load_to_shed -= actual_transfer_mw
-                    available_capacity -= actual_transfer_mw
-                    
-                    if load_to_shed <= 0: # All excess load handled for this segment
-                        break
-        return transfer_recommendations
+    def _find_nearby_receivers(self, overloaded_segments: List[GridSegment], max_distance_km: float) -> Dict[str, List]:
+        """
+        Healthy segments within max_distance_km of each overloaded segment, nearest first.
+        
+        Uses one batched radius query for all overloaded segments.
+        
+        Returns:
+            Dictionary mapping segment_id to a list of (GridSegment, distance_km) tuples.
+        """
+        if not overloaded_segments:
+            return {}
+        matches = self.segment_locator.query_radius(
+            [segment.latitude for segment in overloaded_segments],
+            [segment.longitude for segment in overloaded_segments],
+            max_distance_km,
+        )
+        receivers = {}
+        for overloaded, (indices, distances) in zip(overloaded_segments, matches):
+            receivers[overloaded.segment_id] = [
+                (self.segment_locator.items[i], float(distance))
+                for i, distance in zip(indices, distances)
+                if self.capacity_index.category_of(self.segment_locator.keys[i]) == "healthy"
+            ]
+        return receivers
 
     def validate_transfer_feasibility(self, transfer_plan: List[Dict]) -> bool:
         """
@@ -194,10 +274,4 @@ class GridLoadBalancer:
         Returns:
             List of dictionaries, each representing a dispatch recommendation.
         """
-        # TODO: Implement power source dispatch optimization
-        # - Get current grid demand from self.current_grid_state
-        # - Sort power sources by cost, reliability, and type (renewables first)
-        # - Allocate generation to meet demand and reserve capacity
-        # - Consider startup times for dispatching non-instantaneous sources
-        # - Return dispatch recommendations (source_id, new_output_mw)
-        return [] # Placeholder
+        return self.dispatch_strategy.plan_dispatch(self)
@@ -0,0 +1,123 @@
+"""
+Recent load history per grid segment for live monitoring.
+Keeps the last few hours of readings for every segment in fixed-size NumPy ring
+buffers, so windowed peaks, averages and rates of change are computed for the
+whole grid at once without going back to measurement files.
+"""
+
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class SegmentLoadHistory:
+    """
+    Fixed-capacity ring buffers of (timestamp, load) readings, one row per segment.
+
+    All segments share one 2-D array, so appending a reading is O(1) and windowed
+    queries are evaluated for every segment in a single vectorized pass.
+
+    Business Rules:
+    - Each segment keeps history / sample_interval readings; the oldest reading is
+      overwritten once a segment's buffer is full.
+    - Window queries include readings with as_of - window < timestamp <= as_of, and
+      as_of defaults to the latest reading across all segments.
+    - Segments with no readings in the window report NaN.
+
+    Args:
+        segment_ids: Segments to keep history for.
+        history: How much history to keep at the native sample_interval.
+        sample_interval: Expected time between readings for one segment.
+    """
+
+    def __init__(self, segment_ids: Iterable[str], history: timedelta = timedelta(hours=4),
+                 sample_interval: timedelta = timedelta(minutes=1)):
+        if history <= timedelta(0) or sample_interval <= timedelta(0):
+            raise ValueError("history and sample_interval must be positive")
+        self.segment_ids: List[str] = list(segment_ids)
+        self._rows: Dict[str, int] = {segment_id: row for row, segment_id in enumerate(self.segment_ids)}
+        self.capacity = max(2, math.ceil(history / sample_interval))
+        n_segments = len(self.segment_ids)
+        self._timestamps = np.full((n_segments, self.capacity), np.datetime64("NaT"), dtype="datetime64[s]")
+        self._loads = np.full((n_segments, self.capacity), np.nan)
+        self._heads = np.zeros(n_segments, dtype=np.int64)
+        self.latest_timestamp: Optional[datetime] = None
+
+    def __contains__(self, segment_id: str) -> bool:
+        return segment_id in self._rows
+
+    def append(self, segment_id: str, timestamp: datetime, load_mw: float) -> None:
+        """Record one reading, overwriting the segment's oldest reading when full."""
+        row = self._rows[segment_id]
+        slot = self._heads[row]
+        self._timestamps[row, slot] = np.datetime64(timestamp, "s")
+        self._loads[row, slot] = load_mw
+        self._heads[row] = (slot + 1) % self.capacity
+        if self.latest_timestamp is None or timestamp > self.latest_timestamp:
+            self.latest_timestamp = timestamp
+
+    def _window_mask(self, window: timedelta, as_of: Optional[datetime],
+                     timestamps: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.datetime64]:
+        timestamps = self._timestamps if timestamps is None else timestamps
+        as_of = as_of or self.latest_timestamp
+        if as_of is None:
+            return np.zeros(timestamps.shape, dtype=bool), np.datetime64("NaT")
+        end = np.datetime64(as_of, "s")
+        start = end - np.timedelta64(int(window.total_seconds()), "s")
+        # NaT compares False, so empty slots are excluded
+        return (timestamps > start) & (timestamps <= end), end
+
+    def window_max(self, window: timedelta = timedelta(hours=1), as_of: Optional[datetime] = None) -> np.ndarray:
+        """Peak load per segment over the window, aligned with segment_ids."""
+        mask, _ = self._window_mask(window, as_of)
+        peaks = np.where(mask, self._loads, -np.inf).max(axis=1, initial=-np.inf)
+        return np.where(mask.any(axis=1), peaks, np.nan)
+
+    def window_mean(self, window: timedelta = timedelta(hours=1), as_of: Optional[datetime] = None) -> np.ndarray:
+        """Average load per segment over the window, aligned with segment_ids."""
+        mask, _ = self._window_mask(window, as_of)
+        counts = mask.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(mask, self._loads, 0.0).sum(axis=1) / counts
+
+    def window_slope(self, window: timedelta = timedelta(minutes=15), as_of: Optional[datetime] = None,
+                     segment_ids: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        Rate of change per segment in MW per minute over the window.
+
+        Uses the least-squares line through the window's readings, so a single noisy
+        reading moves the rate less than a first-to-last difference would. Segments
+        with fewer than two readings at distinct times in the window report NaN.
+        Aligned with segment_ids, or with the segment_ids argument when given, in
+        which case only those segments' readings are read.
+        """
+        rows = slice(None) if segment_ids is None else [self._rows[segment_id] for segment_id in segment_ids]
+        timestamps, loads = self._timestamps[rows], self._loads[rows]
+        mask, end = self._window_mask(window, as_of, timestamps)
+        if np.isnat(end):
+            return np.full(len(timestamps), np.nan)
+        minutes = np.where(mask, (timestamps - end).astype(np.int64) / 60.0, 0.0)
+        loads = np.where(mask, loads, 0.0)
+        n = mask.sum(axis=1)
+        sum_t = minutes.sum(axis=1)
+        sum_x = loads.sum(axis=1)
+        denominator = n * (minutes ** 2).sum(axis=1) - sum_t ** 2
+        with np.errstate(invalid="ignore", divide="ignore"):
+            slopes = (n * (minutes * loads).sum(axis=1) - sum_t * sum_x) / denominator
+        return np.where((n >= 2) & (denominator > 0), slopes, np.nan)
+
+    def latest_loads(self) -> np.ndarray:
+        """Most recent reading per segment (NaN if none), aligned with segment_ids."""
+        return self._loads[np.arange(len(self.segment_ids)), (self._heads - 1) % self.capacity]
+
+    def recent(self, segment_id: str, window: timedelta = timedelta(hours=1),
+               as_of: Optional[datetime] = None) -> List[Tuple[datetime, float]]:
+        """Readings for one segment in the window, oldest first."""
+        row = self._rows[segment_id]
+        mask, _ = self._window_mask(window, as_of)
+        timestamps = self._timestamps[row][mask[row]]
+        loads = self._loads[row][mask[row]]
+        order = np.argsort(timestamps, kind="stable")
+        return [(timestamp, float(load)) for timestamp, load in zip(timestamps[order].astype(datetime), loads[order])]
@@ -0,0 +1,121 @@
+"""
+Transmission loss accounting for active power transfers.
+Tracks losses per transfer path, per sending segment and system-wide, updating
+only the transfers that changed between balancing cycles.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models.grid_infrastructure import GridTopology, PowerTransferPath
+
+
+class TransmissionLossLedger:
+    """
+    Running loss totals for the set of active power transfers.
+
+    Each active transfer is keyed by its path ID ("FROM->TO"). Adding, changing or
+    removing a transfer adjusts the path, segment and system totals by the delta,
+    so a cycle costs O(changed transfers) no matter how many transfers are active.
+
+    Business Rules:
+    - Loss on a path is transfer_mw * (power_loss_pct / 100) of its PowerTransferPath.
+    - Losses are attributed to the sending segment (from_segment_id).
+    - Transfers over paths missing from the topology are rejected.
+    """
+
+    def __init__(self, topology: GridTopology):
+        self._paths: Dict[Tuple[str, str], PowerTransferPath] = {
+            (path.from_segment_id, path.to_segment_id): path for path in topology.transfer_paths
+        }
+        self.active_transfers: Dict[str, Dict] = {}
+        self.loss_by_path_mw: Dict[str, float] = {}
+        self.loss_by_segment_mw: Dict[str, float] = defaultdict(float)
+        self.total_loss_mw = 0.0
+        self.total_transfer_mw = 0.0
+
+    @staticmethod
+    def path_id(transfer: Dict) -> str:
+        """Key for a transfer, matching the path_id produced by GridLoadBalancer."""
+        return transfer.get("path_id") or f"{transfer['from_segment_id']}->{transfer['to_segment_id']}"
+
+    def upsert_transfer(self, transfer: Dict) -> float:
+        """
+        Add a transfer or replace the active transfer on the same path.
+
+        Args:
+            transfer: Dictionary with from_segment_id, to_segment_id and transfer_mw.
+
+        Returns:
+            The loss in MW now attributed to this path.
+        """
+        path = self._paths.get((transfer["from_segment_id"], transfer["to_segment_id"]))
+        if path is None:
+            raise ValueError(f"No transfer path from {transfer['from_segment_id']} to {transfer['to_segment_id']}")
+
+        path_id = self.path_id(transfer)
+        self.remove_transfer(path_id)
+
+        transfer_mw = float(transfer["transfer_mw"])
+        loss_mw = transfer_mw * (path.power_loss_pct / 100)
+        self.active_transfers[path_id] = dict(transfer)
+        self.loss_by_path_mw[path_id] = loss_mw
+        self.loss_by_segment_mw[path.from_segment_id] += loss_mw
+        self.total_loss_mw += loss_mw
+        self.total_transfer_mw += transfer_mw
+        return loss_mw
+
+    def remove_transfer(self, path_id: str) -> Optional[Dict]:
+        """Remove an active transfer and subtract its contribution from every total."""
+        transfer = self.active_transfers.pop(path_id, None)
+        if transfer is None:
+            return None
+        loss_mw = self.loss_by_path_mw.pop(path_id)
+        segment_id = transfer["from_segment_id"]
+        self.loss_by_segment_mw[segment_id] -= loss_mw
+        if abs(self.loss_by_segment_mw[segment_id]) < 1e-9:
+            del self.loss_by_segment_mw[segment_id]
+        self.total_loss_mw -= loss_mw
+        self.total_transfer_mw -= float(transfer["transfer_mw"])
+        if not self.active_transfers:
+            # Reset accumulated floating point drift once nothing is active
+            self.loss_by_segment_mw.clear()
+            self.total_loss_mw = 0.0
+            self.total_transfer_mw = 0.0
+        return transfer
+
+    def apply_changes(self, upserts: Iterable[Dict] = (), removals: Iterable[str] = ()) -> None:
+        """Apply a cycle's changed transfers and the path IDs of transfers that ended."""
+        for path_id in removals:
+            self.remove_transfer(path_id)
+        for transfer in upserts:
+            self.upsert_transfer(transfer)
+
+    def sync(self, transfers: List[Dict]) -> int:
+        """
+        Make the ledger match a full list of active transfers.
+
+        Only transfers whose amount changed, appeared or disappeared touch the totals.
+
+        Returns:
+            Number of transfers that changed.
+        """
+        incoming = {self.path_id(transfer): transfer for transfer in transfers}
+        removals = [path_id for path_id in self.active_transfers if path_id not in incoming]
+        upserts = [
+            transfer for path_id, transfer in incoming.items()
+            if path_id not in self.active_transfers
+            or self.active_transfers[path_id]["transfer_mw"] != transfer["transfer_mw"]
+        ]
+        self.apply_changes(upserts, removals)
+        return len(upserts) + len(removals)
+
+    def summary(self) -> Dict:
+        """Loss totals for dashboards."""
+        return {
+            "total_power_loss_mw": self.total_loss_mw,
+            "total_transferred_mw": self.total_transfer_mw,
+            "transfer_loss_pct": (self.total_loss_mw / self.total_transfer_mw) * 100 if self.total_transfer_mw > 0 else 0.0,
+            "power_loss_by_path_mw": dict(self.loss_by_path_mw),
+            "power_loss_by_segment_mw": dict(self.loss_by_segment_mw),
+        }
@@ -4,10 +4,37 @@ Tracks grid segment status and identifies potential issues based on capacity thr
 """
 
 import logging
-from datetime import datetime
-from typing import List, Dict
+from datetime import datetime, timedelta
+from typing import Iterable, List, Dict, Optional
+
+import numpy as np
+
 from ..utils.data_loader import GridDataLoader
 from ..models.grid_infrastructure import GridSegment
+from ..models.load_measurements import LoadMeasurement
+from ..models.events import CapacityAlertEvent
+from ..models.alert_rules import ALERT_LEVELS, CAPACITY_ALERT_THRESHOLDS, AlertRule, RuleMetric, default_alert_rules
+from .alert_engine import AlertRuleEngine
+from .capacity_index import SegmentCapacityIndex
+from .load_history import SegmentLoadHistory
+
+
+# alert_type of rule alerts, by the metric the rule is evaluated against
+ALERT_TYPE_BY_METRIC = {RuleMetric.UTILIZATION_PCT: "CAPACITY", RuleMetric.RATE_MW_PER_MIN: "RISING_LOAD"}
+
+
+def classify_alert_level(utilization_pct: float) -> str:
+    """
+    Map a utilization percentage to the fixed utilization alert levels.
+    
+    Only used to bucket segments in the capacity index; reported alert levels come
+    from the alert rule engine, which also applies safety thresholds, overrides and
+    hysteresis.
+    """
+    for alert_level in reversed(ALERT_LEVELS[1:]):
+        if utilization_pct >= CAPACITY_ALERT_THRESHOLDS[alert_level]:
+            return alert_level
+    return "NORMAL"
 
 class GridMonitoringSystem:
     """
@@ -19,15 +46,34 @@ class GridMonitoringSystem:
     - Warning: 80-90% capacity (yellow alert, monitor closely)
     - Critical: 90-95% capacity (red alert, prepare load shedding)
     - Emergency: > 95% capacity (immediate action required)
+    - Rising load: segments climbing fast enough to reach the critical threshold
+      within the trend horizon raise a RISING_LOAD warning before they cross it
+    - Every alert level reported (routine checks, capacity alerts, the operational
+      summary and live event-bus alerts) comes from the alert rule set
+      (default_alert_rules unless alert_rules is given), which adds per-segment
+      safety thresholds, overrides, rate-of-change rules and hysteresis to the levels above
     
     Copilot Prompting Tip:
     "Implement the GridMonitoringSystem class. Focus on methods to check all segments, generate capacity alerts based on utilization thresholds, and track alert history. Include logging for audit trails."
     """
-    def __init__(self):
+    def __init__(self, alert_rules: Optional[List[AlertRule]] = None):
         self.data_loader = GridDataLoader()
         self.logger = logging.getLogger(__name__)
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
         self.alert_history = []
+        self.grid_state = self.data_loader.get_current_grid_state()
+        self.capacity_index = SegmentCapacityIndex(
+            self.grid_state["topology"].segments,
+            classify=classify_alert_level,
+            categories=ALERT_LEVELS,
+        )
+        segments = self.grid_state["topology"].segments
+        self.load_history = SegmentLoadHistory(segment.segment_id for segment in segments)
+        self._history_capacity_mw = np.array([segment.max_capacity_mw for segment in segments], dtype=float)
+        self.alert_engine = AlertRuleEngine(alert_rules if alert_rules is not None else default_alert_rules(), segments)
+        # Latest measurement timestamp applied per segment, for checkpoint replay
+        self.measurement_watermarks: Dict[str, datetime] = {}
+        self.event_bus = None
 
     def _get_recommended_action(self, alert_level: str, segment: GridSegment) -> str:
         """
@@ -49,52 +95,316 @@ class GridMonitoringSystem:
         else:
             return "No specific action recommended."
 
+    def _build_alert(self, segment: GridSegment, alert_level: str) -> Dict:
+        """Build the alert record for a segment at the given alert level."""
+        return {
+            "segment_id": segment.segment_id,
+            "alert_level": alert_level,
+            "utilization_pct": segment.get_utilization_percentage(),
+            "current_load_mw": segment.current_load_mw,
+            "max_capacity_mw": segment.max_capacity_mw,
+            "timestamp": datetime.now().isoformat(),
+            "recommended_action": self._get_recommended_action(alert_level, segment)
+        }
+
     def generate_capacity_alerts(self) -> List[Dict]:
-        """Generate alerts for segments approaching or exceeding capacity limits"""
+        """
+        Generate alerts for segments approaching or exceeding capacity limits.
+        
+        These are the utilization rules of the alert rule set, so levels match
+        check_all_segments, including safety thresholds, overrides and hysteresis.
+        """
+        return self.evaluate_alert_rules(metrics=(RuleMetric.UTILIZATION_PCT,))
+
+    def _evaluate_rules(self, as_of: Optional[datetime] = None, commit: bool = False,
+                        segment_ids: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Run the alert rule engine on the current loads and load history.
+        
+        Only a commit (one live rule tick) changes the engine's hysteresis state; a
+        commit always covers every segment.
+        """
+        segments = self.grid_state["topology"].segments
+        if segment_ids is None:
+            rows = None
+            loads = np.fromiter((segment.current_load_mw for segment in segments), dtype=float, count=len(segments))
+        else:
+            rows = [self.alert_engine.rows[segment_id] for segment_id in segment_ids]
+            loads = np.array([segments[row].current_load_mw for row in rows], dtype=float)
+        rates = {
+            window: self.load_history.window_slope(timedelta(minutes=window), as_of, segment_ids)
+            for window in self.alert_engine.rate_windows
+        }
+        if commit:
+            return self.alert_engine.commit(loads, rates)
+        return self.alert_engine.evaluate(loads, rates, rows)
+
+    def _build_rule_alert(self, record: Dict) -> Dict:
+        """Build the alert record for a rule engine result."""
+        segment = self.grid_state["topology"].segments[record["row"]]
+        rule = self.alert_engine.rules[self.alert_engine.rule_index[record["rule_id"]]]
+        alert = self._build_alert(segment, record["alert_level"])
+        alert.update(
+            alert_type=ALERT_TYPE_BY_METRIC[rule.metric],
+            rule_id=record["rule_id"],
+            metric=record["metric"],
+            metric_value=record["metric_value"],
+            threshold=record["threshold"],
+        )
+        if rule.recommended_action:
+            alert["recommended_action"] = rule.recommended_action
+        return alert
+
+    def _record_alert(self, alert: Dict) -> None:
+        """Add a rule alert to the alert history and the audit log."""
+        self.alert_history.append(alert)
+        self.logger.warning(
+            f"Rule alert: {alert['segment_id']} {alert['metric']}={alert['metric_value']:.1f} "
+            f"(threshold {alert['threshold']:.1f}) - Rule: {alert['rule_id']} - Level: {alert['alert_level']}"
+        )
+
+    def evaluate_alert_rules(self, as_of: Optional[datetime] = None,
+                             metrics: Optional[Iterable[RuleMetric]] = None, commit: bool = False) -> List[Dict]:
+        """
+        Evaluate the alert rule set against every segment in one vectorized pass.
+        
+        Args:
+            as_of: End of the trend window for rate rules; defaults to the latest reading.
+            metrics: Only report alerts for these rule metrics.
+            commit: Store this evaluation as the rule state hysteresis and new-alert
+                detection compare against. Only control loop ticks should commit;
+                queries leave the state untouched.
+            
+        Returns:
+            Alerts for segments with an active rule, most severe first. Each alert
+            names the rule_id that fired, the metric_value and the segment's threshold.
+        """
+        metrics = set(metrics) if metrics is not None else None
         alerts = []
-        grid_state = self.data_loader.get_current_grid_state()
+        for record in self._evaluate_rules(as_of, commit=commit):
+            if metrics is not None and record["metric"] not in metrics:
+                continue
+            alert = self._build_rule_alert(record)
+            self._record_alert(alert)
+            alerts.append(alert)
+        return alerts
+
+    def segment_alert_levels(self, as_of: Optional[datetime] = None,
+                             segment_ids: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        Current alert level of every segment under the alert rule set.
         
-        for segment in grid_state["topology"].segments:
-            utilization = segment.get_utilization_percentage()
+        Args:
+            as_of: End of the trend window for rate rules; defaults to the latest reading.
+            segment_ids: Only evaluate these segments; defaults to every segment.
             
-            alert_level = None
-            if utilization >= 95:
-                alert_level = "EMERGENCY"
-            elif utilization >= 90:
-                alert_level = "CRITICAL" 
-            elif utilization >= 80:
-                alert_level = "WARNING"
+        Returns:
+            Most severe active rule level per segment ID ("NORMAL" if none is active).
+        """
+        segment_ids = self.alert_engine.segment_ids if segment_ids is None else list(segment_ids)
+        levels = {segment_id: "NORMAL" for segment_id in segment_ids}
+        for record in self._evaluate_rules(as_of, segment_ids=segment_ids):
+            if ALERT_LEVELS.index(record["alert_level"]) > ALERT_LEVELS.index(levels[record["segment_id"]]):
+                levels[record["segment_id"]] = record["alert_level"]
+        return levels
+
+    def generate_trend_alerts(self, window: timedelta = timedelta(minutes=15), min_rate_mw_per_min: float = 1.0,
+                              threshold_pct: float = 90.0, horizon: timedelta = timedelta(minutes=30),
+                              as_of: Optional[datetime] = None, exclude_segment_ids: Iterable[str] = ()) -> List[Dict]:
+        """
+        Generate early warnings for segments whose load is rising toward a threshold.
+        
+        Rates of change come from the recent load history of every segment in one
+        vectorized pass, so no measurement files are re-read.
+        
+        Business Rules:
+        - A segment alerts when its load rises at least min_rate_mw_per_min over the
+          window and, at that rate, reaches threshold_pct of capacity within horizon.
+        - Segments already at or above threshold_pct are covered by capacity alerts.
+        
+        Args:
+            window: Recent period used to fit the rate of change.
+            min_rate_mw_per_min: Smallest rise in MW per minute worth alerting on.
+            threshold_pct: Utilization percentage the projection is checked against.
+            horizon: How far ahead to project the current rate.
+            as_of: Time the window ends at; defaults to the latest reading.
+            exclude_segment_ids: Segments that already have a rising-load alert.
+            
+        Returns:
+            RISING_LOAD alerts, soonest threshold crossing first.
+        """
+        exclude_segment_ids = set(exclude_segment_ids)
+        slopes = self.load_history.window_slope(window, as_of)
+        peaks = self.load_history.window_max(timedelta(hours=1), as_of)
+        loads = self.load_history.latest_loads()
+        headroom_mw = self._history_capacity_mw * (threshold_pct / 100) - loads
+        with np.errstate(invalid="ignore", divide="ignore"):
+            minutes_to_threshold = headroom_mw / slopes
+        rising = (
+            (slopes >= min_rate_mw_per_min) & (headroom_mw > 0)
+            & (minutes_to_threshold <= horizon.total_seconds() / 60)
+        )
+
+        alerts = []
+        for row in np.flatnonzero(rising)[np.argsort(minutes_to_threshold[rising], kind="stable")]:
+            segment = self.capacity_index.get_segment(self.load_history.segment_ids[row])
+            if segment.segment_id in exclude_segment_ids:
+                continue
+            rate, minutes = float(slopes[row]), float(minutes_to_threshold[row])
+            alert = {
+                "segment_id": segment.segment_id,
+                "alert_level": "WARNING",
+                "alert_type": "RISING_LOAD",
+                "utilization_pct": segment.get_utilization_percentage(),
+                "current_load_mw": segment.current_load_mw,
+                "max_capacity_mw": segment.max_capacity_mw,
+                "rate_mw_per_min": rate,
+                "minutes_to_threshold": minutes,
+                "threshold_pct": threshold_pct,
+                "recent_peak_mw": float(peaks[row]),
+                "timestamp": datetime.now().isoformat(),
+                "recommended_action": (
+                    f"Load on {segment.segment_id} rising {rate:.1f} MW/min; {threshold_pct:.0f}% capacity "
+                    f"expected in {minutes:.0f} min. Prepare load transfer."
+                ),
+            }
+            alerts.append(alert)
+            self.alert_history.append(alert)
+            self.logger.warning(f"Trend alert: {segment.segment_id} rising {rate:.1f} MW/min, {threshold_pct:.0f}% capacity in {minutes:.0f} min")
+        return alerts
+
+    def update_segment_load(self, segment_id: str, load_mw: float, timestamp: Optional[datetime] = None) -> str:
+        """
+        Apply a new load reading for a segment and move it to its new alert level.
+        
+        Args:
+            segment_id: The ID of the segment whose load changed.
+            load_mw: The new current load in MW.
+            timestamp: Time of the reading; when given it is also added to the load history.
             
-            if alert_level:
-                alert = {
-                    "segment_id": segment.segment_id,
-                    "alert_level": alert_level,
-                    "utilization_pct": utilization,
-                    "current_load_mw": segment.current_load_mw,
-                    "max_capacity_mw": segment.max_capacity_mw,
-                    "timestamp": datetime.now().isoformat(),
-                    "recommended_action": self._get_recommended_action(alert_level, segment)
-                }
-                alerts.append(alert)
-                self.alert_history.append(alert) # Track alert history
-                
-                # Log alert for audit trail
-                self.logger.warning(f"Capacity alert: {segment.segment_id} at {utilization:.1f}% capacity - Level: {alert_level}")
+        Returns:
+            The segment's alert level under the alert rule set after the update
+            ("NORMAL" if no rule is active). Only this segment's rules are evaluated.
+        """
+        if timestamp is not None:
+            self.load_history.append(segment_id, timestamp, load_mw)
+        self.capacity_index.update_load(segment_id, load_mw)
+        return self.segment_alert_levels(segment_ids=[segment_id])[segment_id]
+
+    def apply_measurements(self, measurements: List[LoadMeasurement]) -> None:
+        """
+        Stream load measurements into the monitored grid state.
+        
+        Measurements are applied in the order given, so the latest reading for
+        each segment wins, and are recorded in the load history for trend alerts.
+        Readings for unknown segments are ignored.
+        
+        Args:
+            measurements: Load measurements, typically in timestamp order.
+        """
+        for measurement in measurements:
+            if measurement.segment_id in self.capacity_index:
+                self.load_history.append(measurement.segment_id, measurement.timestamp, measurement.load_mw)
+                self.capacity_index.update_load(measurement.segment_id, measurement.load_mw)
+                self.measurement_watermarks[measurement.segment_id] = measurement.timestamp
+
+    def connect_event_bus(self, bus) -> None:
+        """
+        Consume live measurement events from an EventBus and publish alert events to it.
+        
+        Args:
+            bus: The EventBus carrying LoadMeasurement and CapacityAlertEvent events.
+        """
+        self.event_bus = bus
+        bus.subscribe(LoadMeasurement, self.handle_measurement_events, name="monitoring_system")
+
+    async def handle_measurement_events(self, measurements: List[LoadMeasurement]) -> List[Dict]:
+        """
+        Apply a batch of live measurements and alert on rules that started firing.
         
+        The alert rule set is evaluated once per batch. Only rules that became
+        active on this batch raise an alert (e.g. a segment escalating from WARNING
+        to CRITICAL), so a segment sitting at WARNING does not re-alert on every
+        reading, and hysteresis keeps a segment hovering at a limit from flapping.
+        
+        Returns:
+            The alerts raised for this batch.
+        """
+        applied = False
+        for measurement in measurements:
+            segment_id = measurement.segment_id
+            if segment_id not in self.capacity_index:
+                continue
+            self.load_history.append(segment_id, measurement.timestamp, measurement.load_mw)
+            self.measurement_watermarks[segment_id] = measurement.timestamp
+            self.capacity_index.update_load(segment_id, measurement.load_mw)
+            applied = True
+        if not applied:
+            return []
+
+        alerts = []
+        for record in self._evaluate_rules(commit=True):
+            if not record["is_new"]:
+                continue
+            alert = self._build_rule_alert(record)
+            self._record_alert(alert)
+            alerts.append(alert)
+            if self.event_bus is not None:
+                await self.event_bus.publish(CapacityAlertEvent(**alert))
         return alerts
 
-    def check_all_segments(self) -> List[Dict]:
+    def checkpoint_state(self) -> Dict:
+        """Derived monitoring state to persist so a restart does not reprocess history."""
+        return {
+            "segment_loads": {
+                segment.segment_id: segment.current_load_mw for segment in self.grid_state["topology"].segments
+            },
+            "alert_history": self.alert_history,
+            "load_history": self.load_history,
+            "active_rules": {
+                "rule_ids": [rule.rule_id for rule in self.alert_engine.rules],
+                "segment_ids": self.alert_engine.segment_ids,
+                "active": self.alert_engine.active,
+            },
+            "measurement_watermarks": self.measurement_watermarks,
+        }
+
+    def restore_checkpoint_state(self, state: Dict) -> None:
+        """
+        Restore state produced by checkpoint_state.
+        
+        Segment loads are re-applied through the capacity index. Rule hysteresis state
+        is kept only if the rule set and segments are unchanged since the checkpoint.
+        """
+        for segment_id, load_mw in state["segment_loads"].items():
+            if segment_id in self.capacity_index:
+                self.capacity_index.update_load(segment_id, load_mw)
+        self.alert_history = state["alert_history"]
+        if state["load_history"].segment_ids == self.load_history.segment_ids:
+            self.load_history = state["load_history"]
+        active_rules = state["active_rules"]
+        if (active_rules["rule_ids"] == [rule.rule_id for rule in self.alert_engine.rules]
+                and active_rules["segment_ids"] == self.alert_engine.segment_ids):
+            self.alert_engine.active = active_rules["active"]
+        self.measurement_watermarks = state["measurement_watermarks"]
+
+    def check_all_segments(self, commit: bool = False) -> List[Dict]:
         """
         Monitor all grid segments and generate alerts for capacity issues.
         
-        Checks each segment against safety thresholds and generates appropriate alerts.
-        Returns list of active alerts for operational dashboards.
+        Evaluates the alert rule set against every segment, followed by projected
+        rising-load alerts from the recent load history for segments that have no
+        rising-load rule alert, so each segment gets at most one alert per type.
+        Returns list of active alerts for operational dashboards. Control loop ticks
+        pass commit=True to advance the rule state (see evaluate_alert_rules).
         
         Copilot Prompting Tip:
         "Implement the check_all_segments method. It should retrieve the current grid state, iterate through each segment, calculate its utilization, and call generate_capacity_alerts if thresholds are met. Log the monitoring events."
         """
         self.logger.info("Performing routine grid segment check.")
-        active_alerts = self.generate_capacity_alerts()
+        rule_alerts = self.evaluate_alert_rules(commit=commit)
+        rising = [alert["segment_id"] for alert in rule_alerts if alert["alert_type"] == "RISING_LOAD"]
+        active_alerts = rule_alerts + self.generate_trend_alerts(exclude_segment_ids=rising)
         if not active_alerts:
             self.logger.info("All segments operating within normal parameters.")
         return active_alerts
@@ -123,24 +433,23 @@ class GridMonitoringSystem:
         Returns:
             A dictionary containing the operational summary.
         """
-        grid_state = self.data_loader.get_current_grid_state()
-        active_alerts = self.generate_capacity_alerts() # Re-run to get current alerts
+        active_alerts = self.evaluate_alert_rules() # Re-run to get current alerts
 
-        alert_counts = {"WARNING": 0, "CRITICAL": 0, "EMERGENCY": 0}
+        alert_counts = {level: 0 for level in ALERT_LEVELS[1:]}
         for alert in active_alerts:
             alert_counts[alert["alert_level"]] += 1
 
         return {
             "timestamp": datetime.now().isoformat(),
-            "total_capacity_mw": grid_state["total_capacity_mw"],
-            "total_current_load_mw": grid_state["total_current_load_mw"],
-            "system_utilization_pct": grid_state["system_utilization_pct"],
+            "total_capacity_mw": self.capacity_index.total_capacity_mw,
+            "total_current_load_mw": self.capacity_index.total_load_mw,
+            "system_utilization_pct": self.capacity_index.system_utilization_pct,
             "active_alerts_count": len(active_alerts),
             "alert_breakdown": alert_counts,
             "segment_status_summary": {
                 segment.segment_id: {
                     "utilization_pct": segment.get_utilization_percentage(),
                     "status": segment.status.value # Assuming GridSegmentStatus has a .value
-                } for segment in grid_state["topology"].segments
+                } for segment in self.grid_state["topology"].segments
             }
         }
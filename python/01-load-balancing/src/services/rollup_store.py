@@ -0,0 +1,259 @@
+"""
+Multi-resolution rollups of load measurements for trend reporting.
+Maintains hourly, daily and monthly aggregates per segment as measurements arrive,
+so long-range trend queries read a handful of pre-aggregated buckets instead of
+rescanning raw 15-minute data.
+"""
+
+import logging
+import math
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+RESOLUTIONS = ("hourly", "daily", "monthly")
+
+
+def period_start(timestamp: datetime, resolution: str) -> datetime:
+    """Truncate a timestamp to the start of its hourly, daily or monthly period."""
+    if resolution == "hourly":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    if resolution == "daily":
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    if resolution == "monthly":
+        return timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown resolution: {resolution}")
+
+
+def next_period(start: datetime, resolution: str) -> datetime:
+    """Start of the period following the one beginning at start."""
+    if resolution == "hourly":
+        return start + timedelta(hours=1)
+    if resolution == "daily":
+        return start + timedelta(days=1)
+    if resolution == "monthly":
+        return start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    raise ValueError(f"Unknown resolution: {resolution}")
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded relative error.
+
+    Values are counted in logarithmic buckets, so any quantile is answered within
+    relative_accuracy of the true value and sketches merge by adding bucket counts.
+    """
+
+    __slots__ = ("gamma", "log_gamma", "buckets", "zero_count", "count")
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for key, bucket_count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + bucket_count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile (0 <= q <= 1), or None for an empty sketch."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                # Midpoint of the bucket (gamma^(key-1), gamma^key] in relative terms
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class RollupBucket:
+    """Aggregate statistics for one segment over one period."""
+
+    __slots__ = ("count", "total", "minimum", "maximum", "sketch")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.sketch = QuantileSketch()
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.sketch.add(value)
+
+    def merge(self, other: "RollupBucket") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.sketch.merge(other.sketch)
+
+    def to_dict(self) -> Dict:
+        return {
+            "average_load": self.total / self.count if self.count else 0.0,
+            "min_load": self.minimum if self.count else 0.0,
+            "peak_load": self.maximum if self.count else 0.0,
+            "measurement_count": self.count,
+            "p95_load": self.sketch.quantile(0.95) or 0.0,
+        }
+
+
+class MeasurementRollupStore:
+    """
+    Per-segment hourly, daily and monthly rollups maintained incrementally.
+
+    Each measurement updates one bucket per resolution in O(1). Queries read
+    buckets directly, never raw measurements.
+
+    Business Rules:
+    - Measurements at or before a segment's watermark (latest ingested timestamp)
+      are treated as already ingested and skipped, so re-submitting a history is safe.
+      Skipped measurements are counted per segment: duplicate_counts for those at the
+      watermark, late_counts for those older than it (which are lost to the rollups
+      and logged as a warning).
+    - Trend queries use the finest resolution that keeps the series within max_points.
+    - Range summaries cover the range with the coarsest buckets that fit inside it.
+    """
+
+    def __init__(self):
+        self._rollups: Dict[str, Dict[str, Dict[datetime, RollupBucket]]] = {
+            resolution: defaultdict(dict) for resolution in RESOLUTIONS
+        }
+        self.watermarks: Dict[str, datetime] = {}
+        self.duplicate_counts: Counter = Counter()
+        self.late_counts: Counter = Counter()
+
+    @property
+    def segment_ids(self) -> List[str]:
+        return sorted(self.watermarks)
+
+    def add_measurement(self, segment_id: str, timestamp: datetime, load_mw: float) -> bool:
+        """
+        Fold one measurement into every resolution.
+
+        Returns:
+            True if the measurement was ingested, False if it was at or before the watermark.
+        """
+        watermark = self.watermarks.get(segment_id)
+        if watermark is not None and timestamp <= watermark:
+            if timestamp == watermark:
+                self.duplicate_counts[segment_id] += 1
+            else:
+                self.late_counts[segment_id] += 1
+            return False
+        for resolution in RESOLUTIONS:
+            buckets = self._rollups[resolution][segment_id]
+            start = period_start(timestamp, resolution)
+            bucket = buckets.get(start)
+            if bucket is None:
+                bucket = buckets[start] = RollupBucket()
+            bucket.add(load_mw)
+        self.watermarks[segment_id] = timestamp
+        return True
+
+    def add_measurements(self, measurements: Iterable) -> int:
+        """
+        Ingest measurement records (dictionaries or LoadMeasurement models) in timestamp order.
+
+        Returns:
+            Number of measurements ingested.
+        """
+        rows = []
+        for measurement in measurements:
+            if isinstance(measurement, dict):
+                row = (measurement.get("timestamp"), measurement.get("segment_id"), measurement.get("load_mw"))
+            else:
+                row = (measurement.timestamp, measurement.segment_id, measurement.load_mw)
+            if row[0] is not None and row[1] and row[2] is not None:
+                rows.append(row)
+        rows.sort(key=lambda row: row[0])
+        late_before = sum(self.late_counts.values())
+        ingested = sum(self.add_measurement(segment_id, timestamp, load_mw) for timestamp, segment_id, load_mw in rows)
+        late = sum(self.late_counts.values()) - late_before
+        if late:
+            logging.getLogger(__name__).warning(
+                f"Dropped {late} measurements older than their segment's rollup watermark"
+            )
+        return ingested
+
+    def choose_resolution(self, start: datetime, end: datetime, max_points: int = 400) -> str:
+        """Finest resolution whose number of periods in [start, end) fits in max_points."""
+        span_hours = (end - start).total_seconds() / 3600
+        if span_hours <= max_points:
+            return "hourly"
+        if span_hours / 24 <= max_points:
+            return "daily"
+        return "monthly"
+
+    def trend(self, segment_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+              resolution: Optional[str] = None, max_points: int = 400) -> Tuple[str, List[Dict]]:
+        """
+        Time series of rollup statistics for a segment over [start, end).
+
+        Args:
+            segment_id: Segment to report on.
+            start: Inclusive range start; defaults to the segment's first period.
+            end: Exclusive range end; defaults to just after the watermark.
+            resolution: "hourly", "daily" or "monthly"; chosen automatically when omitted.
+            max_points: Upper bound on series length used for automatic resolution.
+
+        Returns:
+            The resolution used and one statistics dictionary per non-empty period.
+        """
+        hourly = self._rollups["hourly"].get(segment_id)
+        if not hourly:
+            return resolution or "hourly", []
+        start = start or min(hourly)
+        end = end or self.watermarks[segment_id] + timedelta(microseconds=1)
+        resolution = resolution or self.choose_resolution(start, end, max_points)
+
+        buckets = self._rollups[resolution][segment_id]
+        series = []
+        period = period_start(start, resolution)
+        while period < end:
+            bucket = buckets.get(period)
+            if bucket is not None:
+                series.append({"period_start": period, **bucket.to_dict()})
+            period = next_period(period, resolution)
+        return resolution, series
+
+    def summarize(self, segment_id: str, start: datetime, end: datetime) -> Dict:
+        """
+        Aggregate statistics for a segment over [start, end) at hourly precision.
+
+        Hours only partly inside the range are included in full.
+        The range is covered greedily with whole months, then whole days, then hours,
+        so a year-long summary merges roughly a dozen buckets.
+        """
+        total = RollupBucket()
+        cursor = period_start(start, "hourly")
+        while cursor < end:
+            for resolution in reversed(RESOLUTIONS):
+                if period_start(cursor, resolution) == cursor and next_period(cursor, resolution) <= end:
+                    break
+            bucket = self._rollups[resolution][segment_id].get(cursor) if segment_id in self.watermarks else None
+            if bucket is not None:
+                total.merge(bucket)
+            cursor = next_period(cursor, resolution)
+        return total.to_dict()
@@ -0,0 +1,221 @@
+"""
+Comparative benchmark harness for load balancing strategies.
+Runs every registered transfer and dispatch strategy on the same synthetic and
+recorded grid states and reports runtime, memory and grid outcomes side by side.
+"""
+
+import copy
+import random
+import time
+import tracemalloc
+from datetime import datetime
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional
+
+from ..models.grid_infrastructure import GridSegment, GridTopology, PowerTransferPath
+from ..models.load_measurements import LoadMeasurement
+from ..models.power_sources import PowerSource, PowerSourceType
+from .balancing_strategies import DISPATCH_STRATEGIES, TRANSFER_STRATEGIES, load_to_shed
+from .load_balancer import GridLoadBalancer
+
+
+def _grid_state(topology: GridTopology, power_sources: List[PowerSource], timestamp: datetime) -> Dict:
+    """Grid state dictionary in the shape of GridDataLoader.get_current_grid_state."""
+    total_load = sum(segment.current_load_mw for segment in topology.segments)
+    total_capacity = sum(segment.max_capacity_mw for segment in topology.segments)
+    return {
+        "topology": topology,
+        "power_sources": power_sources,
+        "total_capacity_mw": total_capacity,
+        "total_current_load_mw": total_load,
+        "system_utilization_pct": (total_load / total_capacity) * 100 if total_capacity > 0 else 0.0,
+        "timestamp": timestamp,
+    }
+
+
+def synthetic_grid_state(n_segments: int = 200, overload_fraction: float = 0.15, paths_per_segment: int = 4,
+                         n_sources: int = 20, seed: int = 0) -> Dict:
+    """
+    Random grid state for benchmarking.
+
+    Args:
+        n_segments: Number of grid segments.
+        overload_fraction: Share of segments loaded above 90% utilization.
+        paths_per_segment: Outgoing transfer paths per segment, to random other segments.
+        n_sources: Number of power sources of mixed types, sized so their combined
+            capacity is about 1.3x the total segment load.
+        seed: Random seed, so states are reproducible across runs.
+    """
+    rng = random.Random(seed)
+    segments = []
+    for i in range(n_segments):
+        capacity = rng.uniform(50, 300)
+        utilization = rng.uniform(0.9, 1.05) if rng.random() < overload_fraction else rng.uniform(0.3, 0.85)
+        segments.append(GridSegment(
+            segment_id=f"SYN_{i:05d}", name=f"Synthetic Segment {i}", max_capacity_mw=capacity,
+            current_load_mw=capacity * utilization, latitude=rng.uniform(40.0, 41.0),
+            longitude=rng.uniform(-74.5, -73.5), safety_threshold_pct=rng.choice([80.0, 85.0, 90.0]),
+        ))
+    paths = []
+    for segment in segments:
+        for other in rng.sample(segments, min(paths_per_segment + 1, n_segments)):
+            if other is not segment and len(paths) < n_segments * paths_per_segment:
+                paths.append(PowerTransferPath(
+                    from_segment_id=segment.segment_id, to_segment_id=other.segment_id,
+                    max_transfer_mw=rng.uniform(10, 80), power_loss_pct=rng.uniform(1, 6),
+                ))
+    source_types = list(PowerSourceType)
+    mean_capacity = 1.3 * sum(segment.current_load_mw for segment in segments) / max(n_sources, 1)
+    sources = []
+    for i in range(n_sources):
+        source_type = rng.choice(source_types)
+        capacity = mean_capacity * rng.uniform(0.5, 1.5)
+        sources.append(PowerSource(
+            source_id=f"SRC_{i:04d}", name=f"Synthetic Source {i}", source_type=source_type,
+            max_capacity_mw=capacity, current_output_mw=capacity * rng.uniform(0.2, 0.9),
+            reliability_score=rng.uniform(0.8, 0.99), cost_per_mwh=rng.uniform(20, 120),
+            latitude=rng.uniform(40.0, 41.0), longitude=rng.uniform(-74.5, -73.5),
+            operational_status=rng.choice(["ONLINE", "ONLINE", "ONLINE", "OFFLINE"]),
+            startup_time_minutes=rng.choice([0, 15, 30, 120]),
+            weather_dependent=source_type in (PowerSourceType.SOLAR, PowerSourceType.WIND),
+        ))
+    return _grid_state(GridTopology(segments=segments, transfer_paths=paths), sources, datetime.now())
+
+
+def recorded_grid_states(base_state: Dict, measurements: Iterable[LoadMeasurement], every: int = 1) -> Dict[str, Dict]:
+    """
+    Grid states as of each recorded timestamp, starting from a base state.
+
+    Measurements are applied in timestamp order; a state is captured after every
+    `every`-th distinct timestamp and named by its ISO timestamp.
+    """
+    topology = copy.deepcopy(base_state["topology"])
+    segments = {segment.segment_id: segment for segment in topology.segments}
+    states = {}
+    ordered = sorted(measurements, key=lambda m: m.timestamp)
+    for n, (timestamp, batch) in enumerate(groupby(ordered, key=lambda m: m.timestamp)):
+        for measurement in batch:
+            if measurement.segment_id in segments:
+                segments[measurement.segment_id].current_load_mw = measurement.load_mw
+        if n % every == 0:
+            states[timestamp.isoformat()] = _grid_state(copy.deepcopy(topology), base_state["power_sources"], timestamp)
+    return states
+
+
+class BalancingStrategyBenchmark:
+    """
+    Runs registered balancing strategies on shared grid states and compares them.
+
+    Every strategy sees an identical copy of each grid state. Runtime is the best of
+    `repeats` runs of the planning call alone (balancer construction is excluded);
+    memory is the tracemalloc peak of one extra run.
+
+    Reported per strategy and state:
+    - Transfer strategies: MW shed (total transfer_mw), overload remaining above
+      safety thresholds, transmission losses, and cost of the losses valued at the
+      most expensive source currently producing.
+    - Dispatch strategies: planned generation, shortfall against demand, and
+      generation cost per hour after the adjustments.
+
+    Args:
+        transfer_strategies: Names of transfer strategies to run; all registered by default,
+            none if empty.
+        dispatch_strategies: Names of dispatch strategies to run; all registered by default,
+            none if empty.
+        repeats: Timed runs per strategy and state.
+    """
+
+    def __init__(self, transfer_strategies: Optional[List[str]] = None,
+                 dispatch_strategies: Optional[List[str]] = None, repeats: int = 3):
+        self.transfer_strategies = sorted(TRANSFER_STRATEGIES) if transfer_strategies is None else transfer_strategies
+        self.dispatch_strategies = sorted(DISPATCH_STRATEGIES) if dispatch_strategies is None else dispatch_strategies
+        self.repeats = max(1, repeats)
+
+    def _measure(self, plan) -> Dict:
+        timings = []
+        for _ in range(self.repeats):
+            started = time.perf_counter()
+            result = plan()
+            timings.append(time.perf_counter() - started)
+        tracemalloc.start()
+        try:
+            plan()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return {"result": result, "runtime_ms": min(timings) * 1000, "peak_memory_kb": peak_bytes / 1024}
+
+    def run(self, grid_states: Dict[str, Dict]) -> List[Dict]:
+        """
+        Benchmark every selected strategy on every grid state.
+
+        Args:
+            grid_states: Named grid states (see synthetic_grid_state and recorded_grid_states).
+
+        Returns:
+            One result row per (state, strategy).
+        """
+        rows = []
+        for state_name, grid_state in grid_states.items():
+            for strategy_name in self.transfer_strategies:
+                balancer = GridLoadBalancer(copy.deepcopy(grid_state), transfer_strategy=strategy_name)
+                measured = self._measure(balancer.calculate_optimal_transfers)
+                rows.append({"state": state_name, "kind": "transfer", "strategy": strategy_name,
+                             **self._transfer_outcome(balancer, measured.pop("result")), **measured})
+            for strategy_name in self.dispatch_strategies:
+                balancer = GridLoadBalancer(copy.deepcopy(grid_state), dispatch_strategy=strategy_name)
+                measured = self._measure(balancer.optimize_power_source_dispatch)
+                rows.append({"state": state_name, "kind": "dispatch", "strategy": strategy_name,
+                             **self._dispatch_outcome(balancer, measured.pop("result")), **measured})
+        return rows
+
+    @staticmethod
+    def _transfer_outcome(balancer: GridLoadBalancer, transfers: List[Dict]) -> Dict:
+        shed = {}
+        for transfer in transfers:
+            shed[transfer["from_segment_id"]] = shed.get(transfer["from_segment_id"], 0.0) + transfer["transfer_mw"]
+        remaining_overload = sum(
+            max(0.0, load_to_shed(segment) - shed.get(segment.segment_id, 0.0)) for segment in balancer.topology.segments
+        )
+        losses = sum((transfer["estimated_loss_mw"] for transfer in transfers), 0.0)
+        producing = [s.cost_per_mwh for s in balancer.power_sources if s.operational_status == "ONLINE" and s.current_output_mw > 0]
+        return {
+            "transfers": len(transfers),
+            "mw_shed": sum(shed.values(), 0.0),
+            "remaining_overload_mw": remaining_overload,
+            "losses_mw": losses,
+            "cost_per_hour": losses * max(producing, default=0.0),
+        }
+
+    @staticmethod
+    def _dispatch_outcome(balancer: GridLoadBalancer, adjustments: List[Dict]) -> Dict:
+        outputs = {source.source_id: source.current_output_mw for source in balancer.power_sources}
+        outputs.update({adjustment["source_id"]: adjustment["new_output_mw"] for adjustment in adjustments})
+        generation = sum(outputs.values())
+        return {
+            "adjustments": len(adjustments),
+            "generation_mw": generation,
+            "shortfall_mw": max(0.0, balancer.capacity_index.total_load_mw - generation),
+            "cost_per_hour": sum(source.get_cost_per_hour(outputs[source.source_id]) for source in balancer.power_sources),
+        }
+
+    @staticmethod
+    def format_table(rows: List[Dict]) -> str:
+        """Render benchmark rows as a fixed-width text table, one block per strategy kind."""
+        columns = {
+            "transfer": ["state", "strategy", "runtime_ms", "peak_memory_kb", "transfers", "mw_shed",
+                         "remaining_overload_mw", "losses_mw", "cost_per_hour"],
+            "dispatch": ["state", "strategy", "runtime_ms", "peak_memory_kb", "adjustments", "generation_mw",
+                         "shortfall_mw", "cost_per_hour"],
+        }
+        blocks = []
+        for kind, headers in columns.items():
+            kind_rows = [row for row in rows if row["kind"] == kind]
+            if not kind_rows:
+                continue
+            cells = [[f"{row[h]:.2f}" if isinstance(row[h], float) else str(row[h]) for h in headers] for row in kind_rows]
+            widths = [max(len(h), *(len(cell[i]) for cell in cells)) for i, h in enumerate(headers)]
+            lines = [f"{kind.title()} strategies:", "  ".join(h.ljust(w) for h, w in zip(headers, widths))]
+            lines += ["  ".join(cell.ljust(w) for cell, w in zip(cell_row, widths)) for cell_row in cells]
+            blocks.append("\n".join(lines))
+        return "\n\n".join(blocks)
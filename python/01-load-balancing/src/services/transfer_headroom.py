@@ -0,0 +1,276 @@
+"""
+Transfer headroom queries over the grid's power transfer paths.
+Answers "how many MW can be moved from these segments to those, over any route?"
+with a max-flow computation that is cached per query and updated incrementally
+as path statuses and segment loads change.
+"""
+
+from collections import OrderedDict, deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from ..models.grid_infrastructure import GridTopology
+
+_EPSILON = 1e-9
+
+
+class _FlowNetwork:
+    """
+    Residual graph for max-flow with warm restarts.
+
+    Edges are stored in pairs (e, e ^ 1) of forward and reverse edge, so the
+    current flow survives capacity changes and augmentation resumes from it.
+    """
+
+    def __init__(self, n_nodes: int):
+        self.adjacency: List[List[int]] = [[] for _ in range(n_nodes)]
+        self.heads: List[int] = []
+        self.capacity: List[float] = []
+        self.flow: List[float] = []
+
+    def add_edge(self, u: int, v: int, capacity: float) -> int:
+        edge = len(self.heads)
+        self.heads += [v, u]
+        self.capacity += [capacity, 0.0]
+        self.flow += [0.0, 0.0]
+        self.adjacency[u].append(edge)
+        self.adjacency[v].append(edge + 1)
+        return edge
+
+    def tail(self, edge: int) -> int:
+        return self.heads[edge ^ 1]
+
+    def _push(self, edge: int, amount: float) -> None:
+        self.flow[edge] += amount
+        self.flow[edge ^ 1] -= amount
+
+    def _bfs(self, start: int, goal: int, usable) -> Optional[List[int]]:
+        """Shortest path of edges from start to goal using edges where usable(edge) holds."""
+        parent_edge = {start: None}
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            if u == goal:
+                path = []
+                while parent_edge[u] is not None:
+                    path.append(parent_edge[u])
+                    u = self.tail(parent_edge[u])
+                return path[::-1]
+            for edge in self.adjacency[u]:
+                v = self.heads[edge]
+                if v not in parent_edge and usable(edge):
+                    parent_edge[v] = edge
+                    queue.append(v)
+        return None
+
+    def max_flow(self, source: int, sink: int) -> float:
+        """Augment along shortest residual paths (Edmonds-Karp) until none is left."""
+        residual = lambda edge: self.capacity[edge] - self.flow[edge] > _EPSILON
+        while True:
+            path = self._bfs(source, sink, residual)
+            if path is None:
+                break
+            amount = min(self.capacity[edge] - self.flow[edge] for edge in path)
+            for edge in path:
+                self._push(edge, amount)
+        return sum(self.flow[edge] for edge in self.adjacency[source] if edge % 2 == 0)
+
+    def set_capacity(self, edge: int, capacity: float, source: int, sink: int) -> None:
+        """Change an edge's capacity, first cancelling any flow above the new capacity."""
+        self.capacity[edge] = capacity
+        excess = self.flow[edge] - capacity
+        carrying = lambda e: e % 2 == 0 and self.flow[e] > _EPSILON
+        u, v = self.tail(edge), self.heads[edge]
+        while excess > _EPSILON:
+            # Flow through u->v continues to the sink and arrives from the source,
+            # or else circulates back to u; cancel it along one such route
+            before = [] if u == source else self._bfs(source, u, carrying)
+            after = [] if v == sink else self._bfs(v, sink, carrying)
+            if before is None or after is None:
+                before, after = [], self._bfs(v, u, carrying) or []
+            route = before + [edge] + after
+            amount = min(excess, min(self.flow[e] for e in route))
+            for e in route:
+                self._push(e, -amount)
+            excess -= amount
+
+    def reachable(self, source: int) -> set:
+        """Nodes reachable from source in the residual graph (the source side of a min cut)."""
+        seen = {source}
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for edge in self.adjacency[u]:
+                v = self.heads[edge]
+                if v not in seen and self.capacity[edge] - self.flow[edge] > _EPSILON:
+                    seen.add(v)
+                    queue.append(v)
+        return seen
+
+
+class TransferHeadroomService:
+    """
+    Maximum transferable power between segments or groups of segments.
+
+    Each query builds a flow network over the ACTIVE transfer paths, with a super
+    source feeding the sending segments and a super sink draining the receiving ones,
+    and runs max-flow on it. Networks are cached per query; a path or segment change
+    adjusts the affected edge capacities in place and the next query resumes
+    augmentation from the previous flow instead of starting over.
+
+    Business Rules:
+    - A path carries at most max_transfer_mw, and nothing unless its status is ACTIVE.
+    - A sending segment can give up at most its current load.
+    - A receiving segment can take at most its headroom up to safety_threshold_pct.
+    - transferable_mw is the maximum MW that can be sent, ignoring losses.
+    - route_delivered_mw applies each path's power_loss_pct along the routes of the
+      one max-flow found (shortest augmenting paths). Other max-flows with the same
+      transferable_mw may route differently and lose more or less, so it is the MW
+      these routes would deliver, not the most MW deliverable after losses.
+
+    Args:
+        topology: Grid topology whose segments and paths are read (and updated in
+            place by set_path_status).
+        max_cached_queries: Number of query networks kept, least recently used evicted.
+    """
+
+    def __init__(self, topology: GridTopology, max_cached_queries: int = 256):
+        self.topology = topology
+        self.max_cached_queries = max_cached_queries
+        self.version = 0
+        self._segments = {segment.segment_id: segment for segment in topology.segments}
+        self._nodes = {segment_id: node for node, segment_id in enumerate(self._segments)}
+        self._paths = {(path.from_segment_id, path.to_segment_id): path for path in topology.transfer_paths}
+        self._cache: "OrderedDict[Tuple[FrozenSet[str], FrozenSet[str]], Dict]" = OrderedDict()
+
+    @staticmethod
+    def _as_set(segment_ids: Union[str, Iterable[str]]) -> FrozenSet[str]:
+        return frozenset([segment_ids] if isinstance(segment_ids, str) else segment_ids)
+
+    def _path_capacity(self, key: Tuple[str, str]) -> float:
+        path = self._paths[key]
+        return path.max_transfer_mw if path.status == "ACTIVE" else 0.0
+
+    def _source_capacity(self, segment_id: str) -> float:
+        return self._segments[segment_id].current_load_mw
+
+    def _sink_capacity(self, segment_id: str) -> float:
+        segment = self._segments[segment_id]
+        return max(0.0, segment.max_capacity_mw * (segment.safety_threshold_pct / 100) - segment.current_load_mw)
+
+    def _build_entry(self, sources: FrozenSet[str], sinks: FrozenSet[str]) -> Dict:
+        source, sink = len(self._nodes), len(self._nodes) + 1
+        network = _FlowNetwork(len(self._nodes) + 2)
+        path_edges = {}
+        for key in self._paths:
+            if key[0] in self._nodes and key[1] in self._nodes:
+                path_edges[key] = network.add_edge(self._nodes[key[0]], self._nodes[key[1]], self._path_capacity(key))
+        source_edges = {s: network.add_edge(source, self._nodes[s], self._source_capacity(s)) for s in sorted(sources)}
+        sink_edges = {s: network.add_edge(self._nodes[s], sink, self._sink_capacity(s)) for s in sorted(sinks)}
+        return {
+            "network": network, "source": source, "sink": sink,
+            "path_edges": path_edges, "source_edges": source_edges, "sink_edges": sink_edges,
+            "result": None,
+        }
+
+    def _set_edge(self, entry: Dict, edge: int, capacity: float) -> None:
+        if entry["network"].capacity[edge] != capacity:
+            entry["network"].set_capacity(edge, capacity, entry["source"], entry["sink"])
+            entry["result"] = None
+
+    def refresh_segment(self, segment_id: str) -> None:
+        """Re-read a segment's load after it changed; call after updating current_load_mw."""
+        self.version += 1
+        for entry in self._cache.values():
+            if segment_id in entry["source_edges"]:
+                self._set_edge(entry, entry["source_edges"][segment_id], self._source_capacity(segment_id))
+            if segment_id in entry["sink_edges"]:
+                self._set_edge(entry, entry["sink_edges"][segment_id], self._sink_capacity(segment_id))
+
+    def refresh_path(self, from_segment_id: str, to_segment_id: str) -> None:
+        """Re-read a transfer path's status and limit after it changed."""
+        key = (from_segment_id, to_segment_id)
+        self.version += 1
+        for entry in self._cache.values():
+            if key in entry["path_edges"]:
+                self._set_edge(entry, entry["path_edges"][key], self._path_capacity(key))
+
+    def set_path_status(self, from_segment_id: str, to_segment_id: str, status: str) -> None:
+        """Change a path's status (e.g. "ACTIVE", "OUT_OF_SERVICE") and update cached headroom."""
+        path = self._paths.get((from_segment_id, to_segment_id))
+        if path is None:
+            raise ValueError(f"No transfer path from {from_segment_id} to {to_segment_id}")
+        path.status = status
+        self.refresh_path(from_segment_id, to_segment_id)
+
+    def headroom(self, sources: Union[str, Iterable[str]], sinks: Union[str, Iterable[str]]) -> Dict:
+        """
+        Maximum MW that can be moved from sources to sinks right now, over any routes.
+
+        Args:
+            sources: Sending segment ID or IDs.
+            sinks: Receiving segment ID or IDs.
+
+        Returns:
+            Dictionary with transferable_mw (sent), route_delivered_mw and
+            route_loss_mw (after losses along the routes found, see the class
+            business rules), the routes with their MW, the bottlenecks limiting the
+            transfer (saturated path IDs, "<segment> load" or "<segment> headroom"),
+            and the service version the answer reflects.
+        """
+        sources, sinks = self._as_set(sources), self._as_set(sinks)
+        unknown = sorted((sources | sinks) - self._segments.keys())
+        if unknown:
+            raise ValueError(f"Unknown segments: {', '.join(unknown)}")
+        if not sources or not sinks or sources & sinks:
+            raise ValueError("Sources and sinks must be non-empty and disjoint")
+
+        key = (sources, sinks)
+        entry = self._cache.pop(key, None) or self._build_entry(sources, sinks)
+        self._cache[key] = entry
+        while len(self._cache) > self.max_cached_queries:
+            self._cache.popitem(last=False)
+        if entry["result"] is None:
+            entry["network"].max_flow(entry["source"], entry["sink"])
+            entry["result"] = self._describe(entry, sources, sinks)
+        return {**entry["result"], "version": self.version}
+
+    def _describe(self, entry: Dict, sources: FrozenSet[str], sinks: FrozenSet[str]) -> Dict:
+        network, source, sink = entry["network"], entry["source"], entry["sink"]
+        segment_ids = list(self._nodes)
+        path_of_edge = {edge: key for key, edge in entry["path_edges"].items()}
+
+        # Decompose the flow into source-to-sink routes to apply losses per route
+        remaining = {edge: network.flow[edge] for edge in range(0, len(network.heads), 2) if network.flow[edge] > _EPSILON}
+        routes = []
+        while True:
+            path = network._bfs(source, sink, lambda edge: remaining.get(edge, 0.0) > _EPSILON)
+            if path is None:
+                break
+            amount = min(remaining[edge] for edge in path)
+            delivered = amount
+            for edge in path:
+                remaining[edge] -= amount
+                if edge in path_of_edge:
+                    delivered *= 1 - self._paths[path_of_edge[edge]].power_loss_pct / 100
+            route = [segment_ids[network.heads[edge]] for edge in path[:-1]]
+            routes.append({"route": route, "transfer_mw": amount, "delivered_mw": delivered})
+
+        source_side = network.reachable(source)
+        bottlenecks = []
+        for key, edge in entry["path_edges"].items():
+            if network.tail(edge) in source_side and network.heads[edge] not in source_side:
+                bottlenecks.append(f"{key[0]}->{key[1]}")
+        bottlenecks += [f"{s} load" for s, edge in entry["source_edges"].items() if network.heads[edge] not in source_side]
+        bottlenecks += [f"{s} headroom" for s, edge in entry["sink_edges"].items() if network.tail(edge) in source_side]
+
+        transferable = sum((route["transfer_mw"] for route in routes), 0.0)
+        delivered = sum((route["delivered_mw"] for route in routes), 0.0)
+        return {
+            "sources": sorted(sources),
+            "sinks": sorted(sinks),
+            "transferable_mw": transferable,
+            "route_delivered_mw": delivered,
+            "route_loss_mw": transferable - delivered,
+            "routes": sorted(routes, key=lambda route: -route["transfer_mw"]),
+            "bottlenecks": bottlenecks,
+        }
@@ -0,0 +1,64 @@
+"""
+Checkpoint file utilities for persisting derived analytics state.
+Writes are atomic, so a crash mid-write leaves the previous checkpoint intact.
+"""
+
+import os
+import pickle
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+def write_checkpoint(path: Union[str, Path], state: Dict) -> Path:
+    """
+    Atomically write a checkpoint.
+
+    The state is pickled to a temporary file in the same directory, flushed to
+    disk, and renamed over the previous checkpoint.
+
+    Args:
+        path: Checkpoint file to write.
+        state: Picklable state dictionary.
+
+    Returns:
+        The checkpoint path.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"format_version": CHECKPOINT_FORMAT_VERSION, "saved_at": datetime.now(), "state": state}
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+    return path
+
+
+def read_checkpoint(path: Union[str, Path]) -> Optional[Dict]:
+    """
+    Read a checkpoint written by write_checkpoint.
+
+    Only load checkpoints this service wrote itself: they are pickles.
+
+    Returns:
+        The payload (format_version, saved_at, state), or None if there is no
+        checkpoint or it was written in another format version.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, "rb") as f:
+        payload = pickle.load(f)
+    if payload.get("format_version") != CHECKPOINT_FORMAT_VERSION:
+        return None
+    return payload
@@ -5,13 +5,69 @@ Provides clean access to grid topology, power sources, and measurement data.
 
 import json
 import csv
-from typing import List, Dict, Optional
+import glob
+from itertools import chain
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import numpy as np
+
 from ..models.grid_infrastructure import GridTopology, GridSegment, PowerTransferPath
 from ..models.power_sources import PowerSource, PowerSourceType
-from ..models.load_measurements import LoadMeasurement, MeasurementQuality
+from ..models.load_measurements import (
+    CompactLoadMeasurement, LoadMeasurement, LoadMeasurementBatch, MeasurementQuality, QUALITY_CODES
+)
+
+def _measurement_rows_to_columns(rows: List[Tuple]) -> Dict[str, np.ndarray]:
+    """Convert (timestamp, segment_id, load_mw, quality) tuples into NumPy columns."""
+    timestamps, segment_ids, loads, qualities = zip(*rows) if rows else ((), (), (), ())
+    return {
+        "timestamps": np.asarray(timestamps, dtype="datetime64[us]"),
+        "segment_ids": np.asarray(segment_ids, dtype=str),
+        "loads": np.asarray(loads, dtype=float),
+        "quality_codes": np.asarray([QUALITY_CODES[quality] for quality in qualities], dtype=np.int8),
+    }
+
+
+def _parse_measurement_file(file_path: str, as_columns: bool = False) -> Dict:
+    """
+    Parse and validate one measurement CSV file (runs inside a worker process).
+    
+    Rows are validated with the LoadMeasurement schema and returned sorted by
+    timestamp and segment, either as plain (timestamp, segment_id, load_mw, quality)
+    tuples or as NumPy columns. Both are much cheaper to send back to the parent
+    process than models.
+    """
+    rows = []
+    errors = []
+    try:
+        with open(file_path, "r", newline="") as f:
+            csv_reader = csv.DictReader(f)
+            # Line 1 is the header, so data rows start at line 2
+            for line_number, row in enumerate(csv_reader, start=2):
+                try:
+                    measurement = LoadMeasurement(
+                        timestamp=row['timestamp'],
+                        segment_id=row['segment_id'],
+                        load_mw=float(row['load_mw']),
+                        measurement_quality=row.get('measurement_quality') or 'good'
+                    )
+                    rows.append((measurement.timestamp, measurement.segment_id, measurement.load_mw, measurement.measurement_quality.value))
+                except (ValueError, KeyError, TypeError) as e:
+                    errors.append({"line": line_number, "error": str(e)})
+    except Exception as e:
+        rows = _measurement_rows_to_columns([]) if as_columns else []
+        return {"file": file_path, "rows": rows, "rows_loaded": 0, "rows_skipped": 0, "errors": [], "failed": str(e)}
+
+    rows.sort(key=lambda r: (r[0], r[1]))
+    rows_loaded = len(rows)
+    if as_columns:
+        rows = _measurement_rows_to_columns(rows)
+    return {"file": file_path, "rows": rows, "rows_loaded": rows_loaded, "rows_skipped": len(errors), "errors": errors, "failed": None}
+
 
 class GridDataLoader:
     """
@@ -107,6 +163,87 @@ class GridDataLoader:
         
         return measurements
     
+    def load_measurement_files(self, source: str, pattern: str = "*.csv", max_workers: Optional[int] = None,
+                               as_columns: bool = False, compact: bool = False) -> Dict[str, any]:
+        """
+        Load many measurement CSV files in parallel and merge them into one sorted list.
+        
+        Intended for one-file-per-feed-per-day layouts with hundreds of files. Each file
+        is parsed and validated against the LoadMeasurement schema on a process pool,
+        sorted locally, and the sorted files are k-way merged by (timestamp, segment_id).
+        
+        Args:
+            source: Directory of CSV files, a glob pattern, or a single file. Relative
+                paths are resolved against data_dir.
+            pattern: Filename pattern used when source is a directory.
+            max_workers: Worker processes to use (defaults to the CPU count). With one
+                worker, or a single file, files are parsed in this process.
+            as_columns: Return "measurements" as a LoadMeasurementBatch (NumPy columns,
+                ~21 bytes per row) instead of LoadMeasurement models. Building models
+                is the serial part of a bulk load, so analytics that work on columns
+                should prefer this.
+            compact: Return CompactLoadMeasurement records (~136 bytes per row)
+                instead of LoadMeasurement models (~544 bytes per row). Only
+                as_columns reaches a 5x or better reduction.
+            
+        Returns:
+            Dictionary with the merged "measurements", one entry per file in
+            "file_reports" (rows loaded/skipped, per-line errors, and "failed" if the
+            file could not be read), and "total_rows"/"skipped_rows" counters.
+        """
+        source_path = Path(source)
+        if not source_path.is_absolute():
+            source_path = self.data_dir / source_path
+        if source_path.is_dir():
+            files = sorted(str(path) for path in source_path.glob(pattern))
+        else:
+            files = sorted(glob.glob(str(source_path)))
+
+        workers = max_workers or os.cpu_count() or 1
+        if workers <= 1 or len(files) <= 1:
+            results = [_parse_measurement_file(file_path, as_columns) for file_path in files]
+        else:
+            # Batch small files per task so scheduling overhead stays small
+            chunksize = max(1, len(files) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=min(workers, len(files))) as executor:
+                results = list(executor.map(_parse_measurement_file, files, [as_columns] * len(files), chunksize=chunksize))
+
+        file_rows = [result.pop("rows") for result in results]
+        if as_columns:
+            # Workers already built per-file columns; concatenate and order by (timestamp, segment_id)
+            columns = {
+                name: np.concatenate([columns[name] for columns in file_rows]) if file_rows else _measurement_rows_to_columns([])[name]
+                for name in ("timestamps", "segment_ids", "loads", "quality_codes")
+            }
+            order = np.lexsort((columns["segment_ids"], columns["timestamps"]))
+            measurements = LoadMeasurementBatch.from_columns(**{name: column[order] for name, column in columns.items()})
+            total_rows = len(measurements)
+        else:
+            # Each file's rows are already sorted, so this is a k-way merge of sorted runs
+            # (Timsort detects the runs). Tuples compare by (timestamp, segment_id) first.
+            merged_rows = sorted(chain.from_iterable(file_rows))
+            # Rows were validated in the workers, so skip re-validation when rebuilding models
+            if compact:
+                measurements = [
+                    CompactLoadMeasurement(timestamp, segment_id, load_mw, quality)
+                    for timestamp, segment_id, load_mw, quality in merged_rows
+                ]
+            else:
+                measurements = [
+                    LoadMeasurement.model_construct(
+                        timestamp=timestamp, segment_id=segment_id, load_mw=load_mw,
+                        measurement_quality=MeasurementQuality(quality)
+                    )
+                    for timestamp, segment_id, load_mw, quality in merged_rows
+                ]
+            total_rows = len(measurements)
+        return {
+            "measurements": measurements,
+            "file_reports": results,
+            "total_rows": total_rows,
+            "skipped_rows": sum(result["rows_skipped"] for result in results)
+        }
+    
     def get_current_grid_state(self) -> Dict[str, any]:
         """
         Get complete current state of the grid for decision making.
@@ -0,0 +1,219 @@
+"""
+Spatial indexing utilities for locating grid segments and power sources.
+Provides a k-d tree over geographic coordinates with batched radius and nearest-k queries.
+"""
+
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Great-circle distance in km between coordinate pairs.
+
+    Accepts scalars or NumPy arrays (broadcast against each other), so a whole
+    batch of distances is computed in one vectorized call.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _to_unit_vectors(latitudes, longitudes) -> np.ndarray:
+    """Project latitude/longitude onto the unit sphere as (n, 3) Cartesian vectors."""
+    lat = np.radians(np.asarray(latitudes, dtype=float))
+    lon = np.radians(np.asarray(longitudes, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def _km_to_chord(distance_km) -> np.ndarray:
+    """Convert a great-circle distance to the straight-line chord on the unit sphere."""
+    angle = np.minimum(np.asarray(distance_km, dtype=float) / EARTH_RADIUS_KM, np.pi)
+    return 2 * np.sin(angle / 2)
+
+
+def _chord_to_km(chord) -> np.ndarray:
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2, 0.0, 1.0))
+
+
+class GeoSpatialIndex:
+    """
+    Static k-d tree over geographic points, queried in batches.
+
+    Points are stored as unit vectors so chord distance is monotonic with
+    great-circle distance and there is no longitude wrap-around to handle.
+    Queries walk the tree level by level for all query points at once, pruning
+    (query, node) pairs whose bounding box is out of range, so each query only
+    touches the leaves near it instead of scanning every indexed point.
+
+    Args:
+        keys: Identifier for each point (e.g. segment_id or source_id).
+        latitudes: Latitude of each point in degrees.
+        longitudes: Longitude of each point in degrees.
+        items: Optional objects carried alongside the keys (e.g. GridSegment).
+        leaf_size: Maximum number of points stored in a leaf node.
+    """
+
+    def __init__(self, keys: Sequence[str], latitudes: Sequence[float], longitudes: Sequence[float],
+                 items: Optional[Sequence[Any]] = None, leaf_size: int = 16):
+        if not (len(keys) == len(latitudes) == len(longitudes)):
+            raise ValueError("keys, latitudes and longitudes must have the same length")
+        self.keys: List[str] = list(keys)
+        self.items: List[Any] = list(items) if items is not None else list(keys)
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        self.leaf_size = max(1, leaf_size)
+        self._points = _to_unit_vectors(self.latitudes, self.longitudes)
+        self._build()
+
+    @classmethod
+    def from_items(cls, items: Iterable[Any], key: Callable[[Any], str], leaf_size: int = 16) -> "GeoSpatialIndex":
+        """Index any objects exposing latitude/longitude, such as GridSegment or PowerSource."""
+        items = list(items)
+        return cls(
+            keys=[key(item) for item in items],
+            latitudes=[item.latitude for item in items],
+            longitudes=[item.longitude for item in items],
+            items=items,
+            leaf_size=leaf_size,
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _build(self) -> None:
+        """Build the tree with median splits on the axis of widest spread."""
+        n = len(self.keys)
+        self._order = np.arange(n)
+        starts, ends, lefts, rights, box_min, box_max = [], [], [], [], [], []
+
+        # Iterative construction; each node covers a contiguous slice of self._order
+        stack = [(0, n, -1, False)]
+        while stack:
+            start, end, parent, is_right = stack.pop()
+            node = len(starts)
+            if parent >= 0:
+                (rights if is_right else lefts)[parent] = node
+            pts = self._points[self._order[start:end]]
+            starts.append(start)
+            ends.append(end)
+            lefts.append(-1)
+            rights.append(-1)
+            box_min.append(pts.min(axis=0) if len(pts) else np.zeros(3))
+            box_max.append(pts.max(axis=0) if len(pts) else np.zeros(3))
+
+            if end - start > self.leaf_size:
+                axis = int(np.argmax(box_max[-1] - box_min[-1]))
+                mid = (end - start) // 2
+                partition = np.argpartition(pts[:, axis], mid)
+                self._order[start:end] = self._order[start:end][partition]
+                stack.append((start + mid, end, node, True))
+                stack.append((start, start + mid, node, False))
+
+        self._starts = np.array(starts, dtype=np.int64)
+        self._ends = np.array(ends, dtype=np.int64)
+        self._lefts = np.array(lefts, dtype=np.int64)
+        self._rights = np.array(rights, dtype=np.int64)
+        self._box_min = np.array(box_min).reshape(-1, 3)
+        self._box_max = np.array(box_max).reshape(-1, 3)
+
+    def query_radius(self, latitudes, longitudes, radius_km) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Find all indexed points within radius_km of each query point.
+
+        Args:
+            latitudes: Query latitudes in degrees (scalar or array).
+            longitudes: Query longitudes in degrees (scalar or array).
+            radius_km: Search radius, either one value or one per query point.
+
+        Returns:
+            One (point_indices, distances_km) pair per query point, sorted by distance.
+            Use self.keys / self.items to resolve the indices.
+        """
+        queries = _to_unit_vectors(np.atleast_1d(latitudes), np.atleast_1d(longitudes))
+        chord = np.broadcast_to(_km_to_chord(radius_km), (len(queries),))
+        pair_query, pair_point, pair_chord = self._radius_pairs(queries, chord)
+
+        # Group matches by query, nearest first
+        order = np.lexsort((pair_chord, pair_query))
+        pair_query, pair_point, pair_chord = pair_query[order], pair_point[order], pair_chord[order]
+        bounds = np.searchsorted(pair_query, np.arange(len(queries) + 1))
+        distances = _chord_to_km(pair_chord)
+        return [
+            (pair_point[bounds[i]:bounds[i + 1]], distances[bounds[i]:bounds[i + 1]])
+            for i in range(len(queries))
+        ]
+
+    def query_nearest(self, latitudes, longitudes, k: int = 1) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Find the k nearest indexed points to each query point.
+
+        Runs batched radius queries with a radius that doubles for the query points
+        that have not yet collected k neighbours, so dense areas resolve in one pass.
+
+        Returns:
+            One (point_indices, distances_km) pair per query point, sorted by distance.
+        """
+        lat = np.atleast_1d(np.asarray(latitudes, dtype=float))
+        lon = np.atleast_1d(np.asarray(longitudes, dtype=float))
+        k = min(k, len(self))
+        results: List[Optional[Tuple[np.ndarray, np.ndarray]]] = [None] * len(lat)
+        if k <= 0:
+            return [(np.empty(0, dtype=np.int64), np.empty(0)) for _ in results]
+
+        # Start from the radius that would hold k points if they were spread evenly
+        spread_km = float(_chord_to_km(np.linalg.norm(self._box_max[0] - self._box_min[0])))
+        radius = np.full(len(lat), max(spread_km * np.sqrt(k / len(self)), 1.0))
+        pending = np.arange(len(lat))
+        while len(pending):
+            found = self.query_radius(lat[pending], lon[pending], radius[pending])
+            unresolved = []
+            for query_idx, (indices, distances) in zip(pending, found):
+                if len(indices) >= k or radius[query_idx] >= np.pi * EARTH_RADIUS_KM:
+                    results[query_idx] = (indices[:k], distances[:k])
+                else:
+                    unresolved.append(query_idx)
+            pending = np.array(unresolved, dtype=np.int64)
+            radius[pending] *= 2
+        return results
+
+    def _radius_pairs(self, queries: np.ndarray, chord: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Breadth-first batched traversal returning (query, point, chord distance) matches."""
+        empty = np.empty(0, dtype=np.int64)
+        if len(self) == 0 or len(queries) == 0:
+            return empty, empty, np.empty(0)
+
+        node_query = np.arange(len(queries))
+        node_id = np.zeros(len(queries), dtype=np.int64)
+        matched_query, matched_point, matched_chord = [], [], []
+        while len(node_query):
+            # Lower bound on distance from each query to its node's bounding box
+            q = queries[node_query]
+            gap = np.maximum(self._box_min[node_id] - q, 0) + np.maximum(q - self._box_max[node_id], 0)
+            keep = np.einsum("ij,ij->i", gap, gap) <= chord[node_query] ** 2
+            node_query, node_id = node_query[keep], node_id[keep]
+
+            is_leaf = self._lefts[node_id] < 0
+            leaf_query, leaf_id = node_query[is_leaf], node_id[is_leaf]
+            if len(leaf_query):
+                sizes = self._ends[leaf_id] - self._starts[leaf_id]
+                pair_query = np.repeat(leaf_query, sizes)
+                offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+                pair_point = self._order[np.repeat(self._starts[leaf_id], sizes) + offsets]
+                dist = np.linalg.norm(self._points[pair_point] - queries[pair_query], axis=1)
+                within = dist <= chord[pair_query]
+                matched_query.append(pair_query[within])
+                matched_point.append(pair_point[within])
+                matched_chord.append(dist[within])
+
+            inner_query, inner_id = node_query[~is_leaf], node_id[~is_leaf]
+            node_query = np.concatenate((inner_query, inner_query))
+            node_id = np.concatenate((self._lefts[inner_id], self._rights[inner_id]))
+
+        if not matched_query:
+            return empty, empty, np.empty(0)
+        return np.concatenate(matched_query), np.concatenate(matched_point), np.concatenate(matched_chord)
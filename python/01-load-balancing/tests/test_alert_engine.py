@@ -0,0 +1,113 @@
+"""
+Tests for the alert rule engine and how the monitoring system drives its state.
+"""
+
+import asyncio
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.models.alert_rules import AlertRule, default_alert_rules
+from src.models.events import CapacityAlertEvent
+from src.models.grid_infrastructure import GridSegment
+from src.models.load_measurements import LoadMeasurement
+from src.services.alert_engine import AlertRuleEngine
+from src.services.event_bus import EventBus
+from src.services.monitoring_system import GridMonitoringSystem
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+
+def _segments(count):
+    return [
+        GridSegment(segment_id=f"SEG_{i}", name=f"Segment {i}", max_capacity_mw=100.0, current_load_mw=0.0,
+                    latitude=40.0, longitude=-74.0, safety_threshold_pct=85.0)
+        for i in range(count)
+    ]
+
+
+def _levels(records):
+    return {(record["segment_id"], record["rule_id"]) for record in records}
+
+
+def test_evaluate_does_not_change_rule_state():
+    engine = AlertRuleEngine(default_alert_rules(), _segments(3))
+    loads = np.array([50.0, 91.0, 99.0])
+
+    first = engine.evaluate(loads)
+    assert engine.evaluate(loads) == first
+    assert all(record["is_new"] for record in first)
+    assert not engine.active.any()
+
+    committed = engine.commit(loads)
+    assert committed == first
+    assert not any(record["is_new"] for record in engine.evaluate(loads))
+
+
+def test_hysteresis_only_follows_committed_ticks():
+    rules = [AlertRule(rule_id="high", alert_level="WARNING", threshold=80.0, hysteresis=5.0)]
+    engine = AlertRuleEngine(rules, _segments(1))
+
+    # Inside the hysteresis band a rule only stays active if a committed tick fired it
+    assert engine.evaluate(np.array([78.0])) == []
+    engine.commit(np.array([81.0]))
+    assert _levels(engine.evaluate(np.array([78.0]))) == {("SEG_0", "high")}
+    engine.commit(np.array([74.0]))
+    assert engine.evaluate(np.array([78.0])) == []
+
+
+def test_row_subset_matches_full_evaluation():
+    rng = np.random.default_rng(36)
+    engine = AlertRuleEngine(default_alert_rules(), _segments(40))
+    engine.commit(rng.uniform(60, 100, 40))
+    loads = rng.uniform(60, 100, 40)
+    rates = {window: rng.uniform(0, 10, 40) for window in engine.rate_windows}
+    full = engine.evaluate(loads, rates)
+
+    rows = [3, 17, 25, 39]
+    subset = engine.evaluate(loads[rows], {window: rate[rows] for window, rate in rates.items()}, rows)
+    expected = [record for record in full if record["row"] in rows]
+    assert sorted(subset, key=lambda r: (r["row"], r["rule_id"])) == sorted(expected, key=lambda r: (r["row"], r["rule_id"]))
+
+
+async def _publish_reading(monitor, measurement):
+    alerts = []
+    bus = EventBus()
+    monitor.connect_event_bus(bus)
+    bus.subscribe(CapacityAlertEvent, alerts.extend, name="test_alerts")
+    await bus.start()
+    await bus.publish(measurement)
+    await bus.close()
+    return alerts
+
+
+@pytest.mark.parametrize("query", [
+    lambda monitor: monitor.update_segment_load("GRID_001", 148.5),
+    lambda monitor: monitor.create_operational_summary(),
+    lambda monitor: monitor.segment_alert_levels(),
+    lambda monitor: monitor.check_all_segments(),
+])
+def test_queries_do_not_consume_live_alerts(monkeypatch, query):
+    monkeypatch.chdir(PROJECT_DIR)
+    reading = LoadMeasurement(timestamp=datetime(2025, 6, 1, 12, 0), segment_id="GRID_001", load_mw=148.5)
+
+    baseline = asyncio.run(_publish_reading(GridMonitoringSystem(), reading))
+    assert ("GRID_001", "EMERGENCY") in {(alert.segment_id, alert.alert_level) for alert in baseline}
+
+    monitor = GridMonitoringSystem()
+    query(monitor)
+    after_query = asyncio.run(_publish_reading(monitor, reading))
+    assert sorted((a.segment_id, a.rule_id) for a in after_query) == sorted((a.segment_id, a.rule_id) for a in baseline)
+
+    # The live path committed the tick, so the same reading does not alert again
+    assert asyncio.run(_publish_reading(monitor, reading)) == []
+
+
+def test_update_segment_load_reports_rule_level(monkeypatch):
+    monkeypatch.chdir(PROJECT_DIR)
+    monitor = GridMonitoringSystem()
+    assert monitor.update_segment_load("GRID_001", 148.5) == "EMERGENCY"
+    assert monitor.update_segment_load("GRID_001", 60.0) == "NORMAL"
+    assert monitor.segment_alert_levels()["GRID_001"] == "NORMAL"
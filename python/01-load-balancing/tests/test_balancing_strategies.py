@@ -0,0 +1,161 @@
+"""
+Tests for the balancing strategy registry and the strategy benchmark harness.
+"""
+
+import copy
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.load_measurements import LoadMeasurement
+from src.services.balancing_strategies import (
+    DISPATCH_STRATEGIES, TRANSFER_STRATEGIES, DispatchStrategy, GreedyTransferStrategy, TransferStrategy,
+    load_to_shed, register_strategy,
+)
+from src.services.load_balancer import GridLoadBalancer
+from src.services.strategy_benchmark import BalancingStrategyBenchmark, recorded_grid_states, synthetic_grid_state
+
+
+@pytest.fixture
+def registry():
+    """Registries restored after the test, so strategies registered here do not leak."""
+    saved = dict(TRANSFER_STRATEGIES), dict(DISPATCH_STRATEGIES)
+    yield
+    for registered, original in zip((TRANSFER_STRATEGIES, DISPATCH_STRATEGIES), saved):
+        registered.clear()
+        registered.update(original)
+
+
+def _segment_excess(grid_state):
+    return {segment.segment_id: load_to_shed(segment) for segment in grid_state["topology"].segments}
+
+
+def test_builtin_strategies_are_registered_and_selectable_by_name():
+    assert {"greedy", "lowest_loss"} <= TRANSFER_STRATEGIES.keys()
+    assert {"current_output", "merit_order"} <= DISPATCH_STRATEGIES.keys()
+    balancer = GridLoadBalancer(synthetic_grid_state(n_segments=20, seed=1), transfer_strategy="lowest_loss",
+                                dispatch_strategy="merit_order")
+    assert balancer.transfer_strategy.name == "lowest_loss" and balancer.dispatch_strategy.name == "merit_order"
+    assert isinstance(GridLoadBalancer(synthetic_grid_state(n_segments=5)).transfer_strategy, GreedyTransferStrategy)
+    with pytest.raises(KeyError):
+        GridLoadBalancer(synthetic_grid_state(n_segments=5), transfer_strategy="no_such_strategy")
+
+
+def test_registering_custom_strategies(registry):
+    @register_strategy
+    class NoTransfers(TransferStrategy):
+        name = "none"
+
+        def plan_transfers(self, balancer, max_distance_km=None):
+            return []
+
+    assert TRANSFER_STRATEGIES["none"] is NoTransfers
+    grid_state = synthetic_grid_state(n_segments=30, seed=2)
+    assert GridLoadBalancer(grid_state, transfer_strategy="none").calculate_optimal_transfers() == []
+    rows = BalancingStrategyBenchmark(["none"], [], repeats=1).run({"synthetic": grid_state})
+    assert [(row["strategy"], row["mw_shed"]) for row in rows] == [("none", 0.0)]
+    assert rows[0]["remaining_overload_mw"] == pytest.approx(sum(_segment_excess(grid_state).values()))
+
+    class Unnamed(DispatchStrategy):
+        def plan_dispatch(self, balancer):
+            return []
+
+    with pytest.raises(ValueError):
+        register_strategy(Unnamed)
+    with pytest.raises(TypeError):
+        register_strategy(type("NotAStrategy", (), {"name": "other"}))
+    assert "other" not in TRANSFER_STRATEGIES and "other" not in DISPATCH_STRATEGIES
+
+
+@pytest.mark.parametrize("strategy", ["greedy", "lowest_loss"])
+def test_transfer_plans_respect_paths_and_receiver_headroom(strategy):
+    grid_state = synthetic_grid_state(n_segments=150, overload_fraction=0.3, seed=40)
+    balancer = GridLoadBalancer(copy.deepcopy(grid_state), transfer_strategy=strategy)
+    transfers = balancer.calculate_optimal_transfers()
+    assert transfers
+
+    segments = {segment.segment_id: segment for segment in grid_state["topology"].segments}
+    paths = {}
+    for path in grid_state["topology"].transfer_paths:
+        paths.setdefault((path.from_segment_id, path.to_segment_id), path)
+    excess = _segment_excess(grid_state)
+    shed, received = defaultdict(float), defaultdict(float)
+    for transfer in transfers:
+        path = paths[(transfer["from_segment_id"], transfer["to_segment_id"])]
+        assert 0 < transfer["transfer_mw"] <= path.max_transfer_mw * (1 - path.power_loss_pct / 100) + 1e-9
+        assert transfer["estimated_loss_mw"] == pytest.approx(transfer["transfer_mw"] * path.power_loss_pct / 100)
+        shed[transfer["from_segment_id"]] += transfer["transfer_mw"]
+        received[transfer["to_segment_id"]] += transfer["transfer_mw"]
+    for segment_id, mw in shed.items():
+        assert mw <= excess[segment_id] + 1e-9
+    if strategy == "lowest_loss":
+        for segment_id, mw in received.items():
+            receiver = segments[segment_id]
+            assert mw <= receiver.max_capacity_mw - receiver.current_load_mw + 1e-9
+
+
+def test_benchmark_rows_are_consistent_with_the_plans():
+    states = {"a": synthetic_grid_state(n_segments=80, seed=3), "b": synthetic_grid_state(n_segments=120, seed=4)}
+    pristine = copy.deepcopy(states)
+    rows = BalancingStrategyBenchmark(repeats=2).run(states)
+
+    strategies = sorted(TRANSFER_STRATEGIES) + sorted(DISPATCH_STRATEGIES)
+    assert [(row["state"], row["strategy"]) for row in rows] == [(s, name) for s in states for name in strategies]
+    for name, grid_state in states.items():
+        assert grid_state["topology"].model_dump() == pristine[name]["topology"].model_dump()
+
+    for row in rows:
+        grid_state = states[row["state"]]
+        assert row["runtime_ms"] >= 0 and row["peak_memory_kb"] >= 0
+        if row["kind"] == "transfer":
+            transfers = GridLoadBalancer(copy.deepcopy(grid_state), transfer_strategy=row["strategy"]).calculate_optimal_transfers()
+            assert row["transfers"] == len(transfers)
+            assert row["mw_shed"] == pytest.approx(sum(t["transfer_mw"] for t in transfers))
+            assert row["losses_mw"] == pytest.approx(sum(t["estimated_loss_mw"] for t in transfers))
+            assert row["mw_shed"] + row["remaining_overload_mw"] == pytest.approx(sum(_segment_excess(grid_state).values()))
+        else:
+            demand = sum(segment.current_load_mw for segment in grid_state["topology"].segments)
+            assert row["shortfall_mw"] == pytest.approx(max(0.0, demand - row["generation_mw"]))
+            if row["strategy"] == "current_output":
+                assert row["adjustments"] == 0
+                assert row["generation_mw"] == pytest.approx(sum(s.current_output_mw for s in grid_state["power_sources"]))
+
+    table = BalancingStrategyBenchmark.format_table(rows)
+    assert table.startswith("Transfer strategies:") and "\n\nDispatch strategies:" in table
+
+
+def test_merit_order_covers_demand_plus_reserve_within_source_limits():
+    grid_state = synthetic_grid_state(n_segments=100, n_sources=30, seed=5)
+    balancer = GridLoadBalancer(copy.deepcopy(grid_state), dispatch_strategy="merit_order")
+    adjustments = {a["source_id"]: a["new_output_mw"] for a in balancer.optimize_power_source_dispatch()}
+    outputs = {s.source_id: adjustments.get(s.source_id, s.current_output_mw) for s in grid_state["power_sources"]}
+
+    demand = sum(segment.current_load_mw for segment in grid_state["topology"].segments) * 1.15
+    usable = 0.0
+    for source in grid_state["power_sources"]:
+        limit = source.current_output_mw if source.weather_dependent else source.max_capacity_mw
+        assert outputs[source.source_id] <= limit + 1e-9
+        if source.operational_status == "ONLINE" or (source.startup_time_minutes or 0) <= 60:
+            usable += limit
+        else:
+            assert outputs[source.source_id] == 0.0
+    assert sum(outputs.values()) == pytest.approx(min(demand, usable))
+
+
+def test_recorded_states_follow_the_measurements():
+    base = synthetic_grid_state(n_segments=5, seed=6)
+    segment_ids = [segment.segment_id for segment in base["topology"].segments]
+    start = datetime(2025, 6, 1)
+    measurements = [
+        LoadMeasurement(timestamp=start + timedelta(minutes=minute), segment_id=segment_ids[minute % 5],
+                        load_mw=10.0 + minute)
+        for minute in range(10)
+    ] + [LoadMeasurement(timestamp=start, segment_id="UNKNOWN", load_mw=1.0)]
+
+    states = recorded_grid_states(base, reversed(measurements), every=3)
+    assert list(states) == [(start + timedelta(minutes=minute)).isoformat() for minute in (0, 3, 6, 9)]
+    last = states[(start + timedelta(minutes=9)).isoformat()]
+    loads = {segment.segment_id: segment.current_load_mw for segment in last["topology"].segments}
+    assert loads == {segment_ids[minute % 5]: 10.0 + minute for minute in range(5, 10)}
+    assert base["topology"].model_dump() == synthetic_grid_state(n_segments=5, seed=6)["topology"].model_dump()
@@ -0,0 +1,85 @@
+"""
+Tests for the incrementally maintained segment capacity index.
+"""
+
+import random
+
+import pytest
+
+from src.models.grid_infrastructure import GridSegment
+from src.services.capacity_index import BALANCER_CATEGORIES, SegmentCapacityIndex, classify_balancer_capacity
+
+
+def _segments(rng, count):
+    return [
+        GridSegment(
+            segment_id=f"SEG_{i:03d}", name=f"Segment {i}", max_capacity_mw=rng.uniform(50, 300),
+            current_load_mw=0.0, latitude=40.0, longitude=-74.0, safety_threshold_pct=85.0,
+        )
+        for i in range(count)
+    ]
+
+
+def _assert_matches_full_scan(index, segments):
+    for category in BALANCER_CATEGORIES:
+        expected = [s for s in segments if classify_balancer_capacity(s.get_utilization_percentage()) == category]
+        assert {s.segment_id for s in index.members(category)} == {s.segment_id for s in expected}
+        assert index.category_count(category) == len(expected)
+
+        ordered = sorted(s.get_utilization_percentage() for s in expected)
+        ascending = [s.get_utilization_percentage() for s in index.iter_by_utilization(category)]
+        descending = [s.get_utilization_percentage() for s in index.iter_by_utilization(category, descending=True)]
+        assert ascending == ordered
+        assert descending == ordered[::-1]
+
+        least, most = index.peek_least_loaded(category), index.peek_most_loaded(category)
+        if expected:
+            assert least.get_utilization_percentage() == ordered[0]
+            assert most.get_utilization_percentage() == ordered[-1]
+        else:
+            assert least is None and most is None
+
+    utilizations = [s.get_utilization_percentage() for s in segments]
+    assert index.peek_least_loaded().get_utilization_percentage() == min(utilizations)
+    assert index.peek_most_loaded().get_utilization_percentage() == max(utilizations)
+    assert index.total_load_mw == pytest.approx(sum(s.current_load_mw for s in segments))
+    assert index.total_capacity_mw == pytest.approx(sum(s.max_capacity_mw for s in segments))
+
+
+def test_random_load_updates_match_full_scan():
+    rng = random.Random(26)
+    segments = _segments(rng, 40)
+    for segment in segments:
+        segment.current_load_mw = rng.uniform(0, 1.0) * segment.max_capacity_mw
+    index = SegmentCapacityIndex(segments)
+    _assert_matches_full_scan(index, segments)
+
+    for step in range(500):
+        segment = rng.choice(segments)
+        category = index.update_load(segment.segment_id, rng.uniform(0, 1.05) * segment.max_capacity_mw)
+        assert category == classify_balancer_capacity(segment.get_utilization_percentage())
+        if step % 25 == 0:
+            _assert_matches_full_scan(index, segments)
+    _assert_matches_full_scan(index, segments)
+
+
+def test_removed_segments_leave_every_bucket():
+    rng = random.Random(7)
+    segments = _segments(rng, 20)
+    for segment in segments:
+        segment.current_load_mw = rng.uniform(0, 1.0) * segment.max_capacity_mw
+    index = SegmentCapacityIndex(segments)
+    for segment in segments[:10]:
+        index.remove_segment(segment.segment_id)
+    remaining = segments[10:]
+    assert len(index) == len(remaining)
+    assert segments[0].segment_id not in index
+    _assert_matches_full_scan(index, remaining)
+
+
+def test_update_rejects_unknown_segment_and_negative_load():
+    index = SegmentCapacityIndex(_segments(random.Random(1), 2))
+    with pytest.raises(KeyError):
+        index.update_load("SEG_999", 10.0)
+    with pytest.raises(ValueError):
+        index.update_load("SEG_000", -1.0)
@@ -0,0 +1,142 @@
+"""
+Tests for analytics checkpoints: save/restore equality and replaying only newer measurements.
+"""
+
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.models.load_measurements import LoadMeasurement, MeasurementQuality
+from src.reports.grid_reports import GridReports
+from src.services.checkpointing import AnalyticsCheckpointer
+from src.services.data_processor import LoadDataProcessor
+from src.services.monitoring_system import GridMonitoringSystem
+from src.utils import checkpoint
+from src.utils.checkpoint import read_checkpoint, write_checkpoint
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+START = datetime(2025, 6, 1)
+
+
+@pytest.fixture(autouse=True)
+def project_dir(monkeypatch):
+    monkeypatch.chdir(PROJECT_DIR)
+
+
+def _services():
+    monitor = GridMonitoringSystem()
+    return LoadDataProcessor(monitor.data_loader), monitor, GridReports(monitor.data_loader, None, monitor)
+
+
+def _checkpointer(path, services, **kwargs):
+    processor, monitor, reports = services
+    return AnalyticsCheckpointer(path, data_processor=processor, monitoring_system=monitor,
+                                 grid_reports=reports, **kwargs)
+
+
+def _measurements(rng, segment_ids, minutes=600):
+    return [
+        LoadMeasurement(timestamp=START + timedelta(minutes=minute), segment_id=segment_id,
+                        load_mw=rng.uniform(0, 100),
+                        measurement_quality=rng.choices(list(MeasurementQuality), weights=[80, 10, 5, 5])[0])
+        for minute in range(minutes) for segment_id in segment_ids
+        if rng.random() < 0.8
+    ]
+
+
+def _ingest(services, measurements):
+    processor, monitor, reports = services
+    processor.handle_measurement_events(measurements)
+    monitor.apply_measurements(measurements)
+    reports.handle_measurement_events(measurements)
+
+
+def _assert_same_state(services, expected):
+    processor, monitor, reports = services
+    expected_processor, expected_monitor, expected_reports = expected
+    assert processor.live_statistics.keys() == expected_processor.live_statistics.keys()
+    for segment_id, stats in expected_processor.live_statistics.items():
+        actual = dict(processor.live_statistics[segment_id])
+        assert actual.pop("last_timestamp") == stats["last_timestamp"]
+        assert actual == pytest.approx({key: value for key, value in stats.items() if key != "last_timestamp"})
+    assert processor.live_quality_counts == expected_processor.live_quality_counts
+
+    assert monitor.checkpoint_state()["segment_loads"] == expected_monitor.checkpoint_state()["segment_loads"]
+    history, expected_history = monitor.load_history, expected_monitor.load_history
+    for segment_id in expected_history.segment_ids:
+        assert history.recent(segment_id, timedelta(hours=12)) == expected_history.recent(segment_id, timedelta(hours=12))
+
+    for segment_id in expected_reports.rollups.segment_ids:
+        assert reports.rollups.trend(segment_id, resolution="hourly") == expected_reports.rollups.trend(
+            segment_id, resolution="hourly")
+    for service, expected_service in zip(services, expected):
+        assert service.measurement_watermarks == expected_service.measurement_watermarks
+
+
+def test_save_then_restore_reproduces_the_saved_state(tmp_path):
+    original = _services()
+    segment_ids = original[1].load_history.segment_ids
+    _ingest(original, _measurements(random.Random(39), segment_ids))
+    _checkpointer(tmp_path / "analytics.ckpt", original).save()
+
+    restored = _services()
+    assert _checkpointer(tmp_path / "analytics.ckpt", restored).restore()
+    _assert_same_state(restored, original)
+    np.testing.assert_array_equal(restored[1].alert_engine.active, original[1].alert_engine.active)
+
+
+@pytest.mark.parametrize("as_iterator", [False, True])
+def test_restore_and_replay_matches_processing_everything(tmp_path, as_iterator):
+    reference = _services()
+    segment_ids = reference[1].load_history.segment_ids
+    measurements = _measurements(random.Random(40), segment_ids)
+    _ingest(reference, measurements)
+
+    # The reports service lags behind the others when the checkpoint is taken
+    before_crash = _services()
+    processor, monitor, reports = before_crash
+    processor.handle_measurement_events(measurements[:900])
+    monitor.apply_measurements(measurements[:900])
+    reports.handle_measurement_events(measurements[:600])
+    checkpointer = _checkpointer(tmp_path / "analytics.ckpt", before_crash)
+    checkpointer.save()
+    # The oldest per-segment watermark of the slowest service
+    latest = {m.segment_id: m.timestamp for m in measurements[:600]}
+    assert checkpointer.watermark() == min(latest.values())
+
+    restarted = _services()
+    checkpointer = _checkpointer(tmp_path / "analytics.ckpt", restarted)
+    assert checkpointer.restore()
+    replayed = checkpointer.replay(iter(measurements) if as_iterator else measurements)
+    assert replayed == {
+        "data_processor": len(measurements) - 900,
+        "monitoring_system": len(measurements) - 900,
+        "grid_reports": len(measurements) - 600,
+    }
+    _assert_same_state(restarted, reference)
+
+
+def test_missing_checkpoint_replays_everything(tmp_path):
+    services = _services()
+    checkpointer = _checkpointer(tmp_path / "absent.ckpt", services)
+    assert not checkpointer.restore()
+    assert checkpointer.watermark() is None
+    measurements = _measurements(random.Random(41), services[1].load_history.segment_ids, minutes=10)
+    assert set(checkpointer.replay(measurements).values()) == {len(measurements)}
+
+
+def test_periodic_saves_and_format_version(tmp_path, monkeypatch):
+    checkpointer = _checkpointer(tmp_path / "analytics.ckpt", _services(), interval_seconds=3600)
+    assert checkpointer.maybe_save() is None
+    checkpointer.interval_seconds = 0
+    assert checkpointer.maybe_save() == tmp_path / "analytics.ckpt"
+    assert read_checkpoint(tmp_path / "analytics.ckpt")["state"].keys() == {
+        "data_processor", "monitoring_system", "grid_reports"}
+
+    write_checkpoint(tmp_path / "old.ckpt", {})
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_FORMAT_VERSION", checkpoint.CHECKPOINT_FORMAT_VERSION + 1)
+    assert read_checkpoint(tmp_path / "old.ckpt") is None
+    assert [path.name for path in tmp_path.iterdir() if path.name.endswith(".tmp")] == []
@@ -0,0 +1,123 @@
+"""
+Tests for the event bus overflow policies, batching and failure accounting.
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.event_bus import EventBus, OverflowPolicy
+
+
+class Reading:
+    def __init__(self, value):
+        self.value = value
+
+
+class CriticalReading(Reading):
+    pass
+
+
+class Alert:
+    def __init__(self, value):
+        self.value = value
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.mark.parametrize("policy, kept", [
+    (OverflowPolicy.DROP_OLDEST, list(range(15, 20))),
+    (OverflowPolicy.DROP_NEWEST, list(range(5))),
+])
+def test_drop_policies_count_dropped_events(policy, kept):
+    async def scenario():
+        received = []
+        bus = EventBus()
+        subscription = bus.subscribe(Reading, lambda batch: received.extend(e.value for e in batch),
+                                     max_queue=5, batch_size=100, policy=policy)
+        await bus.start()
+        # Publishing never yields to the consumer here, so the queue fills up
+        for value in range(20):
+            bus.publish_nowait(Reading(value))
+        await bus.close()
+        return received, subscription.stats()
+
+    received, stats = _run(scenario())
+    assert received == kept
+    assert stats["dropped"] == 15 and stats["delivered"] == 5 and stats["queued"] == 0
+
+
+def test_block_policy_applies_backpressure_without_losing_events():
+    async def scenario():
+        received = []
+        bus = EventBus()
+
+        async def slow_consumer(batch):
+            await asyncio.sleep(0.001)
+            received.extend(e.value for e in batch)
+
+        subscription = bus.subscribe(Reading, slow_consumer, max_queue=4, batch_size=3)
+        await bus.start()
+        for value in range(50):
+            await bus.publish(Reading(value))
+            assert len(subscription.queue) <= 4
+        await bus.close()
+        return received, subscription.stats()
+
+    received, stats = _run(scenario())
+    assert received == list(range(50))
+    assert stats["dropped"] == 0 and stats["delivered"] == 50
+    assert stats["batches"] >= 50 // 3
+
+
+def test_routing_batches_and_failures():
+    async def scenario():
+        all_readings, critical = [], []
+        bus = EventBus()
+        bus.subscribe(Reading, lambda batch: all_readings.append(len(batch)), batch_size=4, name="all")
+        bus.subscribe(CriticalReading, lambda batch: critical.extend(e.value for e in batch), name="critical")
+
+        def explode(batch):
+            raise RuntimeError("handler failed")
+
+        bus.subscribe(CriticalReading, explode, batch_size=2, name="failing")
+        await bus.start()
+        queued = await bus.publish_many([Reading(1), CriticalReading(2), Reading(3), CriticalReading(4), Reading(5)])
+        await bus.close()
+        return queued, all_readings, critical, {s["name"]: s for s in bus.stats()}
+
+    queued, all_batches, critical, stats = _run(scenario())
+    assert queued == 5 + 2 + 2
+    assert sum(all_batches) == 5 and max(all_batches) <= 4
+    assert critical == [2, 4]
+    assert stats["failing"]["failures"] == 1 and stats["failing"]["failed_events"] == 2
+    assert stats["failing"]["delivered"] == 0
+    assert stats["all"]["delivered"] == 5 and stats["critical"]["delivered"] == 2
+
+
+def test_close_drains_events_published_by_handlers():
+    async def scenario():
+        bus = EventBus()
+        alerts = []
+
+        async def monitor(batch):
+            for event in batch:
+                if event.value > 10:
+                    await bus.publish(Alert(event.value))
+
+        bus.subscribe(Reading, monitor, name="monitor")
+        bus.subscribe(Alert, lambda batch: alerts.extend(e.value for e in batch), name="alerts")
+        await bus.start()
+        for value in (5, 15, 25):
+            bus.publish_nowait(Reading(value))
+        await bus.close()
+        return alerts
+
+    assert _run(scenario()) == [15, 25]
+
+
+def test_invalid_queue_settings():
+    with pytest.raises(ValueError):
+        EventBus().subscribe(Reading, print, max_queue=0)
@@ -0,0 +1,117 @@
+"""
+Tests for the per-segment load history ring buffers against brute-force window queries.
+"""
+
+import math
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.services.load_history import SegmentLoadHistory
+from src.services.monitoring_system import GridMonitoringSystem
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+START = datetime(2025, 6, 1, 6, 0)
+SEGMENTS = ["S1", "S2", "S3", "S4"]
+
+
+def _filled(rng, capacity_minutes=60, readings=400):
+    """A history fed random readings in time order, plus the readings each segment retains."""
+    history = SegmentLoadHistory(SEGMENTS, history=timedelta(minutes=capacity_minutes))
+    retained = defaultdict(list)
+    clock = START
+    for _ in range(readings):
+        clock += timedelta(seconds=rng.randint(1, 40))
+        segment_id = rng.choice(SEGMENTS[:3])  # S4 never reports
+        load = rng.uniform(0, 120)
+        history.append(segment_id, clock, load)
+        retained[segment_id] = (retained[segment_id] + [(clock, load)])[-history.capacity:]
+    return history, retained, clock
+
+
+def _in_window(readings, window, as_of):
+    return [(t, x) for t, x in readings if as_of - window < t <= as_of]
+
+
+def _reference_slope(readings, as_of):
+    if len({t for t, _ in readings}) < 2:
+        return math.nan
+    minutes = [(t - as_of).total_seconds() / 60 for t, _ in readings]
+    return np.polyfit(minutes, [x for _, x in readings], 1)[0]
+
+
+def _assert_aligned(actual, expected):
+    assert len(actual) == len(expected)
+    for value, reference in zip(actual, expected):
+        if math.isnan(reference):
+            assert math.isnan(value)
+        else:
+            assert value == pytest.approx(reference, rel=1e-9, abs=1e-9)
+
+
+@pytest.mark.parametrize("window_minutes", [5, 15, 45, 240])
+def test_window_queries_match_brute_force(window_minutes):
+    rng = random.Random(35)
+    history, retained, latest = _filled(rng)
+    window = timedelta(minutes=window_minutes)
+    for as_of in (None, latest - timedelta(minutes=3), latest - timedelta(minutes=20, seconds=7)):
+        end = as_of or latest
+        in_window = [_in_window(retained[segment_id], window, end) for segment_id in SEGMENTS]
+        _assert_aligned(history.window_max(window, as_of),
+                        [max(x for _, x in r) if r else math.nan for r in in_window])
+        _assert_aligned(history.window_mean(window, as_of),
+                        [sum(x for _, x in r) / len(r) if r else math.nan for r in in_window])
+        _assert_aligned(history.window_slope(window, as_of), [_reference_slope(r, end) for r in in_window])
+        _assert_aligned(history.window_slope(window, as_of, segment_ids=["S3", "S1"]),
+                        [_reference_slope(in_window[2], end), _reference_slope(in_window[0], end)])
+        assert history.recent("S2", window, as_of) == sorted(in_window[1])
+
+
+def test_full_buffers_overwrite_the_oldest_reading():
+    history = SegmentLoadHistory(["S1", "S2"], history=timedelta(minutes=5))
+    assert history.capacity == 5
+    for minute in range(12):
+        history.append("S1", START + timedelta(minutes=minute), float(minute))
+    history.append("S2", START, 50.0)
+
+    assert history.recent("S1", timedelta(hours=1)) == [
+        (START + timedelta(minutes=minute), float(minute)) for minute in range(7, 12)
+    ]
+    _assert_aligned(history.latest_loads(), [11.0, 50.0])
+    _assert_aligned(history.window_slope(timedelta(hours=1)), [1.0, math.nan])
+    assert history.latest_timestamp == START + timedelta(minutes=11)
+
+
+def test_empty_history_and_invalid_settings():
+    history = SegmentLoadHistory(["S1"])
+    assert np.isnan(history.window_max()).all() and np.isnan(history.window_slope()).all()
+    assert np.isnan(history.latest_loads()).all()
+    assert history.recent("S1") == []
+    with pytest.raises(ValueError):
+        SegmentLoadHistory(["S1"], sample_interval=timedelta(0))
+
+
+def test_trend_alerts_flag_only_segments_rising_toward_the_threshold(monkeypatch):
+    monkeypatch.chdir(PROJECT_DIR)
+    monitor = GridMonitoringSystem()
+    segments = monitor.grid_state["topology"].segments
+    rising, flat, steep_but_far = segments[0], segments[1], segments[2]
+    for minute in range(16):
+        timestamp = START + timedelta(minutes=minute)
+        # Ends 10 MW below 90% of capacity while gaining 2 MW/min: crosses in ~5 minutes
+        monitor.update_segment_load(rising.segment_id,
+                                    rising.max_capacity_mw * 0.9 - 10 - 2 * (15 - minute), timestamp)
+        monitor.update_segment_load(flat.segment_id, flat.max_capacity_mw * 0.5, timestamp)
+        # Rising 1.5 MW/min but over 30 minutes away from the threshold
+        monitor.update_segment_load(steep_but_far.segment_id,
+                                    steep_but_far.max_capacity_mw * 0.9 - 60 - 1.5 * (15 - minute), timestamp)
+
+    alerts = monitor.generate_trend_alerts()
+    assert [alert["segment_id"] for alert in alerts] == [rising.segment_id]
+    assert alerts[0]["rate_mw_per_min"] == pytest.approx(2.0)
+    assert alerts[0]["minutes_to_threshold"] == pytest.approx(5.0)
+    assert monitor.generate_trend_alerts(exclude_segment_ids=[rising.segment_id]) == []
@@ -0,0 +1,116 @@
+"""
+Tests for the compact measurement record and the array-backed measurement batch.
+"""
+
+import random
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.models.load_measurements import (
+    QUALITY_CODES, CompactLoadMeasurement, LoadMeasurement, LoadMeasurementBatch, MeasurementQuality, QualityMask,
+)
+from src.services.data_processor import LoadDataProcessor
+
+START = datetime(2025, 6, 1)
+QUALITIES = list(MeasurementQuality)
+
+
+def _measurements(rng, count=1500):
+    return [
+        LoadMeasurement(
+            timestamp=START + timedelta(seconds=rng.randint(0, 2 * 24 * 3600), microseconds=rng.randint(0, 999999)),
+            segment_id=f"S{rng.randint(1, 5)}",
+            load_mw=rng.uniform(0, 200),
+            measurement_quality=rng.choice(QUALITIES),
+        )
+        for _ in range(count)
+    ]
+
+
+def _rows(measurements):
+    return [(m.timestamp, m.segment_id, m.load_mw, m.measurement_quality) for m in measurements]
+
+
+def test_compact_record_round_trips_through_the_model():
+    measurement = LoadMeasurement(timestamp=START, segment_id="S1", load_mw=12.5,
+                                  measurement_quality=MeasurementQuality.SUSPECT)
+    compact = CompactLoadMeasurement.from_model(measurement)
+    assert compact == CompactLoadMeasurement(START, "S1", 12.5, "suspect")
+    assert compact.measurement_quality is MeasurementQuality.SUSPECT
+    assert compact.to_model() == measurement
+    assert compact != CompactLoadMeasurement(START, "S1", 12.5)
+
+
+def test_batch_appends_and_reads_back_every_row():
+    measurements = _measurements(random.Random(34))
+    batch = LoadMeasurementBatch(capacity=1)
+    for m in measurements:
+        batch.append(m.timestamp, m.segment_id, m.load_mw, m.measurement_quality)
+
+    assert len(batch) == len(measurements)
+    assert _rows(batch) == _rows(measurements)
+    assert _rows([batch[0], batch[-1]]) == _rows([measurements[0], measurements[-1]])
+    with pytest.raises(IndexError):
+        batch[len(measurements)]
+    assert _rows(LoadMeasurementBatch.from_measurements(measurements)) == _rows(measurements)
+
+
+def test_columns_round_trip_through_from_columns():
+    measurements = _measurements(random.Random(35))
+    columns = LoadMeasurementBatch.from_measurements(measurements).columns()
+    assert columns["segment_ids"].tolist() == [m.segment_id for m in measurements]
+    assert columns["hours"].tolist() == [m.timestamp.hour for m in measurements]
+    assert columns["quality_codes"].tolist() == [QUALITY_CODES[m.measurement_quality] for m in measurements]
+
+    rebuilt = LoadMeasurementBatch.from_columns(columns["timestamps"], columns["segment_ids"],
+                                                columns["loads"], columns["quality_codes"])
+    assert _rows(rebuilt) == _rows(measurements)
+    assert rebuilt.nbytes == 21 * len(measurements)
+    assert all(m.measurement_quality is MeasurementQuality.GOOD
+               for m in LoadMeasurementBatch.from_columns(columns["timestamps"], columns["segment_ids"], columns["loads"]))
+
+
+@pytest.mark.parametrize("quality_mask", list(QualityMask))
+def test_analytics_on_a_batch_match_analytics_on_models(quality_mask):
+    measurements = _measurements(random.Random(36))
+    processor = LoadDataProcessor(data_loader=None)
+    from_models = processor.analyze_load_patterns(measurements, quality_mask=quality_mask)
+    from_batch = processor.analyze_load_patterns(LoadMeasurementBatch.from_measurements(measurements),
+                                                 quality_mask=quality_mask)
+
+    assert from_batch["segment_statistics"].keys() == from_models["segment_statistics"].keys()
+    for segment_id, stats in from_models["segment_statistics"].items():
+        assert from_batch["segment_statistics"][segment_id] == pytest.approx(stats)
+    for hour, pattern in from_models["daily_load_pattern"].items():
+        assert from_batch["daily_load_pattern"][hour] == pytest.approx(pattern)
+    assert from_batch["quality_counts"] == from_models["quality_counts"]
+
+
+def test_only_the_batch_meets_the_five_fold_memory_reduction():
+    rng = np.random.default_rng(34)
+    count = 20000
+    timestamps = [START + timedelta(seconds=i) for i in range(count)]
+    segment_ids = [f"S{i % 10}" for i in range(10)]
+    loads = rng.uniform(0, 200, count).tolist()
+
+    def bytes_per_row(build):
+        tracemalloc.start()
+        built = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del built
+        return size / count
+
+    model = bytes_per_row(lambda: [LoadMeasurement(timestamp=timestamps[i] + timedelta(microseconds=1),
+                                                   segment_id=segment_ids[i % 10], load_mw=loads[i] + 1.0)
+                                   for i in range(count)])
+    compact = bytes_per_row(lambda: [CompactLoadMeasurement(timestamps[i] + timedelta(microseconds=1),
+                                                            segment_ids[i % 10], loads[i] + 1.0)
+                                     for i in range(count)])
+    batch = bytes_per_row(lambda: LoadMeasurementBatch.from_columns(
+        timestamps, [segment_ids[i % 10] for i in range(count)], loads))
+    assert model / batch >= 5
+    assert 3 <= model / compact < 5
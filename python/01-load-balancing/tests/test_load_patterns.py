@@ -0,0 +1,104 @@
+"""
+Tests for quality-aware load pattern aggregation against a per-record reference.
+"""
+
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.load_measurements import (
+    QUALITY_CODES, QUALITY_MASK_WEIGHTS, LoadMeasurement, MeasurementQuality, QualityMask,
+)
+from src.services.data_processor import LoadDataProcessor
+
+START = datetime(2025, 6, 1)
+QUALITIES = list(MeasurementQuality)
+
+
+def _measurements(rng, count=2000):
+    return [
+        LoadMeasurement(
+            timestamp=START + timedelta(minutes=rng.randint(0, 3 * 24 * 60)),
+            segment_id=rng.choice(["S1", "S2", "S3"]),
+            load_mw=rng.uniform(0, 200),
+            measurement_quality=rng.choices(QUALITIES, weights=[70, 20, 7, 3])[0],
+        )
+        for _ in range(count)
+    ]
+
+
+def _reference(measurements, weights):
+    groups = defaultdict(list)
+    hours = defaultdict(list)
+    cells = defaultdict(list)
+    for m in measurements:
+        weight = weights[QUALITY_CODES[m.measurement_quality]]
+        if weight > 0:
+            groups[m.segment_id].append((weight, m.load_mw))
+            hours[m.timestamp.hour].append((weight, m.load_mw))
+            cells[(m.segment_id, m.timestamp.hour)].append((weight, m.load_mw))
+
+    def weighted_mean(pairs):
+        return sum(w * x for w, x in pairs) / sum(w for w, _ in pairs)
+
+    stats = {}
+    for segment_id, pairs in groups.items():
+        mean = weighted_mean(pairs)
+        total = sum(w for w, _ in pairs)
+        denominator = total - sum(w * w for w, _ in pairs) / total
+        stats[segment_id] = {
+            "average_load": mean,
+            "peak_load": max(x for _, x in pairs),
+            "min_load": min(x for _, x in pairs),
+            "load_variance": sum(w * (x - mean) ** 2 for w, x in pairs) / denominator if len(pairs) > 1 else 0,
+            "measurement_count": len(pairs),
+        }
+    daily = {hour: {"average_load": weighted_mean(pairs), "load_count": len(pairs)} for hour, pairs in hours.items()}
+    by_cell = {key: (weighted_mean(pairs), len(pairs), sum(w for w, _ in pairs)) for key, pairs in cells.items()}
+    return stats, daily, by_cell
+
+
+@pytest.mark.parametrize("quality_mask, quality_weights", [
+    (QualityMask.GOOD_ONLY, None),
+    (QualityMask.GOOD_AND_SUSPECT, None),
+    (QualityMask.WEIGHTED, None),
+    (QualityMask.WEIGHTED, (1.0, 0.25, 0.0, 0.0)),
+])
+def test_masked_aggregation_matches_reference(quality_mask, quality_weights):
+    measurements = _measurements(random.Random(30))
+    weights = quality_weights or QUALITY_MASK_WEIGHTS[quality_mask]
+    analysis = LoadDataProcessor(data_loader=None).analyze_load_patterns(
+        measurements, quality_mask=quality_mask, quality_weights=quality_weights, by_segment_hour=True)
+    stats, daily, by_cell = _reference(measurements, weights)
+
+    assert analysis["segment_statistics"].keys() == stats.keys()
+    for segment_id, expected in stats.items():
+        assert analysis["segment_statistics"][segment_id] == pytest.approx(expected)
+    assert analysis["daily_load_pattern"].keys() == daily.keys()
+    for hour, expected in daily.items():
+        assert analysis["daily_load_pattern"][hour] == pytest.approx(expected)
+    assert analysis["included_measurements"] == sum(
+        1 for m in measurements if weights[QUALITY_CODES[m.measurement_quality]] > 0)
+    assert analysis["quality_counts"] == {
+        quality.value: sum(1 for m in measurements if m.measurement_quality == quality) for quality in QUALITIES
+    }
+    for (segment_id, hour), (average, count, weight_total) in by_cell.items():
+        cell = analysis["segment_hourly_pattern"][segment_id][hour]
+        assert cell["average_load"] == pytest.approx(average)
+        assert cell["load_count"] == count
+        assert cell["weight_total"] == pytest.approx(weight_total)
+
+
+def test_bad_and_missing_readings_never_set_peaks():
+    measurements = [
+        LoadMeasurement(timestamp=START, segment_id="S1", load_mw=10.0),
+        LoadMeasurement(timestamp=START, segment_id="S1", load_mw=999.0, measurement_quality=MeasurementQuality.BAD),
+        LoadMeasurement(timestamp=START, segment_id="S2", load_mw=5.0, measurement_quality=MeasurementQuality.MISSING),
+    ]
+    analysis = LoadDataProcessor(data_loader=None).analyze_load_patterns(measurements, QualityMask.WEIGHTED)
+    assert analysis["segment_statistics"] == {
+        "S1": {"average_load": 10.0, "peak_load": 10.0, "min_load": 10.0, "load_variance": 0, "measurement_count": 1}
+    }
+    assert analysis["total_measurements"] == 3 and analysis["included_measurements"] == 1
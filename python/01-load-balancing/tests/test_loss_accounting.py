@@ -0,0 +1,124 @@
+"""
+Tests for transmission loss accounting and grid efficiency metrics.
+"""
+
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.grid_infrastructure import GridSegment, GridTopology, PowerTransferPath
+from src.services.data_processor import LoadDataProcessor
+from src.services.loss_accounting import TransmissionLossLedger
+
+
+def _topology(rng, n_segments=6):
+    segments = [
+        GridSegment(segment_id=f"S{i}", name=f"Segment {i}", max_capacity_mw=rng.uniform(80, 200),
+                    current_load_mw=0.0, latitude=40.0, longitude=-74.0, safety_threshold_pct=85.0)
+        for i in range(n_segments)
+    ]
+    paths = [
+        PowerTransferPath(from_segment_id=f"S{a}", to_segment_id=f"S{b}", max_transfer_mw=50.0,
+                          power_loss_pct=rng.uniform(0, 5))
+        for a in range(n_segments) for b in range(n_segments) if a != b
+    ]
+    return GridTopology(segments=segments, transfer_paths=paths)
+
+
+def _expected_losses(topology, transfers):
+    loss_pct = {(p.from_segment_id, p.to_segment_id): p.power_loss_pct for p in topology.transfer_paths}
+    by_path, by_segment = {}, defaultdict(float)
+    for transfer in transfers:
+        loss = transfer["transfer_mw"] * loss_pct[(transfer["from_segment_id"], transfer["to_segment_id"])] / 100
+        by_path[f"{transfer['from_segment_id']}->{transfer['to_segment_id']}"] = loss
+        by_segment[transfer["from_segment_id"]] += loss
+    return by_path, dict(by_segment)
+
+
+def _random_transfers(rng, n_segments=6):
+    pairs = rng.sample([(a, b) for a in range(n_segments) for b in range(n_segments) if a != b], rng.randint(0, 8))
+    return [
+        {"from_segment_id": f"S{a}", "to_segment_id": f"S{b}", "transfer_mw": float(rng.randint(1, 50))}
+        for a, b in pairs
+    ]
+
+
+def test_ledger_totals_match_recomputation_after_path_changes():
+    rng = random.Random(28)
+    topology = _topology(rng)
+    ledger = TransmissionLossLedger(topology)
+    transfers = []
+    for _ in range(200):
+        # Keep some transfers, change the amount of others, and add or drop paths
+        kept = [dict(t, transfer_mw=float(rng.randint(1, 50))) if rng.random() < 0.3 else t
+                for t in transfers if rng.random() < 0.7]
+        used = {(t["from_segment_id"], t["to_segment_id"]) for t in kept}
+        transfers = kept + [t for t in _random_transfers(rng)
+                            if (t["from_segment_id"], t["to_segment_id"]) not in used][:3]
+        ledger.sync(transfers)
+
+        by_path, by_segment = _expected_losses(topology, transfers)
+        summary = ledger.summary()
+        assert summary["power_loss_by_path_mw"] == pytest.approx(by_path)
+        assert summary["power_loss_by_segment_mw"].keys() == by_segment.keys()
+        assert summary["power_loss_by_segment_mw"] == pytest.approx(by_segment)
+        assert summary["total_power_loss_mw"] == pytest.approx(sum(by_path.values()), abs=1e-9)
+        assert summary["total_transferred_mw"] == pytest.approx(sum(t["transfer_mw"] for t in transfers), abs=1e-9)
+
+
+def test_sync_only_touches_changed_transfers():
+    rng = random.Random(3)
+    ledger = TransmissionLossLedger(_topology(rng))
+    transfers = [
+        {"from_segment_id": "S0", "to_segment_id": "S1", "transfer_mw": 10.0},
+        {"from_segment_id": "S2", "to_segment_id": "S3", "transfer_mw": 20.0},
+    ]
+    assert ledger.sync(transfers) == 2
+    assert ledger.sync(transfers) == 0
+    assert ledger.sync([transfers[0], dict(transfers[1], transfer_mw=5.0)]) == 1
+    assert ledger.sync([transfers[0]]) == 1
+    assert ledger.sync([]) == 1
+    assert ledger.summary()["total_power_loss_mw"] == 0.0
+
+
+def test_unknown_path_is_rejected():
+    ledger = TransmissionLossLedger(_topology(random.Random(4), n_segments=2))
+    with pytest.raises(ValueError):
+        ledger.upsert_transfer({"from_segment_id": "S0", "to_segment_id": "S9", "transfer_mw": 1.0})
+
+
+def test_efficiency_metrics_report_losses_and_load_factors():
+    rng = random.Random(5)
+    topology = _topology(rng, n_segments=3)
+    grid_state = {"topology": topology, "total_capacity_mw": 400.0, "total_current_load_mw": 300.0}
+    transfers = [{"from_segment_id": "S0", "to_segment_id": "S1", "transfer_mw": 30.0}]
+    start = datetime(2025, 6, 1)
+    measurements = [
+        {"segment_id": f"S{s}", "timestamp": start + timedelta(minutes=15 * t), "load_mw": rng.uniform(10, 80)}
+        for t in range(20) for s in range(3)
+    ]
+
+    processor = LoadDataProcessor(data_loader=None)
+    metrics = processor.calculate_grid_efficiency_metrics(grid_state, transfers, measurements)
+    by_path, _ = _expected_losses(topology, transfers)
+    assert metrics["overall_grid_utilization_pct"] == pytest.approx(75.0)
+    assert metrics["total_power_loss_mw"] == pytest.approx(sum(by_path.values()))
+
+    # Omitting the transfers reports the previous cycle's totals
+    assert processor.calculate_grid_efficiency_metrics(grid_state)["total_power_loss_mw"] == metrics["total_power_loss_mw"]
+
+    loads = defaultdict(list)
+    system = defaultdict(float)
+    for m in measurements:
+        loads[m["segment_id"]].append(m["load_mw"])
+        system[m["timestamp"]] += m["load_mw"]
+    system_peak = max(system.values())
+    assert metrics["load_factor"] == pytest.approx(sum(system.values()) / len(system) / system_peak)
+    assert metrics["diversity_factor"] == pytest.approx(sum(max(v) for v in loads.values()) / system_peak)
+    for segment in topology.segments:
+        values = loads[segment.segment_id]
+        assert metrics["segment_load_factor"][segment.segment_id] == pytest.approx(sum(values) / len(values) / max(values))
+        assert metrics["segment_capacity_factor"][segment.segment_id] == pytest.approx(
+            sum(values) / len(values) / segment.max_capacity_mw)
@@ -0,0 +1,114 @@
+"""
+Tests for per-region daily reports rendered on a process pool.
+"""
+
+import csv
+import io
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.models.load_measurements import LoadMeasurement
+from src.reports import grid_reports
+from src.reports.grid_reports import REGION_REPORT_COLUMNS, GridReports
+from src.services.data_processor import LoadDataProcessor
+from src.services.monitoring_system import GridMonitoringSystem
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+START = datetime(2025, 6, 1)
+
+
+class FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 6, 2, 6, 0)
+
+
+@pytest.fixture
+def reports(monkeypatch):
+    monkeypatch.chdir(PROJECT_DIR)
+    monkeypatch.setattr(grid_reports, "datetime", FixedDatetime)
+    monitor = GridMonitoringSystem()
+    reports = GridReports(monitor.data_loader, LoadDataProcessor(monitor.data_loader), monitor)
+    return reports, monitor.grid_state
+
+
+def _measurements(rng, segment_ids, count=1500):
+    return [
+        LoadMeasurement(timestamp=START + timedelta(minutes=rng.randint(0, 24 * 60 - 1)),
+                        segment_id=rng.choice(segment_ids), load_mw=rng.uniform(0, 150))
+        for _ in range(count)
+    ]
+
+
+def _regions(segment_ids):
+    return {
+        "North": segment_ids[::2],
+        "South": segment_ids[1::2] + ["GRID_UNKNOWN"],
+        "Whole grid": list(segment_ids),
+        "Empty": [],
+    }
+
+
+def test_pool_rendering_matches_serial_rendering(reports):
+    reports, grid_state = reports
+    segment_ids = [segment.segment_id for segment in grid_state["topology"].segments]
+    measurements = _measurements(random.Random(37), segment_ids)
+    regions = _regions(segment_ids)
+    serial = reports.generate_region_reports(regions, grid_state, measurements, max_workers=1)
+    pooled = reports.generate_region_reports(regions, grid_state, measurements, max_workers=3)
+    assert pooled == serial
+    assert list(pooled) == list(regions)
+
+
+def test_region_contents_agree_with_the_grid_summary(reports):
+    reports, grid_state = reports
+    segments = grid_state["topology"].segments
+    segment_ids = [segment.segment_id for segment in segments]
+    measurements = _measurements(random.Random(38), segment_ids)
+    results = reports.generate_region_reports(_regions(segment_ids), grid_state, measurements, max_workers=1)
+    alert_levels = reports.monitoring_system.segment_alert_levels()
+
+    # The whole-grid region combines per-segment hourly averages back into the grid-wide pattern
+    summary = reports.generate_daily_performance_summary(grid_state, measurements)
+    whole = results["Whole grid"]["text"]
+    peak_line = next(line for line in summary.splitlines() if "Peak Load Hour" in line)
+    assert peak_line in whole.splitlines()
+    assert whole.split("2. Segment Utilization Summary:")[1] == summary.split("2. Segment Utilization Summary:")[1]
+
+    for region, segment_ids_in_region in _regions(segment_ids).items():
+        result = results[region]
+        known = [segment_id for segment_id in segment_ids_in_region if segment_id in segment_ids]
+        assert result["segment_count"] == len(known)
+        expected_alerts = {}
+        for segment_id in known:
+            if alert_levels[segment_id] != "NORMAL":
+                expected_alerts[alert_levels[segment_id]] = expected_alerts.get(alert_levels[segment_id], 0) + 1
+        assert result["alert_counts"] == expected_alerts
+
+        rows = list(csv.DictReader(io.StringIO(result["csv"])))
+        assert [row["segment_id"] for row in rows] == known
+        counts = {segment_id: sum(1 for m in measurements if m.segment_id == segment_id) for segment_id in known}
+        assert {row["segment_id"]: int(row["measurement_count"]) for row in rows} == counts
+        if counts:
+            assert f"Total Measurements Analyzed: {sum(counts.values())}" in result["text"]
+        assert f"--- Daily Grid Performance Summary: {region} - 2025-06-02 06:00:00 ---" in result["text"]
+
+    assert "Segments not in topology: GRID_UNKNOWN" in results["South"]["text"]
+    assert "No measurement data available" in results["Empty"]["text"]
+
+
+def test_reports_are_written_to_output_dir(reports, tmp_path):
+    reports, grid_state = reports
+    segment_ids = [segment.segment_id for segment in grid_state["topology"].segments]
+    results = reports.generate_region_reports({"North/East": segment_ids[:2]}, grid_state, [],
+                                              output_dir=str(tmp_path / "reports"))
+    result = results["North/East"]
+    assert Path(result["text_path"]) == (tmp_path / "reports" / "North_East_daily_summary.txt").resolve()
+    assert "Region Metrics" in Path(result["text_path"]).read_text()
+    with open(result["csv_path"], newline="") as f:
+        reader = csv.DictReader(f)
+        assert reader.fieldnames == REGION_REPORT_COLUMNS
+        assert [row["segment_id"] for row in reader] == segment_ids[:2]
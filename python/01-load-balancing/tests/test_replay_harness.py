@@ -0,0 +1,102 @@
+"""
+Tests for the historical replay harness's simulated clock.
+"""
+
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.models.load_measurements import LoadMeasurement
+from src.services.load_balancer import GridLoadBalancer
+from src.services.monitoring_system import GridMonitoringSystem
+from src.services.replay_harness import GridReplayHarness
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+START = datetime(2025, 6, 1, 8, 0)
+
+
+class RecordingService:
+    """Stands in for the monitor and balancer, reporting which measurements each tick saw."""
+
+    def __init__(self):
+        self.applied = []
+
+    def apply_measurements(self, batch):
+        self.applied.extend(batch)
+
+    def check_all_segments(self, commit=False):
+        return [{"seen": len(self.applied), "commit": commit}]
+
+    def calculate_optimal_transfers(self):
+        return [{"seen": len(self.applied)}]
+
+
+def _measurements(rng, count=300):
+    return [
+        LoadMeasurement(timestamp=START + timedelta(seconds=rng.randint(0, 3 * 3600)),
+                        segment_id=f"S{rng.randint(1, 4)}", load_mw=rng.uniform(0, 100))
+        for _ in range(count)
+    ]
+
+
+def _expected_ticks(timestamps, interval):
+    start, end = min(timestamps), max(timestamps)
+    ticks = []
+    tick = start
+    while tick <= end:
+        ticks.append((tick, sum(1 for t in timestamps if t <= tick)))
+        tick += interval
+    return ticks
+
+
+def test_ticks_see_measurements_up_to_their_time():
+    measurements = _measurements(random.Random(32))
+    monitor, balancer = RecordingService(), RecordingService()
+    harness = GridReplayHarness(monitor, balancer, monitor_interval=timedelta(minutes=7),
+                                balance_interval=timedelta(minutes=30))
+    rng = random.Random(1)
+    shuffled = rng.sample(measurements, len(measurements))
+    summary = harness.run(shuffled)
+
+    timestamps = [m.timestamp for m in measurements]
+    alerts = [(a["simulated_time"], a["seen"]) for a in summary["alerts"]]
+    transfers = [(t["simulated_time"], t["seen"]) for t in summary["transfers"]]
+    assert alerts == _expected_ticks(timestamps, timedelta(minutes=7))
+    assert transfers == _expected_ticks(timestamps, timedelta(minutes=30))
+    assert all(a["commit"] for a in summary["alerts"])
+    assert summary["monitor_cycles"] == len(alerts) and summary["balance_cycles"] == len(transfers)
+    assert summary["measurements_replayed"] == len(measurements)
+    assert [m.timestamp for m in monitor.applied] == sorted(timestamps)
+
+
+def test_paced_replay_takes_simulated_time_over_speedup():
+    measurements = [
+        LoadMeasurement(timestamp=START + timedelta(minutes=minute), segment_id="S1", load_mw=10.0)
+        for minute in range(0, 31, 5)
+    ]
+    # 30 simulated minutes at 6000x real time take about 0.3 s
+    summary = GridReplayHarness(RecordingService(), RecordingService(), speedup=6000).run(measurements)
+    assert 0.25 <= summary["wall_seconds"] < 2.0
+    assert summary["effective_speedup"] <= 6000 * 1.05
+
+
+def test_invalid_settings_and_empty_replay():
+    with pytest.raises(ValueError):
+        GridReplayHarness(RecordingService(), RecordingService(), monitor_interval=timedelta(0))
+    with pytest.raises(ValueError):
+        GridReplayHarness(RecordingService(), RecordingService(), speedup=0)
+    summary = GridReplayHarness(RecordingService(), RecordingService()).run([])
+    assert summary["alerts"] == [] and summary["monitor_cycles"] == 0
+
+
+def test_replays_recorded_data_through_real_services(monkeypatch):
+    monkeypatch.chdir(PROJECT_DIR)
+    monitor = GridMonitoringSystem()
+    harness = GridReplayHarness(monitor, GridLoadBalancer(), monitor_interval=timedelta(minutes=15),
+                                balance_interval=timedelta(hours=1))
+    summary = harness.run_files(monitor.data_loader, "sample_load_data.csv")
+    assert summary["measurements_replayed"] == summary["file_reports"][0]["rows_loaded"] > 0
+    assert summary["monitor_cycles"] > 0 and summary["balance_cycles"] > 0
+    assert all(alert["segment_id"] in monitor.capacity_index for alert in summary["alerts"])
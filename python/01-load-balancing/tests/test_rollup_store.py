@@ -0,0 +1,121 @@
+"""
+Tests for the multi-resolution rollup store against recomputing from raw measurements.
+"""
+
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.services.rollup_store import MeasurementRollupStore, QuantileSketch, next_period, period_start
+
+START = datetime(2024, 11, 20)
+
+
+def _measurements(rng, segments=("S1", "S2"), days=75):
+    # 15-minute readings for a few months, crossing a year boundary
+    return [
+        {"segment_id": segment_id, "timestamp": START + timedelta(minutes=15 * i), "load_mw": rng.uniform(0, 150)}
+        for i in range(days * 96) for segment_id in segments
+        if rng.random() < 0.9
+    ]
+
+
+def _raw_stats(values):
+    ordered = sorted(values)
+    return {
+        "average_load": sum(values) / len(values),
+        "min_load": ordered[0],
+        "peak_load": ordered[-1],
+        "measurement_count": len(values),
+        "p95": ordered[int(0.95 * (len(values) - 1))],
+    }
+
+
+def _assert_bucket_matches(stats, values):
+    expected = _raw_stats(values)
+    assert stats["measurement_count"] == expected["measurement_count"]
+    assert stats["average_load"] == pytest.approx(expected["average_load"])
+    assert stats["min_load"] == expected["min_load"]
+    assert stats["peak_load"] == expected["peak_load"]
+    assert stats["p95_load"] == pytest.approx(expected["p95"], rel=0.011)
+
+
+@pytest.fixture(scope="module")
+def loaded():
+    rng = random.Random(29)
+    measurements = _measurements(rng)
+    store = MeasurementRollupStore()
+    rng.shuffle(measurements)
+    assert store.add_measurements(measurements) == len(measurements)
+    return store, measurements
+
+
+@pytest.mark.parametrize("resolution", ["hourly", "daily", "monthly"])
+def test_trend_matches_raw_grouping(loaded, resolution):
+    store, measurements = loaded
+    raw = defaultdict(list)
+    for m in measurements:
+        if m["segment_id"] == "S1":
+            raw[period_start(m["timestamp"], resolution)].append(m["load_mw"])
+
+    used, series = store.trend("S1", resolution=resolution)
+    assert used == resolution
+    assert [point["period_start"] for point in series] == sorted(raw)
+    for point in series:
+        _assert_bucket_matches(point, raw[point["period_start"]])
+
+
+def test_summarize_matches_raw_range(loaded):
+    store, measurements = loaded
+    rng = random.Random(7)
+    for _ in range(20):
+        start = START + timedelta(minutes=rng.randint(0, 70 * 24 * 60))
+        end = start + timedelta(minutes=rng.randint(60, 60 * 24 * 60))
+        # Hours only partly inside the range count in full, at either end
+        first_hour = period_start(start, "hourly")
+        last_hour = period_start(end, "hourly")
+        end_hour = last_hour if last_hour == end else next_period(last_hour, "hourly")
+        values = [m["load_mw"] for m in measurements
+                  if m["segment_id"] == "S2" and first_hour <= m["timestamp"] < end_hour]
+        _assert_bucket_matches(store.summarize("S2", start, end), values)
+
+
+def test_automatic_resolution_keeps_series_short(loaded):
+    store, _ = loaded
+    assert store.trend("S1", START, START + timedelta(days=2))[0] == "hourly"
+    assert store.trend("S1", START, START + timedelta(days=60))[0] == "daily"
+    resolution, series = store.trend("S1", START, START + timedelta(days=60), max_points=2)
+    assert resolution == "monthly" and len(series) == 3
+
+
+def test_watermark_skips_duplicates_and_late_readings():
+    store = MeasurementRollupStore()
+    assert store.add_measurement("S1", START, 10.0)
+    assert store.add_measurement("S1", START + timedelta(hours=1), 20.0)
+    assert not store.add_measurement("S1", START + timedelta(hours=1), 30.0)
+    assert not store.add_measurement("S1", START, 40.0)
+    assert store.duplicate_counts["S1"] == 1 and store.late_counts["S1"] == 1
+    assert store.summarize("S1", START, START + timedelta(days=1))["measurement_count"] == 2
+
+
+def test_sketch_quantiles_are_within_relative_accuracy():
+    rng = random.Random(1)
+    values = [rng.lognormvariate(3, 1) for _ in range(5000)] + [0.0] * 100
+    halves = QuantileSketch(), QuantileSketch()
+    for i, value in enumerate(values):
+        halves[i % 2].add(value)
+    halves[0].merge(halves[1])
+    ordered = sorted(values)
+    for q in (0.0, 0.01, 0.25, 0.5, 0.9, 0.99, 1.0):
+        expected = ordered[int(q * (len(values) - 1))]
+        assert halves[0].quantile(q) == pytest.approx(expected, rel=0.01, abs=1e-12)
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_period_helpers_step_across_year_end():
+    assert next_period(datetime(2024, 12, 1), "monthly") == datetime(2025, 1, 1)
+    assert period_start(datetime(2024, 12, 31, 23, 59), "daily") == datetime(2024, 12, 31)
+    with pytest.raises(ValueError):
+        period_start(START, "weekly")
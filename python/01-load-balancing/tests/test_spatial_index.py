@@ -0,0 +1,51 @@
+"""
+Tests for the geographic k-d tree against brute-force Haversine distances.
+"""
+
+import numpy as np
+
+from src.utils.spatial_index import GeoSpatialIndex, haversine_km
+
+
+def _random_index(rng, count, leaf_size=4):
+    latitudes = rng.uniform(-80, 80, count)
+    longitudes = rng.uniform(-180, 180, count)
+    keys = [f"P{i}" for i in range(count)]
+    return GeoSpatialIndex(keys, latitudes, longitudes, leaf_size=leaf_size), latitudes, longitudes
+
+
+def test_query_radius_matches_brute_force():
+    rng = np.random.default_rng(26)
+    index, latitudes, longitudes = _random_index(rng, 500)
+    query_lat = rng.uniform(-80, 80, 50)
+    query_lon = rng.uniform(-180, 180, 50)
+    radii = rng.uniform(10, 3000, 50)
+
+    for (indices, distances), lat, lon, radius in zip(index.query_radius(query_lat, query_lon, radii),
+                                                      query_lat, query_lon, radii):
+        all_distances = haversine_km(lat, lon, latitudes, longitudes)
+        found = set(indices.tolist())
+        # Points within rounding distance of the boundary may fall either way
+        assert set(np.flatnonzero(all_distances <= radius - 1e-6).tolist()) <= found
+        assert found <= set(np.flatnonzero(all_distances <= radius + 1e-6).tolist())
+        np.testing.assert_allclose(distances, all_distances[indices], atol=1e-6)
+        assert np.all(np.diff(distances) >= 0)
+
+
+def test_query_nearest_matches_brute_force():
+    rng = np.random.default_rng(3)
+    index, latitudes, longitudes = _random_index(rng, 300)
+    query_lat = rng.uniform(-80, 80, 40)
+    query_lon = rng.uniform(-180, 180, 40)
+
+    for k in (1, 5, 300):
+        for (indices, distances), lat, lon in zip(index.query_nearest(query_lat, query_lon, k), query_lat, query_lon):
+            expected = np.sort(haversine_km(lat, lon, latitudes, longitudes))[:k]
+            assert len(indices) == k
+            np.testing.assert_allclose(distances, expected, atol=1e-6)
+
+
+def test_points_across_the_antimeridian_are_found():
+    index = GeoSpatialIndex(["east", "west", "far"], [0.0, 0.0, 0.0], [179.9, -179.9, 0.0], leaf_size=1)
+    (indices, distances), = index.query_radius(0.0, 180.0, 50.0)
+    assert sorted(index.keys[i] for i in indices) == ["east", "west"]
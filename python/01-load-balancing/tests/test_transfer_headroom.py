@@ -0,0 +1,110 @@
+"""
+Tests for transfer headroom queries against a brute-force minimum cut.
+"""
+
+import itertools
+import random
+
+import pytest
+
+from src.models.grid_infrastructure import GridSegment, GridTopology, PowerTransferPath
+from src.services.transfer_headroom import TransferHeadroomService
+
+
+def _random_topology(rng, n_segments=6, n_paths=12):
+    segments = [
+        GridSegment(
+            segment_id=f"S{i}", name=f"Segment {i}", max_capacity_mw=100.0,
+            current_load_mw=rng.uniform(0, 100), latitude=40.0, longitude=-74.0,
+            safety_threshold_pct=rng.choice([80.0, 90.0]),
+        )
+        for i in range(n_segments)
+    ]
+    pairs = rng.sample([(a, b) for a in range(n_segments) for b in range(n_segments) if a != b], n_paths)
+    paths = [
+        PowerTransferPath(from_segment_id=f"S{a}", to_segment_id=f"S{b}", max_transfer_mw=rng.uniform(5, 60),
+                          power_loss_pct=rng.uniform(0, 5))
+        for a, b in pairs
+    ]
+    return GridTopology(segments=segments, transfer_paths=paths)
+
+
+def _min_cut_mw(topology, sources, sinks):
+    """Max flow by enumerating every source/sink side split of the segments (max-flow = min-cut)."""
+    segments = {segment.segment_id: segment for segment in topology.segments}
+    best = float("inf")
+    for size in range(len(segments) + 1):
+        for source_side in map(set, itertools.combinations(segments, size)):
+            cut = sum(segments[s].current_load_mw for s in sources if s not in source_side)
+            cut += sum(
+                max(0.0, segments[s].max_capacity_mw * segments[s].safety_threshold_pct / 100 - segments[s].current_load_mw)
+                for s in sinks if s in source_side
+            )
+            cut += sum(
+                path.max_transfer_mw for path in topology.transfer_paths
+                if path.status == "ACTIVE" and path.from_segment_id in source_side and path.to_segment_id not in source_side
+            )
+            best = min(best, cut)
+    return best
+
+
+def _check(service, topology, sources, sinks):
+    result = service.headroom(sources, sinks)
+    assert result["transferable_mw"] == pytest.approx(_min_cut_mw(topology, sources, sinks), abs=1e-6)
+    assert sum(route["transfer_mw"] for route in result["routes"]) == pytest.approx(result["transferable_mw"])
+
+    # Delivered MW is what the reported routes deliver after each path's losses
+    paths = {(path.from_segment_id, path.to_segment_id): path for path in topology.transfer_paths}
+    delivered = 0.0
+    for route in result["routes"]:
+        assert route["route"][0] in sources and route["route"][-1] in sinks
+        factor = 1.0
+        for hop in zip(route["route"], route["route"][1:]):
+            assert paths[hop].status == "ACTIVE"
+            factor *= 1 - paths[hop].power_loss_pct / 100
+        assert route["delivered_mw"] == pytest.approx(route["transfer_mw"] * factor)
+        delivered += route["delivered_mw"]
+    assert result["route_delivered_mw"] == pytest.approx(delivered)
+    assert result["route_loss_mw"] == pytest.approx(result["transferable_mw"] - delivered)
+    assert result["route_delivered_mw"] <= result["transferable_mw"] + 1e-9
+
+
+def test_headroom_matches_min_cut():
+    rng = random.Random(26)
+    for _ in range(20):
+        topology = _random_topology(rng)
+        service = TransferHeadroomService(topology)
+        ids = [segment.segment_id for segment in topology.segments]
+        for _ in range(5):
+            chosen = rng.sample(ids, rng.randint(2, 4))
+            split = rng.randint(1, len(chosen) - 1)
+            _check(service, topology, chosen[:split], chosen[split:])
+
+
+def test_cached_queries_stay_exact_after_path_and_load_changes():
+    rng = random.Random(11)
+    topology = _random_topology(rng)
+    service = TransferHeadroomService(topology)
+    queries = [(["S0"], ["S5"]), (["S0", "S1"], ["S4", "S5"]), (["S2"], ["S3"])]
+    for sources, sinks in queries:
+        _check(service, topology, sources, sinks)
+
+    for _ in range(60):
+        if rng.random() < 0.5:
+            path = rng.choice(topology.transfer_paths)
+            status = "OUT_OF_SERVICE" if path.status == "ACTIVE" else "ACTIVE"
+            service.set_path_status(path.from_segment_id, path.to_segment_id, status)
+        else:
+            segment = rng.choice(topology.segments)
+            segment.current_load_mw = rng.uniform(0, 100)
+            service.refresh_segment(segment.segment_id)
+        for sources, sinks in queries:
+            _check(service, topology, sources, sinks)
+
+
+def test_rejects_overlapping_or_unknown_segments():
+    service = TransferHeadroomService(_random_topology(random.Random(1)))
+    with pytest.raises(ValueError):
+        service.headroom("S0", "S0")
+    with pytest.raises(ValueError):
+        service.headroom("S0", "NOPE")
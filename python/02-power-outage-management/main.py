@@ -74,6 +74,7 @@ def main():
     for key, value in stats.items():
         print(f"  {key}: {value}")
 
+    customer_notifier.close()
     print("\nSimulation complete.")
 
 if __name__ == "__main__":
@@ -5,9 +5,10 @@ Supports optimal dispatch and workload balancing across service territory.
 
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Tuple
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 from enum import Enum
 import math
+import uuid
 
 class CrewSpecialization(str, Enum):
     """Different types of field crew specializations for outage restoration"""
@@ -24,6 +25,24 @@ class CrewStatus(str, Enum):
     RETURNING = "returning"      # Returning to base
     OFF_DUTY = "off_duty"       # Not available for assignments
 
+# Business Rules for Specialization Matching: score of a crew specialization (first)
+# doing work that needs another specialization (second)
+EXACT_MATCH_SCORE = 100
+SPECIALIZATION_MATCH_SCORES: Dict[Tuple[CrewSpecialization, CrewSpecialization], int] = {
+    (CrewSpecialization.LINE_WORKER, CrewSpecialization.EMERGENCY_RESPONSE): 75,
+    (CrewSpecialization.EMERGENCY_RESPONSE, CrewSpecialization.LINE_WORKER): 50,
+    (CrewSpecialization.EMERGENCY_RESPONSE, CrewSpecialization.TREE_REMOVAL): 50,
+    (CrewSpecialization.EMERGENCY_RESPONSE, CrewSpecialization.SUBSTATION_TECH): 50,
+}
+BASIC_MATCH_SCORE = 25
+
+def specialization_match_score(crew_specialization: CrewSpecialization,
+                               required_specialization: CrewSpecialization) -> int:
+    """Match score (0-100) of a crew specialization for work needing another specialization."""
+    if crew_specialization == required_specialization:
+        return EXACT_MATCH_SCORE
+    return SPECIALIZATION_MATCH_SCORES.get((crew_specialization, required_specialization), BASIC_MATCH_SCORE)
+
 class FieldCrew(BaseModel):
     """
     Field crew with specializations, equipment, and real-time status tracking.
@@ -38,7 +57,7 @@ class FieldCrew(BaseModel):
     
     # Specialization and capabilities
     specialization: CrewSpecialization
-    skill_level: str = Field(..., regex="^(JUNIOR|SENIOR|EXPERT)$")
+    skill_level: str = Field(..., pattern="^(JUNIOR|SENIOR|EXPERT)$")
     certifications: List[str] = Field(default_factory=list)
     equipment: List[str] = Field(default_factory=list)
     
@@ -69,14 +88,12 @@ class FieldCrew(BaseModel):
         Returns:
             True if crew can accept new assignments
         """
-        # TODO: Implement availability checking logic using business rules above
-        # TODO: Check status is AVAILABLE or RETURNING
-        # TODO: Verify hours_worked_today < 16
-        # TODO: Check shift_end is more than 4 hours away
-        # TODO: Ensure len(current_assignments) < 2
-        # TODO: Return boolean result
-        
-        return False  # Placeholder - implement in tasks
+        return (
+            self.status in (CrewStatus.AVAILABLE, CrewStatus.RETURNING)
+            and self.hours_worked_today < 16
+            and self.shift_end - datetime.now() > timedelta(hours=4)
+            and len(self.current_assignments) < 2
+        )
     
     def calculate_response_time(self, incident_latitude: float, incident_longitude: float) -> int:
         """
@@ -119,12 +136,7 @@ class FieldCrew(BaseModel):
         Returns:
             Match score from 0-100 (higher is better)
         """
-        # TODO: Implement specialization matching logic using business rules above
-        # TODO: Check for exact match first (100 points)
-        # TODO: Apply cross-training rules for related specializations
-        # TODO: Return appropriate score based on match quality
-        
-        return 50  # Placeholder - implement in tasks
+        return specialization_match_score(self.specialization, required_specialization)
 
 class CrewAssignment(BaseModel):
     """
@@ -138,7 +150,7 @@ class CrewAssignment(BaseModel):
     assigned_at: datetime = Field(default_factory=datetime.now)
     
     # Assignment details
-    role: str = Field(..., regex="^(LEAD|SUPPORT|SPECIALIST)$")
+    role: str = Field(..., pattern="^(LEAD|SUPPORT|SPECIALIST)$")
     estimated_arrival: datetime
     actual_arrival: Optional[datetime] = None
     estimated_completion: datetime
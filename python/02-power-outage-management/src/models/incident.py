@@ -3,7 +3,7 @@ Outage incident models with comprehensive lifecycle tracking.
 Handles classification, severity assessment, and status management for power outages.
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Dict
 from datetime import datetime
 from enum import Enum
@@ -71,7 +71,8 @@ class OutageIncident(BaseModel):
     actual_restoration_time: Optional[datetime] = None
     last_status_update: datetime = Field(default_factory=datetime.now)
     
-    @validator('estimated_customers_affected')
+    @field_validator('estimated_customers_affected')
+    @classmethod
     def validate_customer_count(cls, v):
         """Customer count must be positive"""
         if v <= 0:
@@ -7,9 +7,46 @@ import math
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict
-from ..models.crew import FieldCrew, CrewSpecialization, CrewAssignment
-from ..models.incident import OutageIncident
+
+import numpy as np
+
+from ..models.crew import FieldCrew, CrewSpecialization, CrewAssignment, specialization_match_score
+from ..models.incident import OutageIncident, OutageCause
+from .crew_registry import CrewRegistry
+from ..utils.assignment import solve_assignment
 from ..utils.data_loader import data_loader
+from ..utils.distance_calculator import calculate_haversine_distance, haversine_distance_matrix
+from ..utils.priority_calculator import calculate_incident_priority
+
+# Crew scoring weights (see find_optimal_crew_for_incident)
+DISTANCE_PENALTY_PER_KM = 2
+EXPERIENCE_BONUS = {"EXPERT": 20, "SENIOR": 10, "JUNIOR": 0}
+MAX_CUSTOMER_BONUS = 500
+
+# Batch dispatch: points for the most urgent open incident, and for a pairing
+# beyond the allowed distance (large enough that it is only used as a last resort)
+BATCH_PRIORITY_POINTS = 1000
+INFEASIBLE_PAIR_PENALTY = 1e6
+
+# Travel estimates for emergency vehicles
+EMERGENCY_VEHICLE_SPEED_KMH = 60
+CREW_PREPARATION_MINUTES = 15
+
+# Specialization needed for each outage cause; failed substations always need SUBSTATION_TECH
+REQUIRED_SPECIALIZATION_BY_CAUSE = {
+    OutageCause.EQUIPMENT_FAILURE: CrewSpecialization.LINE_WORKER,
+    OutageCause.SEVERE_WEATHER: CrewSpecialization.LINE_WORKER,
+    OutageCause.VEHICLE_ACCIDENT: CrewSpecialization.EMERGENCY_RESPONSE,
+    OutageCause.VEGETATION: CrewSpecialization.TREE_REMOVAL,
+    OutageCause.ANIMAL_CONTACT: CrewSpecialization.LINE_WORKER,
+    OutageCause.PLANNED_MAINTENANCE: CrewSpecialization.LINE_WORKER,
+}
+
+def required_specialization(incident: OutageIncident) -> CrewSpecialization:
+    """Crew specialization an incident needs, from its failed equipment and cause."""
+    if any(equipment_id.startswith("SUB_") for equipment_id in incident.failed_equipment_ids):
+        return CrewSpecialization.SUBSTATION_TECH
+    return REQUIRED_SPECIALIZATION_BY_CAUSE.get(incident.cause, CrewSpecialization.LINE_WORKER)
 
 class CrewDispatchService:
     """
@@ -19,7 +56,8 @@ class CrewDispatchService:
     location, availability, and incident priority to minimize restoration time.
     """
     
-    def __init__(self):
+    def __init__(self, crew_registry: Optional[CrewRegistry] = None):
+        self.crew_registry = crew_registry if crew_registry is not None else CrewRegistry.from_records(self._get_all_crews())
         self.active_assignments: Dict[str, CrewAssignment] = {}  # assignment_id -> assignment details
         self.dispatch_history: List[CrewAssignment] = []
         self.performance_tracking: Dict[str, List] = defaultdict(list)
@@ -47,41 +85,166 @@ class CrewDispatchService:
         Returns:
             Dictionary with optimal crew assignment and justification
         """
-        available_crews = [
-            FieldCrew(**crew) for crew in self._get_all_crews()
-            if self._is_crew_available(crew["crew_id"])
-        ]
+        available_crews = self.crew_registry.available_crews()
         
         if not available_crews:
             return None
+        
+        # Score every crew in one vectorized pass and pick the best
+        distances = self.calculate_crew_incident_distances(available_crews, [incident])
+        scores = self.score_crews_for_incidents(available_crews, [incident], distances)
+        best_index = int(np.argmax(scores[:, 0]))
+        best_crew = available_crews[best_index]
+        distance_km = float(distances[best_index, 0])
+        
+        return {
+            "crew_id": best_crew.crew_id,
+            "total_score": float(scores[best_index, 0]),
+            "score_breakdown": {
+                "specialization": best_crew.get_specialization_match_score(required_specialization(incident)),
+                "distance_penalty": -DISTANCE_PENALTY_PER_KM * distance_km,
+                "experience_bonus": EXPERIENCE_BONUS.get(best_crew.skill_level, 0),
+                "customer_impact": min(incident.estimated_customers_affected, MAX_CUSTOMER_BONUS),
+            },
+            "distance_km": distance_km,
+            "estimated_arrival_minutes": self.estimate_travel_minutes(distance_km),
+            "assignment_justification": "Optimal match based on specialization and location"
+        }
+    
+    def dispatch_crews_batch(self, incidents: List[OutageIncident],
+                             crews: Optional[List[FieldCrew]] = None,
+                             max_distance_km: Optional[float] = None) -> Dict[str, any]:
+        """
+        Assign available crews to open incidents all at once with optimal matching.
+        
+        Scenario: Storm front produces 2,000 open incidents for 500 crews. Matching
+        incidents one at a time hands the best crews to whichever incidents came
+        first; solving the whole crew x incident assignment together does not.
+        
+        Assignment Value (maximized over all pairs, one crew per incident):
+        - Crew suitability: specialization match + experience bonus - 2 points per
+          km of travel (1 km per minute at emergency vehicle speed)
+        - Urgency weighting: suitability counts up to 2x for the most urgent
+          incidents, so EXPERT and well-matched crews go where it matters most
+        - Priority points: 0-1000 from calculate_incident_priority relative to the
+          most urgent incident, deciding which incidents are served when crews run short
+        - Pairs farther than max_distance_km are never assigned
+        
+        Args:
+            incidents: Unassigned incidents needing a crew
+            crews: Crews to assign (default: all available crews in the registry)
+            max_distance_km: Optional limit on crew travel distance
             
-        # TODO: Score each available crew using the algorithm above
-        # TODO: Calculate specialization match score for required work type
-        # TODO: Calculate distance from crew location to incident location
-        # TODO: Apply experience level bonuses
-        # TODO: Add customer impact weighting
-        # TODO: Select crew with highest total score
-        # TODO: Return assignment recommendation with score breakdown
-        
-        best_crew = None
-        best_score = -1000
-        
-        for crew_data in available_crews:
-            # TODO: Calculate total score for this crew
-            # specialization_score = get_specialization_match(...)
-            # distance_penalty = calculate_distance(...) * -2
-            # experience_bonus = get_experience_bonus(...)
-            # customer_bonus = min(incident.estimated_customers_affected, 500)
-            # total_score = specialization_score + distance_penalty + experience_bonus + customer_bonus
+        Returns:
+            Dictionary with assignments (one per matched incident, highest value
+            first), unassigned_incident_ids, and total_score
+        """
+        if crews is None:
+            crews = self.crew_registry.available_crews()
+        if not crews or not incidents:
+            return {
+                "assignments": [],
+                "unassigned_incident_ids": [incident.incident_id for incident in incidents],
+                "total_score": 0.0,
+            }
+        
+        distances = self.calculate_crew_incident_distances(crews, incidents)
+        suitability = self.score_crews_for_incidents(crews, incidents, distances)
+        # The customer impact bonus is the same for every crew and is covered by priority
+        suitability -= np.minimum(
+            np.array([incident.estimated_customers_affected for incident in incidents], dtype=np.float64),
+            MAX_CUSTOMER_BONUS,
+        )[None, :]
+        priorities = np.array([calculate_incident_priority(incident) for incident in incidents], dtype=np.float64)
+        urgency = priorities / priorities.max() if priorities.max() > 0 else np.zeros_like(priorities)
+        values = suitability * (1 + urgency)[None, :] + BATCH_PRIORITY_POINTS * urgency[None, :]
+        if max_distance_km is not None:
+            values[distances > max_distance_km] = -INFEASIBLE_PAIR_PENALTY
+        
+        crew_indices, incident_indices = solve_assignment(values, maximize=True)
+        assignments = []
+        for crew_index, incident_index in zip(crew_indices, incident_indices):
+            if max_distance_km is not None and distances[crew_index, incident_index] > max_distance_km:
+                continue
+            distance_km = float(distances[crew_index, incident_index])
+            assignments.append({
+                "crew_id": crews[crew_index].crew_id,
+                "incident_id": incidents[incident_index].incident_id,
+                "score": float(values[crew_index, incident_index]),
+                "incident_priority": float(priorities[incident_index]),
+                "distance_km": distance_km,
+                "estimated_arrival_minutes": self.estimate_travel_minutes(distance_km),
+            })
+        assignments.sort(key=lambda assignment: -assignment["score"])
+        assigned = {assignment["incident_id"] for assignment in assignments}
+        return {
+            "assignments": assignments,
+            "unassigned_incident_ids": [i.incident_id for i in incidents if i.incident_id not in assigned],
+            "total_score": sum(assignment["score"] for assignment in assignments),
+        }
+    
+    def calculate_crew_incident_distances(self, crews: List[FieldCrew], incidents: List[OutageIncident],
+                                          dtype=np.float64) -> np.ndarray:
+        """
+        Distances from every crew to every incident in one call.
+        
+        Args:
+            crews: Field crews (matrix rows)
+            incidents: Incidents (matrix columns)
+            dtype: np.float64, or np.float32 for large storm-scale matrices
             
-            # TODO: Track best crew and score
-            pass
+        Returns:
+            Crew x incident matrix of distances in kilometers
+        """
+        return haversine_distance_matrix(
+            np.fromiter((crew.current_latitude for crew in crews), dtype=np.float64, count=len(crews)),
+            np.fromiter((crew.current_longitude for crew in crews), dtype=np.float64, count=len(crews)),
+            np.fromiter((incident.latitude for incident in incidents), dtype=np.float64, count=len(incidents)),
+            np.fromiter((incident.longitude for incident in incidents), dtype=np.float64, count=len(incidents)),
+            dtype=dtype,
+        )
+    
+    def score_crews_for_incidents(self, crews: List[FieldCrew], incidents: List[OutageIncident],
+                                  distances: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Dispatch score of every crew for every incident.
+        
+        Applies the scoring algorithm of find_optimal_crew_for_incident to the
+        whole crew x incident grid with array operations.
+        
+        Args:
+            crews: Field crews (matrix rows)
+            incidents: Incidents (matrix columns)
+            distances: Precomputed crew x incident distances, if available
             
-        return {
-            "crew_id": best_crew.crew_id if best_crew else None,
-            "estimated_arrival_minutes": 45,  # TODO: Calculate actual arrival time
-            "assignment_justification": "Optimal match based on specialization and location"
-        } if best_crew else None
+        Returns:
+            Crew x incident matrix of total scores (higher is better)
+        """
+        if distances is None:
+            distances = self.calculate_crew_incident_distances(crews, incidents)
+        specializations = list(CrewSpecialization)
+        match_table = np.array([
+            [specialization_match_score(crew_spec, required) for required in specializations]
+            for crew_spec in specializations
+        ], dtype=np.float64)
+        crew_codes = np.array([specializations.index(crew.specialization) for crew in crews], dtype=np.intp)
+        required_codes = np.array([specializations.index(required_specialization(i)) for i in incidents], dtype=np.intp)
+        experience = np.array([EXPERIENCE_BONUS.get(crew.skill_level, 0) for crew in crews], dtype=np.float64)
+        customer_bonus = np.minimum(
+            np.array([incident.estimated_customers_affected for incident in incidents], dtype=np.float64),
+            MAX_CUSTOMER_BONUS,
+        )
+        return (
+            match_table[np.ix_(crew_codes, required_codes)]
+            - DISTANCE_PENALTY_PER_KM * distances
+            + experience[:, None]
+            + customer_bonus[None, :]
+        )
+    
+    @staticmethod
+    def estimate_travel_minutes(distance_km: float) -> int:
+        """Minutes to reach an incident: preparation plus driving at emergency vehicle speed."""
+        return CREW_PREPARATION_MINUTES + math.ceil(distance_km / EMERGENCY_VEHICLE_SPEED_KMH * 60)
     
     def calculate_haversine_distance(self, lat1: float, lon1: float, 
                                    lat2: float, lon2: float) -> float:
@@ -101,13 +264,7 @@ class CrewDispatchService:
         Copilot Prompting Tip:
         "Implement Haversine formula for geographic distance calculation"
         """
-        # TODO: Convert latitude and longitude from degrees to radians
-        # TODO: Apply Haversine formula: a = sin²(Δφ/2) + cos φ1 ⋅ cos φ2 ⋅ sin²(Δλ/2)
-        # TODO: Calculate c = 2 ⋅ atan2( √a, √(1−a) )
-        # TODO: Calculate distance = R ⋅ c (where R = 6371 km)
-        # TODO: Return distance in kilometers
-        
-        return 0.0  # Implement in tasks
+        return calculate_haversine_distance(lat1, lon1, lat2, lon2)
     
     def assign_crew_to_incident(self, crew_id: str, incident_id: str, 
                               estimated_duration_hours: float = 4.0) -> Dict[str, any]:
@@ -146,11 +303,4 @@ class CrewDispatchService:
     
     def _is_crew_available(self, crew_id: str) -> bool:
         """Check if specific crew is available for assignment."""
-        crews = self._get_all_crews()
-        for crew_data in crews:
-            if crew_data["crew_id"] == crew_id:
-                crew = FieldCrew(**crew_data)
-                # TODO: Use FieldCrew model to check availability
-                # TODO: Validate status, hours worked, and assignment count
-                return crew.is_available_for_assignment()
-        return False
+        return self.crew_registry.is_available(crew_id)
@@ -0,0 +1,156 @@
+"""
+In-memory crew registry with secondary indexes for dispatch lookups.
+Holds validated FieldCrew objects so availability checks and specialization
+searches do not re-read and re-validate the whole roster.
+"""
+
+from typing import Dict, Iterable, List, Optional
+from datetime import datetime
+
+from ..models.crew import FieldCrew, CrewStatus, CrewSpecialization
+
+class CrewRegistry:
+    """
+    Validated field crews keyed by crew ID, indexed by status, specialization and skill level.
+
+    Each index maps a key to an insertion-ordered set of crew IDs (a dict with None
+    values), so adding, removing and moving a crew between index entries are O(1).
+    Crew status and location must be changed through the registry to keep the
+    indexes current.
+
+    Business Rules:
+    - Crew IDs are unique; adding a crew with an existing ID replaces it.
+    - Candidates for assignment are crews with status AVAILABLE or RETURNING that
+      also pass FieldCrew.is_available_for_assignment.
+
+    Args:
+        crews: Initial crews.
+    """
+
+    ASSIGNABLE_STATUSES = (CrewStatus.AVAILABLE, CrewStatus.RETURNING)
+
+    def __init__(self, crews: Iterable[FieldCrew] = ()):
+        self._crews: Dict[str, FieldCrew] = {}
+        self._by_status: Dict[CrewStatus, Dict[str, None]] = {status: {} for status in CrewStatus}
+        self._by_specialization: Dict[CrewSpecialization, Dict[str, None]] = {s: {} for s in CrewSpecialization}
+        self._by_skill_level: Dict[str, Dict[str, None]] = {}
+        for crew in crews:
+            self.add(crew)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "CrewRegistry":
+        """
+        Build a registry from crew roster records, validating each once.
+
+        Roster files may spell enum fields by member name ("LINE_WORKER",
+        "AVAILABLE"); these are converted to the model's values.
+        """
+        return cls(FieldCrew(**cls._normalize_record(record)) for record in records)
+
+    @staticmethod
+    def _normalize_record(record: Dict) -> Dict:
+        record = dict(record)
+        for field, enum_type in (("specialization", CrewSpecialization), ("status", CrewStatus)):
+            value = record.get(field)
+            if isinstance(value, str) and value in enum_type.__members__:
+                record[field] = enum_type[value].value
+        return record
+
+    def __len__(self) -> int:
+        return len(self._crews)
+
+    def __contains__(self, crew_id: str) -> bool:
+        return crew_id in self._crews
+
+    def __iter__(self):
+        return iter(self._crews.values())
+
+    def get(self, crew_id: str) -> Optional[FieldCrew]:
+        """Crew by ID, or None if it is not registered."""
+        return self._crews.get(crew_id)
+
+    def add(self, crew: FieldCrew) -> None:
+        """Register a crew (replacing any crew with the same ID)."""
+        if crew.crew_id in self._crews:
+            self.remove(crew.crew_id)
+        self._crews[crew.crew_id] = crew
+        self._by_status[crew.status][crew.crew_id] = None
+        self._by_specialization[crew.specialization][crew.crew_id] = None
+        self._by_skill_level.setdefault(crew.skill_level, {})[crew.crew_id] = None
+
+    def remove(self, crew_id: str) -> Optional[FieldCrew]:
+        """Unregister a crew; returns it, or None if it was not registered."""
+        crew = self._crews.pop(crew_id, None)
+        if crew is not None:
+            del self._by_status[crew.status][crew_id]
+            del self._by_specialization[crew.specialization][crew_id]
+            del self._by_skill_level[crew.skill_level][crew_id]
+        return crew
+
+    def update_status(self, crew_id: str, status: CrewStatus) -> FieldCrew:
+        """
+        Change a crew's status and move it to the matching status index.
+
+        Raises:
+            KeyError: If the crew is not registered.
+        """
+        crew = self._crews[crew_id]
+        status = CrewStatus(status)
+        if crew.status != status:
+            del self._by_status[crew.status][crew_id]
+            self._by_status[status][crew_id] = None
+            crew.status = status
+        return crew
+
+    def update_location(self, crew_id: str, latitude: float, longitude: float,
+                        timestamp: Optional[datetime] = None) -> FieldCrew:
+        """Record a crew's reported position."""
+        crew = self._crews[crew_id]
+        crew.current_latitude = latitude
+        crew.current_longitude = longitude
+        crew.last_location_update = timestamp or datetime.now()
+        return crew
+
+    def find(self, status: Optional[CrewStatus] = None,
+             specialization: Optional[CrewSpecialization] = None,
+             skill_level: Optional[str] = None) -> List[FieldCrew]:
+        """
+        Crews matching every given criterion, from the index lookups.
+
+        The smallest matching index entry is scanned and checked against the others,
+        so the cost is proportional to the rarest criterion, not the roster size.
+        """
+        entries = []
+        if status is not None:
+            entries.append(self._by_status[CrewStatus(status)])
+        if specialization is not None:
+            entries.append(self._by_specialization[CrewSpecialization(specialization)])
+        if skill_level is not None:
+            entries.append(self._by_skill_level.get(skill_level, {}))
+        if not entries:
+            return list(self._crews.values())
+        entries.sort(key=len)
+        smallest, others = entries[0], entries[1:]
+        return [self._crews[crew_id] for crew_id in smallest if all(crew_id in other for other in others)]
+
+    def available_crews(self, specialization: Optional[CrewSpecialization] = None) -> List[FieldCrew]:
+        """
+        Crews that can take a new assignment now, optionally of one specialization.
+
+        Only crews in the AVAILABLE and RETURNING status indexes are checked.
+        """
+        return [
+            crew
+            for status in self.ASSIGNABLE_STATUSES
+            for crew in self.find(status=status, specialization=specialization)
+            if crew.is_available_for_assignment()
+        ]
+
+    def is_available(self, crew_id: str) -> bool:
+        """Whether a registered crew can take a new assignment now."""
+        crew = self._crews.get(crew_id)
+        return crew is not None and crew.status in self.ASSIGNABLE_STATUSES and crew.is_available_for_assignment()
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Number of crews in each status."""
+        return {status.value: len(crew_ids) for status, crew_ids in self._by_status.items()}
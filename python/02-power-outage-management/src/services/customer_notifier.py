@@ -4,12 +4,21 @@ Handles automated messaging and status updates with realistic delivery simulatio
 """
 
 import json
-from typing import List, Dict, Optional
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Union
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter, defaultdict
 from ..models.incident import OutageIncident
 from ..models.customer import CustomerType, Customer
 from ..utils.data_loader import data_loader
+from ..utils.delivery_log import ColumnarDeliveryLog
+from ..utils.timer_wheel import HierarchicalTimerWheel
+from .message_renderer import MessageRenderer, customer_fields, incident_fields
+from .notification_delivery import (
+    CHANNEL_DELIVERY_DELAYS, CHANNEL_SUCCESS_RATES, NotificationDeliveryEngine, SimulatedGateway
+)
 
 class CustomerNotificationService:
     """
@@ -17,13 +26,58 @@ class CustomerNotificationService:
     
     Manages notification scheduling, message personalization, and delivery tracking
     using simulated communication channels for workshop purposes.
+    
+    Delivery results go to a ColumnarDeliveryLog, configured by the delivery_log
+    section of outage_config.json (path, recent_window, flush_rows). A relative
+    path is resolved against the directory holding the config directory. The log
+    is flushed after every delivery run and by close(); use the service as a
+    context manager, or call close(), so buffered results reach the file.
+    
+    Args:
+        gateway: Delivery gateway (default: SimulatedGateway)
+        delivery_log_path: Overrides the configured delivery log file
     """
     
-    def __init__(self):
+    def __init__(self, gateway=None, delivery_log_path: Optional[Union[str, Path]] = None):
+        config = data_loader.get_outage_config()
+        log_config = config.get("delivery_log", {})
+        log_path = delivery_log_path or log_config.get("path")
+        if delivery_log_path is None and log_path is not None:
+            log_path = data_loader.config_dir.resolve().parent / log_path
         self.notification_queue: List[Dict] = []
-        self.delivery_log: List[Dict] = []
+        self.delivery_log = ColumnarDeliveryLog(
+            log_path,
+            recent_size=log_config.get("recent_window", 10000),
+            flush_rows=log_config.get("flush_rows", 5000),
+        )
         self.customer_preferences: Dict[str, Dict] = {}
         self.message_templates = self._load_message_templates()
+        self.message_renderer = MessageRenderer(self.message_templates)
+        self.notification_rules: Dict[str, Dict] = config["notification_rules"]
+        self.delivery_engine = NotificationDeliveryEngine(
+            gateway if gateway is not None else SimulatedGateway(),
+            config.get("channel_limits", {}),
+            self.notification_rules,
+            log_sink=self.delivery_log.extend,
+        )
+        # Delayed sends (notification_rules delay_minutes), keyed by
+        # (incident_id, customer_id, channel); incident_id -> pending keys for cancellation
+        self.scheduled_notifications = HierarchicalTimerWheel()
+        self._scheduled_by_incident: Dict[str, Dict[tuple, None]] = defaultdict(dict)
+        # (customer_id, channel) -> (send time, pending keys): notifications for the same
+        # customer and channel held together so they go out as one message
+        self._scheduled_by_customer: Dict[Tuple[str, str], Tuple[datetime, Dict[tuple, None]]] = {}
+        self.coalescing_stats = Counter()
+    
+    def close(self) -> None:
+        """Write delivery results still buffered in the delivery log to its file."""
+        self.delivery_log.close()
+    
+    def __enter__(self) -> "CustomerNotificationService":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
     
     def notify_customers_of_outage(self, incident: OutageIncident, 
                                  immediate_send: bool = True) -> Dict[str, int]:
@@ -36,33 +90,300 @@ class CustomerNotificationService:
         - Commercial customers get SMS + email (within 15 minutes)
         - Residential customers get SMS only (within 30 minutes)
         - Messages include cause, estimated restoration time, safety information
+        - Sends are held for the customer type's delay_minutes from outage_config.json
+          in scheduled_notifications; dispatch_due_notifications sends them when due
+        - Sends are held at least coalescing_window_minutes, so a customer inside
+          several overlapping incidents gets one message per channel covering them all
         
         Args:
             incident: Outage incident with location and impact details
-            immediate_send: If True, send immediately; if False, queue for later
+            immediate_send: If True, send undelayed notifications now and schedule
+                the rest; if False, queue everything for later
+            
+        Returns:
+            Dictionary with notification counts by channel (SMS, EMAIL, PHONE)
+        """
+        return self.notify_customers_of_outages([incident], immediate_send)
+    
+    def notify_customers_of_outages(self, incidents: List[OutageIncident],
+                                    immediate_send: bool = True) -> Dict[str, int]:
+        """
+        Send initial outage notifications for several incidents at once.
+        
+        Affected customers of every incident come from one data_loader.get_customers_in_areas
+        lookup. Undelayed notifications of all the incidents are delivered together,
+        so a customer inside several of them gets one merged message per channel
+        straight away; delayed ones follow the rules of notify_customers_of_outage.
+        
+        Args:
+            incidents: Outage incidents with location and impact details
+            immediate_send: If True, send undelayed notifications now and schedule
+                the rest; if False, queue everything for later
             
         Returns:
             Dictionary with notification counts by channel (SMS, EMAIL, PHONE)
         """
-        affected_customers = incident.get_affected_customers()
         notification_counts = {"SMS": 0, "EMAIL": 0, "PHONE": 0}
+        if not incidents:
+            return notification_counts
+        all_customers = data_loader.get_all_customers()
+        positions, coverage = data_loader.get_customers_in_areas(
+            [incident.latitude for incident in incidents],
+            [incident.longitude for incident in incidents],
+            [incident.affected_radius_km for incident in incidents],
+        )
+        customer_models: Dict[int, Customer] = {}
+        notifications = []
+        now = datetime.now()
         
-        # TODO: Group customers by priority level (CRITICAL, HIGH, STANDARD)
-        # TODO: Generate personalized messages for each customer type
-        # TODO: Schedule notifications with appropriate delays based on customer type
-        # TODO: Track notification attempts for delivery confirmation
-        # TODO: Return counts of scheduled notifications by communication method
-        
-        for customer_data in affected_customers:
-            customer = Customer(**customer_data)
-            # TODO: Determine notification priority and timing
-            # TODO: Generate personalized message using incident details
-            # TODO: Schedule delivery through preferred channels
-            # TODO: Update notification counts
-            pass
+        for column, incident in enumerate(incidents):
+            affected_positions = positions[coverage[:, column]]
+            affected_customers = [all_customers[position] for position in affected_positions]
+            messages = self._render_outage_messages(affected_customers, incident)
+            # Kept on each notification so merged messages can be rendered per customer
+            outage_fields = incident_fields(incident)
             
+            for position, customer_data, message in zip(affected_positions, affected_customers, messages):
+                customer = customer_models.get(position)
+                if customer is None:
+                    customer = customer_models[position] = Customer(**customer_data)
+                customer_type = customer.customer_type.value
+                rule = self.notification_rules.get(customer_type, {})
+                delay_minutes = rule.get("delay_minutes", 0)
+                coalescing_window = timedelta(minutes=rule.get("coalescing_window_minutes", 0))
+                for channel in self._notification_channels(customer):
+                    notification = {
+                        "customer_id": customer.customer_id,
+                        "incident_id": incident.incident_id,
+                        "customer_type": customer_type,
+                        "channel": channel,
+                        "message": message,
+                        "priority": customer.priority_level.value,
+                        **customer_fields(customer_data),
+                        "cause": outage_fields["cause"],
+                        "estimated_time": outage_fields["estimated_time"],
+                    }
+                    if immediate_send and (delay_minutes > 0 or coalescing_window):
+                        self.schedule_notification(notification, now + timedelta(minutes=delay_minutes),
+                                                   coalescing_window)
+                    else:
+                        notifications.append(notification)
+                    notification_counts[channel] = notification_counts.get(channel, 0) + 1
+        
+        if immediate_send:
+            if notifications:
+                self._deliver_coalesced(notifications)
+        else:
+            self.notification_queue.extend(notifications)
         return notification_counts
     
+    def _render_outage_messages(self, customers: List[Dict], incident: OutageIncident) -> List[str]:
+        """Initial outage messages for customers, rendered in bulk per message type."""
+        messages: List[Optional[str]] = [None] * len(customers)
+        by_message_type: Dict[str, List[int]] = defaultdict(list)
+        for i, customer in enumerate(customers):
+            is_critical = customer.get("customer_type") == CustomerType.CRITICAL_INFRASTRUCTURE.value
+            by_message_type["critical_infrastructure" if is_critical else "initial_outage"].append(i)
+        for message_type, indices in by_message_type.items():
+            rendered = self.message_renderer.render_batch([customers[i] for i in indices], incident, message_type)
+            for i, message in zip(indices, rendered):
+                messages[i] = message
+        return messages
+    
+    def schedule_notification(self, notification: Dict, send_at: datetime,
+                              coalescing_window: timedelta = timedelta(0)) -> datetime:
+        """
+        Hold a notification until send_at.
+        
+        Business Rules:
+        - A pending notification for the same incident, customer and channel is replaced
+        - If the customer already has a notification pending on the channel, this one
+          joins it and is sent with it, as a single merged message
+        - Otherwise it is held until send_at, but at least coalescing_window from now,
+          so notifications from overlapping incidents can join it
+        
+        Returns:
+            Time the notification will be sent
+        """
+        key = (notification["incident_id"], notification["customer_id"], notification["channel"])
+        group_key = (notification["customer_id"], notification["channel"])
+        self._unindex_scheduled(key)
+        group = self._scheduled_by_customer.get(group_key)
+        if group is None:
+            group_send_at = max(send_at, datetime.now() + coalescing_window) if coalescing_window else send_at
+            group = self._scheduled_by_customer[group_key] = (group_send_at, {})
+        group_send_at, keys = group
+        self.scheduled_notifications.schedule(key, group_send_at, notification)
+        self._scheduled_by_incident[notification["incident_id"]][key] = None
+        keys[key] = None
+        return group_send_at
+    
+    def _unindex_scheduled(self, key: tuple) -> None:
+        """Drop a pending key from the per-incident and per-customer indexes."""
+        incident_id, customer_id, channel = key
+        pending = self._scheduled_by_incident.get(incident_id)
+        if pending is not None:
+            pending.pop(key, None)
+            if not pending:
+                del self._scheduled_by_incident[incident_id]
+        group = self._scheduled_by_customer.get((customer_id, channel))
+        if group is not None:
+            group[1].pop(key, None)
+            if not group[1]:
+                del self._scheduled_by_customer[(customer_id, channel)]
+    
+    def cancel_incident_notifications(self, incident_id: str) -> int:
+        """
+        Drop all pending delayed notifications for an incident, e.g. once it is resolved.
+        
+        Returns:
+            Number of notifications cancelled
+        """
+        cancelled = 0
+        for key in list(self._scheduled_by_incident.get(incident_id, {})):
+            self._unindex_scheduled(key)
+            if self.scheduled_notifications.cancel(key) is not None:
+                cancelled += 1
+        return cancelled
+    
+    def dispatch_due_notifications(self, now: Optional[datetime] = None) -> Dict[str, any]:
+        """
+        Send every scheduled notification whose delay has expired.
+        
+        Call periodically (e.g. every few seconds) from the operations loop.
+        
+        Args:
+            now: Current time (default: now)
+            
+        Returns:
+            Delivery summary for the notifications sent, with sends_saved by coalescing
+        """
+        due = self.scheduled_notifications.advance(now)
+        for key, _ in due:
+            self._unindex_scheduled(key)
+        return self._deliver_coalesced([notification for _, notification in due])
+    
+    def save_scheduled_notifications(self, path: Union[str, Path]) -> int:
+        """
+        Persist pending delayed notifications so they survive a restart.
+        
+        The file is written to a temporary name and renamed into place.
+        
+        Returns:
+            Number of notifications saved
+        """
+        path = Path(path)
+        pending = [
+            {**notification, "send_at": send_at.isoformat()}
+            for _, send_at, notification in self.scheduled_notifications.pending()
+        ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"saved_at": datetime.now().isoformat(), "notifications": pending}, f)
+        os.replace(temp_path, path)
+        return len(pending)
+    
+    def restore_scheduled_notifications(self, path: Union[str, Path]) -> int:
+        """
+        Re-schedule notifications saved by save_scheduled_notifications.
+        
+        Notifications that fell due while the service was down are sent by the next
+        dispatch_due_notifications call.
+        
+        Returns:
+            Number of notifications restored
+        """
+        path = Path(path)
+        if not path.exists():
+            return 0
+        with open(path) as f:
+            saved = json.load(f)
+        for record in saved["notifications"]:
+            notification = dict(record)
+            send_at = datetime.fromisoformat(notification.pop("send_at"))
+            self.schedule_notification(notification, send_at)
+        return len(saved["notifications"])
+    
+    def send_queued_notifications(self) -> Dict[str, any]:
+        """
+        Deliver everything in notification_queue through the delivery engine.
+        
+        Returns:
+            Delivery summary (sent, delivered, failed, attempts, throughput)
+        """
+        notifications, self.notification_queue = self.notification_queue, []
+        return self._deliver_coalesced(notifications)
+    
+    def _deliver_coalesced(self, notifications: List[Dict]) -> Dict[str, any]:
+        """
+        Merge notifications per customer and channel, deliver them, and count the sends saved.
+        
+        The delivery log is flushed afterwards, so each run's results are on disk.
+        """
+        merged = self.coalesce_notifications(notifications)
+        summary = self.delivery_engine.run(merged)
+        self.delivery_log.flush()
+        summary["sends_saved"] = len(notifications) - len(merged)
+        self.coalescing_stats["received"] += len(notifications)
+        self.coalescing_stats["sent"] += len(merged)
+        self.coalescing_stats["sends_saved"] += summary["sends_saved"]
+        return summary
+    
+    def coalesce_notifications(self, notifications: List[Dict]) -> List[Dict]:
+        """
+        Merge notifications for the same customer and channel into one message.
+        
+        Business Rules:
+        - The merged message is rendered from the multiple_outages template: one
+          greeting, then the cause and estimated restoration of each incident once,
+          in arrival order
+        - It carries every incident in incident_ids; incident_id is the first of them
+        - A customer's notifications on different channels are not merged
+        
+        Returns:
+            One notification per (customer_id, channel), in order of first appearance
+        """
+        groups: Dict[Tuple[str, str], List[Dict]] = {}
+        for notification in notifications:
+            groups.setdefault((notification["customer_id"], notification["channel"]), []).append(notification)
+        merged = []
+        for group in groups.values():
+            if len(group) == 1:
+                merged.append(group[0])
+                continue
+            outages = {n.get("incident_id"): n for n in group}
+            incident_ids = list(outages)
+            if len(outages) == 1:
+                merged.append({**group[-1], "incident_ids": incident_ids})
+                continue
+            first = group[0]
+            template = (self.message_templates.get(f"multiple_outages:{first.get('customer_type')}")
+                        or self.message_templates["multiple_outages"])
+            message = template.format(
+                customer_name=first.get("customer_name", "Valued Customer"),
+                affected_area=first.get("affected_area", "your area"),
+                outage_count=len(outages),
+                outage_list="\n".join(
+                    f"{i}. Outage due to {n.get('cause', 'an equipment issue')}, "
+                    f"estimated restoration: {n.get('estimated_time', 'to be confirmed')}"
+                    for i, n in enumerate(outages.values(), 1)
+                ),
+            )
+            merged.append({**first, "incident_ids": incident_ids, "message": message})
+        return merged
+    
+    def _notification_channels(self, customer: Customer) -> List[str]:
+        """
+        Channels to notify a customer on.
+        
+        Business Rule: The customer type's configured channels, limited to those the
+        customer opted into; customers with none of them get their first preference.
+        """
+        rule_channels = self.notification_rules.get(customer.customer_type.value, {}).get("channels", ["SMS"])
+        preferred = [channel for channel in rule_channels if channel in customer.communication_preferences]
+        return preferred or customer.communication_preferences[:1] or rule_channels[:1]
+    
     def send_restoration_progress_update(self, incident_id: str, 
                                        progress_message: str,
                                        estimated_completion: datetime) -> int:
@@ -117,37 +438,9 @@ class CustomerNotificationService:
         Returns:
             Formatted, personalized message ready for delivery
         """
-        template = self.message_templates.get(message_type, "")
-        customer_type = customer.get("customer_type", "RESIDENTIAL")
-        
-        # TODO: Select appropriate message template based on customer type
-        # TODO: Convert technical outage cause to customer-friendly language
-        # TODO: Format estimated restoration time in readable format
-        # TODO: Add safety information for relevant outage causes
-        # TODO: Include customer-specific information (account, service address)
-        # TODO: Return fully formatted message
-        
-        # Convert technical causes to customer-friendly language
-        cause_mapping = {
-            "equipment_failure": "equipment malfunction",
-            "severe_weather": "severe weather conditions", 
-            "vehicle_accident": "vehicle incident",
-            "vegetation": "tree/vegetation contact",
-            "animal_contact": "wildlife interference"
-        }
-        
-        friendly_cause = cause_mapping.get(incident.cause.value, "equipment issue")
-        
-        # TODO: Apply template substitution with customer and incident data
-        personalized_message = template.format(
-            customer_name=customer.get("name", "Valued Customer"),
-            estimated_time=f"{incident.estimated_restoration_hours:.1f} hours",
-            cause=friendly_cause,
-            affected_area=f"{customer.get('service_address', 'your area')}",
-            crew_status="Crew has been dispatched" if incident.status != "reported" else "Assessing situation"
-        )
-        
-        return personalized_message
+        # Incident-level text (friendly cause, restoration time, crew status) is
+        # rendered once per incident and cached; only customer fields are filled here
+        return self.message_renderer.render(customer, incident, message_type)
     
     def simulate_message_delivery(self, customer: Dict, message: str, 
                                 channel: str, priority: str = "STANDARD") -> Dict[str, any]:
@@ -173,8 +466,8 @@ class CustomerNotificationService:
         from datetime import datetime, timedelta
         
         # Simulate delivery success rates and delays
-        success_rates = {"SMS": 0.95, "EMAIL": 0.98, "PHONE": 0.85}
-        delivery_delays = {"SMS": (1, 3), "EMAIL": (2, 5), "PHONE": (0, 1)}
+        success_rates = CHANNEL_SUCCESS_RATES
+        delivery_delays = CHANNEL_DELIVERY_DELAYS
         
         # TODO: Simulate delivery attempt with realistic success rate
         # TODO: Apply delivery delay based on communication channel
@@ -223,5 +516,16 @@ class CustomerNotificationService:
                 "PRIORITY ALERT for {customer_name}: Power outage affecting your facility due to {cause}. "
                 "{crew_status}. Estimated restoration: {estimated_time}. "
                 "Contact emergency services if backup power systems are not functioning."
+            ),
+            # Several incidents for one customer, merged into one message by coalesce_notifications
+            "multiple_outages": (
+                "Hello {customer_name}, {outage_count} power outages are affecting {affected_area}:\n"
+                "{outage_list}\n"
+                "We'll keep you updated on our progress."
+            ),
+            "multiple_outages:CRITICAL_INFRASTRUCTURE": (
+                "PRIORITY ALERT for {customer_name}: {outage_count} power outages affecting your facility:\n"
+                "{outage_list}\n"
+                "Contact emergency services if backup power systems are not functioning."
             )
         }
@@ -10,6 +10,7 @@ from collections import defaultdict
 from ..models.incident import OutageIncident, IncidentStatus, OutageSeverity, OutageCause
 from ..models.customer import CustomerType
 from ..utils.data_loader import data_loader
+from ..utils.incident_queue import IncidentPriorityQueue
 
 class OutageIncidentManager:
     """
@@ -23,6 +24,22 @@ class OutageIncidentManager:
         self.active_incidents: Dict[str, OutageIncident] = {}
         self.incident_history: List[OutageIncident] = []
         self.performance_metrics = defaultdict(list)
+        self.priority_queue = IncidentPriorityQueue()
+        self.assigned_crews: Dict[str, str] = {}  # incident_id -> crew_id
+    
+    def add_incident(self, incident: OutageIncident) -> str:
+        """
+        Register an active incident and queue it for dispatch by priority.
+        
+        Args:
+            incident: Newly created outage incident
+            
+        Returns:
+            The incident ID
+        """
+        self.active_incidents[incident.incident_id] = incident
+        self.priority_queue.push(incident)
+        return incident.incident_id
     
     def create_incident_from_equipment_failure(self, failed_equipment_id: str, 
                                              cause: str, latitude: float, 
@@ -81,37 +98,75 @@ class OutageIncidentManager:
         Returns:
             True if update was successful, False if validation failed
         """
-        # TODO: Validate incident exists in active_incidents
-        # TODO: Validate status transition is allowed (can't go backwards)
-        # TODO: Apply business rules for each status change
-        # TODO: Update incident object with new status and timestamp
-        # TODO: Create timeline entry for audit trail
-        # TODO: Update performance metrics for reporting
-        # TODO: Return success status
-        
-        return False  # Implement in tasks
+        incident = self.active_incidents.get(incident_id)
+        if incident is None:
+            return False
+        
+        transitions = data_loader.get_outage_config()["valid_status_transitions"]
+        if new_status.name not in transitions.get(incident.status.name, []):
+            return False
+        if new_status == IncidentStatus.ASSIGNED:
+            if not crew_id:
+                return False
+            self.assigned_crews[incident_id] = crew_id
+        
+        now = datetime.now()
+        incident.status = new_status
+        incident.last_status_update = now
+        self.performance_metrics["status_updates"].append({
+            "incident_id": incident_id,
+            "status": new_status.value,
+            "crew_id": crew_id,
+            "notes": progress_notes,
+            "timestamp": now,
+        })
+        
+        if new_status == IncidentStatus.RESOLVED:
+            incident.actual_restoration_time = now
+            self.priority_queue.remove(incident_id)
+            del self.active_incidents[incident_id]
+            self.incident_history.append(incident)
+        else:
+            self.priority_queue.update(incident)
+        return True
     
-    def get_incidents_by_priority(self, status_filter: Optional[List[IncidentStatus]] = None) -> List[Dict]:
+    def get_incidents_by_priority(self, status_filter: Optional[List[IncidentStatus]] = None,
+                                  limit: Optional[int] = None) -> List[Dict]:
         """
         Retrieve active incidents sorted by priority for crew dispatch optimization.
         
         Default filter excludes RESOLVED incidents. Use for dispatcher dashboard
         showing incidents that need crew assignment or are in progress.
         
+        Incidents are read in order from the priority queue, so the top `limit`
+        incidents cost O(limit log n) rather than re-scoring and sorting every
+        active incident. Incidents changed outside update_incident_status must be
+        re-queued with priority_queue.update().
+        
         Args:
             status_filter: List of statuses to include (default: all except RESOLVED)
+            limit: Maximum number of incidents to return (default: all)
             
         Returns:
             List of incident dictionaries sorted by priority score (highest first)
         """
-        # TODO: Filter incidents by status (default: exclude RESOLVED)
-        # TODO: Calculate current priority score for each incident
-        # TODO: Sort incidents by priority score descending
-        # TODO: Convert to dictionary format for API/dashboard use
-        # TODO: Include crew assignment status and estimated completion times
-        # TODO: Return prioritized incident list
-        
-        return []  # Implement in tasks
+        if status_filter is None:
+            status_filter = [status for status in IncidentStatus if status != IncidentStatus.RESOLVED]
+        
+        prioritized = []
+        for incident, priority_score in self.priority_queue.top(limit, status_filter):
+            prioritized.append({
+                "incident_id": incident.incident_id,
+                "priority_score": priority_score,
+                "status": incident.status.value,
+                "severity": incident.severity.value,
+                "cause": incident.cause.value,
+                "estimated_customers_affected": incident.estimated_customers_affected,
+                "assigned_crew_id": self.assigned_crews.get(incident.incident_id),
+                "created_at": incident.created_at,
+                "estimated_completion": incident.created_at + timedelta(hours=incident.estimated_restoration_hours),
+            })
+        return prioritized
     
     def calculate_outage_statistics(self, hours_back: int = 24) -> Dict[str, any]:
         """
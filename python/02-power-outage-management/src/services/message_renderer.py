@@ -0,0 +1,195 @@
+"""
+Precompiled rendering of customer outage messages.
+Templates are parsed once; incident-level text is filled in once per incident and
+cached, so rendering a message per customer only joins a few strings.
+"""
+
+import time
+from collections import OrderedDict
+from string import Formatter
+from typing import Dict, List, Optional, Tuple
+
+from ..models.incident import OutageIncident
+
+# Technical outage causes in customer-friendly language
+FRIENDLY_CAUSES = {
+    "equipment_failure": "equipment malfunction",
+    "severe_weather": "severe weather conditions",
+    "vehicle_accident": "vehicle incident",
+    "vegetation": "tree/vegetation contact",
+    "animal_contact": "wildlife interference"
+}
+
+# Template fields that differ between customers of the same incident
+CUSTOMER_FIELDS = ("customer_name", "affected_area")
+
+def incident_fields(incident: OutageIncident) -> Dict[str, str]:
+    """Incident-level template fields: estimated_time, cause and crew_status."""
+    return {
+        "estimated_time": f"{incident.estimated_restoration_hours:.1f} hours",
+        "cause": FRIENDLY_CAUSES.get(incident.cause.value, "equipment issue"),
+        "crew_status": "Crew has been dispatched" if incident.status != "reported" else "Assessing situation",
+    }
+
+def customer_fields(customer: Dict) -> Dict[str, str]:
+    """Customer-level template fields: customer_name and affected_area."""
+    return {
+        "customer_name": customer.get("name", "Valued Customer"),
+        "affected_area": f"{customer.get('service_address', 'your area')}",
+    }
+
+def _format_value(value, conversion: Optional[str], format_spec: str) -> str:
+    if conversion == "r":
+        value = repr(value)
+    elif conversion == "s":
+        value = str(value)
+    elif conversion == "a":
+        value = ascii(value)
+    return format(value, format_spec)
+
+class CompiledTemplate:
+    """
+    A message template parsed once into literal text and named fields.
+
+    Args:
+        template: str.format style template with named fields
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        self.parts: List[Tuple[str, Optional[str], Optional[str], str]] = [
+            (literal, field, conversion, format_spec or "")
+            for literal, field, format_spec, conversion in Formatter().parse(template)
+        ]
+
+    def bind(self, values: Dict[str, str]) -> "BoundTemplate":
+        """
+        Fill in the fields known in advance, leaving customer fields open.
+
+        Adjacent literal text and filled fields are merged into single fragments.
+        """
+        fragments, open_fields = [""], []
+        for literal, field, conversion, format_spec in self.parts:
+            fragments[-1] += literal
+            if field is None:
+                continue
+            if field in values:
+                fragments[-1] += _format_value(values[field], conversion, format_spec)
+            else:
+                open_fields.append((field, conversion, format_spec))
+                fragments.append("")
+        return BoundTemplate(fragments, open_fields)
+
+class BoundTemplate:
+    """
+    A template with incident-level fields filled in.
+
+    Rendering interleaves the fixed fragments with the remaining field values.
+    """
+
+    def __init__(self, fragments: List[str], open_fields: List[Tuple[str, Optional[str], str]]):
+        self.fragments = fragments
+        self.open_fields = open_fields
+        self._plain = all(conversion is None and not format_spec for _, conversion, format_spec in open_fields)
+
+    def render(self, values: Dict[str, str]) -> str:
+        fragments = self.fragments
+        pieces = [fragments[0]]
+        for i, (field, conversion, format_spec) in enumerate(self.open_fields):
+            value = values[field]
+            pieces.append(value if self._plain else _format_value(value, conversion, format_spec))
+            pieces.append(fragments[i + 1])
+        return "".join(pieces)
+
+class MessageRenderer:
+    """
+    Renders personalized outage messages in bulk.
+
+    Incident-level fragments are cached per (incident version, message type,
+    customer type). The incident version is the incident's ID together with the
+    fields that feed its text (cause, status, estimated restoration), so the cache
+    never serves stale text when those change.
+
+    Args:
+        templates: Message templates by message type; a key of
+            "<message_type>:<customer_type>" overrides one for a customer type
+        max_cached_incidents: Bound templates kept, least recently used evicted
+    """
+
+    def __init__(self, templates: Dict[str, str], max_cached_incidents: int = 1024):
+        self.compiled = {name: CompiledTemplate(template) for name, template in templates.items()}
+        self.max_cached_incidents = max_cached_incidents
+        self._bound: "OrderedDict[tuple, BoundTemplate]" = OrderedDict()
+
+    @staticmethod
+    def incident_version(incident: OutageIncident) -> tuple:
+        return (incident.incident_id, incident.cause, incident.status, incident.estimated_restoration_hours)
+
+    def _bound_template(self, incident: OutageIncident, message_type: str, customer_type: str) -> BoundTemplate:
+        key = (self.incident_version(incident), message_type, customer_type)
+        bound = self._bound.get(key)
+        if bound is not None:
+            self._bound.move_to_end(key)
+            return bound
+        compiled = self.compiled.get(f"{message_type}:{customer_type}") or self.compiled.get(message_type)
+        bound = (compiled or CompiledTemplate("")).bind(incident_fields(incident))
+        self._bound[key] = bound
+        if len(self._bound) > self.max_cached_incidents:
+            self._bound.popitem(last=False)
+        return bound
+
+    def render(self, customer: Dict, incident: OutageIncident, message_type: str) -> str:
+        """Render one customer's message."""
+        customer_type = customer.get("customer_type", "RESIDENTIAL")
+        return self._bound_template(incident, message_type, customer_type).render(customer_fields(customer))
+
+    def render_batch(self, customers: List[Dict], incident: OutageIncident, message_type: str) -> List[str]:
+        """
+        Render one message per customer for the same incident and message type.
+
+        Returns:
+            Messages in the same order as customers
+        """
+        bound_by_type: Dict[str, BoundTemplate] = {}
+        messages = []
+        for customer in customers:
+            customer_type = customer.get("customer_type", "RESIDENTIAL")
+            bound = bound_by_type.get(customer_type)
+            if bound is None:
+                bound = bound_by_type[customer_type] = self._bound_template(incident, message_type, customer_type)
+            messages.append(bound.render(customer_fields(customer)))
+        return messages
+
+def benchmark_message_rendering(templates: Dict[str, str], incident: OutageIncident,
+                                customers: List[Dict], message_type: str = "initial_outage") -> Dict[str, float]:
+    """
+    Compare per-customer str.format rendering with the compiled bulk renderer.
+
+    Args:
+        templates: Message templates by message type
+        incident: Incident the messages are about
+        customers: Customer records to render for
+        message_type: Template to render
+
+    Returns:
+        Messages per second for each approach, and the speedup
+    """
+    template = templates[message_type]
+    started = time.perf_counter()
+    for customer in customers:
+        template.format(**incident_fields(incident), **customer_fields(customer))
+    format_seconds = time.perf_counter() - started
+
+    renderer = MessageRenderer(templates)
+    started = time.perf_counter()
+    renderer.render_batch(customers, incident, message_type)
+    compiled_seconds = time.perf_counter() - started
+
+    format_rate = len(customers) / format_seconds if format_seconds > 0 else 0.0
+    compiled_rate = len(customers) / compiled_seconds if compiled_seconds > 0 else 0.0
+    return {
+        "messages": len(customers),
+        "format_messages_per_second": format_rate,
+        "compiled_messages_per_second": compiled_rate,
+        "speedup": compiled_rate / format_rate if format_rate > 0 else 0.0,
+    }
@@ -0,0 +1,220 @@
+"""
+Asynchronous delivery engine for customer notifications.
+Fans messages out over per-channel worker pools with rate limits and bounded
+queues, retries failures, and writes results to the delivery log in batches.
+"""
+
+import asyncio
+import random
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Simulated gateway behaviour per channel: success rate and delivery delay in minutes
+CHANNEL_SUCCESS_RATES = {"SMS": 0.95, "EMAIL": 0.98, "PHONE": 0.85}
+CHANNEL_DELIVERY_DELAYS = {"SMS": (1, 3), "EMAIL": (2, 5), "PHONE": (0, 1)}
+
+# Used when the configuration has no channel_limits entry for a channel
+DEFAULT_CHANNEL_LIMITS = {"rate_per_second": 100.0, "burst": 100, "workers": 16, "queue_size": 1000}
+
+class TokenBucket:
+    """
+    Token bucket rate limiter for one delivery channel.
+
+    Tokens refill continuously at rate_per_second up to burst; each send takes one.
+
+    Args:
+        rate_per_second: Sustained sends per second
+        burst: Maximum sends allowed back to back
+    """
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate_per_second)
+
+class SimulatedGateway:
+    """
+    Local stand-in for the SMS, email and voice gateways.
+
+    Each send waits a random latency and succeeds with the channel's success rate,
+    so engine throughput can be measured without external services.
+
+    Args:
+        latency_ms: (min, max) simulated gateway response time in milliseconds
+        success_rates: Success probability per channel
+        seed: Random seed for reproducible runs
+    """
+
+    def __init__(self, latency_ms: tuple = (5, 20), success_rates: Optional[Dict[str, float]] = None,
+                 seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.success_rates = success_rates or CHANNEL_SUCCESS_RATES
+        self._random = random.Random(seed)
+        self.sent = Counter()
+
+    async def send(self, channel: str, notification: Dict) -> bool:
+        """Send one message; returns True if the gateway accepted it."""
+        await asyncio.sleep(self._random.uniform(*self.latency_ms) / 1000)
+        self.sent[channel] += 1
+        return self._random.random() < self.success_rates.get(channel, 0.9)
+
+class NotificationDeliveryEngine:
+    """
+    Delivers notifications concurrently with per-channel limits.
+
+    Each channel (SMS, EMAIL, PHONE) has its own producer, bounded queue, worker
+    pool and token bucket. Notifications are split by channel before queueing, so
+    a slow or throttled channel does not hold up the others; only that channel's
+    producer waits when its queue is full.
+
+    Business Rules:
+    - A notification is attempted up to retry_attempts times for its customer type
+      (from outage_config.json notification_rules), backing off between attempts
+    - Results are passed to the log sink in batches of log_batch_size
+
+    Args:
+        gateway: Object with an async send(channel, notification) -> bool
+        channel_limits: Per-channel rate_per_second, burst, workers and queue_size
+        notification_rules: Per-customer-type rules with retry_attempts
+        log_sink: Called with each batch of delivery results
+        log_batch_size: Results per log batch
+        retry_backoff_seconds: Delay before the second attempt, doubled for each further one
+    """
+
+    def __init__(self, gateway, channel_limits: Dict[str, Dict], notification_rules: Dict[str, Dict],
+                 log_sink: Callable[[List[Dict]], None], log_batch_size: int = 500,
+                 retry_backoff_seconds: float = 0.05):
+        self.gateway = gateway
+        self.channel_limits = channel_limits
+        self.notification_rules = notification_rules
+        self.log_sink = log_sink
+        self.log_batch_size = log_batch_size
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._results: List[Dict] = []
+        self._stats = Counter()
+
+    def _limits(self, channel: str) -> Dict:
+        return {**DEFAULT_CHANNEL_LIMITS, **self.channel_limits.get(channel, {})}
+
+    def _log(self, result: Dict) -> None:
+        self._results.append(result)
+        if len(self._results) >= self.log_batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._results:
+            batch, self._results = self._results, []
+            self.log_sink(batch)
+
+    async def _deliver_one(self, channel: str, notification: Dict, bucket: TokenBucket) -> None:
+        rule = self.notification_rules.get(notification.get("customer_type"), {})
+        max_attempts = max(1, rule.get("retry_attempts", 1))
+        started = time.monotonic()
+        delivered = False
+        attempt = 0
+        while attempt < max_attempts and not delivered:
+            if attempt:
+                await asyncio.sleep(self.retry_backoff_seconds * 2 ** (attempt - 1))
+            attempt += 1
+            await bucket.acquire()
+            try:
+                delivered = await self.gateway.send(channel, notification)
+            except Exception:
+                delivered = False
+        self._stats["attempts"] += attempt
+        self._stats["delivered" if delivered else "failed"] += 1
+        self._stats[f"{channel}_sent"] += 1
+        self._log({
+            "customer_id": notification["customer_id"],
+            "incident_id": notification.get("incident_id"),
+            "channel": channel,
+            "message_length": len(notification.get("message", "")),
+            "delivery_successful": delivered,
+            "delivery_time": datetime.now(),
+            "attempt_count": attempt,
+            "priority": notification.get("priority", "STANDARD"),
+            "latency_ms": (time.monotonic() - started) * 1000,
+        })
+
+    async def _worker(self, channel: str, queue: asyncio.Queue, bucket: TokenBucket) -> None:
+        while True:
+            notification = await queue.get()
+            try:
+                if notification is None:
+                    return
+                await self._deliver_one(channel, notification, bucket)
+            finally:
+                queue.task_done()
+
+    async def deliver(self, notifications: Iterable[Dict]) -> Dict[str, any]:
+        """
+        Deliver notifications and wait until every one has a final result.
+
+        Args:
+            notifications: Dicts with customer_id, channel, message, priority,
+                customer_type and incident_id
+
+        Returns:
+            Summary with sent, delivered, failed and attempts counts, per-channel
+            counts, elapsed_seconds and messages_per_second
+        """
+        self._stats = Counter()
+        started = time.monotonic()
+        by_channel: Dict[str, List[Dict]] = defaultdict(list)
+        for notification in notifications:
+            by_channel[notification["channel"]].append(notification)
+        workers: Dict[str, List[asyncio.Task]] = {}
+
+        async def produce(channel: str, channel_notifications: List[Dict]) -> None:
+            limits = self._limits(channel)
+            queue: asyncio.Queue = asyncio.Queue(maxsize=limits["queue_size"])
+            bucket = TokenBucket(limits["rate_per_second"], limits["burst"])
+            workers[channel] = [
+                asyncio.create_task(self._worker(channel, queue, bucket)) for _ in range(limits["workers"])
+            ]
+            for notification in channel_notifications:
+                await queue.put(notification)
+            for _ in workers[channel]:
+                await queue.put(None)
+            await asyncio.gather(*workers[channel])
+
+        try:
+            await asyncio.gather(*(produce(channel, items) for channel, items in by_channel.items()))
+        finally:
+            for tasks in workers.values():
+                for task in tasks:
+                    task.cancel()
+            self._flush()
+
+        elapsed = time.monotonic() - started
+        sent = self._stats["delivered"] + self._stats["failed"]
+        return {
+            "sent": sent,
+            "delivered": self._stats["delivered"],
+            "failed": self._stats["failed"],
+            "attempts": self._stats["attempts"],
+            "by_channel": {channel: self._stats[f"{channel}_sent"] for channel in by_channel},
+            "elapsed_seconds": elapsed,
+            "messages_per_second": sent / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def run(self, notifications: Iterable[Dict]) -> Dict[str, any]:
+        """Synchronous wrapper around deliver() for callers outside an event loop."""
+        return asyncio.run(self.deliver(notifications))
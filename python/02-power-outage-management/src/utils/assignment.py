@@ -0,0 +1,129 @@
+"""
+Optimal one-to-one assignment (the linear sum assignment problem).
+Used for batch crew dispatch, where matching each incident greedily in turn
+leaves later critical incidents with poor crews.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def solve_assignment(cost: np.ndarray, maximize: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Match rows to columns so the total cost is minimal (or maximal).
+
+    Uses the shortest augmenting path form of the Hungarian algorithm
+    (Jonker-Volgenant), with each Dijkstra step vectorized over the columns.
+    Rectangular matrices are supported; every row of the smaller dimension is matched.
+
+    When there are more columns than rows, only columns among some row's n_rows
+    cheapest are kept: a row matched outside its n_rows cheapest columns could
+    always switch to one of them left free, so an optimal matching exists within.
+
+    Args:
+        cost: Matrix of assignment costs (or values, if maximize).
+        maximize: Find the assignment with the largest total instead.
+
+    Returns:
+        Tuple of (row indices, column indices) of the matched pairs, sorted by row.
+
+    Raises:
+        ValueError: If the matrix contains NaN or no complete matching has finite cost.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    if cost.ndim != 2:
+        raise ValueError("cost must be a 2-D matrix")
+    if np.isnan(cost).any():
+        raise ValueError("cost contains NaN")
+    if maximize:
+        cost = -cost
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+
+    n_rows, n_cols = cost.shape
+    if n_rows == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    if n_rows < n_cols:
+        columns = np.unique(np.argpartition(cost, n_rows - 1, axis=1)[:, :n_rows])
+    else:
+        columns = np.arange(n_cols)
+    col4row = columns[_shortest_augmenting_path(cost[:, columns])]
+    rows = np.arange(n_rows)
+    if transposed:
+        order = np.argsort(col4row)
+        return col4row[order], rows[order]
+    return rows, col4row
+
+
+def _shortest_augmenting_path(cost: np.ndarray) -> np.ndarray:
+    """Column matched to each row of a matrix with no more rows than columns."""
+    n_rows, n_cols = cost.shape
+    u = np.zeros(n_rows)
+    v = np.zeros(n_cols)
+    row4col = np.full(n_cols, -1, dtype=np.intp)
+    col4row = np.full(n_rows, -1, dtype=np.intp)
+
+    # Row reduction: start from each row's cheapest column, matching rows whose
+    # cheapest column is still free (all matched edges are tight, duals feasible)
+    u[:] = cost.min(axis=1)
+    for row, col in enumerate(cost.argmin(axis=1)):
+        if row4col[col] == -1:
+            row4col[col] = row
+            col4row[row] = col
+
+    reduced = np.empty(n_cols)
+    improved = np.empty(n_cols, dtype=bool)
+
+    for current_row in np.flatnonzero(col4row == -1):
+        # Tentative path lengths of unvisited columns; visited columns are parked at
+        # infinity and their final lengths kept in settled. Their potential in
+        # search_v is -inf, so reduced costs never improve them again.
+        shortest = np.full(n_cols, np.inf)
+        settled = np.zeros(n_cols)
+        path = np.full(n_cols, -1, dtype=np.intp)
+        search_v = v.copy()
+        visited_rows = [current_row]
+        min_value = 0.0
+        row = current_row
+        sink = -1
+
+        # Dijkstra over reduced costs until an unmatched column is reached
+        while sink == -1:
+            np.subtract(cost[row], search_v, out=reduced)
+            reduced += min_value - u[row]
+            np.less(reduced, shortest, out=improved)
+            np.copyto(shortest, reduced, where=improved)
+            np.copyto(path, row, where=improved)
+
+            col = int(shortest.argmin())
+            min_value = shortest[col]
+            if min_value == np.inf:
+                raise ValueError("cost matrix is infeasible")
+            settled[col] = min_value
+            shortest[col] = np.inf
+            search_v[col] = -np.inf
+            if row4col[col] == -1:
+                sink = col
+            else:
+                row = row4col[col]
+                visited_rows.append(row)
+
+        # Update the dual variables
+        u[current_row] += min_value
+        other_rows = np.array(visited_rows[1:], dtype=np.intp)
+        u[other_rows] += min_value - settled[col4row[other_rows]]
+        visited_cols = search_v == -np.inf
+        v[visited_cols] -= min_value - settled[visited_cols]
+
+        # Augment along the path back to the current row
+        col = sink
+        while True:
+            row = path[col]
+            row4col[col] = row
+            col4row[row], col = col, col4row[row]
+            if row == current_row:
+                break
+
+    return col4row
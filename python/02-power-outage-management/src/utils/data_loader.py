@@ -4,20 +4,28 @@ Provides complete operational context for all outage management components.
 """
 
 import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from pathlib import Path
 
+import numpy as np
+
+from .distance_calculator import iter_haversine_distance_chunks
+from .spatial_index import CustomerSpatialIndex
+
 class OutageDataLoader:
     """
     Central data access for all outage management components.
     Loads and provides structured access to infrastructure, crew, and customer data.
     """
     
-    def __init__(self, data_directory: str = "data"):
+    def __init__(self, data_directory: str = "data", config_directory: str = "config"):
         self.data_dir = Path(data_directory)
+        self.config_dir = Path(config_directory)
+        self._config_cache = None
         self._infrastructure_cache = None
         self._crew_cache = None
         self._customer_cache = None
+        self._customer_index = None
     
     def get_current_grid_state(self) -> Dict:
         """
@@ -31,6 +39,18 @@ class OutageDataLoader:
                 self._infrastructure_cache = json.load(f)
         return self._infrastructure_cache
     
+    def get_outage_config(self) -> Dict:
+        """
+        Load operational configuration: notification rules and valid status transitions.
+        
+        Returns:
+            Configuration dictionary from outage_config.json
+        """
+        if self._config_cache is None:
+            with open(self.config_dir / "outage_config.json") as f:
+                self._config_cache = json.load(f)
+        return self._config_cache
+    
     def get_available_crews(self) -> List[Dict]:
         """
         Load all crew information with current status and capabilities.
@@ -57,18 +77,64 @@ class OutageDataLoader:
         Returns:
             List of affected customers with contact preferences and priority levels
         """
+        customers = self.get_all_customers()
+        
+        # Business Rule: Use Haversine formula for distance calculation
+        # Business Rule: Include customers within radius_km of incident location
+        positions, _ = self.get_customer_spatial_index().query_radius(latitude, longitude, radius_km)
+        return [customers[position] for position in positions]
+    
+    def get_customers_in_areas(self, latitudes: Sequence[float], longitudes: Sequence[float],
+                               radii_km: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find customers inside any of several incident areas, and which areas cover each.
+        
+        Candidates come from the spatial index; coverage is then decided from a
+        customer x area distance matrix computed in bounded chunks.
+        
+        Args:
+            latitudes: Area center latitudes
+            longitudes: Area center longitudes
+            radii_km: Area radii in kilometers
+            
+        Returns:
+            Tuple of (customer positions into get_all_customers(), boolean matrix of
+            shape customers x areas that is True where the area covers the customer)
+        """
+        index = self.get_customer_spatial_index()
+        radii = np.asarray(radii_km, dtype=np.float64)
+        hits = [index.query_radius(lat, lon, radius)[0] for lat, lon, radius in zip(latitudes, longitudes, radii)]
+        positions = np.unique(np.concatenate(hits)) if hits else np.empty(0, dtype=np.int64)
+        coverage = np.zeros((len(positions), len(radii)), dtype=bool)
+        customer_latitudes, customer_longitudes = index.coordinates(positions)
+        for start, distances in iter_haversine_distance_chunks(customer_latitudes, customer_longitudes,
+                                                               latitudes, longitudes):
+            coverage[start:start + len(distances)] = distances <= radii
+        return positions, coverage
+    
+    def get_all_customers(self) -> List[Dict]:
+        """
+        Load the full customer database (cached after the first call).
+        
+        Returns:
+            List of customer records in database order
+        """
         if self._customer_cache is None:
             with open(self.data_dir / "customer_database.json") as f:
                 customer_data = json.load(f)
                 self._customer_cache = customer_data["customers"]
+            self._customer_index = None
+        return self._customer_cache
+    
+    def get_customer_spatial_index(self) -> CustomerSpatialIndex:
+        """
+        Spatial index over customer coordinates, built once when the customer cache loads.
         
-        # TODO: Filter customers by distance from incident
-        # Business Rule: Use Haversine formula for distance calculation
-        # Business Rule: Include customers within radius_km of incident location
-        # Tip for Copilot: "Find customers within radius using geographic distance"
-        affected_customers = []
-        # Implementation will be done in tasks
-        return affected_customers
+        Positions returned by its queries index into get_all_customers().
+        """
+        if self._customer_index is None:
+            self._customer_index = CustomerSpatialIndex.from_customers(self.get_all_customers())
+        return self._customer_index
     
     def get_equipment_by_id(self, equipment_id: str) -> Optional[Dict]:
         """
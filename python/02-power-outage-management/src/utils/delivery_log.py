@@ -0,0 +1,286 @@
+"""
+Append-only columnar log of notification delivery results.
+Keeps memory bounded after large events: results are written to disk in batches,
+only a recent window stays in RAM, and reporting aggregates are kept up to date
+as results arrive instead of being recomputed from the full history.
+"""
+
+import json
+import math
+import os
+import struct
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# File layout: MAGIC, then one block per flushed batch:
+# 4-byte little-endian header length, JSON header, column buffers in header order
+MAGIC = b"DLOG1\n"
+_HEADER_LENGTH = struct.Struct("<I")
+
+# Dictionary-encoded text columns: header holds the distinct values, buffer holds int32 codes (-1 = None)
+STRING_COLUMNS = ("customer_id", "incident_id", "channel", "priority")
+# Fixed-width columns; delivery_time is stored as POSIX seconds. Missing values are
+# stored as NaN in float columns and as 0 / False otherwise
+NUMERIC_COLUMNS = {
+    "delivery_successful": "|b1",
+    "attempt_count": "<i4",
+    "message_length": "<i4",
+    "latency_ms": "<f8",
+    "delivery_time": "<f8",
+}
+COLUMNS = STRING_COLUMNS + tuple(NUMERIC_COLUMNS)
+
+class ColumnarDeliveryLog:
+    """
+    Delivery results with bounded memory and incremental aggregates.
+
+    Results are buffered and appended to the log file as one columnar block per
+    flush_rows results, so a report can read just the columns it needs. The last
+    recent_size results stay available in memory through recent().
+
+    Business Rules:
+    - The file is only ever appended to; a block cut short by a crash is ignored
+      on read, losing at most the results of that flush
+    - Success rate, latency by channel and retries by priority cover every result
+      logged, including those no longer held in memory. Opening an existing file
+      rebuilds them from its blocks, so they also cover earlier runs; the recent
+      window starts empty
+    - Without a path, results are not persisted; only the window and aggregates are kept
+
+    Args:
+        path: Log file, created with its directory on first flush (default: no file)
+        recent_size: Results kept in memory
+        flush_rows: Buffered results that trigger a write to the file
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, recent_size: int = 10000, flush_rows: int = 5000):
+        self.path = Path(path) if path is not None else None
+        self.recent_size = recent_size
+        self.flush_rows = flush_rows
+        self._recent: deque = deque(maxlen=recent_size)
+        self._buffer: List[Dict] = []
+        self._tail_checked = False
+        self.total_count = 0
+        self.successful_count = 0
+        self._latency_by_channel: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+        self._retries_by_priority: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        self._load_aggregates()
+
+    def __len__(self) -> int:
+        return self.total_count
+
+    def append(self, result: Dict) -> None:
+        """Log one delivery result."""
+        self.extend((result,))
+
+    def extend(self, results: Iterable[Dict]) -> None:
+        """Log a batch of delivery results (usable as the delivery engine's log_sink)."""
+        for result in results:
+            self.total_count += 1
+            if result.get("delivery_successful"):
+                self.successful_count += 1
+            latency = result.get("latency_ms")
+            if latency is not None:
+                stats = self._latency_by_channel[result.get("channel")]
+                stats[0] += 1
+                stats[1] += latency
+                stats[2] = max(stats[2], latency)
+            retries = self._retries_by_priority[result.get("priority", "STANDARD")]
+            retries[0] += 1
+            retries[1] += max(0, result.get("attempt_count", 1) - 1)
+            self._recent.append(result)
+            if self.path is not None:
+                self._buffer.append(result)
+        if len(self._buffer) >= self.flush_rows:
+            self.flush()
+
+    def _load_aggregates(self) -> None:
+        """Fold the blocks already in the log file into the aggregates, one block at a time."""
+        columns = ("channel", "priority", "delivery_successful", "attempt_count", "latency_ms")
+        for block, _ in self._iter_blocks(columns):
+            self.total_count += len(block["delivery_successful"])
+            self.successful_count += int(block["delivery_successful"].sum())
+            latencies = block["latency_ms"]
+            for channel in dict.fromkeys(block["channel"]):
+                channel_latencies = latencies[(block["channel"] == channel) & ~np.isnan(latencies)]
+                if len(channel_latencies):
+                    stats = self._latency_by_channel[channel]
+                    stats[0] += len(channel_latencies)
+                    stats[1] += float(channel_latencies.sum())
+                    stats[2] = max(stats[2], float(channel_latencies.max()))
+            priorities = np.where(block["priority"] == None, "STANDARD", block["priority"])  # noqa: E711
+            retries = np.maximum(block["attempt_count"] - 1, 0)
+            for priority in dict.fromkeys(priorities):
+                selected = priorities == priority
+                stats = self._retries_by_priority[priority]
+                stats[0] += int(selected.sum())
+                stats[1] += int(retries[selected].sum())
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict]:
+        """Most recently logged results, oldest first."""
+        if limit is None or limit >= len(self._recent):
+            return list(self._recent)
+        return list(self._recent)[len(self._recent) - limit:]
+
+    def summary(self) -> Dict[str, any]:
+        """
+        Aggregates over every result logged.
+
+        Returns:
+            total_deliveries, successful, success_rate, latency_by_channel (count,
+            mean_ms, max_ms) and retries_by_priority (deliveries, retries, mean_retries)
+        """
+        return {
+            "total_deliveries": self.total_count,
+            "successful": self.successful_count,
+            "success_rate": self.successful_count / self.total_count if self.total_count else 0.0,
+            "latency_by_channel": {
+                channel: {"count": count, "mean_ms": total / count, "max_ms": longest}
+                for channel, (count, total, longest) in self._latency_by_channel.items()
+            },
+            "retries_by_priority": {
+                priority: {"deliveries": count, "retries": retries, "mean_retries": retries / count}
+                for priority, (count, retries) in self._retries_by_priority.items()
+            },
+        }
+
+    def flush(self) -> int:
+        """
+        Write buffered results to the log file as one block.
+
+        Returns:
+            Number of results written
+        """
+        if self.path is None or not self._buffer:
+            return 0
+        batch, self._buffer = self._buffer, []
+        header_columns, buffers = {}, []
+        for column in STRING_COLUMNS:
+            values, codes = _dictionary_encode([result.get(column) for result in batch])
+            header_columns[column] = {"dtype": "<i4", "nbytes": codes.nbytes, "values": values}
+            buffers.append(codes)
+        for column, dtype in NUMERIC_COLUMNS.items():
+            array = _column_array(column, [result.get(column) for result in batch])
+            header_columns[column] = {"dtype": dtype, "nbytes": array.nbytes}
+            buffers.append(array)
+        header = json.dumps({"rows": len(batch), "columns": header_columns}).encode()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self._tail_checked:
+            self._truncate_incomplete_block()
+            self._tail_checked = True
+        with open(self.path, "ab") as f:
+            if f.tell() == 0:
+                f.write(MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header)) + header + b"".join(array.tobytes() for array in buffers))
+        return len(batch)
+
+    def _truncate_incomplete_block(self) -> None:
+        """Cut off a block left half-written by a crash, so new blocks follow the last complete one."""
+        if not self.path.exists():
+            return
+        size = self.path.stat().st_size
+        end = 0
+        if size >= len(MAGIC):
+            end = len(MAGIC)
+            for _, end in self._iter_blocks(()):
+                pass
+        if end < size:
+            os.truncate(self.path, end)
+
+    def close(self) -> None:
+        """Write any buffered results."""
+        self.flush()
+
+    def __enter__(self) -> "ColumnarDeliveryLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def read_columns(self, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Read whole columns back from the log file, plus results not yet flushed.
+
+        Only the requested columns are read from disk. Text columns come back as
+        object arrays (None where missing), delivery_time as POSIX seconds.
+
+        Args:
+            columns: Column names (default: all)
+
+        Returns:
+            Column name -> array, rows in logging order
+        """
+        columns = list(columns or COLUMNS)
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown delivery log columns: {sorted(unknown)}")
+        parts: Dict[str, List[np.ndarray]] = {column: [] for column in columns}
+        for block, _ in self._iter_blocks(columns):
+            for column in columns:
+                parts[column].append(block[column])
+        if self._buffer:
+            for column in columns:
+                parts[column].append(_column_array(column, [result.get(column) for result in self._buffer]))
+        return {
+            column: np.concatenate(arrays) if arrays else _column_array(column, [])
+            for column, arrays in parts.items()
+        }
+
+    def _iter_blocks(self, columns: Sequence[str]) -> Iterator[Tuple[Dict[str, np.ndarray], int]]:
+        """Complete blocks as (requested columns, file offset of the block's end)."""
+        if self.path is None or not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a delivery log")
+            while True:
+                length_bytes = f.read(_HEADER_LENGTH.size)
+                if len(length_bytes) < _HEADER_LENGTH.size:
+                    return
+                header_bytes = f.read(_HEADER_LENGTH.unpack(length_bytes)[0])
+                try:
+                    header = json.loads(header_bytes)
+                except ValueError:
+                    return
+                offset = f.tell()
+                if offset + sum(spec["nbytes"] for spec in header["columns"].values()) > size:
+                    return
+                block = {}
+                for column, spec in header["columns"].items():
+                    if column in columns:
+                        f.seek(offset)
+                        array = np.frombuffer(f.read(spec["nbytes"]), dtype=spec["dtype"])
+                        if "values" in spec:
+                            array = _dictionary_decode(spec["values"], array)
+                        block[column] = array
+                    offset += spec["nbytes"]
+                f.seek(offset)
+                yield block, offset
+
+def _dictionary_encode(values: List[Optional[str]]):
+    codes_by_value: Dict[str, int] = {}
+    codes = np.fromiter(
+        (-1 if value is None else codes_by_value.setdefault(value, len(codes_by_value)) for value in values),
+        dtype="<i4", count=len(values),
+    )
+    return list(codes_by_value), codes
+
+def _dictionary_decode(values: List[str], codes: np.ndarray) -> np.ndarray:
+    lookup = np.array(values + [None], dtype=object)
+    return lookup[codes]
+
+def _column_array(column: str, values: List) -> np.ndarray:
+    dtype = NUMERIC_COLUMNS.get(column)
+    if dtype is None:
+        return np.array(values, dtype=object)
+    missing = math.nan if np.dtype(dtype).kind == "f" else 0
+    return np.array([
+        missing if value is None else value.timestamp() if isinstance(value, datetime) else value
+        for value in values
+    ], dtype=dtype)
@@ -3,6 +3,14 @@ Utility functions for calculating distances between geographic coordinates.
 """
 
 import math
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# Distances computed per chunk by the batch functions (about 32 MB of float64 temporaries)
+_DEFAULT_CHUNK_ELEMENTS = 4_194_304
 
 def calculate_haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -32,4 +40,89 @@ def calculate_haversine_distance(lat1: float, lon1: float, lat2: float, lon2: fl
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
     distance = R * c
     
-    return distance
\ No newline at end of file
+    return distance
+
+
+def haversine_distances_from_point(latitude: float, longitude: float,
+                                   latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """
+    Great-circle distances from one point to many points, computed in a single vectorized pass.
+
+    Args:
+        latitude: Latitude of the reference point in degrees.
+        longitude: Longitude of the reference point in degrees.
+        latitudes: Array of latitudes in degrees.
+        longitudes: Array of longitudes in degrees (same shape as latitudes).
+
+    Returns:
+        Array of distances in kilometers, one per point.
+    """
+    lat1 = math.radians(latitude)
+    lat2 = np.radians(latitudes)
+    dlat = lat2 - lat1
+    dlon = np.radians(longitudes) - math.radians(longitude)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def iter_haversine_distance_chunks(latitudes1: np.ndarray, longitudes1: np.ndarray,
+                                   latitudes2: np.ndarray, longitudes2: np.ndarray,
+                                   dtype=np.float64, chunk_rows: Optional[int] = None) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Great-circle distances between two point sets, one block of rows at a time.
+
+    Use this to reduce very large distance matrices (e.g. customers x incidents)
+    without materializing them; haversine_distance_matrix stacks the blocks.
+
+    Args:
+        latitudes1, longitudes1: First point set (matrix rows) in degrees.
+        latitudes2, longitudes2: Second point set (matrix columns) in degrees.
+        dtype: np.float64, or np.float32 to halve memory at about 1 m precision.
+        chunk_rows: Rows per block; by default blocks hold about 4M distances.
+
+    Yields:
+        (first row index, block of distances in km with shape rows x len(latitudes2))
+    """
+    lat1 = np.radians(np.asarray(latitudes1, dtype=np.float64)).astype(dtype, copy=False)
+    lon1 = np.radians(np.asarray(longitudes1, dtype=np.float64)).astype(dtype, copy=False)
+    lat2 = np.radians(np.asarray(latitudes2, dtype=np.float64)).astype(dtype, copy=False)
+    lon2 = np.radians(np.asarray(longitudes2, dtype=np.float64)).astype(dtype, copy=False)
+    cos_lat2 = np.cos(lat2)
+    if chunk_rows is None:
+        chunk_rows = max(1, _DEFAULT_CHUNK_ELEMENTS // max(len(lat2), 1))
+
+    for start in range(0, len(lat1), chunk_rows):
+        block_lat = lat1[start:start + chunk_rows, None]
+        block_lon = lon1[start:start + chunk_rows, None]
+        a = np.sin((lat2 - block_lat) / 2) ** 2
+        a += np.cos(block_lat) * cos_lat2 * np.sin((lon2 - block_lon) / 2) ** 2
+        np.clip(a, 0.0, 1.0, out=a)
+        np.sqrt(a, out=a)
+        np.arcsin(a, out=a)
+        a *= 2 * EARTH_RADIUS_KM
+        yield start, a
+
+
+def haversine_distance_matrix(latitudes1: np.ndarray, longitudes1: np.ndarray,
+                              latitudes2: np.ndarray, longitudes2: np.ndarray,
+                              dtype=np.float64, chunk_rows: Optional[int] = None) -> np.ndarray:
+    """
+    Full matrix of great-circle distances between two point sets in one call.
+
+    Typical use is crews x incidents for dispatch scoring. Rows are computed in
+    chunks so temporaries stay bounded; only the result is full size.
+
+    Args:
+        latitudes1, longitudes1: First point set (matrix rows) in degrees.
+        latitudes2, longitudes2: Second point set (matrix columns) in degrees.
+        dtype: np.float64, or np.float32 to halve memory at about 1 m precision.
+        chunk_rows: Rows computed per chunk; by default about 4M distances per chunk.
+
+    Returns:
+        Array of shape (len(latitudes1), len(latitudes2)) with distances in kilometers.
+    """
+    distances = np.empty((len(latitudes1), len(latitudes2)), dtype=dtype)
+    for start, block in iter_haversine_distance_chunks(latitudes1, longitudes1, latitudes2, longitudes2,
+                                                       dtype=dtype, chunk_rows=chunk_rows):
+        distances[start:start + len(block)] = block
+    return distances
@@ -0,0 +1,166 @@
+"""
+Priority queue of active incidents for dispatcher dashboards.
+Keeps incidents ordered by priority without re-scoring and re-sorting them on
+every request, although their scores keep aging.
+"""
+
+import heapq
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models.incident import OutageIncident, IncidentStatus
+from .priority_calculator import calculate_priority_key, hours_since_priority_epoch
+
+class _IndexedMaxHeap:
+    """Binary max-heap of (key, incident ID) with a position map for O(log n) update and removal."""
+
+    def __init__(self):
+        self.keys: List[float] = []
+        self.ids: List[str] = []
+        self.positions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _swap(self, i: int, j: int) -> None:
+        self.keys[i], self.keys[j] = self.keys[j], self.keys[i]
+        self.ids[i], self.ids[j] = self.ids[j], self.ids[i]
+        self.positions[self.ids[i]] = i
+        self.positions[self.ids[j]] = j
+
+    def _sift_up(self, i: int) -> None:
+        while i > 0:
+            parent = (i - 1) // 2
+            if self.keys[parent] >= self.keys[i]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int) -> None:
+        n = len(self.keys)
+        while True:
+            largest, left, right = i, 2 * i + 1, 2 * i + 2
+            if left < n and self.keys[left] > self.keys[largest]:
+                largest = left
+            if right < n and self.keys[right] > self.keys[largest]:
+                largest = right
+            if largest == i:
+                return
+            self._swap(i, largest)
+            i = largest
+
+    def push(self, incident_id: str, key: float) -> None:
+        self.keys.append(key)
+        self.ids.append(incident_id)
+        self.positions[incident_id] = len(self.ids) - 1
+        self._sift_up(len(self.ids) - 1)
+
+    def update(self, incident_id: str, key: float) -> None:
+        i = self.positions[incident_id]
+        old_key, self.keys[i] = self.keys[i], key
+        if key > old_key:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def remove(self, incident_id: str) -> None:
+        i = self.positions[incident_id]
+        last = len(self.ids) - 1
+        if i != last:
+            self._swap(i, last)
+        self.keys.pop()
+        self.ids.pop()
+        del self.positions[incident_id]
+        if i != last:
+            self._sift_up(i)
+            self._sift_down(i)
+
+class IncidentPriorityQueue:
+    """
+    Incidents ordered by calculate_incident_priority, with per-status heaps.
+
+    Each incident is stored under its time-invariant priority key (see
+    calculate_priority_key). Incidents that age at the same rate never change order,
+    so one max-heap per (status, aging rate) stays valid as time passes; only the
+    comparison between heaps of different rates needs the current time.
+
+    Complexity:
+    - push, update and remove: O(log n)
+    - top(k): O(k log(k + h)), walking the heaps' trees from their roots, where h
+      is the number of (status, aging rate) heaps selected
+    """
+
+    def __init__(self, incidents: Iterable[OutageIncident] = ()):
+        self._heaps: Dict[Tuple[IncidentStatus, float], _IndexedMaxHeap] = {}
+        self._incidents: Dict[str, OutageIncident] = {}
+        self._heap_of: Dict[str, Tuple[IncidentStatus, float]] = {}
+        for incident in incidents:
+            self.push(incident)
+
+    def __len__(self) -> int:
+        return len(self._incidents)
+
+    def __contains__(self, incident_id: str) -> bool:
+        return incident_id in self._incidents
+
+    def push(self, incident: OutageIncident) -> None:
+        """Add an incident, or re-rank it if it is already queued."""
+        if incident.incident_id in self._incidents:
+            self.update(incident)
+            return
+        key, aging_rate = calculate_priority_key(incident)
+        heap_id = (incident.status, aging_rate)
+        self._heaps.setdefault(heap_id, _IndexedMaxHeap()).push(incident.incident_id, key)
+        self._incidents[incident.incident_id] = incident
+        self._heap_of[incident.incident_id] = heap_id
+
+    def update(self, incident: OutageIncident) -> None:
+        """Re-rank an incident after its status, severity, cause or customer counts changed."""
+        key, aging_rate = calculate_priority_key(incident)
+        heap_id = (incident.status, aging_rate)
+        if self._heap_of[incident.incident_id] != heap_id:
+            self.remove(incident.incident_id)
+            self.push(incident)
+        else:
+            self._heaps[heap_id].update(incident.incident_id, key)
+            self._incidents[incident.incident_id] = incident
+
+    def remove(self, incident_id: str) -> Optional[OutageIncident]:
+        """Drop an incident (e.g. once resolved); returns it, or None if it was not queued."""
+        heap_id = self._heap_of.pop(incident_id, None)
+        if heap_id is None:
+            return None
+        self._heaps[heap_id].remove(incident_id)
+        return self._incidents.pop(incident_id)
+
+    def top(self, k: Optional[int] = None, statuses: Optional[Iterable[IncidentStatus]] = None,
+            as_of: Optional[datetime] = None) -> List[Tuple[OutageIncident, float]]:
+        """
+        Highest-priority incidents with their current priority scores.
+
+        Args:
+            k: Number of incidents to return (default: all matching)
+            statuses: Statuses to include (default: all queued)
+            as_of: Time at which scores are evaluated (default: now)
+
+        Returns:
+            List of (incident, priority score), highest score first
+        """
+        statuses = set(IncidentStatus(status) for status in statuses) if statuses is not None else None
+        now_hours = hours_since_priority_epoch(as_of or datetime.now())
+        heaps = [
+            (aging_rate, heap) for (status, aging_rate), heap in self._heaps.items()
+            if len(heap) and (statuses is None or status in statuses)
+        ]
+        # Frontier of heap nodes whose parents were already returned
+        frontier = [(-(heap.keys[0] + aging_rate * now_hours), n, 0) for n, (aging_rate, heap) in enumerate(heaps)]
+        heapq.heapify(frontier)
+        results = []
+        while frontier and (k is None or len(results) < k):
+            negative_score, n, i = heapq.heappop(frontier)
+            aging_rate, heap = heaps[n]
+            results.append((self._incidents[heap.ids[i]], -negative_score))
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (-(heap.keys[child] + aging_rate * now_hours), n, child))
+        return results
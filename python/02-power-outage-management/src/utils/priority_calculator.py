@@ -2,11 +2,27 @@
 Utility functions for calculating incident priority.
 """
 
-from typing import Dict
+from typing import Dict, Optional, Tuple
 from ..models.incident import OutageIncident, OutageSeverity, OutageCause
 from datetime import datetime, timedelta
 
-def calculate_incident_priority(incident: OutageIncident) -> float:
+# Priority points per affected customer, by customer category
+CRITICAL_INFRASTRUCTURE_POINTS = 100
+COMMERCIAL_POINTS = 10
+RESIDENTIAL_POINTS = 1
+SEVERITY_MULTIPLIERS = {
+    OutageSeverity.MINOR: 1,
+    OutageSeverity.MODERATE: 2,
+    OutageSeverity.MAJOR: 3,
+    OutageSeverity.CRITICAL: 5,
+    OutageSeverity.CATASTROPHIC: 10
+}
+AGING_POINTS_PER_HOUR = 20
+SEVERE_WEATHER_MULTIPLIER = 1.5
+# Reference time for time-invariant priority keys
+PRIORITY_EPOCH = datetime(2000, 1, 1)
+
+def calculate_incident_priority(incident: OutageIncident, now: Optional[datetime] = None) -> float:
     """
     Calculate incident priority score for crew dispatch optimization.
     
@@ -18,34 +34,47 @@ def calculate_incident_priority(incident: OutageIncident) -> float:
     - Duration penalty: +20 points per hour since incident creation
     - Weather condition multiplier: SEVERE_WEATHER incidents get 1.5x multiplier
     
+    The score is evaluated from calculate_priority_key, so it always agrees with
+    the order of the incident priority queue.
+    
     Args:
         incident: The OutageIncident object.
+        now: Time to score at (default: now).
         
     Returns:
         Numeric priority score (higher = more urgent)
     """
-    base_score = (
-        incident.critical_infrastructure_count * 100 +
-        incident.commercial_customer_count * 10 +
-        incident.residential_customer_count * 1
-    )
-    
-    severity_multiplier = {
-        OutageSeverity.MINOR: 1,
-        OutageSeverity.MODERATE: 2,
-        OutageSeverity.MAJOR: 3,
-        OutageSeverity.CRITICAL: 5,
-        OutageSeverity.CATASTROPHIC: 10
-    }.get(incident.severity, 1)
-    
-    score = base_score * severity_multiplier
+    key, aging_rate = calculate_priority_key(incident)
+    return key + aging_rate * hours_since_priority_epoch(now or datetime.now())
+
+def hours_since_priority_epoch(moment: datetime) -> float:
+    """Hours from PRIORITY_EPOCH to moment."""
+    return (moment - PRIORITY_EPOCH).total_seconds() / 3600
+
+def calculate_priority_key(incident: OutageIncident) -> Tuple[float, float]:
+    """
+    Split an incident's priority into a time-invariant key and an aging rate.
     
-    # Duration penalty
-    time_since_creation = (datetime.now() - incident.created_at).total_seconds() / 3600
-    score += time_since_creation * 20
+    calculate_incident_priority(incident) at time t equals
+    key + aging_rate * hours_since_priority_epoch(t), because the duration penalty
+    grows linearly from created_at. Incidents with the same aging rate therefore
+    keep their relative order as time passes, and can be ordered by key alone.
     
-    # Weather condition multiplier
-    if incident.cause == OutageCause.SEVERE_WEATHER:
-        score *= 1.5
+    Args:
+        incident: The OutageIncident object.
+        
+    Returns:
+        Tuple of (key, aging rate in points per hour)
+    """
+    base_score = (
+        incident.critical_infrastructure_count * CRITICAL_INFRASTRUCTURE_POINTS +
+        incident.commercial_customer_count * COMMERCIAL_POINTS +
+        incident.residential_customer_count * RESIDENTIAL_POINTS
+    )
+    severity_multiplier = SEVERITY_MULTIPLIERS.get(incident.severity, 1)
     
-    return score
\ No newline at end of file
+    # Weather multiplies the whole score, so it also scales the aging rate
+    weather_multiplier = SEVERE_WEATHER_MULTIPLIER if incident.cause == OutageCause.SEVERE_WEATHER else 1
+    aging_rate = AGING_POINTS_PER_HOUR * weather_multiplier
+    key = base_score * severity_multiplier * weather_multiplier - aging_rate * hours_since_priority_epoch(incident.created_at)
+    return key, aging_rate
@@ -0,0 +1,127 @@
+"""
+Spatial index over customer coordinates for fast radius queries.
+Lets incident impact assessment and notifications find affected customers without
+scanning the whole customer database.
+"""
+
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .distance_calculator import EARTH_RADIUS_KM, haversine_distances_from_point
+
+KM_PER_DEGREE_LATITUDE = math.pi * EARTH_RADIUS_KM / 180
+
+
+class CustomerSpatialIndex:
+    """
+    Grid-band index of customer locations, built once per customer database load.
+
+    Customers are bucketed into latitude bands of band_degrees height and sorted by
+    longitude within each band. A radius query visits only the bands overlapping the
+    search circle's bounding box, binary-searches the longitude range inside each band,
+    and refines the candidates with a vectorized Haversine distance.
+
+    Business Rules:
+    - Distances use the Haversine formula, same as calculate_haversine_distance.
+    - A customer exactly radius_km away is inside the area.
+    - Results are in customer database order.
+
+    Args:
+        latitudes: Customer latitudes in degrees.
+        longitudes: Customer longitudes in degrees.
+        band_degrees: Height of a latitude band (0.05 degrees is about 5.5 km).
+    """
+
+    def __init__(self, latitudes: np.ndarray, longitudes: np.ndarray, band_degrees: float = 0.05):
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        if latitudes.shape != longitudes.shape:
+            raise ValueError("latitudes and longitudes must have the same shape")
+        self.band_degrees = band_degrees
+        self._latitudes_by_position = latitudes
+        self._longitudes_by_position = longitudes
+        bands = self._band_of(latitudes)
+        # Position in the customer database of each entry, sorted by (band, longitude)
+        self.order = np.lexsort((longitudes, bands))
+        self.bands = bands[self.order]
+        self.latitudes = latitudes[self.order]
+        self.longitudes = longitudes[self.order]
+
+    @classmethod
+    def from_customers(cls, customers: List[Dict], band_degrees: float = 0.05) -> "CustomerSpatialIndex":
+        """Build the index from customer records with latitude and longitude fields."""
+        latitudes = np.fromiter((c["latitude"] for c in customers), dtype=np.float64, count=len(customers))
+        longitudes = np.fromiter((c["longitude"] for c in customers), dtype=np.float64, count=len(customers))
+        return cls(latitudes, longitudes, band_degrees)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def coordinates(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Latitudes and longitudes of the customers at the given database positions."""
+        return self._latitudes_by_position[positions], self._longitudes_by_position[positions]
+
+    def _band_of(self, latitudes):
+        return np.floor((np.asarray(latitudes) + 90.0) / self.band_degrees).astype(np.int64)
+
+    def _longitude_ranges(self, longitude: float, latitude_max_abs: float, radius_km: float) -> List[Tuple[float, float]]:
+        """Longitude intervals covering the search circle, split at the antimeridian."""
+        cos_lat = math.cos(math.radians(latitude_max_abs))
+        sin_radius = math.sin(radius_km / EARTH_RADIUS_KM)
+        if latitude_max_abs >= 90.0 or sin_radius >= cos_lat:
+            return [(-180.0, 180.0)]
+        half_width = math.degrees(math.asin(sin_radius / cos_lat))
+        west, east = longitude - half_width, longitude + half_width
+        if west < -180.0:
+            return [(west + 360.0, 180.0), (-180.0, east)]
+        if east > 180.0:
+            return [(west, 180.0), (-180.0, east - 360.0)]
+        return [(west, east)]
+
+    def query_radius(self, latitude: float, longitude: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find customers within radius_km of a point.
+
+        Args:
+            latitude: Search center latitude in degrees.
+            longitude: Search center longitude in degrees.
+            radius_km: Search radius in kilometers.
+
+        Returns:
+            Tuple of (customer database positions, distances in km), in database order.
+        """
+        if radius_km < 0 or len(self) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        # Bounding box: latitude extent is exact, longitude extent is widest at the
+        # box edge nearest a pole
+        delta_lat = radius_km / KM_PER_DEGREE_LATITUDE
+        south, north = max(-90.0, latitude - delta_lat), min(90.0, latitude + delta_lat)
+        longitude_ranges = self._longitude_ranges(longitude, max(abs(south), abs(north)), radius_km)
+
+        first_band, last_band = self._band_of(south), self._band_of(north)
+        band_starts = np.searchsorted(self.bands, np.arange(first_band, last_band + 1), side="left")
+        band_ends = np.searchsorted(self.bands, np.arange(first_band, last_band + 1), side="right")
+        slices = []
+        for start, end in zip(band_starts, band_ends):
+            if start == end:
+                continue
+            band_longitudes = self.longitudes[start:end]
+            for west, east in longitude_ranges:
+                lo = start + np.searchsorted(band_longitudes, west, side="left")
+                hi = start + np.searchsorted(band_longitudes, east, side="right")
+                if lo < hi:
+                    slices.append(np.arange(lo, hi))
+        if not slices:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        candidates = np.concatenate(slices)
+        distances = haversine_distances_from_point(
+            latitude, longitude, self.latitudes[candidates], self.longitudes[candidates]
+        )
+        inside = distances <= radius_km
+        positions = self.order[candidates[inside]]
+        by_position = np.argsort(positions, kind="stable")
+        return positions[by_position], distances[inside][by_position]
@@ -0,0 +1,137 @@
+"""
+Hierarchical timing wheel for large numbers of pending timers.
+Used to hold delayed customer notifications until they are due without one
+sleeping task or heap entry per message.
+"""
+
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+class HierarchicalTimerWheel:
+    """
+    Timers bucketed by expiry into wheels of increasing granularity.
+
+    Level 0 has one slot per tick; each higher level's slot spans a full turn of
+    the level below. A timer goes into the finest level whose span covers its delay.
+    When a coarser slot comes due, its timers cascade down to finer levels. Timers
+    beyond the top level wait in an overflow bucket that is rechecked once per top
+    level turn.
+
+    Complexity:
+    - schedule and cancel: O(1)
+    - advance: O(ticks elapsed + timers fired + timers cascaded)
+
+    Args:
+        tick: Time resolution of the wheel
+        wheel_sizes: Slots per level (default: 60 seconds, 60 minutes, 24 hours)
+        origin: Time of tick 0 (default: now)
+    """
+
+    def __init__(self, tick: timedelta = timedelta(seconds=1), wheel_sizes: Tuple[int, ...] = (60, 60, 24),
+                 origin: Optional[datetime] = None):
+        self.tick = tick
+        self.wheel_sizes = wheel_sizes
+        self.origin = origin or datetime.now()
+        self.current_tick = 0
+        # Ticks per slot at each level, and ticks covered by a full turn of all levels
+        self._granularity = [math.prod(wheel_sizes[:level]) for level in range(len(wheel_sizes))]
+        self._span = math.prod(wheel_sizes)
+        self._wheels: List[List[Dict[Hashable, Tuple[int, Any]]]] = [[{} for _ in range(size)] for size in wheel_sizes]
+        self._overflow: Dict[Hashable, Tuple[int, Any]] = {}
+        self._due: Dict[Hashable, Tuple[int, Any]] = {}
+        self._locations: Dict[Hashable, Dict[Hashable, Tuple[int, Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._locations
+
+    def _tick_of(self, moment: datetime) -> int:
+        return math.ceil((moment - self.origin) / self.tick)
+
+    def time_of(self, tick: int) -> datetime:
+        """Wall time at which a tick is reached."""
+        return self.origin + tick * self.tick
+
+    def _place(self, key: Hashable, expiry_tick: int, payload: Any) -> None:
+        delta = expiry_tick - self.current_tick
+        if delta <= 0:
+            bucket = self._due
+        elif delta >= self._span:
+            bucket = self._overflow
+        else:
+            level = 0
+            while delta >= self._granularity[level] * self.wheel_sizes[level]:
+                level += 1
+            bucket = self._wheels[level][(expiry_tick // self._granularity[level]) % self.wheel_sizes[level]]
+        bucket[key] = (expiry_tick, payload)
+        self._locations[key] = bucket
+
+    def schedule(self, key: Hashable, due_at: datetime, payload: Any) -> None:
+        """
+        Add a timer, replacing any pending timer with the same key.
+
+        Args:
+            key: Unique timer identifier, used to cancel it
+            due_at: When the timer fires (rounded up to the next tick)
+            payload: Value returned by advance() when it fires
+        """
+        self.cancel(key)
+        self._place(key, self._tick_of(due_at), payload)
+
+    def cancel(self, key: Hashable) -> Optional[Any]:
+        """Remove a pending timer; returns its payload, or None if it was not pending."""
+        bucket = self._locations.pop(key, None)
+        if bucket is None:
+            return None
+        return bucket.pop(key)[1]
+
+    def _cascade(self, bucket: Dict[Hashable, Tuple[int, Any]]) -> None:
+        entries = list(bucket.items())
+        bucket.clear()
+        for key, (expiry_tick, payload) in entries:
+            self._place(key, expiry_tick, payload)
+
+    def advance(self, now: Optional[datetime] = None) -> List[Tuple[Hashable, Any]]:
+        """
+        Move the wheel forward to now and collect the timers that came due.
+
+        Args:
+            now: Current time (default: datetime.now())
+
+        Returns:
+            List of (key, payload) for fired timers, in expiry order per tick
+        """
+        target_tick = math.floor(((now or datetime.now()) - self.origin) / self.tick)
+        fired = self._pop_due()
+        while self.current_tick < target_tick:
+            self.current_tick += 1
+            tick = self.current_tick
+            if tick % self._span == 0 and self._overflow:
+                self._cascade(self._overflow)
+            for level in range(len(self.wheel_sizes) - 1, 0, -1):
+                if tick % self._granularity[level] == 0:
+                    self._cascade(self._wheels[level][(tick // self._granularity[level]) % self.wheel_sizes[level]])
+            slot = self._wheels[0][tick % self.wheel_sizes[0]]
+            if slot:
+                self._due.update(slot)
+                for key in slot:
+                    self._locations[key] = self._due
+                slot.clear()
+            fired.extend(self._pop_due())
+        return fired
+
+    def _pop_due(self) -> List[Tuple[Hashable, Any]]:
+        fired = [(key, payload) for key, (_, payload) in self._due.items()]
+        for key, _ in fired:
+            del self._locations[key]
+        self._due.clear()
+        return fired
+
+    def pending(self) -> Iterator[Tuple[Hashable, datetime, Any]]:
+        """All pending timers as (key, due time, payload), e.g. for persisting them."""
+        for key, bucket in self._locations.items():
+            expiry_tick, payload = bucket[key]
+            yield key, self.time_of(expiry_tick), payload
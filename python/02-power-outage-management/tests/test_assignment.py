@@ -0,0 +1,50 @@
+"""
+Tests for the linear sum assignment solver against exhaustive search.
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from src.utils.assignment import solve_assignment
+
+
+def _brute_force_total(cost, maximize=False):
+    n_rows, n_cols = cost.shape
+    pick = max if maximize else min
+    if n_rows <= n_cols:
+        return pick(sum(cost[r, c] for r, c in zip(range(n_rows), cols))
+                    for cols in itertools.permutations(range(n_cols), n_rows))
+    return pick(sum(cost[r, c] for r, c in zip(rows, range(n_cols)))
+                for rows in itertools.permutations(range(n_rows), n_cols))
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (3, 3), (5, 5), (6, 6), (2, 6), (4, 7), (7, 3), (6, 2)])
+def test_matches_exhaustive_search(shape):
+    rng = np.random.default_rng(sum(shape))
+    for _ in range(25):
+        # Small integer costs give many ties, which exercise the tie handling
+        cost = rng.integers(0, 10, size=shape).astype(float)
+        for maximize in (False, True):
+            rows, cols = solve_assignment(cost, maximize=maximize)
+            assert len(rows) == min(shape)
+            assert len(set(rows.tolist())) == len(set(cols.tolist())) == min(shape)
+            assert np.all(np.diff(rows) > 0)
+            assert cost[rows, cols].sum() == pytest.approx(_brute_force_total(cost, maximize))
+
+
+def test_forbidden_pairs_are_avoided():
+    cost = np.array([[1.0, np.inf, 3.0], [np.inf, np.inf, 1.0], [2.0, 5.0, np.inf]])
+    rows, cols = solve_assignment(cost)
+    assert np.isfinite(cost[rows, cols]).all()
+    assert cost[rows, cols].sum() == pytest.approx(_brute_force_total(np.where(np.isinf(cost), 1e9, cost)))
+
+
+def test_infeasible_and_invalid_matrices_raise():
+    with pytest.raises(ValueError):
+        solve_assignment(np.array([[np.inf, 1.0], [np.inf, 2.0]]))
+    with pytest.raises(ValueError):
+        solve_assignment(np.array([[np.nan, 1.0], [1.0, 2.0]]))
+    rows, cols = solve_assignment(np.empty((0, 3)))
+    assert len(rows) == len(cols) == 0
@@ -0,0 +1,157 @@
+"""
+Tests for batch crew dispatch against per-pair scoring and exhaustive matching.
+"""
+
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.models.crew import CrewSpecialization, FieldCrew, specialization_match_score
+from src.models.incident import OutageCause, OutageIncident, OutageSeverity
+from src.services.crew_dispatcher import (
+    BATCH_PRIORITY_POINTS, DISTANCE_PENALTY_PER_KM, EXPERIENCE_BONUS, MAX_CUSTOMER_BONUS,
+    CrewDispatchService, required_specialization,
+)
+from src.services.crew_registry import CrewRegistry
+from src.utils.distance_calculator import calculate_haversine_distance
+from src.utils.priority_calculator import calculate_incident_priority
+
+
+def _crew(rng, i, latitude=None, longitude=None, **overrides):
+    fields = dict(
+        crew_id=f"CREW_{i:04d}", name=f"Crew {i}", team_size=4,
+        specialization=rng.choice(list(CrewSpecialization)),
+        skill_level=rng.choice(list(EXPERIENCE_BONUS)),
+        current_latitude=rng.uniform(40.5, 40.9) if latitude is None else latitude,
+        current_longitude=rng.uniform(-74.2, -73.8) if longitude is None else longitude,
+        shift_end=datetime.now() + timedelta(hours=8),
+    )
+    fields.update(overrides)
+    return FieldCrew(**fields)
+
+
+def _incident(rng, i, latitude=None, longitude=None, **overrides):
+    fields = dict(
+        incident_id=f"INC_{i:04d}",
+        created_at=datetime.now() - timedelta(minutes=rng.randint(0, 600)),
+        latitude=rng.uniform(40.5, 40.9) if latitude is None else latitude,
+        longitude=rng.uniform(-74.2, -73.8) if longitude is None else longitude,
+        affected_radius_km=2.0,
+        cause=rng.choice(list(OutageCause)), severity=rng.choice(list(OutageSeverity)),
+        estimated_customers_affected=rng.randint(1, 2000),
+        critical_infrastructure_count=rng.randint(0, 2),
+        residential_customer_count=rng.randint(0, 2000),
+    )
+    fields.update(overrides)
+    return OutageIncident(**fields)
+
+
+def _dispatcher():
+    return CrewDispatchService(crew_registry=CrewRegistry())
+
+
+def _pair_value(crew, incident, max_priority):
+    distance = calculate_haversine_distance(crew.current_latitude, crew.current_longitude,
+                                            incident.latitude, incident.longitude)
+    suitability = (
+        specialization_match_score(crew.specialization, required_specialization(incident))
+        + EXPERIENCE_BONUS[crew.skill_level] - DISTANCE_PENALTY_PER_KM * distance
+    )
+    urgency = calculate_incident_priority(incident) / max_priority
+    return distance, suitability * (1 + urgency) + BATCH_PRIORITY_POINTS * urgency
+
+
+def test_scores_match_per_pair_scoring():
+    rng = random.Random(43)
+    crews = [_crew(rng, i) for i in range(12)]
+    incidents = [_incident(rng, i) for i in range(9)]
+    scores = _dispatcher().score_crews_for_incidents(crews, incidents)
+    for (r, crew), (c, incident) in itertools.product(enumerate(crews), enumerate(incidents)):
+        expected = (
+            specialization_match_score(crew.specialization, required_specialization(incident))
+            - DISTANCE_PENALTY_PER_KM * calculate_haversine_distance(
+                crew.current_latitude, crew.current_longitude, incident.latitude, incident.longitude)
+            + EXPERIENCE_BONUS[crew.skill_level]
+            + min(incident.estimated_customers_affected, MAX_CUSTOMER_BONUS)
+        )
+        assert scores[r, c] == pytest.approx(expected, abs=1e-6)
+
+
+@pytest.mark.parametrize("n_crews, n_incidents, max_distance_km", [
+    (4, 4, None), (3, 6, None), (6, 3, None), (5, 5, 15.0), (4, 6, 10.0),
+])
+def test_batch_dispatch_matches_exhaustive_matching(n_crews, n_incidents, max_distance_km):
+    rng = random.Random(n_crews * 10 + n_incidents)
+    for _ in range(5):
+        crews = [_crew(rng, i) for i in range(n_crews)]
+        incidents = [_incident(rng, i) for i in range(n_incidents)]
+        max_priority = max(calculate_incident_priority(incident) for incident in incidents)
+        pairs = {(r, c): _pair_value(crew, incident, max_priority)
+                 for (r, crew), (c, incident) in itertools.product(enumerate(crews), enumerate(incidents))}
+
+        # Fewest pairs beyond max_distance_km first, then the highest total value of the rest
+        best = None
+        matchings = (
+            [list(zip(range(n_crews), cols)) for cols in itertools.permutations(range(n_incidents), n_crews)]
+            if n_crews <= n_incidents else
+            [list(zip(rows, range(n_incidents))) for rows in itertools.permutations(range(n_crews), n_incidents)]
+        )
+        for matching in matchings:
+            feasible = [pair for pair in matching if max_distance_km is None or pairs[pair][0] <= max_distance_km]
+            key = (len(feasible), sum(pairs[pair][1] for pair in feasible))
+            best = key if best is None or key[0] > best[0] or (key[0] == best[0] and key[1] > best[1]) else best
+
+        result = _dispatcher().dispatch_crews_batch(incidents, crews, max_distance_km=max_distance_km)
+        assignments = result["assignments"]
+        assert len(assignments) == best[0]
+        assert result["total_score"] == pytest.approx(best[1], rel=1e-6, abs=1e-6)
+        assert len({a["crew_id"] for a in assignments}) == len({a["incident_id"] for a in assignments}) == best[0]
+        assert [a["score"] for a in assignments] == sorted((a["score"] for a in assignments), reverse=True)
+        if max_distance_km is not None:
+            assert all(a["distance_km"] <= max_distance_km for a in assignments)
+        assigned = {a["incident_id"] for a in assignments}
+        assert result["unassigned_incident_ids"] == [i.incident_id for i in incidents if i.incident_id not in assigned]
+
+
+def test_most_urgent_incidents_are_served_when_crews_run_short():
+    rng = random.Random(5)
+    crews = [_crew(rng, i, 40.7, -74.0) for i in range(2)]
+    incidents = [
+        _incident(rng, i, 40.71, -74.01, severity=severity, cause=OutageCause.EQUIPMENT_FAILURE)
+        for i, severity in enumerate([OutageSeverity.MINOR, OutageSeverity.CATASTROPHIC,
+                                      OutageSeverity.MODERATE, OutageSeverity.CRITICAL])
+    ]
+    result = _dispatcher().dispatch_crews_batch(incidents, crews)
+    urgent = sorted(incidents, key=calculate_incident_priority, reverse=True)[:2]
+    assert {a["incident_id"] for a in result["assignments"]} == {i.incident_id for i in urgent}
+    assert len(result["unassigned_incident_ids"]) == 2
+
+
+def test_incidents_beyond_max_distance_stay_unassigned():
+    rng = random.Random(6)
+    crews = [_crew(rng, i, 40.7, -74.0) for i in range(3)]
+    near = _incident(rng, 0, 40.71, -74.0)
+    far = _incident(rng, 1, 42.0, -71.0, severity=OutageSeverity.CATASTROPHIC)
+    result = _dispatcher().dispatch_crews_batch([near, far], crews, max_distance_km=50.0)
+    assert [a["incident_id"] for a in result["assignments"]] == [near.incident_id]
+    assert result["unassigned_incident_ids"] == [far.incident_id]
+
+    # Without a limit the far incident is served too
+    assert _dispatcher().dispatch_crews_batch([near, far], crews)["unassigned_incident_ids"] == []
+
+
+def test_storm_scale_batch_dispatch_is_fast():
+    rng = random.Random(2000)
+    crews = [_crew(rng, i) for i in range(500)]
+    incidents = [_incident(rng, i) for i in range(2000)]
+    dispatcher = _dispatcher()
+    started = time.perf_counter()
+    result = dispatcher.dispatch_crews_batch(incidents, crews)
+    elapsed = time.perf_counter() - started
+    assert len(result["assignments"]) == 500
+    assert len(result["unassigned_incident_ids"]) == 1500
+    assert elapsed < 1.0
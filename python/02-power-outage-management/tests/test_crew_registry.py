@@ -0,0 +1,127 @@
+"""
+Tests for the indexed crew registry against filtering the whole roster.
+"""
+
+import itertools
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.crew import CrewSpecialization, CrewStatus, FieldCrew
+from src.services.crew_registry import CrewRegistry
+
+SKILL_LEVELS = ("JUNIOR", "SENIOR", "EXPERT")
+
+
+def _crew(rng, crew_id, **overrides):
+    fields = dict(
+        crew_id=crew_id,
+        name=f"Crew {crew_id}",
+        team_size=rng.randint(1, 8),
+        specialization=rng.choice(list(CrewSpecialization)),
+        skill_level=rng.choice(SKILL_LEVELS),
+        current_latitude=40.7,
+        current_longitude=-74.0,
+        status=rng.choice(list(CrewStatus)),
+        shift_end=datetime.now() + timedelta(hours=rng.choice([2, 8])),
+        hours_worked_today=rng.choice([2.0, 17.0]),
+    )
+    fields.update(overrides)
+    return FieldCrew(**fields)
+
+
+def _brute_force(roster, status=None, specialization=None, skill_level=None):
+    return sorted(
+        crew.crew_id for crew in roster.values()
+        if (status is None or crew.status == status)
+        and (specialization is None or crew.specialization == specialization)
+        and (skill_level is None or crew.skill_level == skill_level)
+    )
+
+
+def _assert_indexes_match(registry, roster):
+    assert len(registry) == len(roster)
+    for status, specialization, skill_level in itertools.product(
+            [None, *CrewStatus], [None, *CrewSpecialization], [None, *SKILL_LEVELS]):
+        found = sorted(crew.crew_id for crew in registry.find(status, specialization, skill_level))
+        assert found == _brute_force(roster, status, specialization, skill_level)
+    for specialization in [None, *CrewSpecialization]:
+        expected = sorted(
+            crew.crew_id for crew in roster.values()
+            if (specialization is None or crew.specialization == specialization) and crew.is_available_for_assignment()
+        )
+        assert sorted(crew.crew_id for crew in registry.available_crews(specialization)) == expected
+    assert registry.count_by_status() == {
+        status.value: len(_brute_force(roster, status=status)) for status in CrewStatus
+    }
+
+
+def test_indexes_follow_random_changes():
+    rng = random.Random(44)
+    roster = {}
+    registry = CrewRegistry()
+    for step in range(400):
+        operation = rng.random()
+        if operation < 0.4 or not roster:
+            # IDs repeat, so some adds replace a registered crew
+            crew = _crew(rng, f"CREW_{rng.randint(0, 60):03d}")
+            roster[crew.crew_id] = crew
+            registry.add(crew)
+        elif operation < 0.85:
+            crew_id = rng.choice(sorted(roster))
+            status = rng.choice(list(CrewStatus))
+            assert registry.update_status(crew_id, status) is roster[crew_id]
+            assert roster[crew_id].status == status
+        else:
+            crew_id = rng.choice(sorted(roster))
+            assert registry.remove(crew_id) is roster.pop(crew_id)
+        if step % 50 == 0:
+            _assert_indexes_match(registry, roster)
+    _assert_indexes_match(registry, roster)
+
+
+def test_add_replaces_a_crew_in_every_index():
+    rng = random.Random(1)
+    original = _crew(rng, "CREW_001", status=CrewStatus.AVAILABLE,
+                     specialization=CrewSpecialization.LINE_WORKER, skill_level="JUNIOR")
+    replacement = _crew(rng, "CREW_001", status=CrewStatus.ON_SITE,
+                        specialization=CrewSpecialization.TREE_REMOVAL, skill_level="EXPERT")
+    registry = CrewRegistry([original, replacement])
+
+    assert len(registry) == 1
+    assert registry.get("CREW_001") is replacement
+    assert registry.find(status=CrewStatus.AVAILABLE) == []
+    assert registry.find(specialization=CrewSpecialization.LINE_WORKER) == []
+    assert registry.find(skill_level="JUNIOR") == []
+    assert registry.find(CrewStatus.ON_SITE, CrewSpecialization.TREE_REMOVAL, "EXPERT") == [replacement]
+
+
+def test_update_status_moves_crew_between_status_indexes():
+    crew = _crew(random.Random(2), "CREW_001", status=CrewStatus.AVAILABLE, hours_worked_today=0.0,
+                 shift_end=datetime.now() + timedelta(hours=8))
+    registry = CrewRegistry([crew])
+    assert registry.available_crews() == [crew]
+
+    registry.update_status("CREW_001", CrewStatus.DISPATCHED)
+    assert registry.find(status=CrewStatus.AVAILABLE) == []
+    assert registry.find(status=CrewStatus.DISPATCHED) == [crew]
+    assert registry.available_crews() == []
+    assert not registry.is_available("CREW_001")
+
+    registry.update_status("CREW_001", "returning")
+    assert crew.status == CrewStatus.RETURNING
+    assert registry.available_crews(crew.specialization) == [crew]
+    with pytest.raises(KeyError):
+        registry.update_status("CREW_MISSING", CrewStatus.AVAILABLE)
+
+
+def test_from_records_accepts_enum_member_names():
+    registry = CrewRegistry.from_records([{
+        "crew_id": "CREW_001", "name": "Alpha", "team_size": 4, "specialization": "LINE_WORKER",
+        "skill_level": "SENIOR", "current_latitude": 40.7, "current_longitude": -74.0,
+        "status": "AVAILABLE", "shift_end": (datetime.now() + timedelta(hours=8)).isoformat(),
+    }])
+    crew = registry.get("CREW_001")
+    assert crew.specialization == CrewSpecialization.LINE_WORKER
+    assert registry.find(status=CrewStatus.AVAILABLE) == [crew]
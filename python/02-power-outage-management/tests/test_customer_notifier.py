@@ -0,0 +1,277 @@
+"""
+Tests for delayed notification scheduling and cross-incident coalescing in the
+customer notification service.
+"""
+
+import asyncio
+import json
+import math
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.models.incident import OutageCause, OutageIncident, OutageSeverity
+from src.services.customer_notifier import CustomerNotificationService
+from src.utils.data_loader import data_loader
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+CENTER = (40.75, -73.98)
+RULES = json.loads((PROJECT_DIR / "config" / "outage_config.json").read_text())["notification_rules"]
+
+
+class RecordingGateway:
+    """Gateway that accepts every message and records what was sent."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, channel, notification):
+        await asyncio.sleep(0)
+        self.sent.append(notification)
+        return True
+
+
+@pytest.fixture
+def customers(monkeypatch, tmp_path):
+    """A synthetic customer database around CENTER, served by the shared data loader."""
+    monkeypatch.chdir(PROJECT_DIR)
+    rng = random.Random(47)
+    records = []
+    for i in range(150):
+        customer_type = rng.choices(["RESIDENTIAL", "COMMERCIAL", "CRITICAL_INFRASTRUCTURE"], weights=[70, 22, 8])[0]
+        records.append({
+            "customer_id": f"CUST_{i:04d}", "name": f"Customer {i}", "customer_type": customer_type,
+            "priority_level": "CRITICAL" if customer_type == "CRITICAL_INFRASTRUCTURE" else "STANDARD",
+            "service_address": f"{i} Test Ave", "latitude": CENTER[0] + rng.uniform(-0.025, 0.025),
+            "longitude": CENTER[1] + rng.uniform(-0.03, 0.03),
+            "communication_preferences": rng.sample(["SMS", "EMAIL", "PHONE"], rng.randint(0, 3)),
+        })
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "customer_database.json").write_text(json.dumps({"customers": records}))
+    monkeypatch.setattr(data_loader, "data_dir", tmp_path / "data")
+    monkeypatch.setattr(data_loader, "_customer_cache", None)
+    monkeypatch.setattr(data_loader, "_customer_index", None)
+    return records
+
+
+@pytest.fixture
+def make_service(tmp_path):
+    services = []
+
+    def make():
+        gateway = RecordingGateway()
+        service = CustomerNotificationService(gateway, delivery_log_path=tmp_path / f"deliveries_{len(services)}.log")
+        services.append(service)
+        return service, gateway
+
+    yield make
+    for service in services:
+        service.close()
+
+
+def _incident(incident_id, latitude, longitude, radius_km=2.0, cause=OutageCause.EQUIPMENT_FAILURE):
+    return OutageIncident(incident_id=incident_id, latitude=latitude, longitude=longitude,
+                          affected_radius_km=radius_km, cause=cause, severity=OutageSeverity.MODERATE,
+                          estimated_customers_affected=100)
+
+
+def _distance_km(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * 6371.0 * math.asin(math.sqrt(a))
+
+
+def _channels(customer):
+    rule_channels = RULES[customer["customer_type"]]["channels"]
+    preferred = [channel for channel in rule_channels if channel in customer["communication_preferences"]]
+    return preferred or customer["communication_preferences"][:1] or rule_channels[:1]
+
+
+def _expected_sends(customers, incident, customer_types):
+    """(incident_id, customer_id, channel) for every covered customer of the given types."""
+    return {
+        (incident.incident_id, customer["customer_id"], channel)
+        for customer in customers
+        if customer["customer_type"] in customer_types
+        and _distance_km(customer["latitude"], customer["longitude"], incident.latitude, incident.longitude)
+        <= incident.affected_radius_km
+        for channel in _channels(customer)
+    }
+
+
+def _sent_keys(notifications):
+    return {(n["incident_id"], n["customer_id"], n["channel"]) for n in notifications}
+
+
+def test_delayed_notifications_go_out_when_their_tier_is_due(customers, make_service):
+    service, gateway = make_service()
+    incident = _incident("INC_A", *CENTER)
+    started = datetime.now()
+    counts = service.notify_customers_of_outage(incident)
+
+    critical = _expected_sends(customers, incident, {"CRITICAL_INFRASTRUCTURE"})
+    commercial = _expected_sends(customers, incident, {"COMMERCIAL"})
+    residential = _expected_sends(customers, incident, {"RESIDENTIAL"})
+    assert critical and commercial and residential
+    assert sum(counts.values()) == len(critical) + len(commercial) + len(residential)
+    assert _sent_keys(gateway.sent) == critical and len(gateway.sent) == len(critical)
+    assert {key for key, _, _ in service.scheduled_notifications.pending()} == commercial | residential
+
+    for minutes, expected in [(14, set()), (16, commercial), (29, set()), (31, residential)]:
+        gateway.sent.clear()
+        summary = service.dispatch_due_notifications(started + timedelta(minutes=minutes))
+        assert _sent_keys(gateway.sent) == expected and summary["sent"] == len(expected)
+    assert len(service.scheduled_notifications) == 0
+
+
+def test_cancel_drops_only_the_resolved_incidents_pending_sends(customers, make_service):
+    service, gateway = make_service()
+    first, second = _incident("INC_A", *CENTER), _incident("INC_B", CENTER[0] + 0.02, CENTER[1])
+    started = datetime.now()
+    service.notify_customers_of_outage(first)
+    service.notify_customers_of_outage(second)
+    delayed = {"COMMERCIAL", "RESIDENTIAL"}
+
+    assert service.cancel_incident_notifications("INC_A") == len(_expected_sends(customers, first, delayed))
+    assert service.cancel_incident_notifications("INC_A") == 0
+    assert service.cancel_incident_notifications("INC_UNKNOWN") == 0
+    expected = _expected_sends(customers, second, delayed)
+    assert {key for key, _, _ in service.scheduled_notifications.pending()} == expected
+
+    gateway.sent.clear()
+    service.dispatch_due_notifications(started + timedelta(minutes=31))
+    assert {(n["customer_id"], n["channel"]) for n in gateway.sent} == {(c, ch) for _, c, ch in expected}
+    assert all(n["incident_id"] == "INC_B" for n in gateway.sent)
+
+
+def test_rescheduling_replaces_the_pending_notification(customers, make_service):
+    service, _ = make_service()
+    notification = {"incident_id": "INC_A", "customer_id": "CUST_0001", "channel": "SMS", "message": "first"}
+    send_at = datetime.now() + timedelta(minutes=10)
+    service.schedule_notification(notification, send_at)
+    service.schedule_notification({**notification, "message": "second"}, send_at + timedelta(minutes=5))
+    pending = list(service.scheduled_notifications.pending())
+    assert [(key, payload["message"]) for key, _, payload in pending] == [(("INC_A", "CUST_0001", "SMS"), "second")]
+    assert abs(pending[0][1] - (send_at + timedelta(minutes=5))) <= timedelta(seconds=1)
+
+
+def test_saved_notifications_are_restored_after_a_restart(customers, make_service, tmp_path):
+    service, _ = make_service()
+    started = datetime.now()
+    service.notify_customers_of_outages([_incident("INC_A", *CENTER), _incident("INC_B", CENTER[0], CENTER[1] + 0.03)])
+    pending = {key: (send_at, payload) for key, send_at, payload in service.scheduled_notifications.pending()}
+    assert service.save_scheduled_notifications(tmp_path / "pending" / "scheduled.json") == len(pending)
+
+    restarted, gateway = make_service()
+    assert restarted.restore_scheduled_notifications(tmp_path / "pending" / "scheduled.json") == len(pending)
+    assert restarted.restore_scheduled_notifications(tmp_path / "missing.json") == 0
+    restored = {key: (send_at, payload) for key, send_at, payload in restarted.scheduled_notifications.pending()}
+    assert restored.keys() == pending.keys()
+    for key, (send_at, payload) in pending.items():
+        assert restored[key][1] == payload
+        assert abs(restored[key][0] - send_at) <= timedelta(seconds=1)
+
+    # Everything falls due while the service is down and goes out on the next dispatch
+    restarted.dispatch_due_notifications(started + timedelta(hours=2))
+    assert {(n["customer_id"], n["channel"]) for n in gateway.sent} == {(c, ch) for _, c, ch in pending}
+    assert len(restarted.scheduled_notifications) == 0
+
+
+def test_overlapping_incidents_reach_each_customer_once_per_channel(customers, make_service):
+    service, gateway = make_service()
+    incidents = [
+        _incident("INC_A", *CENTER, cause=OutageCause.EQUIPMENT_FAILURE),
+        _incident("INC_B", CENTER[0] + 0.01, CENTER[1] + 0.01, cause=OutageCause.SEVERE_WEATHER),
+        _incident("INC_C", CENTER[0] - 0.01, CENTER[1], cause=OutageCause.VEGETATION),
+    ]
+    started = datetime.now()
+    service.notify_customers_of_outages(incidents)
+
+    def covering(customer_types, incident_ids):
+        expected = {}
+        for incident in incidents:
+            if incident.incident_id in incident_ids:
+                for _, customer_id, channel in _expected_sends(customers, incident, customer_types):
+                    expected.setdefault((customer_id, channel), set()).add(incident.incident_id)
+        return expected
+
+    def assert_one_message_each(sent, expected):
+        assert sorted((n["customer_id"], n["channel"]) for n in sent) == sorted(expected)
+        for notification in sent:
+            incident_ids = expected[(notification["customer_id"], notification["channel"])]
+            assert set(notification.get("incident_ids", [notification["incident_id"]])) == incident_ids
+            if len(incident_ids) > 1:
+                assert f"{len(incident_ids)} power outages" in notification["message"]
+                assert notification["message"].count("Outage due to") == len(incident_ids)
+
+    # Critical infrastructure is notified at once, already merged across all three incidents
+    immediate = covering({"CRITICAL_INFRASTRUCTURE"}, {"INC_A", "INC_B", "INC_C"})
+    assert_one_message_each(gateway.sent, immediate)
+    assert any(len(incident_ids) > 1 for incident_ids in immediate.values())
+
+    # INC_C resolves before the delayed tiers are due
+    service.cancel_incident_notifications("INC_C")
+    pending = len(service.scheduled_notifications)
+    gateway.sent.clear()
+    summary = service.dispatch_due_notifications(started + timedelta(minutes=31))
+    delayed = covering({"COMMERCIAL", "RESIDENTIAL"}, {"INC_A", "INC_B"})
+    assert_one_message_each(gateway.sent, delayed)
+    assert any(len(incident_ids) > 1 for incident_ids in delayed.values())
+    assert pending == sum(len(incident_ids) for incident_ids in delayed.values())
+    assert summary["sends_saved"] == pending - len(delayed)
+
+    immediate_sends = sum(len(incident_ids) for incident_ids in immediate.values())
+    assert service.coalescing_stats == {
+        "received": immediate_sends + pending,
+        "sent": len(immediate) + len(delayed),
+        "sends_saved": immediate_sends - len(immediate) + pending - len(delayed),
+    }
+
+
+def test_coalescing_window_holds_sends_for_later_incidents(customers, make_service):
+    service, _ = make_service()
+    now = datetime.now()
+    window = timedelta(minutes=5)
+    notification = {"incident_id": "INC_A", "customer_id": "CUST_0001", "channel": "SMS", "message": "A"}
+    first = service.schedule_notification(notification, now, window)
+    assert now + window <= first <= datetime.now() + window
+    # A later incident joins the pending send instead of going out on its own
+    assert service.schedule_notification({**notification, "incident_id": "INC_B"}, now, window) == first
+    assert service.schedule_notification({**notification, "channel": "EMAIL"}, now) == now
+    assert service.cancel_incident_notifications("INC_A") == 2
+    assert service.schedule_notification({**notification, "incident_id": "INC_C"}, now + timedelta(hours=1)) == first
+
+
+def test_coalesce_merges_per_customer_and_channel(customers, make_service):
+    service, _ = make_service()
+
+    def notification(incident_id, customer_id="CUST_0001", channel="SMS", customer_type="RESIDENTIAL", cause="storm"):
+        return {"incident_id": incident_id, "customer_id": customer_id, "channel": channel, "message": incident_id,
+                "customer_type": customer_type, "customer_name": "Ann", "affected_area": "1 Elm St",
+                "cause": cause, "estimated_time": "2.0 hours"}
+
+    merged = service.coalesce_notifications([
+        notification("INC_A", cause="storm"),
+        notification("INC_A", channel="EMAIL"),
+        notification("INC_B", cause="vegetation"),
+        notification("INC_A", customer_id="CUST_0002", customer_type="CRITICAL_INFRASTRUCTURE"),
+        notification("INC_B", customer_id="CUST_0002", customer_type="CRITICAL_INFRASTRUCTURE"),
+        notification("INC_C", customer_id="CUST_0003"),
+        notification("INC_C", customer_id="CUST_0003"),
+    ])
+    assert [(n["customer_id"], n["channel"]) for n in merged] == [
+        ("CUST_0001", "SMS"), ("CUST_0001", "EMAIL"), ("CUST_0002", "SMS"), ("CUST_0003", "SMS"),
+    ]
+    sms, email, critical, duplicate = merged
+    assert sms["incident_ids"] == ["INC_A", "INC_B"] and sms["incident_id"] == "INC_A"
+    assert sms["message"] == service.message_templates["multiple_outages"].format(
+        customer_name="Ann", affected_area="1 Elm St", outage_count=2,
+        outage_list="1. Outage due to storm, estimated restoration: 2.0 hours\n"
+                    "2. Outage due to vegetation, estimated restoration: 2.0 hours",
+    )
+    assert email["message"] == "INC_A" and "incident_ids" not in email
+    assert critical["message"].startswith("PRIORITY ALERT for Ann: 2 power outages")
+    assert duplicate["incident_ids"] == ["INC_C"] and duplicate["message"] == "INC_C"
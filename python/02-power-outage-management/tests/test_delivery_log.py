@@ -0,0 +1,90 @@
+"""
+Tests for the columnar delivery log, including reading back after a crash.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.utils.delivery_log import ColumnarDeliveryLog
+
+
+def _results(count, start=0):
+    base = datetime(2025, 1, 1)
+    return [
+        {
+            "customer_id": f"CUST_{i:05d}",
+            "incident_id": None if i % 7 == 0 else f"INC_{i % 3}",
+            "channel": ("SMS", "EMAIL", "PHONE")[i % 3],
+            "priority": ("CRITICAL", "HIGH", "STANDARD")[i % 3],
+            "delivery_successful": i % 5 != 0,
+            "attempt_count": 1 + i % 3,
+            "message_length": 100 + i,
+            "latency_ms": None if i % 11 == 0 else float(i % 50),
+            "delivery_time": base + timedelta(seconds=i),
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def test_columns_round_trip_through_file_and_buffer(tmp_path):
+    results = _results(250)
+    log = ColumnarDeliveryLog(tmp_path / "deliveries.dlog", recent_size=20, flush_rows=100)
+    log.extend(results)
+    assert len(log.recent()) == 20
+
+    columns = log.read_columns()
+    assert columns["customer_id"].tolist() == [r["customer_id"] for r in results]
+    assert columns["incident_id"].tolist() == [r["incident_id"] for r in results]
+    assert columns["delivery_successful"].tolist() == [r["delivery_successful"] for r in results]
+    assert columns["attempt_count"].tolist() == [r["attempt_count"] for r in results]
+    np.testing.assert_array_equal(columns["delivery_time"], [r["delivery_time"].timestamp() for r in results])
+    latencies = [np.nan if r["latency_ms"] is None else r["latency_ms"] for r in results]
+    np.testing.assert_array_equal(columns["latency_ms"], latencies)
+
+
+def test_torn_block_is_ignored_and_overwritten_after_crash(tmp_path):
+    path = tmp_path / "deliveries.dlog"
+    log = ColumnarDeliveryLog(path, flush_rows=100)
+    log.extend(_results(200))
+    complete_size = path.stat().st_size
+
+    # Simulate a crash halfway through writing the third block
+    crashed = ColumnarDeliveryLog(path, flush_rows=100)
+    crashed.extend(_results(100, start=200))
+    torn_size = complete_size + (path.stat().st_size - complete_size) // 2
+    os.truncate(path, torn_size)
+
+    reopened = ColumnarDeliveryLog(path, flush_rows=100)
+    assert reopened.read_columns(["customer_id"])["customer_id"].tolist() == [
+        r["customer_id"] for r in _results(200)
+    ]
+    assert len(reopened) == 200
+
+    # New blocks replace the torn tail instead of following it
+    reopened.extend(_results(50, start=300))
+    reopened.close()
+    ids = ColumnarDeliveryLog(path).read_columns(["customer_id"])["customer_id"].tolist()
+    assert ids == [r["customer_id"] for r in _results(200) + _results(50, start=300)]
+
+
+def test_reopened_log_rebuilds_aggregates(tmp_path):
+    path = tmp_path / "deliveries.dlog"
+    with ColumnarDeliveryLog(path, flush_rows=64) as log:
+        log.extend(_results(300))
+        expected = log.summary()
+
+    summary = ColumnarDeliveryLog(path).summary()
+    assert summary["total_deliveries"] == expected["total_deliveries"] == 300
+    assert summary["successful"] == expected["successful"]
+    assert summary["latency_by_channel"].keys() == expected["latency_by_channel"].keys()
+    for channel, stats in expected["latency_by_channel"].items():
+        assert summary["latency_by_channel"][channel] == pytest.approx(stats)
+    assert summary["retries_by_priority"] == expected["retries_by_priority"]
+
+
+def test_rejects_unknown_columns(tmp_path):
+    with pytest.raises(ValueError):
+        ColumnarDeliveryLog(tmp_path / "deliveries.dlog").read_columns(["nope"])
@@ -0,0 +1,82 @@
+"""
+Tests for the incident priority queue against sorting by priority score.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.incident import IncidentStatus, OutageCause, OutageIncident, OutageSeverity
+from src.utils.incident_queue import IncidentPriorityQueue
+from src.utils.priority_calculator import calculate_incident_priority
+
+NOW = datetime(2025, 6, 1, 12, 0)
+
+
+def _incident(rng, i):
+    return OutageIncident(
+        incident_id=f"INC_{i:04d}",
+        created_at=NOW - timedelta(minutes=rng.randint(0, 72 * 60)),
+        latitude=40.7, longitude=-74.0, affected_radius_km=2.0,
+        cause=rng.choice(list(OutageCause)), severity=rng.choice(list(OutageSeverity)),
+        status=rng.choice(list(IncidentStatus)),
+        estimated_customers_affected=100,
+        critical_infrastructure_count=rng.randint(0, 3),
+        commercial_customer_count=rng.randint(0, 30),
+        residential_customer_count=rng.randint(0, 500),
+    )
+
+
+def _assert_top_matches_sort(queue, incidents, k=None, statuses=None, as_of=NOW):
+    expected = sorted(
+        (calculate_incident_priority(incident, as_of) for incident in incidents.values()
+         if statuses is None or incident.status in statuses),
+        reverse=True,
+    )[:k]
+    top = queue.top(k, statuses=statuses, as_of=as_of)
+    assert [score for _, score in top] == pytest.approx(expected)
+    for incident, score in top:
+        assert score == pytest.approx(calculate_incident_priority(incident, as_of))
+
+
+def test_top_matches_sorting_after_random_operations():
+    rng = random.Random(45)
+    incidents = {}
+    queue = IncidentPriorityQueue()
+    for i in range(300):
+        operation = rng.random()
+        if operation < 0.6 or not incidents:
+            incident = _incident(rng, i)
+            incidents[incident.incident_id] = incident
+            queue.push(incident)
+        elif operation < 0.8:
+            incident = incidents[rng.choice(sorted(incidents))].model_copy(update={
+                "status": rng.choice(list(IncidentStatus)),
+                "severity": rng.choice(list(OutageSeverity)),
+                "residential_customer_count": rng.randint(0, 500),
+            })
+            incidents[incident.incident_id] = incident
+            queue.update(incident)
+        else:
+            incident_id = rng.choice(sorted(incidents))
+            assert queue.remove(incident_id).incident_id == incident_id
+            del incidents[incident_id]
+        assert len(queue) == len(incidents)
+
+    _assert_top_matches_sort(queue, incidents)
+    _assert_top_matches_sort(queue, incidents, k=10)
+    _assert_top_matches_sort(queue, incidents, k=5, statuses={IncidentStatus.REPORTED, IncidentStatus.CONFIRMED})
+
+
+def test_order_follows_aging_without_reinsertion():
+    rng = random.Random(7)
+    incidents = {incident.incident_id: incident for incident in (_incident(rng, i) for i in range(100))}
+    queue = IncidentPriorityQueue(incidents.values())
+    # Severe weather incidents age faster, so the ranking changes over time
+    for hours in (0, 6, 48, 500):
+        _assert_top_matches_sort(queue, incidents, k=20, as_of=NOW + timedelta(hours=hours))
+
+
+def test_remove_unknown_incident_returns_none():
+    assert IncidentPriorityQueue().remove("INC_MISSING") is None
@@ -0,0 +1,107 @@
+"""
+Tests for compiled message rendering against plain str.format.
+"""
+
+import random
+from pathlib import Path
+from string import Formatter
+
+import pytest
+
+from src.models.customer import CustomerType
+from src.models.incident import IncidentStatus, OutageCause, OutageIncident, OutageSeverity
+from src.services.customer_notifier import CustomerNotificationService
+from src.services.message_renderer import CompiledTemplate, MessageRenderer, customer_fields, incident_fields
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def templates(monkeypatch, tmp_path):
+    monkeypatch.chdir(PROJECT_DIR)
+    with CustomerNotificationService(delivery_log_path=tmp_path / "deliveries.log") as service:
+        return service.message_templates
+
+
+def _incidents():
+    return [
+        OutageIncident(latitude=40.7, longitude=-74.0, cause=cause, severity=OutageSeverity.MODERATE,
+                       status=status, estimated_customers_affected=50, estimated_restoration_hours=hours)
+        for cause, status, hours in [
+            (OutageCause.EQUIPMENT_FAILURE, IncidentStatus.REPORTED, 2.25),
+            (OutageCause.SEVERE_WEATHER, IncidentStatus.ASSIGNED, 7.0),
+            (OutageCause.PLANNED_MAINTENANCE, IncidentStatus.IN_PROGRESS, 0.5),
+        ]
+    ]
+
+
+def _customers(rng, count=30):
+    customers = []
+    for i in range(count):
+        customer = {"customer_id": f"CUST_{i}", "customer_type": rng.choice(list(CustomerType)).value}
+        if rng.random() < 0.8:
+            customer["name"] = f"Customer {i} {{literal braces}}"
+        if rng.random() < 0.8:
+            customer["service_address"] = f"{i} Main St"
+        customers.append(customer)
+    return customers
+
+
+def _template_for(templates, message_type, customer_type):
+    return templates.get(f"{message_type}:{customer_type}") or templates[message_type]
+
+
+def _fields(template):
+    return {field for _, field, _, _ in Formatter().parse(template) if field is not None}
+
+
+def test_compiled_templates_match_format_for_every_template(templates):
+    values = {
+        "customer_name": "Ada", "affected_area": "12 Elm St", "estimated_time": "3.0 hours",
+        "cause": "severe weather conditions", "crew_status": "Crew has been dispatched",
+        "outage_count": "2", "outage_list": "1. one\n2. two",
+    }
+    for template in templates.values():
+        expected = template.format(**values)
+        # Any split between fields bound up front and fields filled per customer renders the same text
+        for bound_fields in ({}, values, {k: v for k, v in values.items() if k not in ("customer_name", "affected_area")}):
+            open_values = {k: v for k, v in values.items() if k not in bound_fields}
+            assert CompiledTemplate(template).bind(bound_fields).render(open_values) == expected
+
+
+@pytest.mark.parametrize("customer_type", list(CustomerType))
+def test_rendered_messages_match_format_for_every_message_type(templates, customer_type):
+    renderer = MessageRenderer(templates)
+    rng = random.Random(48)
+    message_types = {name.split(":")[0] for name in templates}
+    # Message types the renderer fills from incident and customer fields alone
+    renderable = [name for name in sorted(message_types)
+                  if _fields(_template_for(templates, name, customer_type.value))
+                  <= set(incident_fields(_incidents()[0])) | set(customer_fields({}))]
+    assert {"initial_outage", "crew_dispatched", "restoration_complete", "delay_notification",
+            "critical_infrastructure"} <= set(renderable)
+
+    customers = [{**customer, "customer_type": customer_type.value} for customer in _customers(rng)]
+    for incident in _incidents():
+        for message_type in renderable:
+            template = _template_for(templates, message_type, customer_type.value)
+            expected = [template.format(**incident_fields(incident), **customer_fields(customer)) for customer in customers]
+            assert renderer.render_batch(customers, incident, message_type) == expected
+            assert [renderer.render(customer, incident, message_type) for customer in customers] == expected
+
+
+def test_customer_type_overrides_and_cache_invalidation():
+    renderer = MessageRenderer({
+        "update": "{customer_name}: {crew_status} ({estimated_time})",
+        "update:COMMERCIAL": "{customer_name!r:>12} business update: {cause}",
+    }, max_cached_incidents=2)
+    incident = _incidents()[0]
+    customers = [{"name": "Ann", "customer_type": "RESIDENTIAL"}, {"name": "Shop", "customer_type": "COMMERCIAL"}]
+    assert renderer.render_batch(customers, incident, "update") == [
+        "Ann: Assessing situation (2.2 hours)", "      'Shop' business update: equipment malfunction",
+    ]
+    incident.status = IncidentStatus.ASSIGNED
+    incident.estimated_restoration_hours = 5
+    assert renderer.render(customers[0], incident, "update") == "Ann: Crew has been dispatched (5.0 hours)"
+    assert len(renderer._bound) <= 2
+    assert renderer.render(customers[0], incident, "unknown_type") == ""
@@ -0,0 +1,35 @@
+"""
+Tests for the customer spatial index against brute-force Haversine distances.
+"""
+
+import numpy as np
+
+from src.utils.distance_calculator import haversine_distances_from_point
+from src.utils.spatial_index import CustomerSpatialIndex
+
+
+def _assert_matches_brute_force(index, latitudes, longitudes, latitude, longitude, radius_km):
+    positions, distances = index.query_radius(latitude, longitude, radius_km)
+    all_distances = haversine_distances_from_point(latitude, longitude, latitudes, longitudes)
+    np.testing.assert_array_equal(positions, np.flatnonzero(all_distances <= radius_km))
+    np.testing.assert_allclose(distances, all_distances[positions])
+
+
+def test_query_radius_matches_brute_force():
+    rng = np.random.default_rng(42)
+    latitudes = rng.uniform(40.4, 41.0, 5000)
+    longitudes = rng.uniform(-74.3, -73.6, 5000)
+    index = CustomerSpatialIndex(latitudes, longitudes)
+    for _ in range(50):
+        _assert_matches_brute_force(index, latitudes, longitudes, rng.uniform(40.4, 41.0),
+                                    rng.uniform(-74.3, -73.6), rng.uniform(0.1, 20.0))
+
+
+def test_query_radius_near_poles_and_antimeridian():
+    rng = np.random.default_rng(7)
+    latitudes = np.concatenate([rng.uniform(-89.9, 89.9, 2000), rng.uniform(88.0, 89.99, 200)])
+    longitudes = np.concatenate([rng.uniform(-180, 180, 2000), rng.uniform(-180, 180, 200)])
+    index = CustomerSpatialIndex(latitudes, longitudes, band_degrees=1.0)
+    for latitude, longitude, radius_km in [(0.0, 179.9, 500.0), (10.0, -179.95, 800.0),
+                                           (89.5, 30.0, 300.0), (-89.0, 0.0, 400.0), (45.0, 0.0, 0.0)]:
+        _assert_matches_brute_force(index, latitudes, longitudes, latitude, longitude, radius_km)
@@ -0,0 +1,60 @@
+"""
+Tests for the hierarchical timer wheel against a plain dictionary of due times.
+"""
+
+import math
+import random
+from datetime import datetime, timedelta
+
+from src.utils.timer_wheel import HierarchicalTimerWheel
+
+ORIGIN = datetime(2025, 1, 1)
+TICK = timedelta(seconds=1)
+
+
+def test_fires_every_timer_once_at_its_tick():
+    rng = random.Random(26)
+    # Small wheels (span 64 ticks) so cascades and the overflow bucket are exercised
+    wheel = HierarchicalTimerWheel(tick=TICK, wheel_sizes=(4, 4, 4), origin=ORIGIN)
+    expected = {}
+    now = ORIGIN
+    fired_total = 0
+
+    for step in range(400):
+        for _ in range(rng.randint(0, 4)):
+            key = f"T{rng.randint(0, 150)}"
+            due_at = now + timedelta(seconds=rng.uniform(-2, 300))
+            wheel.schedule(key, due_at, (key, due_at))
+            expected[key] = due_at
+        if expected and rng.random() < 0.2:
+            key = rng.choice(sorted(expected))
+            assert wheel.cancel(key) == (key, expected.pop(key))
+
+        now += timedelta(seconds=rng.uniform(0, 5))
+        fired = wheel.advance(now)
+        reached = math.floor((now - ORIGIN) / TICK)
+        due = {key for key, due_at in expected.items() if math.ceil((due_at - ORIGIN) / TICK) <= reached}
+        assert {key for key, _ in fired} == due
+        for key, payload in fired:
+            assert payload == (key, expected.pop(key))
+        fired_total += len(fired)
+        assert len(wheel) == len(expected)
+        assert {key: due_at for key, _, (_, due_at) in wheel.pending()} == expected
+
+    assert fired_total > 0
+
+
+def test_pending_reports_due_time_rounded_up_to_a_tick():
+    wheel = HierarchicalTimerWheel(tick=TICK, origin=ORIGIN)
+    wheel.schedule("a", ORIGIN + timedelta(seconds=90.2), "payload")
+    assert list(wheel.pending()) == [("a", ORIGIN + timedelta(seconds=91), "payload")]
+    assert wheel.advance(ORIGIN + timedelta(seconds=90)) == []
+    assert wheel.advance(ORIGIN + timedelta(seconds=91)) == [("a", "payload")]
+    assert "a" not in wheel
+
+
+def test_timers_beyond_the_top_level_wait_in_overflow():
+    wheel = HierarchicalTimerWheel(tick=TICK, wheel_sizes=(4, 4), origin=ORIGIN)
+    wheel.schedule("late", ORIGIN + timedelta(seconds=100), None)
+    assert wheel.advance(ORIGIN + timedelta(seconds=99)) == []
+    assert wheel.advance(ORIGIN + timedelta(seconds=100)) == [("late", None)]